@@ -1,5 +1,6 @@
 import adsk.core, adsk.fusion, traceback
 import os
+from dataclasses import asdict
 
 
 
@@ -7,9 +8,17 @@ from ...lib import configUtils
 from ...lib import fusion360utils as futil
 from ... import config
 from ...lib.gridfinityUtils.const import DIMENSION_DEFAULT_WIDTH_UNIT
-from ...lib.gridfinityUtils.baseplateGenerator import createGridfinityBaseplate
+from ...lib.gridfinityUtils.baseplateGenerator import createGridfinityBaseplate, planOptimizedBaseplate
 from ...lib.gridfinityUtils.baseplateGeneratorInput import BaseplateGeneratorInput
 from ...lib.gridfinityUtils import const
+from ...lib.gridfinityUtils import traceUtils
+from ...lib.gridfinityUtils import batchGenerator
+from ...lib.gridfinityUtils import planSerializer
+from ...lib.gridfinityUtils.meshPreview import MeshPreview
+from ...lib.gridfinityUtils.previewScheduler import PreviewScheduler, previewKey
+from ...lib.gridfinityUtils.planWorker import PlanWorker
+from ...lib.gridfinityUtils.previewBodyCache import PreviewBodyCache
+from ...lib.gridfinityUtils.generationProgress import GenerationProgress, GenerationCancelledException
 from .inputState import InputState
 from ...lib.ui.commandUiState import CommandUiState
 from ...lib.ui.unsupportedDesignTypeException import UnsupportedDesignTypeException
@@ -45,6 +54,14 @@ UI_INPUT_DEFAULTS_CONFIG_PATH = os.path.join(CONFIG_FOLDER_PATH, "ui_input_defau
 # they are not released and garbage collected.
 local_handlers = []
 
+meshPreview = MeshPreview(f'{CMD_ID}_meshPreview')
+previewScheduler = PreviewScheduler(f'{CMD_ID}_previewScheduler')
+previewBodyCache = PreviewBodyCache()
+planCache = planSerializer.PlanCache()
+planWorker = PlanWorker(f'{CMD_ID}_planWorker', planCache)
+# plan key of the dialog values last handed to the plan worker
+baseplatePlanKey: str = None
+
 # Input groups
 INFO_GROUP = 'info_group'
 BASIC_SIZES_GROUP = 'basic_sizes'
@@ -99,6 +116,11 @@ INPUT_CHANGES_RESET_TO_DEFAULTS = 'input_changes_button_reset_to_defaults'
 INPUT_CHANGES_RESET_TO_FACTORY = 'input_changes_button_factory_reset'
 
 SHOW_PREVIEW_INPUT = 'show_preview'
+PREVIEW_MODE_INPUT = 'preview_mode'
+PREVIEW_MODE_MESH = 'Mesh'
+PREVIEW_MODE_SIMPLIFIED = 'Simplified model'
+PREVIEW_MODE_FULL = 'Full model'
+PREVIEW_STATUS_INPUT = 'preview_status'
 
 INFO_TEXT = ("<b>Help:</b> Info for inputs can be found "
              "<a href=\"https://github.com/Le0Michine/FusionGridfinityGenerator/wiki/Baseplate-generator-options\">"
@@ -343,9 +365,22 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     previewGroup = inputs.addGroupCommandInput(PREVIEW_GROUP, 'Preview')
     uiState.registerCommandInput(previewGroup)
     previewGroup.isExpanded = uiState.getState(PREVIEW_GROUP)
-    showLivePreview = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_INPUT, 'Show preview (slow)', True, '', uiState.getState(SHOW_PREVIEW_INPUT))
+    showLivePreview = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_INPUT, 'Show preview', True, '', uiState.getState(SHOW_PREVIEW_INPUT))
     uiState.registerCommandInput(showLivePreview)
-
+    previewModeDropdown = previewGroup.children.addDropDownCommandInput(PREVIEW_MODE_INPUT, 'Preview mode', adsk.core.DropDownStyles.LabeledIconDropDownStyle)
+    previewModeDropdownDefaultValue = uiState.getState(PREVIEW_MODE_INPUT)
+    previewModeDropdown.listItems.add(PREVIEW_MODE_MESH, previewModeDropdownDefaultValue == PREVIEW_MODE_MESH)
+    previewModeDropdown.listItems.add(PREVIEW_MODE_SIMPLIFIED, previewModeDropdownDefaultValue == PREVIEW_MODE_SIMPLIFIED)
+    previewModeDropdown.listItems.add(PREVIEW_MODE_FULL, previewModeDropdownDefaultValue == PREVIEW_MODE_FULL)
+    previewModeDropdown.tooltip = 'Mesh is drawn without touching the timeline, simplified model skips fillets, holes and clips'
+    uiState.registerCommandInput(previewModeDropdown)
+    previewGroup.children.addTextBoxCommandInput(PREVIEW_STATUS_INPUT, 'Status', '', 1, True)
+
+    command = args.command
+    meshPreview.register(lambda: updatePreviewStatus(command.commandInputs))
+    previewScheduler.register(command.doExecutePreview)
+    planWorker.register(lambda key: updatePreviewStatus(command.commandInputs))
+    requestBaseplatePlan(getInputsState())
     futil.add_handler(args.command.execute, command_execute, local_handlers=local_handlers)
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
     futil.add_handler(args.command.executePreview, command_preview, local_handlers=local_handlers)
@@ -358,7 +393,11 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 def command_execute(args: adsk.core.CommandEventArgs):
     # General logging for debug.
     futil.log(f'{CMD_NAME} Command Execute Event')
-    generateBaseplate(args)
+    previewScheduler.cancel()
+    meshPreview.clear()
+    with traceUtils.trace(CMD_NAME) as trace:
+        generateBaseplate(args, progress=GenerationProgress(CMD_NAME), isExecute=True)
+    logTrace(trace)
 
 
 # This event handler is called when the command needs to compute a new preview in the graphics window.
@@ -368,12 +407,34 @@ def command_preview(args: adsk.core.CommandEventArgs):
     # Get a reference to command's inputs.
     inputs = args.command.commandInputs
     showPreview: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_INPUT)
+    previewMode: adsk.core.DropDownCommandInput = inputs.itemById(PREVIEW_MODE_INPUT)
     if showPreview.value:
         if INPUTS_VALID:
-            generateBaseplate(args)
+            spec = batchGenerator.normalizeSpec(dict(asdict(getInputsState()), type=batchGenerator.BATCH_ITEM_BASEPLATE))
+            key = previewKey(spec, previewMode.selectedItem.name)
+            # previews seen before come back right away
+            if key in previewBodyCache:
+                previewScheduler.cancel()
+                meshPreview.clear()
+                previewBodyCache.restore(key)
+            elif previewScheduler.isDue(key):
+                if previewMode.selectedItem.name == PREVIEW_MODE_MESH:
+                    showMeshPreview(spec)
+                else:
+                    meshPreview.clear()
+                    with traceUtils.trace(f'{CMD_NAME} preview') as trace:
+                        isGenerated = generateBaseplate(args, previewMode.selectedItem.name == PREVIEW_MODE_SIMPLIFIED)
+                    logTrace(trace)
+                    if isGenerated:
+                        des = adsk.fusion.Design.cast(app.activeProduct)
+                        previewBodyCache.remember(key, des.activeComponent)
         else:
             args.executeFailed = True
             args.executeFailedMessage = "Some inputs are invalid, unable to generate preview"
+    else:
+        previewScheduler.cancel()
+        meshPreview.clear()
+    updatePreviewStatus(inputs)
 
 
 # This event handler is called when the user changes anything in the command dialog
@@ -406,6 +467,7 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
         uiState.forceUIRefresh()
 
     inputs = args.inputs
+    requestBaseplatePlan(getInputsState())
 
     # General logging for debug.
     futil.log(f'{CMD_NAME} Input Changed Event fired from a change to {changed_input.id}')
@@ -420,17 +482,13 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
     inputsState = getInputsState()
     
     # Verify the validity of the input values. This controls if the OK button is enabled or not.
-    INPUTS_VALID = inputsState.baseWidth >= 1 \
-        and inputsState.baseLength >= 1 \
-        and inputsState.xyClearance >= 0.01 \
-        and inputsState.xyClearance <= 0.05 \
-        and inputsState.plateWidth > 0 \
-        and inputsState.plateLength > 0 \
-        and (not inputsState.hasMagnetSockets or (inputsState.magnetSocketSize <= 1 and inputsState.magnetSocketSize > 0 and inputsState.magnetSocketDepth > 0)) \
-        and (not inputsState.hasScrewHoles or (inputsState.screwHoleSize > 0 and inputsState.screwHoleSize <= 1 and inputsState.screwHeadSize > inputsState.screwHoleSize and inputsState.screwHeadSize <= 1.5)) \
-        and (not inputsState.hasConnectionHoles or (inputsState.connectionHoleSize > 0 and inputsState.connectionHoleSize <= 0.5)) \
-        and (inputsState.extraBottomThickness > 0)
-
+    INPUTS_VALID = isInputsStateValid(inputsState)
+    if INPUTS_VALID and baseplatePlanKey:
+        # values the worker failed to plan keep OK disabled
+        planError = planWorker.errorOf(baseplatePlanKey)
+        if planError:
+            INPUTS_VALID = False
+            futil.log(f'{CMD_NAME} Inputs can not be planned, {planError}')
 
     args.areInputsValid = INPUTS_VALID
         
@@ -438,12 +496,119 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
 # This event handler is called when the command terminates.
 def command_destroy(args: adsk.core.CommandEventArgs):
     futil.log(f'{CMD_NAME} Command Destroy Event')
+    previewScheduler.unregister()
+    planWorker.unregister()
+    meshPreview.unregister()
+    previewBodyCache.clear()
     global local_handlers
     local_handlers = []
     global uiState
 
 
-def generateBaseplate(args: adsk.core.CommandEventArgs):
+def logTrace(trace: traceUtils.Trace):
+    if trace is None:
+        return
+    if trace.error:
+        futil.log(f'{CMD_NAME} Failed to write trace, {trace.error}')
+    else:
+        futil.log(f'{CMD_NAME} Trace written to {trace.path}')
+
+def showMeshPreview(spec: dict):
+    try:
+        key, factory = batchGenerator.createItemFactory(spec)
+        meshPreview.show(key, factory)
+    except Exception as err:
+        meshPreview.clear()
+        futil.log(f'{CMD_NAME} Mesh preview failed, {err}')
+
+def updatePreviewStatus(inputs: adsk.core.CommandInputs):
+    previewStatus: adsk.core.TextBoxCommandInput = inputs.itemById(PREVIEW_STATUS_INPUT)
+    if previewStatus is None:
+        return
+    if previewScheduler.isPending:
+        previewStatus.text = 'Waiting for input changes to settle'
+    elif meshPreview.isBuilding:
+        previewStatus.text = 'Building preview'
+    elif planWorker.isPlanning:
+        previewStatus.text = 'Planning'
+    else:
+        previewStatus.text = 'Up to date'
+
+def savePlan(graph, parameters: dict):
+    # shared plan files reproduce a generation exactly, writing them never fails it
+    try:
+        path = planSerializer.savePlan(graph, parameters)
+    except OSError as err:
+        futil.log(f'{CMD_NAME} Failed to write plan, {err}')
+        return
+    if path:
+        futil.log(f'{CMD_NAME} Plan written to {path}')
+
+def isInputsStateValid(inputsState: InputState) -> bool:
+    return inputsState.baseWidth >= 1 \
+        and inputsState.baseLength >= 1 \
+        and inputsState.xyClearance >= 0.01 \
+        and inputsState.xyClearance <= 0.05 \
+        and inputsState.plateWidth > 0 \
+        and inputsState.plateLength > 0 \
+        and (not inputsState.hasMagnetSockets or (inputsState.magnetSocketSize <= 1 and inputsState.magnetSocketSize > 0 and inputsState.magnetSocketDepth > 0)) \
+        and (not inputsState.hasScrewHoles or (inputsState.screwHoleSize > 0 and inputsState.screwHoleSize <= 1 and inputsState.screwHeadSize > inputsState.screwHoleSize and inputsState.screwHeadSize <= 1.5)) \
+        and (not inputsState.hasConnectionHoles or (inputsState.connectionHoleSize > 0 and inputsState.connectionHoleSize <= 0.5)) \
+        and (inputsState.extraBottomThickness > 0)
+
+def getBaseplateInput(inputsState: InputState, isLowFidelity: bool = False) -> BaseplateGeneratorInput:
+    baseplateGeneratorInput = BaseplateGeneratorInput()
+
+    baseplateGeneratorInput.baseWidth = inputsState.baseWidth
+    baseplateGeneratorInput.baseLength = inputsState.baseLength
+    baseplateGeneratorInput.xyClearance = inputsState.xyClearance
+    baseplateGeneratorInput.baseplateWidth = inputsState.plateWidth
+    baseplateGeneratorInput.baseplateLength = inputsState.plateLength
+    baseplateGeneratorInput.hasExtendedBottom = not inputsState.plateType == BASEPLATE_TYPE_LIGHT
+    baseplateGeneratorInput.hasSkeletonizedBottom = inputsState.plateType == BASEPLATE_TYPE_SKELETONIZED
+    baseplateGeneratorInput.hasMagnetCutouts = inputsState.hasMagnetSockets
+    baseplateGeneratorInput.magnetCutoutsDiameter = inputsState.magnetSocketSize
+    baseplateGeneratorInput.magnetCutoutsDepth = inputsState.magnetSocketDepth
+    baseplateGeneratorInput.hasScrewHoles = inputsState.hasScrewHoles
+    baseplateGeneratorInput.screwHolesDiameter = inputsState.screwHoleSize
+    baseplateGeneratorInput.screwHeadCutoutDiameter = inputsState.screwHeadSize
+    baseplateGeneratorInput.hasPadding = inputsState.hasPadding
+    baseplateGeneratorInput.paddingLeft = inputsState.paddingLeft
+    baseplateGeneratorInput.paddingTop = inputsState.paddingTop
+    baseplateGeneratorInput.paddingRight = inputsState.paddingRight
+    baseplateGeneratorInput.paddingBottom = inputsState.paddingBottom
+    baseplateGeneratorInput.bottomExtensionHeight = inputsState.extraBottomThickness
+    baseplateGeneratorInput.binZClearance = inputsState.verticalClearance
+    baseplateGeneratorInput.hasConnectionHoles = inputsState.hasConnectionHoles
+    baseplateGeneratorInput.connectionScrewHolesDiameter = inputsState.connectionHoleSize
+    baseplateGeneratorInput.cornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
+    baseplateGeneratorInput.hasClips = inputsState.hasClips
+    baseplateGeneratorInput.hasClipsLeft = inputsState.hasClipsLeft
+    baseplateGeneratorInput.hasClipsRight = inputsState.hasClipsRight
+    baseplateGeneratorInput.hasClipsTop = inputsState.hasClipsTop
+    baseplateGeneratorInput.hasClipsBottom = inputsState.hasClipsBottom
+    baseplateGeneratorInput.isLowFidelity = isLowFidelity
+    return baseplateGeneratorInput
+
+def getBaseplatePlanParameters(inputsState: InputState, isLowFidelity: bool = False) -> dict:
+    return {
+        'spec': batchGenerator.normalizeSpec(dict(asdict(inputsState), type=batchGenerator.BATCH_ITEM_BASEPLATE)),
+        'isLowFidelity': isLowFidelity,
+    }
+
+def requestBaseplatePlan(inputsState: InputState):
+    """
+    Starts planning the baseplate of the dialog values on the plan worker, validation looks up its outcome by baseplatePlanKey
+    """
+    global baseplatePlanKey
+    baseplatePlanKey = None
+    if not isInputsStateValid(inputsState) or adsk.fusion.Design.cast(app.activeProduct).designType != adsk.fusion.DesignTypes.ParametricDesignType:
+        return
+    baseplateGeneratorInput = getBaseplateInput(inputsState)
+    baseplatePlanKey = planSerializer.planKey(getBaseplatePlanParameters(inputsState))
+    planWorker.request(baseplatePlanKey, lambda log: planOptimizedBaseplate(baseplateGeneratorInput, log))
+
+def generateBaseplate(args: adsk.core.CommandEventArgs, isLowFidelity: bool = False, progress: GenerationProgress = None, isExecute: bool = False):
     futil.log(f'{CMD_NAME} Generating baseplate')
     inputsState = getInputsState()
 
@@ -460,38 +625,15 @@ def generateBaseplate(args: adsk.core.CommandEventArgs):
         newCmpOcc.component.name = baseplateName
         newCmpOcc.activate()
         gridfinityBaseplateComponent: adsk.fusion.Component = newCmpOcc.component
-        baseplateGeneratorInput = BaseplateGeneratorInput()
-
-        baseplateGeneratorInput.baseWidth = inputsState.baseWidth
-        baseplateGeneratorInput.baseLength = inputsState.baseLength
-        baseplateGeneratorInput.xyClearance = inputsState.xyClearance
-        baseplateGeneratorInput.baseplateWidth = inputsState.plateWidth
-        baseplateGeneratorInput.baseplateLength = inputsState.plateLength
-        baseplateGeneratorInput.hasExtendedBottom = not inputsState.plateType == BASEPLATE_TYPE_LIGHT
-        baseplateGeneratorInput.hasSkeletonizedBottom = inputsState.plateType == BASEPLATE_TYPE_SKELETONIZED
-        baseplateGeneratorInput.hasMagnetCutouts = inputsState.hasMagnetSockets
-        baseplateGeneratorInput.magnetCutoutsDiameter = inputsState.magnetSocketSize
-        baseplateGeneratorInput.magnetCutoutsDepth = inputsState.magnetSocketDepth
-        baseplateGeneratorInput.hasScrewHoles = inputsState.hasScrewHoles
-        baseplateGeneratorInput.screwHolesDiameter = inputsState.screwHoleSize
-        baseplateGeneratorInput.screwHeadCutoutDiameter = inputsState.screwHeadSize
-        baseplateGeneratorInput.hasPadding = inputsState.hasPadding
-        baseplateGeneratorInput.paddingLeft = inputsState.paddingLeft
-        baseplateGeneratorInput.paddingTop = inputsState.paddingTop
-        baseplateGeneratorInput.paddingRight = inputsState.paddingRight
-        baseplateGeneratorInput.paddingBottom = inputsState.paddingBottom
-        baseplateGeneratorInput.bottomExtensionHeight = inputsState.extraBottomThickness
-        baseplateGeneratorInput.binZClearance = inputsState.verticalClearance
-        baseplateGeneratorInput.hasConnectionHoles = inputsState.hasConnectionHoles
-        baseplateGeneratorInput.connectionScrewHolesDiameter = inputsState.connectionHoleSize
-        baseplateGeneratorInput.cornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
-        baseplateGeneratorInput.hasClips = inputsState.hasClips
-        baseplateGeneratorInput.hasClipsLeft = inputsState.hasClipsLeft
-        baseplateGeneratorInput.hasClipsRight = inputsState.hasClipsRight
-        baseplateGeneratorInput.hasClipsTop = inputsState.hasClipsTop
-        baseplateGeneratorInput.hasClipsBottom = inputsState.hasClipsBottom
-
-        baseplateBody = createGridfinityBaseplate(baseplateGeneratorInput, gridfinityBaseplateComponent)
+        baseplateGeneratorInput = getBaseplateInput(inputsState, isLowFidelity)
+
+        # the same dialog values give the same plan, OK usually finds the one the worker made while the dialog was edited
+        planParameters = getBaseplatePlanParameters(inputsState, isLowFidelity)
+        baseplateGraph = planWorker.getOrCreate(planSerializer.planKey(planParameters), lambda log: planOptimizedBaseplate(baseplateGeneratorInput, log))
+        if isExecute:
+            # previews would push the plans worth replaying out of the plans folder
+            savePlan(baseplateGraph, planParameters)
+        baseplateBody = createGridfinityBaseplate(baseplateGeneratorInput, gridfinityBaseplateComponent, baseplateGraph, progress)
         baseplateBody.name = baseplateName
 
         if des.designType == 1:
@@ -502,11 +644,19 @@ def generateBaseplate(args: adsk.core.CommandEventArgs):
         args.executeFailed = True
         args.executeFailedMessage = 'Design type is unsupported. Projects with disabled design history are unsupported, please enable timeline feature to proceed.'
         return False
+    except GenerationCancelledException as err:
+        # nothing of a cancelled baseplate is kept
+        newCmpOcc.deleteMe()
+        args.executeFailed = True
+        args.executeFailedMessage = 'Generation cancelled. {}'.format(err)
+        futil.log(f'{CMD_NAME} {err}')
+        return False
     except Exception as err:
         args.executeFailed = True
         args.executeFailedMessage = getErrorMessage()
         futil.log(f'{CMD_NAME} Error occurred, {err}, {getErrorMessage()}')
         return False
+    return True
 
 def initUiState():
     global uiState
@@ -556,6 +706,7 @@ def initUiState():
     uiState.initValue(BASEPLATE_CLIPS_BOTTOM_INPUT, True, adsk.core.BoolValueCommandInput.classType())
 
     uiState.initValue(SHOW_PREVIEW_INPUT, False, adsk.core.BoolValueCommandInput.classType())
+    uiState.initValue(PREVIEW_MODE_INPUT, PREVIEW_MODE_MESH, adsk.core.DropDownCommandInput.classType())
 
     recordedDefaults = configUtils.readJsonConfig(UI_INPUT_DEFAULTS_CONFIG_PATH)
     if recordedDefaults:
@@ -6,18 +6,23 @@ import math
 from ...lib import configUtils
 from ...lib import fusion360utils as futil
 from ... import config
-from ...lib.gridfinityUtils import combineUtils
-from ...lib.gridfinityUtils import geometryUtils
-from ...lib.gridfinityUtils import faceUtils
-from ...lib.gridfinityUtils import shellUtils
-from ...lib.gridfinityUtils import commonUtils
 from ...lib.gridfinityUtils import const
-from ...lib.gridfinityUtils.baseGenerator import createSingleGridfinityBaseBody, createBaseBodyPattern, cutBaseClearance
+from ...lib.gridfinityUtils import traceUtils
+from ...lib.gridfinityUtils import batchGenerator
+from ...lib.gridfinityUtils import operationGraph
+from ...lib.gridfinityUtils import graphOptimizer
+from ...lib.gridfinityUtils import planSerializer
+from ...lib.gridfinityUtils.fusionExecutor import FusionExecutor
+from ...lib.gridfinityUtils.generationProgress import GenerationProgress, GenerationCancelledException
+from ...lib.gridfinityUtils.meshPreview import MeshPreview
+from ...lib.gridfinityUtils.previewScheduler import PreviewScheduler, previewKey
+from ...lib.gridfinityUtils.planWorker import PlanWorker
+from ...lib.gridfinityUtils.previewBodyCache import PreviewBodyCache
 from ...lib.gridfinityUtils.baseGeneratorInput import BaseGeneratorInput
-from ...lib.gridfinityUtils.binBodyGenerator import createGridfinityBinBody, uniformCompartments
+from ...lib.gridfinityUtils.binBodyGenerator import planGridfinityBin, uniformCompartments, BIN_BODY_OUTPUT
 from ...lib.gridfinityUtils.binBodyGeneratorInput import BinBodyGeneratorInput, BinBodyCompartmentDefinition
-from ...lib.gridfinityUtils.binBodyTabGeneratorInput import BinBodyTabGeneratorInput
-from ...lib.gridfinityUtils.binBodyTabGenerator import createGridfinityBinBodyTab
+from ...lib.gridfinityUtils.shelledBinGenerator import applyShelledBinType, shellGridfinityBin
+from ...lib.gridfinityUtils.directBinGenerator import createDirectGridfinityBin, unsupportedBinOptions
 from ...lib.ui.commandUiState import CommandUiState
 from ...lib.ui.unsupportedDesignTypeException import UnsupportedDesignTypeException
 
@@ -56,6 +61,14 @@ UI_INPUT_DEFAULTS_CONFIG_PATH = os.path.join(CONFIG_FOLDER_PATH, "ui_input_defau
 # they are not released and garbage collected.
 local_handlers = []
 
+meshPreview = MeshPreview(f'{CMD_ID}_meshPreview')
+previewScheduler = PreviewScheduler(f'{CMD_ID}_previewScheduler')
+previewBodyCache = PreviewBodyCache()
+planCache = planSerializer.PlanCache()
+planWorker = PlanWorker(f'{CMD_ID}_planWorker', planCache)
+# plan key of the dialog values last handed to the plan worker
+binPlanKey: str = None
+
 # Constants
 BIN_BASIC_SIZES_GROUP = "bin_basic_sizes_group"
 BIN_DIMENSIONS_GROUP = "bin_dimensions_group"
@@ -127,6 +140,11 @@ PRESERVE_CHAGES_RADIO_GROUP_RESET = 'Reset inputs after creation'
 RESET_CHAGES_INPUT = 'reset_changes'
 SHOW_PREVIEW_INPUT = 'show_preview'
 SHOW_PREVIEW_MANUAL_INPUT = 'show_preview_manual'
+PREVIEW_MODE_INPUT = 'preview_mode'
+PREVIEW_MODE_MESH = 'Mesh'
+PREVIEW_MODE_SIMPLIFIED = 'Simplified model'
+PREVIEW_MODE_FULL = 'Full model'
+PREVIEW_STATUS_INPUT = 'preview_status'
 
 INFO_TEXT = ("<b>Help:</b> Info for inputs can be found "
              "<a href=\"https://github.com/Le0Michine/FusionGridfinityGenerator/wiki/Bin-generator-options\">"
@@ -154,6 +172,7 @@ def initDefaultUiState():
     commandUIState.initValue(BIN_BASE_FEATURES_GROUP_ID, True, adsk.core.GroupCommandInput.classType())
     commandUIState.initValue(USER_CHANGES_GROUP_ID, True, adsk.core.GroupCommandInput.classType())
     commandUIState.initValue(PREVIEW_GROUP_ID, True, adsk.core.GroupCommandInput.classType())
+    commandUIState.initValue(PREVIEW_MODE_INPUT, PREVIEW_MODE_MESH, adsk.core.DropDownCommandInput.classType())
 
     commandUIState.initValue(BIN_BASE_WIDTH_UNIT_INPUT_ID, const.DIMENSION_DEFAULT_WIDTH_UNIT, adsk.core.ValueCommandInput.classType())
     commandUIState.initValue(BIN_BASE_LENGTH_UNIT_INPUT_ID, const.DIMENSION_DEFAULT_WIDTH_UNIT, adsk.core.ValueCommandInput.classType())
@@ -668,14 +687,27 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     previewGroup = inputs.addGroupCommandInput(PREVIEW_GROUP_ID, 'Preview')
     previewGroup.isExpanded = commandUIState.getState(PREVIEW_GROUP_ID)
     commandUIState.registerCommandInput(userChangesGroup)
-    showPreviewCheckboxInput =  previewGroup.children.addBoolValueInput(SHOW_PREVIEW_INPUT, 'Show auto update preview (slow)', True, '', False)
+    showPreviewCheckboxInput =  previewGroup.children.addBoolValueInput(SHOW_PREVIEW_INPUT, 'Show auto update preview', True, '', False)
     commandUIState.registerCommandInput(showPreviewCheckboxInput)
+    previewModeDropdown = previewGroup.children.addDropDownCommandInput(PREVIEW_MODE_INPUT, 'Preview mode', adsk.core.DropDownStyles.LabeledIconDropDownStyle)
+    previewModeDropdownDefaultValue = commandUIState.getState(PREVIEW_MODE_INPUT)
+    previewModeDropdown.listItems.add(PREVIEW_MODE_MESH, previewModeDropdownDefaultValue == PREVIEW_MODE_MESH)
+    previewModeDropdown.listItems.add(PREVIEW_MODE_SIMPLIFIED, previewModeDropdownDefaultValue == PREVIEW_MODE_SIMPLIFIED)
+    previewModeDropdown.listItems.add(PREVIEW_MODE_FULL, previewModeDropdownDefaultValue == PREVIEW_MODE_FULL)
+    previewModeDropdown.tooltip = 'Mesh is drawn without touching the timeline, simplified model skips fillets, holes and tabs'
+    commandUIState.registerCommandInput(previewModeDropdown)
+    previewGroup.children.addTextBoxCommandInput(PREVIEW_STATUS_INPUT, 'Status', '', 1, True)
     showPreviewManual = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_MANUAL_INPUT, 'Update preview once', False, '', False)
     showPreviewManual.isFullWidth = True
     commandUIState.registerCommandInput(showPreviewManual)
 
     refreshUi()
 
+    command = args.command
+    meshPreview.register(lambda: updatePreviewStatus(command.commandInputs))
+    previewScheduler.register(command.doExecutePreview)
+    planWorker.register(lambda key: updatePreviewStatus(command.commandInputs))
+    requestBinPlan(command.commandInputs)
     futil.add_handler(args.command.execute, command_execute, local_handlers=local_handlers)
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
     futil.add_handler(args.command.executePreview, command_preview, local_handlers=local_handlers)
@@ -687,7 +719,11 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 # is immediately called after the created event not command inputs were created for the dialog.
 def command_execute(args: adsk.core.CommandEventArgs):
     futil.log(f'{CMD_NAME} Command Execute Event')
-    generateBin(args)
+    previewScheduler.cancel()
+    meshPreview.clear()
+    with traceUtils.trace(CMD_NAME) as trace:
+        generateBin(args, progress=GenerationProgress(CMD_NAME), isExecute=True)
+    logTrace(trace)
 
 # This event handler is called when the command needs to compute a new preview in the graphics window.
 def command_preview(args: adsk.core.CommandEventArgs):
@@ -696,9 +732,27 @@ def command_preview(args: adsk.core.CommandEventArgs):
     if is_all_input_valid(inputs):
         showPreview: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_INPUT)
         showPreviewManual: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_MANUAL_INPUT)
-        if showPreview.value or showPreviewManual.value:
-            args.isValidResult = generateBin(args)
+        previewMode: adsk.core.DropDownCommandInput = inputs.itemById(PREVIEW_MODE_INPUT)
+        previewModeName = previewMode.selectedItem.name
+        spec = batchGenerator.normalizeSpec(getBinSpec(inputs))
+        if previewModeName == PREVIEW_MODE_MESH and batchGenerator.unsupportedItemOptions(spec):
+            # shelled bins and options the headless mesh leaves out use the simplified model instead
+            previewModeName = PREVIEW_MODE_SIMPLIFIED
+        key = previewKey(spec, previewModeName)
+        if showPreview.value and not showPreviewManual.value and key not in previewBodyCache:
+            isDue = previewScheduler.isDue(key)
+        else:
+            # manual updates and previews seen before run right away
+            previewScheduler.cancel()
+            isDue = showPreview.value or showPreviewManual.value
+        if isDue:
+            if previewModeName == PREVIEW_MODE_MESH:
+                showMeshPreview(spec)
+            else:
+                meshPreview.clear()
+                showModelPreview(args, key, previewModeName == PREVIEW_MODE_SIMPLIFIED)
             showPreviewManual.value = False
+        updatePreviewStatus(inputs)
     else:
         args.executeFailed = True
         args.executeFailedMessage = "Some inputs are invalid, unable to generate preview"
@@ -766,6 +820,8 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
     except:
         showErrorInMessageBox()
 
+    requestBinPlan(inputs)
+
 
 
 # This event handler is called when the user interacts with any of the inputs in the dialog
@@ -778,6 +834,12 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
     
     # Verify the validity of the input values. This controls if the OK button is enabled or not.
     args.areInputsValid = is_all_input_valid(inputs)
+    if args.areInputsValid and binPlanKey:
+        # values the worker failed to plan keep OK disabled
+        planError = planWorker.errorOf(binPlanKey)
+        if planError:
+            args.areInputsValid = False
+            futil.log(f'{CMD_NAME} Inputs can not be planned, {planError}')
     futil.log(f'{CMD_NAME} Inputs are {"valid" if args.areInputsValid else "invalid"}')
 
 
@@ -785,6 +847,10 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
 def command_destroy(args: adsk.core.CommandEventArgs):
     # General logging for debug.
     futil.log(f'{CMD_NAME} Command Destroy Event "{args.terminationReason}"')
+    previewScheduler.unregister()
+    planWorker.unregister()
+    meshPreview.unregister()
+    previewBodyCache.clear()
     global local_handlers
     local_handlers = []
 
@@ -851,8 +917,121 @@ def saveUIInputsAsDefaults():
     else:
         futil.log(f'{CMD_NAME} UI state failed to save')
 
-def generateBin(args: adsk.core.CommandEventArgs):
-    inputs = args.command.commandInputs
+def logTrace(trace: traceUtils.Trace):
+    if trace is None:
+        return
+    if trace.error:
+        futil.log(f'{CMD_NAME} Failed to write trace, {trace.error}')
+    else:
+        futil.log(f'{CMD_NAME} Trace written to {trace.path}')
+
+def getBinSpec(inputs: adsk.core.CommandInputs) -> dict:
+    """
+    Dialog values as a batch renderer bin spec
+    """
+    binCompartmentsTable: adsk.core.TableCommandInput = inputs.itemById(BIN_COMPARTMENTS_TABLE_ID)
+    compartments = []
+    for i in range(1, binCompartmentsTable.rowCount):
+        compartments.append({
+            'positionX': binCompartmentsTable.getInputAtPosition(i, 0).value,
+            'positionY': binCompartmentsTable.getInputAtPosition(i, 1).value,
+            'width': binCompartmentsTable.getInputAtPosition(i, 2).value,
+            'length': binCompartmentsTable.getInputAtPosition(i, 3).value,
+            'depth': binCompartmentsTable.getInputAtPosition(i, 4).value,
+        })
+    return {
+        'type': batchGenerator.BATCH_ITEM_BIN,
+        'baseWidth': inputs.itemById(BIN_BASE_WIDTH_UNIT_INPUT_ID).value,
+        'baseLength': inputs.itemById(BIN_BASE_LENGTH_UNIT_INPUT_ID).value,
+        'heightUnit': inputs.itemById(BIN_HEIGHT_UNIT_INPUT_ID).value,
+        'xyClearance': inputs.itemById(BIN_XY_CLEARANCE_INPUT_ID).value,
+        'binWidth': inputs.itemById(BIN_WIDTH_INPUT_ID).value,
+        'binLength': inputs.itemById(BIN_LENGTH_INPUT_ID).value,
+        'binHeight': inputs.itemById(BIN_HEIGHT_INPUT_ID).value,
+        'binType': inputs.itemById(BIN_TYPE_DROPDOWN_ID).selectedItem.name,
+        'wallThickness': inputs.itemById(BIN_WALL_THICKNESS_INPUT_ID).value,
+        'hasLip': inputs.itemById(BIN_WITH_LIP_INPUT_ID).value,
+        'hasLipNotches': inputs.itemById(BIN_WITH_LIP_NOTCHES_INPUT_ID).value,
+        'compartmentsX': inputs.itemById(BIN_COMPARTMENTS_GRID_BASE_WIDTH_ID).value,
+        'compartmentsY': inputs.itemById(BIN_COMPARTMENTS_GRID_BASE_LENGTH_ID).value,
+        'compartmentsGridType': inputs.itemById(BIN_COMPARTMENTS_GRID_TYPE_ID).selectedItem.name,
+        'compartments': compartments,
+        'hasScoop': inputs.itemById(BIN_HAS_SCOOP_INPUT_ID).value,
+        'scoopMaxRadius': inputs.itemById(BIN_SCOOP_MAX_RADIUS_INPUT_ID).value,
+        'hasTab': inputs.itemById(BIN_HAS_TAB_INPUT_ID).value,
+        'tabLength': inputs.itemById(BIN_TAB_LENGTH_INPUT_ID).value,
+        'tabWidth': inputs.itemById(BIN_TAB_WIDTH_INPUT_ID).value,
+        'tabPosition': inputs.itemById(BIN_TAB_POSITION_INPUT_ID).value,
+        'tabAngle': math.degrees(inputs.itemById(BIN_TAB_ANGLE_INPUT_ID).value),
+        'generateBody': inputs.itemById(BIN_GENERATE_BODY_INPUT_ID).value,
+        'generateBase': inputs.itemById(BIN_GENERATE_BASE_INPUT_ID).value,
+        'hasScrewHoles': inputs.itemById(BIN_SCREW_HOLES_INPUT_ID).value,
+        'screwHoleDiameter': inputs.itemById(BIN_SCREW_DIAMETER_INPUT).value,
+        'hasMagnetCutouts': inputs.itemById(BIN_MAGNET_CUTOUTS_INPUT_ID).value,
+        'hasMagnetCutoutsTabs': inputs.itemById(BIN_MAGNET_CUTOUTS_TABS_INPUT_ID).value,
+        'magnetCutoutDiameter': inputs.itemById(BIN_MAGNET_DIAMETER_INPUT).value,
+        'magnetCutoutDepth': inputs.itemById(BIN_MAGNET_HEIGHT_INPUT).value,
+    }
+
+def showMeshPreview(spec: dict):
+    try:
+        key, factory = batchGenerator.createItemFactory(spec)
+        meshPreview.show(key, factory)
+    except Exception as err:
+        meshPreview.clear()
+        futil.log(f'{CMD_NAME} Mesh preview failed, {err}')
+
+def showModelPreview(args: adsk.core.CommandEventArgs, key: str, isLowFidelity: bool):
+    # restored bodies are not the parametric bin, OK still runs execute for them
+    if previewBodyCache.restore(key):
+        futil.log(f'{CMD_NAME} Restored cached preview')
+        return
+    with traceUtils.trace(f'{CMD_NAME} preview') as trace:
+        args.isValidResult = generateBin(args, isLowFidelity)
+    logTrace(trace)
+    if args.isValidResult:
+        des = adsk.fusion.Design.cast(app.activeProduct)
+        previewBodyCache.remember(key, des.activeComponent)
+
+def updatePreviewStatus(inputs: adsk.core.CommandInputs):
+    previewStatus: adsk.core.TextBoxCommandInput = inputs.itemById(PREVIEW_STATUS_INPUT)
+    if previewStatus is None:
+        return
+    if previewScheduler.isPending:
+        previewStatus.text = 'Waiting for input changes to settle'
+    elif meshPreview.isBuilding:
+        previewStatus.text = 'Building preview'
+    elif planWorker.isPlanning:
+        previewStatus.text = 'Planning'
+    else:
+        previewStatus.text = 'Up to date'
+
+def planOptimizedBin(binName: str, baseGeneratorInput: BaseGeneratorInput, binBodyInput: BinBodyGeneratorInput, generateBase: bool, generateBody: bool, log = futil.log) -> operationGraph.OperationGraph:
+    binGraph = planGridfinityBin(binName, baseGeneratorInput, binBodyInput, generateBase, generateBody)
+    optimization = graphOptimizer.optimize(binGraph)
+    if optimization.featuresSaved > 0:
+        for line in optimization.lines():
+            log(line)
+    return binGraph
+
+def savePlan(graph: operationGraph.OperationGraph, parameters: dict):
+    # shared plan files reproduce a generation exactly, writing them never fails it
+    try:
+        path = planSerializer.savePlan(graph, parameters)
+    except OSError as err:
+        futil.log(f'{CMD_NAME} Failed to write plan, {err}')
+        return
+    if path:
+        futil.log(f'{CMD_NAME} Plan written to {path}')
+
+def getBinName(binBodyInput: BinBodyGeneratorInput) -> str:
+    return 'Gridfinity bin {}x{}x{}'.format(int(binBodyInput.binLength), int(binBodyInput.binWidth), int(binBodyInput.binHeight))
+
+def getBinInputs(inputs: adsk.core.CommandInputs, isLowFidelity: bool = False) -> tuple[BaseGeneratorInput, BinBodyGeneratorInput]:
+    """
+    Generator inputs of the dialog values, plain values only so planning them may run off the main thread.
+    The origin is a tuple, the direct generators need it as a point
+    """
     base_width_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_BASE_WIDTH_UNIT_INPUT_ID)
     base_length_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_BASE_LENGTH_UNIT_INPUT_ID)
     height_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_HEIGHT_UNIT_INPUT_ID)
@@ -862,8 +1041,6 @@ def generateBin(args: adsk.core.CommandEventArgs):
     bin_height: adsk.core.ValueCommandInput = inputs.itemById(BIN_HEIGHT_INPUT_ID)
     bin_wall_thickness: adsk.core.ValueCommandInput = inputs.itemById(BIN_WALL_THICKNESS_INPUT_ID)
     bin_screw_holes: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_SCREW_HOLES_INPUT_ID)
-    bin_generate_base: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BASE_INPUT_ID)
-    bin_generate_body: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BODY_INPUT_ID)
     bin_magnet_cutouts: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_INPUT_ID)
     bin_screw_hole_diameter: adsk.core.ValueCommandInput = inputs.itemById(BIN_SCREW_DIAMETER_INPUT)
     bin_magnet_cutouts_tabs: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_TABS_INPUT_ID)
@@ -886,165 +1063,160 @@ def generateBin(args: adsk.core.CommandEventArgs):
 
     isHollow = binTypeDropdownInput.selectedItem.name == BIN_TYPE_HOLLOW
     isSolid = binTypeDropdownInput.selectedItem.name == BIN_TYPE_SOLID
+    isShelled = binTypeDropdownInput.selectedItem.name == BIN_TYPE_SHELLED
+    xyClearance = xy_clearance.value
+
+    # create base interface
+    baseGeneratorInput = BaseGeneratorInput()
+    baseGeneratorInput.originPoint = operationGraph.offsetPoint((0, 0, 0), byX=-xyClearance, byY=-xyClearance)
+    baseGeneratorInput.baseWidth = base_width_unit.value
+    baseGeneratorInput.baseLength = base_length_unit.value
+    baseGeneratorInput.xyClearance = xyClearance
+    baseGeneratorInput.hasScrewHoles = bin_screw_holes.value
+    baseGeneratorInput.hasMagnetCutouts = bin_magnet_cutouts.value
+    baseGeneratorInput.hasMagnetCutoutsTabs = bin_magnet_cutouts_tabs.value
+    baseGeneratorInput.screwHolesDiameter = bin_screw_hole_diameter.value
+    baseGeneratorInput.magnetCutoutsDiameter = bin_magnet_cutout_diameter.value
+    baseGeneratorInput.magnetCutoutsDepth = bin_magnet_cutout_depth.value
+    baseGeneratorInput.isLowFidelity = isLowFidelity
+
+    # create bin body
+    binBodyInput = BinBodyGeneratorInput()
+    binBodyInput.hasLip = with_lip.value
+    binBodyInput.hasLipNotches = with_lip_notches.value
+    binBodyInput.binWidth = bin_width.value
+    binBodyInput.binLength = bin_length.value
+    binBodyInput.binHeight = bin_height.value
+    binBodyInput.baseWidth = base_width_unit.value
+    binBodyInput.baseLength = base_length_unit.value
+    binBodyInput.heightUnit = height_unit.value
+    binBodyInput.xyClearance = xyClearance
+    binBodyInput.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - xyClearance
+    binBodyInput.isSolid = isSolid
+    binBodyInput.wallThickness = bin_wall_thickness.value
+    binBodyInput.hasScoop = has_scoop.value and isHollow
+    binBodyInput.scoopMaxRadius = binScoopMaxRadius.value
+    binBodyInput.hasTab = hasTabInput.value and isHollow
+    binBodyInput.tabLength = binTabLength.value
+    binBodyInput.tabWidth = binTabWidth.value
+    binBodyInput.tabPosition = binTabPosition.value
+    binBodyInput.tabOverhangAngle = binTabAngle.value
+    binBodyInput.compartmentsByX = compartmentsX.value
+    binBodyInput.compartmentsByY = compartmentsY.value
+    binBodyInput.isLowFidelity = isLowFidelity
+
+    if binCompartmentGridTypeDropdownInput.selectedItem.name == BIN_COMPARTMENTS_GRID_TYPE_UNIFORM:
+        binBodyInput.compartments = uniformCompartments(binBodyInput.compartmentsByX, binBodyInput.compartmentsByY)
+    else:
+        binBodyInput.compartments = []
+        for i in range(1, binCompartmentsTable.rowCount):
+            positionX: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 0)
+            positionY: adsk.core.IntegerSpinnerCommandInput  = binCompartmentsTable.getInputAtPosition(i, 1)
+            width: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 2)
+            length: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 3)
+            depth: adsk.core.ValueCommandInput = binCompartmentsTable.getInputAtPosition(i, 4)
+            binBodyInput.compartments.append(BinBodyCompartmentDefinition(positionX.value, positionY.value, width.value, length.value, depth.value))
+
+    if isShelled:
+        applyShelledBinType(baseGeneratorInput, binBodyInput)
+
+    return baseGeneratorInput, binBodyInput
+
+def getBinPlanParameters(inputs: adsk.core.CommandInputs, isLowFidelity: bool = False) -> dict:
+    return {'spec': getBinSpec(inputs), 'isLowFidelity': isLowFidelity}
+
+def binPlanFactory(inputs: adsk.core.CommandInputs, baseGeneratorInput: BaseGeneratorInput, binBodyInput: BinBodyGeneratorInput):
+    # controls are read here, the factory only uses plain values and may run on the plan worker
+    generateBase = inputs.itemById(BIN_GENERATE_BASE_INPUT_ID).value
+    generateBody = inputs.itemById(BIN_GENERATE_BODY_INPUT_ID).value
+    binName = getBinName(binBodyInput)
+    return lambda log: planOptimizedBin(binName, baseGeneratorInput, binBodyInput, generateBase, generateBody, log)
+
+def requestBinPlan(inputs: adsk.core.CommandInputs):
+    """
+    Starts planning the bin of the dialog values on the plan worker, validation looks up its outcome by binPlanKey
+    """
+    global binPlanKey
+    binPlanKey = None
+    if not is_all_input_valid(inputs) or adsk.fusion.Design.cast(app.activeProduct).designType == adsk.fusion.DesignTypes.DirectDesignType:
+        return
+    baseGeneratorInput, binBodyInput = getBinInputs(inputs)
+    binPlanKey = planSerializer.planKey(getBinPlanParameters(inputs))
+    planWorker.request(binPlanKey, binPlanFactory(inputs, baseGeneratorInput, binBodyInput))
+
+def generateBin(args: adsk.core.CommandEventArgs, isLowFidelity: bool = False, progress: GenerationProgress = None, isExecute: bool = False):
+    inputs = args.command.commandInputs
+    bin_generate_base: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BASE_INPUT_ID)
+    bin_generate_body: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BODY_INPUT_ID)
+    bin_magnet_cutouts: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_INPUT_ID)
+    bin_magnet_cutouts_tabs: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_TABS_INPUT_ID)
+    hasTabInput: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_HAS_TAB_INPUT_ID)
+    binTypeDropdownInput: adsk.core.DropDownCommandInput = inputs.itemById(BIN_TYPE_DROPDOWN_ID)
+
     isShelled = binTypeDropdownInput.selectedItem.name == BIN_TYPE_SHELLED
 
     try:
         des = adsk.fusion.Design.cast(app.activeProduct)
-        if des.designType == 0:
-            raise UnsupportedDesignTypeException('Timeline must be enabled for the generator to work, projects with disabled design history currently are not supported')
+        # designs without history get the whole bin as one body built in memory
+        isDirectDesign = des.designType == adsk.fusion.DesignTypes.DirectDesignType
+        if isDirectDesign:
+            unsupportedOptions = unsupportedBinOptions(bin_magnet_cutouts.value and bin_magnet_cutouts_tabs.value, isShelled)
+            if len(unsupportedOptions) > 0:
+                raise UnsupportedDesignTypeException('Projects with disabled design history do not support {}, please enable timeline feature or turn these options off to proceed.'.format(', '.join(unsupportedOptions)))
         root = adsk.fusion.Component.cast(des.rootComponent)
-        xyClearance = xy_clearance.value
-        binName = 'Gridfinity bin {}x{}x{}'.format(int(bin_length.value), int(bin_width.value), int(bin_height.value))
+        baseGeneratorInput, binBodyInput = getBinInputs(inputs, isLowFidelity)
+        binName = getBinName(binBodyInput)
 
         # create new component
         newCmpOcc = adsk.fusion.Occurrences.cast(root.occurrences).addNewComponent(adsk.core.Matrix3D.create())
         newCmpOcc.component.name = binName
         newCmpOcc.activate()
         gridfinityBinComponent: adsk.fusion.Component = newCmpOcc.component
-        features: adsk.fusion.Features = gridfinityBinComponent.features
-
-        # create base interface
-        baseGeneratorInput = BaseGeneratorInput()
-        baseGeneratorInput.originPoint = geometryUtils.createOffsetPoint(
-            gridfinityBinComponent.originConstructionPoint.geometry,
-            byX=-xyClearance,
-            byY=-xyClearance,
-        )
-        baseGeneratorInput.baseWidth = base_width_unit.value
-        baseGeneratorInput.baseLength = base_length_unit.value
-        baseGeneratorInput.xyClearance = xyClearance
-        baseGeneratorInput.hasScrewHoles = bin_screw_holes.value and not isShelled
-        baseGeneratorInput.hasMagnetCutouts = bin_magnet_cutouts.value and not isShelled
-        baseGeneratorInput.hasMagnetCutoutsTabs = bin_magnet_cutouts_tabs.value and not isShelled
-        baseGeneratorInput.screwHolesDiameter = bin_screw_hole_diameter.value
-        baseGeneratorInput.magnetCutoutsDiameter = bin_magnet_cutout_diameter.value
-        baseGeneratorInput.magnetCutoutsDepth = bin_magnet_cutout_depth.value
-
-        baseBodies: list[adsk.fusion.BRepBody]
-        if bin_generate_base.value:
-            baseBodies = createBaseBodyPattern(
-                baseGeneratorInput,
-                bin_width.value,
-                bin_length.value,
-                gridfinityBinComponent,
-            )
-
-        # create bin body
-        binBodyInput = BinBodyGeneratorInput()
-        binBodyInput.hasLip = with_lip.value
-        binBodyInput.hasLipNotches = with_lip_notches.value
-        binBodyInput.binWidth = bin_width.value
-        binBodyInput.binLength = bin_length.value
-        binBodyInput.binHeight = bin_height.value
-        binBodyInput.baseWidth = base_width_unit.value
-        binBodyInput.baseLength = base_length_unit.value
-        binBodyInput.heightUnit = height_unit.value
-        binBodyInput.xyClearance = xyClearance
-        binBodyInput.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - xyClearance
-        binBodyInput.isSolid = isSolid or isShelled
-        binBodyInput.wallThickness = bin_wall_thickness.value
-        binBodyInput.hasScoop = has_scoop.value and isHollow
-        binBodyInput.scoopMaxRadius = binScoopMaxRadius.value
-        binBodyInput.hasTab = hasTabInput.value and isHollow
-        binBodyInput.tabLength = binTabLength.value
-        binBodyInput.tabWidth = binTabWidth.value
-        binBodyInput.tabPosition = binTabPosition.value
-        binBodyInput.tabOverhangAngle = binTabAngle.value
-        binBodyInput.compartmentsByX = compartmentsX.value
-        binBodyInput.compartmentsByY = compartmentsY.value
-
-        if binCompartmentGridTypeDropdownInput.selectedItem.name == BIN_COMPARTMENTS_GRID_TYPE_UNIFORM:
-            binBodyInput.compartments = uniformCompartments(binBodyInput.compartmentsByX, binBodyInput.compartmentsByY)
-        else:
-            binBodyInput.compartments = []
-            for i in range(1, binCompartmentsTable.rowCount):
-                positionX: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 0)
-                positionY: adsk.core.IntegerSpinnerCommandInput  = binCompartmentsTable.getInputAtPosition(i, 1)
-                width: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 2)
-                length: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 3)
-                depth: adsk.core.ValueCommandInput = binCompartmentsTable.getInputAtPosition(i, 4)
-                binBodyInput.compartments.append(BinBodyCompartmentDefinition(positionX.value, positionY.value, width.value, length.value, depth.value))
 
         binBody: adsk.fusion.BRepBody
 
-        if bin_generate_body.value:
-            binBody = createGridfinityBinBody(
+        if isDirectDesign:
+            baseGeneratorInput.originPoint = adsk.core.Point3D.create(*baseGeneratorInput.originPoint)
+            binBody = createDirectGridfinityBin(
                 binBodyInput,
-                gridfinityBinComponent,
-            )
-        if bin_generate_body.value or bin_generate_base.value:
-            cutBaseClearance(
                 baseGeneratorInput,
-                bin_width.value,
-                bin_length.value,
+                bin_generate_base.value,
+                bin_generate_body.value,
                 gridfinityBinComponent,
             )
+            if binBody is not None:
+                binBody.name = binName
+            return True
+
+        # the same dialog values give the same plan, OK usually finds the one the worker made while the dialog was edited
+        planParameters = getBinPlanParameters(inputs, isLowFidelity)
+        binGraph = planWorker.getOrCreate(
+            planSerializer.planKey(planParameters),
+            binPlanFactory(inputs, baseGeneratorInput, binBodyInput),
+        )
+        if isExecute:
+            # previews would push the plans worth replaying out of the plans folder
+            savePlan(binGraph, planParameters)
+        binExecutor = FusionExecutor(gridfinityBinComponent).run(binGraph, progress)
+        if bin_generate_body.value:
+            binBody = binExecutor.body(binGraph.outputs[BIN_BODY_OUTPUT])
 
-        # merge everything
-        if bin_generate_body.value and bin_generate_base.value:
-            toolBodies = commonUtils.objectCollectionFromList(baseBodies)
-            combineFeatures = gridfinityBinComponent.features.combineFeatures
-            combineFeatureInput = combineFeatures.createInput(binBody, toolBodies)
-            combineFeatures.add(combineFeatureInput)
-            gridfinityBinComponent.bRepBodies.item(0).name = binName
-
-        if isShelled and bin_generate_body.value:
-            # face.boundingBox.maxPoint.z ~ face.boundingBox.minPoint.z => face horizontal
-            # largest horizontal face
-            horizontalFaces = [face for face in binBody.faces if geometryUtils.isHorizontal(face)]
-            topFace = faceUtils.maxByArea(horizontalFaces)
-            topFaceMinPoint = topFace.boundingBox.minPoint
-            if binBodyInput.hasLip:
-                splitBodyFeatures = features.splitBodyFeatures
-                splitBodyInput = splitBodyFeatures.createInput(
-                    binBody,
-                    topFace,
-                    True
-                )
-                splitBodies = splitBodyFeatures.add(splitBodyInput)
-                bottomBody = min(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
-                topBody = max(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
-                horizontalFaces = [face for face in bottomBody.faces if geometryUtils.isHorizontal(face)]
-                topFace = faceUtils.maxByArea(horizontalFaces)
-                shellUtils.simpleShell([topFace], binBodyInput.wallThickness - xyClearance, gridfinityBinComponent)
-                toolBodies = adsk.core.ObjectCollection.create()
-                toolBodies.add(topBody)
-                combineAfterShellFeatureInput = combineFeatures.createInput(bottomBody, toolBodies)
-                combineFeatures.add(combineAfterShellFeatureInput)
-                binBody = gridfinityBinComponent.bRepBodies.item(0)
-            else:
-                shellUtils.simpleShell([topFace], binBodyInput.wallThickness - xyClearance, gridfinityBinComponent)
-            
-            if hasTabInput.value:
-                compartmentTabInput = BinBodyTabGeneratorInput()
-                tabOriginPoint = adsk.core.Point3D.create(
-                    binBodyInput.wallThickness + max(0, min(binBodyInput.tabPosition, binBodyInput.binWidth - binBodyInput.tabLength)) * binBodyInput.baseWidth,
-                    const.BIN_LIP_WALL_THICKNESS if binBodyInput.hasLip and binBodyInput.hasScoop else binBodyInput.wallThickness + binBodyInput.binLength * binBodyInput.baseLength - binBodyInput.wallThickness - binBodyInput.xyClearance * 2,
-                    (binBodyInput.binHeight - 1) * binBodyInput.heightUnit + max(0, binBodyInput.heightUnit - const.BIN_BASE_HEIGHT),
-                )
-                compartmentTabInput.origin = tabOriginPoint
-                compartmentTabInput.length = max(0, min(binBodyInput.tabLength, binBodyInput.binWidth)) * binBodyInput.baseWidth - binBodyInput.wallThickness * 2 - binBodyInput.xyClearance * 2
-                compartmentTabInput.width = binBodyInput.tabWidth
-                compartmentTabInput.overhangAngle = binBodyInput.tabOverhangAngle
-                compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
-                tabBody = createGridfinityBinBodyTab(compartmentTabInput, gridfinityBinComponent)
-                combineInput = combineFeatures.createInput(tabBody, commonUtils.objectCollectionFromList([binBody]))
-                combineInput.operation = adsk.fusion.FeatureOperations.CutFeatureOperation
-                combineInput.isKeepToolBodies = True
-                combineFeature = combineFeatures.add(combineInput)
-                tabBodies = [body for body in combineFeature.bodies if body.faces != binBody.faces]
-                tabMainBody = max([body for body in tabBodies], key=lambda x: x.edges.count)
-                bodiesToRemove = [body for body in tabBodies if body is not tabMainBody]
-                for body in bodiesToRemove:
-                    gridfinityBinComponent.features.removeFeatures.add(body)
-                combineUtils.joinBodies(binBody, commonUtils.objectCollectionFromList([tabMainBody]), gridfinityBinComponent)
+        if isShelled and bin_generate_body.value and not isLowFidelity:
+            binBody = shellGridfinityBin(binBody, binBodyInput, hasTabInput.value, gridfinityBinComponent)
 
         # group features in timeline
         binGroup = des.timeline.timelineGroups.add(newCmpOcc.timelineObject.index, newCmpOcc.timelineObject.index + gridfinityBinComponent.features.count + gridfinityBinComponent.constructionPlanes.count + gridfinityBinComponent.constructionAxes.count + gridfinityBinComponent.sketches.count)
         binGroup.name = binName
     except UnsupportedDesignTypeException as err:
         args.executeFailed = True
-        args.executeFailedMessage = 'Design type is unsupported. Projects with disabled design history are unsupported, please enable timeline feature to proceed.'
+        args.executeFailedMessage = 'Design type is unsupported. {}'.format(err)
+        return False
+    except GenerationCancelledException as err:
+        # nothing of a cancelled bin is kept
+        newCmpOcc.deleteMe()
+        args.executeFailed = True
+        args.executeFailedMessage = 'Generation cancelled. {}'.format(err)
+        futil.log(f'{CMD_NAME} {err}')
         return False
     except Exception as err:
         args.executeFailed = True
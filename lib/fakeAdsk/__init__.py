@@ -0,0 +1,83 @@
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import types
+
+from . import recorder
+from .recorder import Recorder, CostModel, OperationCost, OperationRecord, getRecorder
+
+# Recording stand in for the Fusion API, lets the real generators run on any python:
+#   recorder = fakeAdsk.install()
+#   baseplateGenerator = fakeAdsk.loadAddinModule('lib.gridfinityUtils.baseplateGenerator')
+#   baseplateGenerator.createGridfinityBaseplate(input, fakeAdsk.newComponent())
+#   print(recorder.summary())
+
+ADDIN_PACKAGE_NAME = 'gridfinityAddin'
+ADDIN_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def isInstalled() -> bool:
+    return getattr(sys.modules.get('adsk'), '_isFake', False)
+
+def install(activeRecorder: Recorder = None) -> Recorder:
+    """
+    Registers the fake adsk.core and adsk.fusion modules, returns the recorder the calls go to
+    """
+    existing = sys.modules.get('adsk')
+    if existing is not None and not getattr(existing, '_isFake', False):
+        raise RuntimeError('The Fusion API is already loaded, the recording backend only runs outside of Fusion')
+    from . import core, fusion
+
+    if existing is None:
+        adsk = types.ModuleType('adsk')
+        adsk._isFake = True
+        adsk.__path__ = []
+        adsk.core = core
+        adsk.fusion = fusion
+        adsk.doEvents = doEvents
+        sys.modules['adsk'] = adsk
+        sys.modules['adsk.core'] = core
+        sys.modules['adsk.fusion'] = fusion
+
+    activeRecorder = activeRecorder or Recorder()
+    recorder.setRecorder(activeRecorder)
+    core.Application.get().newDesign()
+    return activeRecorder
+
+def loadAddinModule(name: str) -> types.ModuleType:
+    """
+    Imports an add-in module by its path in the repo (e.g. 'lib.gridfinityUtils.baseGenerator'),
+    the add-in uses relative imports above lib so the repo root is loaded as a package
+    """
+    if not isInstalled():
+        install()
+    if ADDIN_PACKAGE_NAME not in sys.modules:
+        spec = importlib.machinery.ModuleSpec(ADDIN_PACKAGE_NAME, None, is_package=True)
+        spec.submodule_search_locations = [ADDIN_ROOT]
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [ADDIN_ROOT]
+        sys.modules[ADDIN_PACKAGE_NAME] = package
+    return importlib.import_module('{}.{}'.format(ADDIN_PACKAGE_NAME, name))
+
+def doEvents() -> int:
+    """
+    Delivers custom events fired so far on the calling thread, stands in for adsk.doEvents
+    """
+    from . import core
+    return core.Application.get()._dispatchCustomEvents()
+
+def newDesign(designType: int = None):
+    from . import core
+    return core.Application.get().newDesign(designType)
+
+def newComponent(name: str = 'Component'):
+    """
+    Adds a component to the active design the same way the commands do
+    """
+    from . import core
+    design = core.Application.get().activeProduct
+    occurrence = design.rootComponent.occurrences.addNewComponent(core.Matrix3D.create())
+    occurrence.component.name = name
+    occurrence.activate()
+    return occurrence
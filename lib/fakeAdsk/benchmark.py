@@ -0,0 +1,236 @@
+import argparse
+import json
+import math
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+
+from . import harness
+from .recorder import CostModel
+
+# Scaling benchmark for the Fusion generators on the recording backend:
+#   python -m lib.fakeAdsk.benchmark --report benchmark.json
+#
+# Every series sweeps one size parameter (plate cells, bin cells, compartment count) with the rest
+# of the configuration fixed. For each metric the growth exponent is the log-log slope over the
+# larger half of the sweep, 1 means the work grows linearly with the size. The run fails when an
+# exponent goes above 1 + tolerance, or above the accepted exponent from --baseline plus tolerance
+# for series that are knowingly super-linear.
+
+BENCHMARK_METRICS = ['operations', 'features', 'combineToolBodies', 'estimatedSeconds']
+BENCHMARK_DEFAULT_TOLERANCE = 0.15
+BENCHMARK_DEFAULT_PLATE_SIZES = [1, 2, 3, 4, 6, 8, 10, 12, 16, 20]
+BENCHMARK_DEFAULT_BIN_SIZES = [1, 2, 3, 4, 6, 8, 10]
+BENCHMARK_DEFAULT_COMPARTMENT_COUNTS = [1, 2, 3, 4, 6, 8, 10]
+# compartment series run in the largest bin so every grid fits
+BENCHMARK_COMPARTMENTS_BIN_SIZE = 10
+
+@dataclass
+class BenchmarkPoint:
+    series: str
+    label: str
+    scale: float
+    operations: int = 0
+    features: int = 0
+    combineToolBodies: float = 0
+    estimatedSeconds: float = 0.0
+    wallSeconds: float = 0.0
+    counts: dict = field(default_factory=dict)
+    error: str = ''
+
+@dataclass
+class SeriesGrowth:
+    series: str
+    metric: str
+    exponent: float
+    limit: float
+
+    @property
+    def isOk(self) -> bool:
+        return self.exponent <= self.limit
+
+def _customCompartments(count: int) -> list[dict]:
+    # strips two cells wide with alternating depths, the layouts people draw in the table
+    compartments = []
+    for y in range(count):
+        for x in range(0, count, 2):
+            compartments.append({
+                'positionX': x,
+                'positionY': y,
+                'width': min(2, count - x),
+                'length': 1,
+                'depth': 2.0 if (x // 2 + y) % 2 else 9999999999999,
+            })
+    return compartments
+
+def baseplateSeries(sizes: list[int]) -> dict[str, list[tuple[float, str, dict]]]:
+    """
+    Square plates for every plate type, with and without clips, connection holes only exist on skeletonized plates
+    """
+    variants = []
+    for plateType in ['Light', 'Full', 'Skeletonized']:
+        for hasClips in [False, True]:
+            variants.append((plateType, hasClips, False))
+            if plateType == 'Skeletonized':
+                variants.append((plateType, hasClips, True))
+    series = {}
+    for plateType, hasClips, hasConnectionHoles in variants:
+        name = 'baseplate-{}{}{}'.format(plateType.lower(), '-clips' if hasClips else '', '-connection-holes' if hasConnectionHoles else '')
+        series[name] = [
+            (size * size, '{}x{}'.format(size, size), {
+                'type': 'baseplate',
+                'plateWidth': size,
+                'plateLength': size,
+                'plateType': plateType,
+                'hasClips': hasClips,
+                'hasConnectionHoles': hasConnectionHoles,
+            })
+            for size in sizes
+        ]
+    return series
+
+def binSeries(sizes: list[int], compartmentCounts: list[int]) -> dict[str, list[tuple[float, str, dict]]]:
+    binSize = BENCHMARK_COMPARTMENTS_BIN_SIZE
+    series = {
+        'bin-size': [
+            (size * size, '{}x{}'.format(size, size), {'type': 'bin', 'binWidth': size, 'binLength': size})
+            for size in sizes
+        ],
+        'bin-size-magnets-screws': [
+            (size * size, '{}x{}'.format(size, size), {'type': 'bin', 'binWidth': size, 'binLength': size, 'hasMagnetCutouts': True, 'hasScrewHoles': True})
+            for size in sizes
+        ],
+        'bin-compartments-uniform': [
+            (count * count, '{}x{}'.format(count, count), {'type': 'bin', 'binWidth': binSize, 'binLength': binSize, 'compartmentsX': count, 'compartmentsY': count})
+            for count in compartmentCounts
+        ],
+        'bin-compartments-uniform-scoop-tab': [
+            (count * count, '{}x{}'.format(count, count), {'type': 'bin', 'binWidth': binSize, 'binLength': binSize, 'compartmentsX': count, 'compartmentsY': count, 'hasScoop': True, 'hasTab': True})
+            for count in compartmentCounts
+        ],
+        'bin-compartments-custom': [],
+    }
+    for count in compartmentCounts:
+        compartments = _customCompartments(count)
+        series['bin-compartments-custom'].append((len(compartments), '{}x{} grid, {} compartments'.format(count, count, len(compartments)), {
+            'type': 'bin',
+            'binWidth': binSize,
+            'binLength': binSize,
+            'compartmentsGridType': 'Custom grid',
+            'compartmentsX': count,
+            'compartmentsY': count,
+            'compartments': compartments,
+        }))
+    return series
+
+def runPoint(series: str, scale: float, label: str, spec: dict, costModel: CostModel = None) -> BenchmarkPoint:
+    point = BenchmarkPoint(series, label, scale)
+    start = time.perf_counter()
+    try:
+        summary = harness.recordItem(spec, costModel).summary()
+    except Exception as err:
+        point.error = '{}: {}'.format(type(err).__name__, err)
+        return point
+    point.wallSeconds = time.perf_counter() - start
+    point.operations = summary['operations']
+    point.features = summary['features']
+    point.combineToolBodies = summary['combineToolBodies']
+    point.estimatedSeconds = summary['estimatedSeconds']
+    point.counts = summary['counts']
+    return point
+
+def growthExponent(points: list[BenchmarkPoint], metric: str) -> float:
+    """
+    Least squares slope of log(metric) over log(scale) for the larger half of the points
+    """
+    usable = sorted([point for point in points if not point.error and point.scale > 0 and getattr(point, metric) > 0], key=lambda x: x.scale)
+    usable = usable[len(usable) // 2:] if len(usable) > 3 else usable
+    if len(usable) < 2 or usable[0].scale == usable[-1].scale:
+        return math.nan
+    xs = [math.log(point.scale) for point in usable]
+    ys = [math.log(getattr(point, metric)) for point in usable]
+    meanX, meanY = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys)) / sum((x - meanX) ** 2 for x in xs)
+
+def checkGrowth(pointsBySeries: dict[str, list[BenchmarkPoint]], tolerance: float = BENCHMARK_DEFAULT_TOLERANCE, baseline: dict = None) -> list[SeriesGrowth]:
+    growth = []
+    for series, points in pointsBySeries.items():
+        for metric in BENCHMARK_METRICS:
+            exponent = growthExponent(points, metric)
+            if math.isnan(exponent):
+                continue
+            accepted = (baseline or {}).get(series, {}).get(metric, 1.0)
+            growth.append(SeriesGrowth(series, metric, exponent, max(1.0, accepted) + tolerance))
+    return growth
+
+def runBenchmark(series: dict[str, list[tuple[float, str, dict]]], costModel: CostModel = None, onPoint=None) -> dict[str, list[BenchmarkPoint]]:
+    results = {}
+    for name, configurations in series.items():
+        results[name] = []
+        for scale, label, spec in configurations:
+            point = runPoint(name, scale, label, spec, costModel)
+            results[name].append(point)
+            if onPoint:
+                onPoint(point)
+    return results
+
+def _printPoint(point: BenchmarkPoint):
+    if point.error:
+        print('FAILED {:<46} {:<28} {}'.format(point.series, point.label, point.error), flush=True)
+        return
+    print('{:<46} {:<28} {:>6} ops {:>5} features {:>5} tool bodies {:9.3f}s modelled {:7.2f}s wall'.format(
+        point.series, point.label, point.operations, point.features, int(point.combineToolBodies), point.estimatedSeconds, point.wallSeconds,
+    ), flush=True)
+
+def _parseSizes(value: str) -> list[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Sweep bin and baseplate sizes on the recording backend and fail on super-linear growth')
+    parser.add_argument('--plate-sizes', type=_parseSizes, default=BENCHMARK_DEFAULT_PLATE_SIZES, help='comma separated square plate sizes')
+    parser.add_argument('--bin-sizes', type=_parseSizes, default=BENCHMARK_DEFAULT_BIN_SIZES, help='comma separated square bin sizes')
+    parser.add_argument('--compartments', type=_parseSizes, default=BENCHMARK_DEFAULT_COMPARTMENT_COUNTS, help='comma separated compartment grid sizes')
+    parser.add_argument('--series', action='append', help='only run series containing this text, can be repeated')
+    parser.add_argument('--costs', help='JSON cost model overrides')
+    parser.add_argument('--tolerance', type=float, default=BENCHMARK_DEFAULT_TOLERANCE, help='allowed exponent above linear (or above the baseline)')
+    parser.add_argument('--baseline', help='JSON {"series": {"metric": exponent}} of accepted exponents')
+    parser.add_argument('--write-baseline', help='write the measured exponents to this JSON file')
+    parser.add_argument('--report', help='write every point and exponent to this JSON file')
+    args = parser.parse_args(argv)
+
+    series = dict(baseplateSeries(args.plate_sizes))
+    series.update(binSeries(args.bin_sizes, args.compartments))
+    if args.series:
+        series = {name: configurations for name, configurations in series.items() if any(text in name for text in args.series)}
+    costModel = CostModel.fromJson(args.costs) if args.costs else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    results = runBenchmark(series, costModel, _printPoint)
+    growth = checkGrowth(results, args.tolerance, baseline)
+    errors = [point for points in results.values() for point in points if point.error]
+    regressions = [item for item in growth if not item.isOk]
+
+    print()
+    for item in growth:
+        print('{:<4} {:<46} {:<18} exponent {:5.2f} limit {:5.2f}'.format('ok' if item.isOk else 'FAIL', item.series, item.metric, item.exponent, item.limit))
+    print('{} series, {} points, {} errors, {} super-linear metrics'.format(len(results), sum(len(points) for points in results.values()), len(errors), len(regressions)))
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump({
+                'points': [asdict(point) for points in results.values() for point in points],
+                'growth': [dict(asdict(item), isOk=item.isOk) for item in growth],
+            }, file, indent=2)
+    if args.write_baseline:
+        exponents = {}
+        for item in growth:
+            exponents.setdefault(item.series, {})[item.metric] = round(item.exponent, 3)
+        with open(args.write_baseline, 'w', encoding='utf-8') as file:
+            json.dump(exponents, file, indent=2)
+    return 1 if errors or regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
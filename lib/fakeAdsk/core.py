@@ -0,0 +1,514 @@
+import math
+import queue
+import re
+
+from . import recorder
+
+# Stand in for adsk.core, only the parts the generators touch.
+
+def _add(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+def _scale(a, factor: float):
+    return (a[0] * factor, a[1] * factor, a[2] * factor)
+
+def _dot(a, b) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+def _length(a) -> float:
+    return math.sqrt(_dot(a, a))
+
+def _unit(a):
+    length = _length(a)
+    return _scale(a, 1 / length) if length > 0 else a
+
+class Base():
+    @classmethod
+    def classType(cls) -> str:
+        return '{}::{}'.format(cls.__module__, cls.__name__)
+
+    @classmethod
+    def cast(cls, value):
+        return value if isinstance(value, cls) else None
+
+    @property
+    def objectType(self) -> str:
+        return self.classType()
+
+    @property
+    def isValid(self) -> bool:
+        return True
+
+class Point3D(Base):
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    @staticmethod
+    def create(x: float = 0, y: float = 0, z: float = 0) -> 'Point3D':
+        return Point3D(x, y, z)
+
+    def asTuple(self):
+        return (self.x, self.y, self.z)
+
+    def asArray(self) -> list[float]:
+        return [self.x, self.y, self.z]
+
+    def asVector(self) -> 'Vector3D':
+        return Vector3D(self.x, self.y, self.z)
+
+    def copy(self) -> 'Point3D':
+        return Point3D(self.x, self.y, self.z)
+
+    def distanceTo(self, point: 'Point3D') -> float:
+        return _length(_sub(self.asTuple(), point.asTuple()))
+
+    def isEqualTo(self, point: 'Point3D') -> bool:
+        return self.isEqualToByTolerance(point, 1e-10)
+
+    def isEqualToByTolerance(self, point: 'Point3D', tolerance: float) -> bool:
+        return self.distanceTo(point) <= tolerance
+
+    def translateBy(self, vector: 'Vector3D') -> bool:
+        self.x, self.y, self.z = _add(self.asTuple(), vector.asTuple())
+        return True
+
+    def transformBy(self, matrix: 'Matrix3D') -> bool:
+        self.x, self.y, self.z = matrix.transformPoint(self.asTuple())
+        return True
+
+    def vectorTo(self, point: 'Point3D') -> 'Vector3D':
+        return Vector3D(*_sub(point.asTuple(), self.asTuple()))
+
+    def __repr__(self):
+        return 'Point3D({:g}, {:g}, {:g})'.format(self.x, self.y, self.z)
+
+class Vector3D(Point3D):
+    @staticmethod
+    def create(x: float = 0, y: float = 0, z: float = 0) -> 'Vector3D':
+        return Vector3D(x, y, z)
+
+    @property
+    def length(self) -> float:
+        return _length(self.asTuple())
+
+    def add(self, vector: 'Vector3D') -> bool:
+        return self.translateBy(vector)
+
+    def subtract(self, vector: 'Vector3D') -> bool:
+        self.x, self.y, self.z = _sub(self.asTuple(), vector.asTuple())
+        return True
+
+    def scaleBy(self, factor: float) -> bool:
+        self.x, self.y, self.z = _scale(self.asTuple(), factor)
+        return True
+
+    def normalize(self) -> bool:
+        self.x, self.y, self.z = _unit(self.asTuple())
+        return True
+
+    def dotProduct(self, vector: 'Vector3D') -> float:
+        return _dot(self.asTuple(), vector.asTuple())
+
+    def crossProduct(self, vector: 'Vector3D') -> 'Vector3D':
+        return Vector3D(*_cross(self.asTuple(), vector.asTuple()))
+
+    def asPoint(self) -> Point3D:
+        return Point3D(self.x, self.y, self.z)
+
+    def copy(self) -> 'Vector3D':
+        return Vector3D(self.x, self.y, self.z)
+
+    def transformBy(self, matrix: 'Matrix3D') -> bool:
+        self.x, self.y, self.z = matrix.transformVector(self.asTuple())
+        return True
+
+    def __repr__(self):
+        return 'Vector3D({:g}, {:g}, {:g})'.format(self.x, self.y, self.z)
+
+class Matrix3D(Base):
+    def __init__(self, rows: list[list[float]] = None):
+        self.rows = rows or [[1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+
+    @staticmethod
+    def create() -> 'Matrix3D':
+        return Matrix3D()
+
+    def copy(self) -> 'Matrix3D':
+        return Matrix3D([list(row) for row in self.rows])
+
+    def getCell(self, row: int, column: int) -> float:
+        return self.rows[row][column]
+
+    def setCell(self, row: int, column: int, value: float) -> bool:
+        self.rows[row][column] = value
+        return True
+
+    def asArray(self) -> list[float]:
+        return [value for row in self.rows for value in row]
+
+    @property
+    def translation(self) -> Vector3D:
+        return Vector3D(self.rows[0][3], self.rows[1][3], self.rows[2][3])
+
+    @translation.setter
+    def translation(self, value: Vector3D):
+        self.rows[0][3], self.rows[1][3], self.rows[2][3] = value.x, value.y, value.z
+
+    def setToIdentity(self) -> bool:
+        self.rows = Matrix3D().rows
+        return True
+
+    def setToRotation(self, angle: float, axis: Vector3D, origin: Point3D) -> bool:
+        x, y, z = _unit(axis.asTuple())
+        c, s = math.cos(angle), math.sin(angle)
+        t = 1 - c
+        rotation = [
+            [t * x * x + c, t * x * y - s * z, t * x * z + s * y],
+            [t * x * y + s * z, t * y * y + c, t * y * z - s * x],
+            [t * x * z - s * y, t * y * z + s * x, t * z * z + c],
+        ]
+        o = origin.asTuple()
+        rotated = tuple(sum(rotation[i][j] * o[j] for j in range(3)) for i in range(3))
+        self.rows = [rotation[i] + [o[i] - rotated[i]] for i in range(3)] + [[0.0, 0.0, 0.0, 1.0]]
+        return True
+
+    def transformBy(self, matrix: 'Matrix3D') -> bool:
+        # applies matrix after this transform
+        self.rows = [[sum(matrix.rows[i][k] * self.rows[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+        return True
+
+    def transformPoint(self, point):
+        (a, b, c, d), (e, f, g, h), (i, j, k, l) = self.rows[0], self.rows[1], self.rows[2]
+        x, y, z = point
+        return (a * x + b * y + c * z + d, e * x + f * y + g * z + h, i * x + j * y + k * z + l)
+
+    def transformVector(self, vector):
+        (a, b, c, _), (e, f, g, _), (i, j, k, _) = self.rows[0], self.rows[1], self.rows[2]
+        x, y, z = vector
+        return (a * x + b * y + c * z, e * x + f * y + g * z, i * x + j * y + k * z)
+
+class BoundingBox3D(Base):
+    def __init__(self, minPoint: Point3D, maxPoint: Point3D):
+        self.minPoint = minPoint
+        self.maxPoint = maxPoint
+
+    @staticmethod
+    def create(minPoint: Point3D, maxPoint: Point3D) -> 'BoundingBox3D':
+        return BoundingBox3D(minPoint.copy(), maxPoint.copy())
+
+    @staticmethod
+    def fromPoints(points) -> 'BoundingBox3D':
+        xs, ys, zs = zip(*points)
+        return BoundingBox3D(Point3D(min(xs), min(ys), min(zs)), Point3D(max(xs), max(ys), max(zs)))
+
+    def copy(self) -> 'BoundingBox3D':
+        return BoundingBox3D(self.minPoint.copy(), self.maxPoint.copy())
+
+    def contains(self, point: Point3D) -> bool:
+        return all(low - 1e-9 <= value <= high + 1e-9 for low, value, high in zip(self.minPoint.asTuple(), point.asTuple(), self.maxPoint.asTuple()))
+
+    def expand(self, point: Point3D) -> bool:
+        self.minPoint = Point3D(*map(min, self.minPoint.asTuple(), point.asTuple()))
+        self.maxPoint = Point3D(*map(max, self.maxPoint.asTuple(), point.asTuple()))
+        return True
+
+class OrientedBoundingBox3D(Base):
+    def __init__(self, centerPoint: Point3D, lengthDirection: Vector3D, widthDirection: Vector3D, length: float, width: float, height: float):
+        self.centerPoint = centerPoint
+        self.lengthDirection = lengthDirection
+        self.widthDirection = widthDirection
+        self.length = length
+        self.width = width
+        self.height = height
+
+    @staticmethod
+    def create(centerPoint: Point3D, lengthDirection: Vector3D, widthDirection: Vector3D, length: float, width: float, height: float) -> 'OrientedBoundingBox3D':
+        return OrientedBoundingBox3D(centerPoint.copy(), lengthDirection.copy(), widthDirection.copy(), length, width, height)
+
+    @property
+    def heightDirection(self) -> Vector3D:
+        return self.lengthDirection.crossProduct(self.widthDirection)
+
+    def copy(self) -> 'OrientedBoundingBox3D':
+        return OrientedBoundingBox3D.create(self.centerPoint, self.lengthDirection, self.widthDirection, self.length, self.width, self.height)
+
+class ValueTypes():
+    RealValueType = 0
+    StringValueType = 1
+    ObjectValueType = 2
+
+_UNIT_FACTORS = {'': 1.0, 'cm': 1.0, 'mm': 0.1, 'm': 100.0, 'in': 2.54, 'deg': math.pi / 180, 'rad': 1.0}
+
+class ValueInput(Base):
+    def __init__(self, realValue: float, stringValue: str = '', valueType: int = ValueTypes.RealValueType):
+        self.realValue = realValue
+        self.stringValue = stringValue
+        self.valueType = valueType
+
+    @staticmethod
+    def createByReal(value: float) -> 'ValueInput':
+        return ValueInput(float(value))
+
+    @staticmethod
+    def createByString(expression: str) -> 'ValueInput':
+        # plain numbers with an optional unit, no parameter expressions
+        match = re.fullmatch(r'\s*([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([a-z]*)\s*', expression)
+        if match is None or match.group(2) not in _UNIT_FACTORS:
+            raise ValueError('Unsupported value expression "{}"'.format(expression))
+        return ValueInput(float(match.group(1)) * _UNIT_FACTORS[match.group(2)], expression, ValueTypes.StringValueType)
+
+    @staticmethod
+    def createByObject(value) -> 'ValueInput':
+        input = ValueInput(0.0, '', ValueTypes.ObjectValueType)
+        input.objectValue = value
+        return input
+
+def valueOf(value) -> float:
+    return value.realValue if isinstance(value, ValueInput) else float(value)
+
+class ObjectCollection(Base):
+    def __init__(self, items: list = None):
+        self._items = list(items or [])
+
+    @staticmethod
+    def create() -> 'ObjectCollection':
+        return ObjectCollection()
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def add(self, item) -> bool:
+        if any(existing is item for existing in self._items):
+            return False
+        self._items.append(item)
+        return True
+
+    def item(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def find(self, item, startIndex: int = 0) -> int:
+        for index in range(startIndex, len(self._items)):
+            if self._items[index] is item:
+                return index
+        return -1
+
+    def contains(self, item) -> bool:
+        return self.find(item) >= 0
+
+    def removeByIndex(self, index: int) -> bool:
+        del self._items[index]
+        return True
+
+    def removeByItem(self, item) -> bool:
+        index = self.find(item)
+        if index < 0:
+            return False
+        return self.removeByIndex(index)
+
+    def clear(self) -> bool:
+        self._items = []
+        return True
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+class LogLevels():
+    InfoLogLevel = 0
+    WarningLogLevel = 1
+    ErrorLogLevel = 2
+
+class LogTypes():
+    ConsoleLogType = 0
+    FileLogType = 1
+
+class ProgressDialog(Base):
+    """
+    Never shown, cancelAfter presses Cancel once that many values were set
+    """
+    def __init__(self):
+        self.isCancelButtonShown = True
+        self.isShowing = False
+        self.title = ''
+        self.message = ''
+        self.minimumValue = 0
+        self.maximumValue = 100
+        self.values: list[int] = []
+        self.cancelAfter = None
+        self._value = 0
+
+    @property
+    def progressValue(self) -> int:
+        return self._value
+
+    @progressValue.setter
+    def progressValue(self, value: int):
+        self._value = value
+        self.values.append(value)
+
+    @property
+    def wasCancelled(self) -> bool:
+        return self.isCancelButtonShown and self.cancelAfter is not None and len(self.values) >= self.cancelAfter
+
+    def show(self, title: str, message: str, minimumValue: int, maximumValue: int, delay: int = 0) -> bool:
+        self.title, self.message = title, message
+        self.minimumValue, self.maximumValue = minimumValue, maximumValue
+        self.isShowing = True
+        return True
+
+    def hide(self) -> bool:
+        self.isShowing = False
+        return True
+
+class UserInterface(Base):
+    def __init__(self):
+        self.activeSelections = ObjectCollection()
+        self.progressDialogs: list[ProgressDialog] = []
+        # set on dialogs created from here on, see ProgressDialog
+        self.cancelProgressAfter = None
+
+    def messageBox(self, text: str, title: str = '', *args) -> int:
+        recorder.getRecorder().log('messageBox: {}'.format(text))
+        return 0
+
+    def createProgressDialog(self) -> ProgressDialog:
+        dialog = ProgressDialog()
+        dialog.cancelAfter = self.cancelProgressAfter
+        self.progressDialogs.append(dialog)
+        return dialog
+
+class Color(Base):
+    def __init__(self, red: int, green: int, blue: int, opacity: int):
+        self.red = red
+        self.green = green
+        self.blue = blue
+        self.opacity = opacity
+
+    @staticmethod
+    def create(red: int, green: int, blue: int, opacity: int) -> 'Color':
+        return Color(red, green, blue, opacity)
+
+class Viewport(Base):
+    def __init__(self):
+        self.refreshCount = 0
+
+    def refresh(self) -> bool:
+        self.refreshCount += 1
+        return True
+
+class CustomEventArgs(Base):
+    def __init__(self, additionalInfo: str):
+        self.additionalInfo = additionalInfo
+
+class CustomEventHandler():
+    def notify(self, args: CustomEventArgs):
+        pass
+
+class CustomEvent(Base):
+    def __init__(self, eventId: str):
+        self.eventId = eventId
+        self._handlers: list[CustomEventHandler] = []
+
+    def add(self, handler: 'CustomEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+    def remove(self, handler: 'CustomEventHandler') -> bool:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        return True
+
+class Application(Base):
+    _instance = None
+
+    def __init__(self):
+        self.userInterface = UserInterface()
+        self.activeViewport = Viewport()
+        self._product = None
+        self._customEvents: dict[str, CustomEvent] = {}
+        # fired events wait here until doEvents, Fusion delivers them on the main thread the same way
+        self._firedEvents = queue.Queue()
+
+    @staticmethod
+    def get() -> 'Application':
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    @property
+    def activeProduct(self):
+        if self._product is None:
+            from . import fusion
+            self._product = fusion.Design()
+        return self._product
+
+    @property
+    def activeDocument(self):
+        return None
+
+    def newDesign(self, designType: int = None):
+        from . import fusion
+        self._product = fusion.Design(fusion.DesignTypes.ParametricDesignType if designType is None else designType)
+        return self._product
+
+    def log(self, message: str, level: int = LogLevels.InfoLogLevel, type: int = LogTypes.ConsoleLogType):
+        recorder.getRecorder().log(message)
+
+    def registerCustomEvent(self, eventId: str) -> CustomEvent:
+        if eventId not in self._customEvents:
+            self._customEvents[eventId] = CustomEvent(eventId)
+        return self._customEvents[eventId]
+
+    def unregisterCustomEvent(self, eventId: str) -> bool:
+        return self._customEvents.pop(eventId, None) is not None
+
+    def fireCustomEvent(self, eventId: str, additionalInfo: str = '') -> bool:
+        # safe from any thread, like in Fusion
+        if eventId not in self._customEvents:
+            return False
+        self._firedEvents.put((eventId, additionalInfo))
+        return True
+
+    def _dispatchCustomEvents(self) -> int:
+        delivered = 0
+        while True:
+            try:
+                eventId, additionalInfo = self._firedEvents.get_nowait()
+            except queue.Empty:
+                return delivered
+            event = self._customEvents.get(eventId)
+            if event is None:
+                continue
+            for handler in list(event._handlers):
+                handler.notify(CustomEventArgs(additionalInfo))
+            delivered += 1
+
+def unsupported(moduleName: str, name: str):
+    """
+    Placeholder for API members the fake does not model, fine in annotations, fails loudly when used
+    """
+    def fail(*args, **kwargs):
+        raise NotImplementedError('{}.{} is not supported by the recording backend'.format(moduleName, name))
+
+    return type(name, (Base,), {'__getattr__': lambda self, attribute: fail(), '__init__': fail, 'create': staticmethod(fail), 'cast': classmethod(lambda cls, value: value)})
+
+def __getattr__(name: str):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    placeholder = unsupported('adsk.core', name)
+    globals()[name] = placeholder
+    return placeholder
@@ -0,0 +1,2409 @@
+import math
+
+from . import recorder
+from .core import (
+    Base, Point3D, Vector3D, Matrix3D, BoundingBox3D, ObjectCollection, ValueInput, valueOf, unsupported,
+    _add, _sub, _scale, _dot, _cross, _length, _unit,
+)
+
+# Stand in for adsk.fusion that records every modelling call.
+# Geometry is approximate: every extrusion is a prism of its profile loop, booleans merge face lists
+# instead of computing intersections and fillets/chamfers keep the topology unchanged. That is
+# enough for the generators to find the faces and edges they query (bottom face, edges by length,
+# projected face edges) and for operation counts to scale like they do in Fusion.
+# Next to the faces every body keeps a CSG solid for point probes (see _Shape): extrusions are prisms
+# with the inner loops of their sketch as holes, booleans, patterns and moves combine and transform
+# them, fillets and chamfers take the material off their edges. Lofts, shells and splits are not
+# modelled, their bodies have no solid.
+
+TOLERANCE = 1e-6
+ARC_SEGMENT_ANGLE = math.pi / 8
+# extrusions of a body face keep the section of the body this far below the face, fillets and chamfers included
+SECTION_DEPTH = 1e-4
+
+class FeatureOperations():
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+_OPERATION_NAMES = {
+    FeatureOperations.JoinFeatureOperation: 'join',
+    FeatureOperations.CutFeatureOperation: 'cut',
+    FeatureOperations.IntersectFeatureOperation: 'intersect',
+    FeatureOperations.NewBodyFeatureOperation: 'newBody',
+    FeatureOperations.NewComponentFeatureOperation: 'newComponent',
+}
+
+class ExtentDirections():
+    PositiveExtentDirection = 0
+    NegativeExtentDirection = 1
+    SymmetricExtentDirection = 2
+
+class PatternDistanceType():
+    ExtentPatternDistanceType = 0
+    SpacingPatternDistanceType = 1
+
+class PatternComputeOptions():
+    OptimizedPatternCompute = 0
+    IdenticalPatternCompute = 1
+    AdjustPatternCompute = 2
+
+class DimensionOrientations():
+    AlignedDimensionOrientation = 0
+    HorizontalDimensionOrientation = 1
+    VerticalDimensionOrientation = 2
+
+class SurfaceExtendTypes():
+    NaturalSurfaceExtendType = 0
+    TangentSurfaceExtendType = 1
+    LinearSurfaceExtendType = 2
+
+class DesignTypes():
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+class BooleanTypes():
+    DifferenceBooleanType = 0
+    IntersectionBooleanType = 1
+    UnionBooleanType = 2
+
+class FeatureHealthStates():
+    HealthyFeatureHealthState = 0
+    WarningFeatureHealthState = 1
+    ErrorFeatureHealthState = 2
+
+def _record(kind: str, call: str, arguments: dict = None, **counters) -> recorder.OperationRecord:
+    return recorder.getRecorder().record(kind, call, arguments, **counters)
+
+def _tuple(point) -> tuple:
+    if isinstance(point, SketchPoint):
+        return point._point
+    if isinstance(point, (tuple, list)):
+        return (float(point[0]), float(point[1]), float(point[2]) if len(point) > 2 else 0.0)
+    return point.asTuple()
+
+def _items(entities) -> list:
+    if entities is None:
+        return []
+    if isinstance(entities, (list, tuple, ObjectCollection, _Collection)):
+        return list(entities)
+    return [entities]
+
+def _polylineLength(points) -> float:
+    return sum(_length(_sub(points[i + 1], points[i])) for i in range(len(points) - 1))
+
+def _loopArea(points, normal) -> float:
+    # signed area of a closed polyline seen from the normal
+    total = (0.0, 0.0, 0.0)
+    for i in range(len(points)):
+        total = _add(total, _cross(points[i], points[(i + 1) % len(points)]))
+    return _dot(total, normal) / 2
+
+def _arcPoints(center, start, sweep: float, normal=(0.0, 0.0, 1.0)) -> list:
+    steps = max(2, int(math.ceil(abs(sweep) / ARC_SEGMENT_ANGLE)))
+    radial = _sub(start, center)
+    tangent = _cross(normal, radial)
+    points = []
+    for step in range(steps + 1):
+        angle = sweep * step / steps
+        points.append(_add(center, _add(_scale(radial, math.cos(angle)), _scale(tangent, math.sin(angle)))))
+    return points
+
+class _Frame():
+    """
+    Sketch or construction plane coordinate system in model space
+    """
+    def __init__(self, origin, xDirection, yDirection, normal):
+        self.origin = origin
+        self.xDirection = xDirection
+        self.yDirection = yDirection
+        self.normal = normal
+
+    @staticmethod
+    def fromNormal(point, normal) -> '_Frame':
+        normal = _unit(normal)
+        # same axis choice as Fusion: sketch Y follows model Y on horizontal planes, model Z otherwise
+        reference = (0.0, 1.0, 0.0) if abs(normal[2]) > 1 - TOLERANCE else (0.0, 0.0, 1.0)
+        yDirection = _unit(_sub(reference, _scale(normal, _dot(reference, normal))))
+        xDirection = _cross(yDirection, normal)
+        return _Frame(_scale(normal, _dot(point, normal)), xDirection, yDirection, normal)
+
+    def offset(self, distance: float) -> '_Frame':
+        return _Frame(_add(self.origin, _scale(self.normal, distance)), self.xDirection, self.yDirection, self.normal)
+
+    def toModel(self, point) -> tuple:
+        return _add(self.origin, _add(_scale(self.xDirection, point[0]), _add(_scale(self.yDirection, point[1]), _scale(self.normal, point[2]))))
+
+    def toSketch(self, point) -> tuple:
+        delta = _sub(point, self.origin)
+        return (_dot(delta, self.xDirection), _dot(delta, self.yDirection), _dot(delta, self.normal))
+
+    def matrix(self) -> Matrix3D:
+        columns = (self.xDirection, self.yDirection, self.normal, self.origin)
+        return Matrix3D([[columns[j][i] for j in range(4)] for i in range(3)] + [[0.0, 0.0, 0.0, 1.0]])
+
+_XY_FRAME = _Frame((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+_XZ_FRAME = _Frame((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 0.0, -1.0), (0.0, 1.0, 0.0))
+_YZ_FRAME = _Frame((0.0, 0.0, 0.0), (0.0, 0.0, -1.0), (0.0, 1.0, 0.0), (1.0, 0.0, 0.0))
+
+class _Segment():
+    """
+    Piece of a profile loop, kind is line, arc or circle, points are in model or sketch space
+    """
+    def __init__(self, kind: str, points: list):
+        self.kind = kind
+        self.points = points
+
+    def mapped(self, function) -> '_Segment':
+        return _Segment(self.kind, [function(point) for point in self.points])
+
+    def reversed(self) -> '_Segment':
+        return _Segment(self.kind, list(reversed(self.points)))
+
+def _loopPoints(segments: list[_Segment]) -> list:
+    points = []
+    for segment in segments:
+        points.extend(segment.points[:-1] if segment.kind != 'circle' else segment.points[:-1])
+    return points
+
+def _isInsidePolygon(points: list, x: float, y: float) -> bool:
+    # even-odd rule on the first two coordinates
+    inside = False
+    for i in range(len(points)):
+        (ax, ay), (bx, by) = points[i][:2], points[i - 1][:2]
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+    return inside
+
+def _segmentDistance(point, start, end) -> float:
+    direction = _sub(end, start)
+    lengthSquared = _dot(direction, direction)
+    along = min(1.0, max(0.0, _dot(_sub(point, start), direction) / lengthSquared)) if lengthSquared > 0 else 0.0
+    return _length(_sub(point, _add(start, _scale(direction, along))))
+
+class _Collection(Base):
+    def __init__(self, items: list = None):
+        self._items = items if items is not None else []
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def itemByName(self, name: str):
+        return next((item for item in self._items if getattr(item, 'name', None) == name), None)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+class BRepBodies(_Collection):
+    def __init__(self, items: list = None, component: 'Component' = None):
+        super().__init__(items)
+        self._component = component
+
+    def add(self, body, targetBaseFeature=None) -> 'BRepBody':
+        """
+        Inserts a temporary body, parametric designs only allow that inside a base feature
+        """
+        component = self._component
+        if component is None:
+            raise RuntimeError('Bodies can only be added to the bRepBodies of a component')
+        if component._design.designType == DesignTypes.ParametricDesignType and targetBaseFeature is None:
+            raise RuntimeError('Parametric designs need a base feature to add a body')
+        minPoint, maxPoint = body._shape.bounds()
+        outline = [
+            _Segment('line', [(minPoint[0], minPoint[1], 0.0), (maxPoint[0], minPoint[1], 0.0)]),
+            _Segment('line', [(maxPoint[0], minPoint[1], 0.0), (maxPoint[0], maxPoint[1], 0.0)]),
+            _Segment('line', [(maxPoint[0], maxPoint[1], 0.0), (minPoint[0], maxPoint[1], 0.0)]),
+            _Segment('line', [(minPoint[0], maxPoint[1], 0.0), (minPoint[0], minPoint[1], 0.0)]),
+        ]
+        startFaces, endFaces, sideFaces = _buildPrism(outline, (0.0, 0.0, minPoint[2]), (0.0, 0.0, maxPoint[2] - minPoint[2]))
+        inserted = BRepBody(component, startFaces + endFaces + sideFaces)
+        # keeps the exact solid for point probes, the faces are only its bounding box
+        inserted._shape = body._shape
+        inserted._solid = body._shape
+        _record('temporaryBRep', 'bRepBodies.add', {'baseFeature': targetBaseFeature is not None}, faces=body._shape.faceCount())
+        self._items.append(inserted)
+        return component._addBody(inserted)
+
+class BRepFaces(_Collection):
+    pass
+
+class BRepEdges(_Collection):
+    pass
+
+class BRepVertex(Base):
+    def __init__(self, point):
+        self._point = point
+
+    @property
+    def geometry(self) -> Point3D:
+        return Point3D(*self._point)
+
+class _CurveEvaluator(Base):
+    def __init__(self, edge: 'BRepEdge'):
+        self._edge = edge
+
+    def getEndPoints(self):
+        return (True, Point3D(*self._edge._points[0]), Point3D(*self._edge._points[-1]))
+
+    def getLength(self):
+        return (True, self._edge.length)
+
+_nextTempId = 0
+
+def _takeTempId() -> int:
+    global _nextTempId
+    _nextTempId += 1
+    return _nextTempId
+
+class BRepEdge(Base):
+    def __init__(self, kind: str, points: list):
+        self._kind = kind
+        self._points = points
+        self._faces: list[BRepFace] = []
+        self._chain: list[BRepEdge] = None
+        self.tempId = _takeTempId()
+
+    @property
+    def body(self) -> 'BRepBody':
+        return self._faces[0]._body if self._faces else None
+
+    @property
+    def faces(self) -> BRepFaces:
+        return BRepFaces(list(self._faces))
+
+    @property
+    def length(self) -> float:
+        return _polylineLength(self._points)
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints(self._points)
+
+    @property
+    def startVertex(self) -> BRepVertex:
+        return BRepVertex(self._points[0])
+
+    @property
+    def endVertex(self) -> BRepVertex:
+        return BRepVertex(self._points[-1])
+
+    @property
+    def evaluator(self) -> _CurveEvaluator:
+        return _CurveEvaluator(self)
+
+    @property
+    def isDegenerate(self) -> bool:
+        return self.length < TOLERANCE
+
+    @property
+    def tangentiallyConnectedEdges(self) -> BRepEdges:
+        return BRepEdges(list(self._chain) if self._chain else [self])
+
+class Plane(Base):
+    def __init__(self, origin, normal, uDirection=None, vDirection=None):
+        self.origin = Point3D(*origin)
+        self.normal = Vector3D(*normal)
+        self.uDirection = Vector3D(*(uDirection or (1.0, 0.0, 0.0)))
+        self.vDirection = Vector3D(*(vDirection or (0.0, 1.0, 0.0)))
+
+class Cylinder(Base):
+    pass
+
+class InfiniteLine3D(Base):
+    def __init__(self, origin, direction):
+        self.origin = Point3D(*origin)
+        self.direction = Vector3D(*direction)
+
+class BRepFace(Base):
+    def __init__(self, kind: str, points: list, normal, edges: list[BRepEdge], area: float, segments: list[_Segment] = None):
+        self._kind = kind
+        self._points = points
+        self._normal = normal
+        self._edges = edges
+        self._area = area
+        # ordered outer loop, only kept for planar faces that can be sketched on or extruded
+        self._segments = segments
+        self._body: BRepBody = None
+        self.tempId = _takeTempId()
+        for edge in edges:
+            edge._faces.append(self)
+
+    @property
+    def body(self) -> 'BRepBody':
+        return self._body
+
+    @property
+    def edges(self) -> BRepEdges:
+        return BRepEdges(list(self._edges))
+
+    @property
+    def area(self) -> float:
+        return self._area
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints(self._points)
+
+    @property
+    def centroid(self) -> Point3D:
+        return Point3D(*(sum(point[i] for point in self._points) / len(self._points) for i in range(3)))
+
+    @property
+    def pointOnFace(self) -> Point3D:
+        return self.centroid
+
+    @property
+    def geometry(self):
+        if self._kind == 'plane':
+            frame = self._frame()
+            return Plane(self._points[0], self._normal, frame.xDirection, frame.yDirection)
+        return Cylinder()
+
+    @property
+    def isParamReversed(self) -> bool:
+        return False
+
+    def _frame(self) -> _Frame:
+        if self._kind != 'plane':
+            raise ValueError('Face is not planar')
+        return _Frame.fromNormal(self._points[0], self._normal)
+
+def _copyTopology(faces: list[BRepFace], transformPoint, transformVector) -> list[BRepFace]:
+    edgeMap: dict[int, BRepEdge] = {}
+    for face in faces:
+        for edge in face._edges:
+            if id(edge) not in edgeMap:
+                edgeMap[id(edge)] = BRepEdge(edge._kind, [transformPoint(point) for point in edge._points])
+    for face in faces:
+        for edge in face._edges:
+            if edge._chain and edgeMap[id(edge)]._chain is None:
+                chain = [edgeMap[id(item)] for item in edge._chain if id(item) in edgeMap]
+                for item in chain:
+                    item._chain = chain
+    return [
+        BRepFace(
+            face._kind,
+            [transformPoint(point) for point in face._points],
+            transformVector(face._normal) if face._normal else None,
+            [edgeMap[id(edge)] for edge in face._edges],
+            face._area,
+            [segment.mapped(transformPoint) for segment in face._segments] if face._segments else None,
+        )
+        for face in faces
+    ]
+
+def _copyFaces(faces: list[BRepFace], matrix: Matrix3D = None) -> list[BRepFace]:
+    if matrix is None:
+        return _copyTopology(faces, lambda point: point, lambda vector: vector)
+    return _copyTopology(faces, matrix.transformPoint, lambda vector: _unit(matrix.transformVector(vector)))
+
+class BRepBody(Base):
+    def __init__(self, component: 'Component', faces: list[BRepFace] = None):
+        self.parentComponent = component
+        self._faces: list[BRepFace] = []
+        self._revision = 0
+        self._name = component._nextBodyName()
+        self.isVisible = True
+        self.isSolid = True
+        self.isLightBulbOn = True
+        self._isDeleted = False
+        self.tempId = _takeTempId()
+        # CSG solid next to the faces, None when a feature without a solid model built the body
+        self._solid: _Shape = None
+        self._addFaces(faces or [])
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def faces(self) -> BRepFaces:
+        return BRepFaces(list(self._faces))
+
+    @property
+    def edges(self) -> BRepEdges:
+        edges = {}
+        for face in self._faces:
+            for edge in face._edges:
+                edges[id(edge)] = edge
+        return BRepEdges(list(edges.values()))
+
+    @property
+    def vertices(self) -> _Collection:
+        points = {}
+        for edge in self.edges:
+            for point in (edge._points[0], edge._points[-1]):
+                points[tuple(round(value / TOLERANCE) for value in point)] = point
+        return _Collection([BRepVertex(point) for point in points.values()])
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints(point for face in self._faces for point in face._points)
+
+    @property
+    def area(self) -> float:
+        return sum(face._area for face in self._faces)
+
+    @property
+    def revisionId(self) -> str:
+        return '{}:{}'.format(self.tempId, self._revision)
+
+    @property
+    def isValid(self) -> bool:
+        return not self._isDeleted
+
+    @property
+    def entityToken(self) -> str:
+        return 'body:{}'.format(self.tempId)
+
+    def _addFaces(self, faces: list[BRepFace]):
+        for face in faces:
+            face._body = self
+        self._faces.extend(faces)
+        self._touch()
+
+    def _touch(self):
+        self._revision += 1
+
+    def _transform(self, matrix: Matrix3D):
+        # moves the body in place, faces are rebuilt so edge chains and normals follow
+        faces = _copyFaces(self._faces, matrix)
+        self._faces = []
+        self._addFaces(faces)
+        if self._solid is not None:
+            self._solid = self._solid.transformed(matrix)
+
+    def deleteMe(self) -> bool:
+        self.parentComponent._removeBody(self)
+        return True
+
+def _buildPrism(segments: list[_Segment], start, extent, topSegments: list[_Segment] = None):
+    """
+    Faces of a prism swept from the loop moved by start along extent, returns (startFaces, endFaces, sideFaces)
+    """
+    height = _length(extent)
+    direction = _unit(extent) if height > TOLERANCE else (0.0, 0.0, 1.0)
+    bottom = [segment.mapped(lambda point: _add(point, start)) for segment in segments]
+    top = topSegments or [segment.mapped(lambda point: _add(_add(point, start), extent)) for segment in segments]
+    bottomEdges = [BRepEdge(segment.kind, segment.points) for segment in bottom]
+    topEdges = [BRepEdge(segment.kind, segment.points) for segment in top]
+    for chain in (bottomEdges, topEdges):
+        for edge in chain:
+            edge._chain = chain
+    # circles have no seam edges, every other segment gets one at its start
+    lateralEdges = [
+        BRepEdge('line', [bottom[i].points[0], top[i].points[0]]) if segments[i].kind != 'circle' else None
+        for i in range(len(segments))
+    ]
+    loop = _loopPoints(bottom)
+    orientation = 1.0 if _loopArea(loop, direction) >= 0 else -1.0
+    area = abs(_loopArea(loop, direction))
+    sideFaces = []
+    for i, segment in enumerate(bottom):
+        edges = [bottomEdges[i], topEdges[i]] + [edge for edge in (lateralEdges[i], lateralEdges[(i + 1) % len(segments)]) if edge is not None]
+        points = segment.points + list(reversed(top[i].points))
+        if segment.kind == 'line':
+            normal = _scale(_unit(_cross(_sub(segment.points[-1], segment.points[0]), direction)), orientation)
+            outline = [_Segment('line', [points[0], points[1]]), _Segment('line', [points[1], points[2]]), _Segment('line', [points[2], points[3]]), _Segment('line', [points[3], points[0]])]
+            sideFaces.append(BRepFace('plane', points, normal, edges, _polylineLength(segment.points) * height, outline))
+        else:
+            sideFaces.append(BRepFace('cylinder', points, None, edges, _polylineLength(segment.points) * height))
+    startFace = BRepFace('plane', _loopPoints(bottom), _scale(direction, -1), bottomEdges, area, bottom)
+    endFace = BRepFace('plane', _loopPoints(top), direction, topEdges, area, top)
+    return [startFace], [endFace], sideFaces
+
+# sketches
+
+class SketchPoint(Base):
+    def __init__(self, sketch: 'Sketch', point):
+        self.parentSketch = sketch
+        self._point = point
+        self.isFixed = False
+
+    @property
+    def geometry(self) -> Point3D:
+        return Point3D(*self._point)
+
+    @property
+    def worldGeometry(self) -> Point3D:
+        return Point3D(*self.parentSketch._frame.toModel(self._point))
+
+class SketchCurve(Base):
+    def __init__(self, sketch: 'Sketch'):
+        self.parentSketch = sketch
+        self._isConstruction = False
+        self.isFixed = False
+        self.isReference = False
+
+    @property
+    def isConstruction(self) -> bool:
+        return self._isConstruction
+
+    @isConstruction.setter
+    def isConstruction(self, value: bool):
+        self._isConstruction = value
+        self.parentSketch._changed()
+
+    def deleteMe(self) -> bool:
+        self.parentSketch._curves.remove(self)
+        self.parentSketch._changed()
+        return True
+
+class SketchLine(SketchCurve):
+    def __init__(self, sketch: 'Sketch', startPoint: SketchPoint, endPoint: SketchPoint):
+        super().__init__(sketch)
+        self.startSketchPoint = startPoint
+        self.endSketchPoint = endPoint
+
+    @property
+    def length(self) -> float:
+        return _length(_sub(self.endSketchPoint._point, self.startSketchPoint._point))
+
+    def _segment(self) -> _Segment:
+        return _Segment('line', [self.startSketchPoint._point, self.endSketchPoint._point])
+
+class SketchArc(SketchCurve):
+    def __init__(self, sketch: 'Sketch', centerPoint: SketchPoint, startPoint: SketchPoint, sweep: float):
+        super().__init__(sketch)
+        self.centerSketchPoint = centerPoint
+        self.startSketchPoint = startPoint
+        self._sweep = sweep
+        self.endSketchPoint = SketchPoint(sketch, _arcPoints(centerPoint._point, startPoint._point, sweep)[-1])
+
+    @property
+    def radius(self) -> float:
+        return _length(_sub(self.startSketchPoint._point, self.centerSketchPoint._point))
+
+    @property
+    def length(self) -> float:
+        return self.radius * abs(self._sweep)
+
+    def _segment(self) -> _Segment:
+        points = _arcPoints(self.centerSketchPoint._point, self.startSketchPoint._point, self._sweep)
+        return _Segment('arc', points[:-1] + [self.endSketchPoint._point])
+
+class SketchCircle(SketchCurve):
+    def __init__(self, sketch: 'Sketch', centerPoint: SketchPoint, radius: float):
+        super().__init__(sketch)
+        self.centerSketchPoint = centerPoint
+        self.radius = radius
+
+    @property
+    def length(self) -> float:
+        return 2 * math.pi * self.radius
+
+    def _segment(self) -> _Segment:
+        center = self.centerSketchPoint._point
+        return _Segment('circle', _arcPoints(center, _add(center, (self.radius, 0.0, 0.0)), 2 * math.pi))
+
+class _SketchCurveCollection(_Collection):
+    def __init__(self, sketch: 'Sketch', curveType: type):
+        super().__init__()
+        self._sketch = sketch
+        self._curveType = curveType
+
+    @property
+    def _items(self):
+        return [curve for curve in self._sketch._curves if type(curve) is self._curveType]
+
+    @_items.setter
+    def _items(self, value):
+        pass
+
+    def _add(self, curve: SketchCurve, call: str) -> SketchCurve:
+        self._sketch._curves.append(curve)
+        self._sketch._changed()
+        _record('sketchCurve', call, {'sketch': self._sketch.name})
+        return curve
+
+class SketchLines(_SketchCurveCollection):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__(sketch, SketchLine)
+
+    def addByTwoPoints(self, startPoint, endPoint) -> SketchLine:
+        return self._add(SketchLine(self._sketch, self._sketch._point(startPoint), self._sketch._point(endPoint)), 'sketchLines.addByTwoPoints')
+
+    def addTwoPointRectangle(self, pointOne, pointTwo) -> ObjectCollection:
+        (x1, y1, z), (x2, y2, _) = _tuple(pointOne), _tuple(pointTwo)
+        corners = [SketchPoint(self._sketch, point) for point in ((x1, y1, z), (x2, y1, z), (x2, y2, z), (x1, y2, z))]
+        lines = ObjectCollection()
+        for i in range(4):
+            lines.add(self._add(SketchLine(self._sketch, corners[i], corners[(i + 1) % 4]), 'sketchLines.addTwoPointRectangle'))
+        return lines
+
+    def addCenterPointRectangle(self, centerPoint, cornerPoint) -> ObjectCollection:
+        (cx, cy, cz), (x, y, _) = _tuple(centerPoint), _tuple(cornerPoint)
+        return self.addTwoPointRectangle((2 * cx - x, 2 * cy - y, cz), (x, y, cz))
+
+class SketchCircles(_SketchCurveCollection):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__(sketch, SketchCircle)
+
+    def addByCenterRadius(self, centerPoint, radius: float) -> SketchCircle:
+        return self._add(SketchCircle(self._sketch, self._sketch._point(centerPoint), valueOf(radius)), 'sketchCircles.addByCenterRadius')
+
+class SketchArcs(_SketchCurveCollection):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__(sketch, SketchArc)
+
+    def addByCenterStartSweep(self, centerPoint, startPoint, sweepAngle: float) -> SketchArc:
+        return self._add(SketchArc(self._sketch, self._sketch._point(centerPoint), self._sketch._point(startPoint), valueOf(sweepAngle)), 'sketchArcs.addByCenterStartSweep')
+
+    def addFillet(self, firstEntity: SketchLine, firstEntityPoint, secondEntity: SketchLine, secondEntityPoint, radius: float) -> SketchArc:
+        # trims both lines back from their shared corner like Fusion does
+        def cornerEnd(line: SketchLine, point) -> str:
+            point = _tuple(point)
+            return 'start' if _length(_sub(line.startSketchPoint._point, point)) <= _length(_sub(line.endSketchPoint._point, point)) else 'end'
+
+        def ends(line: SketchLine, end: str) -> tuple:
+            return (line.startSketchPoint, line.endSketchPoint) if end == 'start' else (line.endSketchPoint, line.startSketchPoint)
+
+        firstEnd = cornerEnd(firstEntity, firstEntityPoint)
+        secondEnd = cornerEnd(secondEntity, secondEntityPoint)
+        firstCorner, firstOther = ends(firstEntity, firstEnd)
+        _, secondOther = ends(secondEntity, secondEnd)
+        corner = firstCorner._point
+        incoming = _unit(_sub(corner, firstOther._point))
+        outgoing = _unit(_sub(secondOther._point, corner))
+        trimmedFirst = SketchPoint(self._sketch, _sub(corner, _scale(incoming, radius)))
+        trimmedSecond = SketchPoint(self._sketch, _add(corner, _scale(outgoing, radius)))
+        setattr(firstEntity, firstEnd + 'SketchPoint', trimmedFirst)
+        setattr(secondEntity, secondEnd + 'SketchPoint', trimmedSecond)
+        center = SketchPoint(self._sketch, _add(trimmedFirst._point, _scale(outgoing, radius)))
+        startRadial = _sub(trimmedFirst._point, center._point)
+        endRadial = _sub(trimmedSecond._point, center._point)
+        sweep = math.atan2(_cross(startRadial, endRadial)[2], _dot(startRadial, endRadial))
+        arc = SketchArc(self._sketch, center, trimmedFirst, sweep)
+        arc.endSketchPoint = trimmedSecond
+        return self._add(arc, 'sketchArcs.addFillet')
+
+class SketchCurves(_Collection):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__()
+        self._sketch = sketch
+        self.sketchLines = SketchLines(sketch)
+        self.sketchCircles = SketchCircles(sketch)
+        self.sketchArcs = SketchArcs(sketch)
+
+    @property
+    def _items(self):
+        return list(self._sketch._curves)
+
+    @_items.setter
+    def _items(self, value):
+        pass
+
+class SketchPoints(_Collection):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__()
+        self._sketch = sketch
+
+    def add(self, point) -> SketchPoint:
+        sketchPoint = SketchPoint(self._sketch, _tuple(point))
+        self._items.append(sketchPoint)
+        _record('sketchCurve', 'sketchPoints.add', {'sketch': self._sketch.name})
+        return sketchPoint
+
+class _SketchEntity(Base):
+    def __init__(self, kind: str, call: str):
+        self.kind = kind
+        self.call = call
+        self.isDriving = True
+
+    def deleteMe(self) -> bool:
+        return True
+
+class _SketchCallRecorder(_Collection):
+    """
+    Constraints and dimensions do not move the fake geometry, they are only counted
+    """
+    def __init__(self, sketch: 'Sketch', kind: str):
+        super().__init__()
+        self._sketch = sketch
+        self._kind = kind
+
+    def __getattr__(self, name: str):
+        if not name.startswith('add'):
+            raise AttributeError(name)
+
+        def add(*args, **kwargs):
+            entity = _SketchEntity(self._kind, name)
+            self._items.append(entity)
+            _record(self._kind, name, {'sketch': self._sketch.name})
+            return entity
+
+        return add
+
+class GeometricConstraints(_SketchCallRecorder):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__(sketch, 'sketchConstraint')
+
+class SketchDimensions(_SketchCallRecorder):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__(sketch, 'sketchDimension')
+
+class Profile(Base):
+    def __init__(self, sketch: 'Sketch', segments: list[_Segment]):
+        self.parentSketch = sketch
+        self._segments = segments
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints(point for segment in self._segments for point in segment.points)
+
+    @property
+    def profileLoops(self) -> _Collection:
+        return _Collection([self])
+
+    def _extrusionLoop(self) -> tuple[list[_Segment], tuple]:
+        frame = self.parentSketch._frame
+        return [segment.mapped(frame.toModel) for segment in self._segments], frame.normal
+
+class Profiles(_Collection):
+    pass
+
+def _closedLoops(curves: list[SketchCurve]) -> list[list[_Segment]]:
+    """
+    Groups connected open curves and returns the ones that close into a single loop
+    """
+    segments = [curve._segment() for curve in curves]
+    nodes: list[tuple] = []
+
+    def node(point) -> int:
+        for index, existing in enumerate(nodes):
+            if _length(_sub(existing, point)) <= TOLERANCE:
+                return index
+        nodes.append(point)
+        return len(nodes) - 1
+
+    ends = [(node(segment.points[0]), node(segment.points[-1])) for segment in segments]
+    parents = list(range(len(nodes)))
+
+    def root(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    for start, end in ends:
+        parents[root(start)] = root(end)
+    groups: dict[int, list[int]] = {}
+    for index, (start, _) in enumerate(ends):
+        groups.setdefault(root(start), []).append(index)
+
+    loops = []
+    for members in groups.values():
+        degrees: dict[int, int] = {}
+        for index in members:
+            for end in ends[index]:
+                degrees[end] = degrees.get(end, 0) + 1
+        if any(degree != 2 for degree in degrees.values()):
+            continue
+        # walk the cycle, flipping segments so they run head to tail
+        remaining = list(members[1:])
+        loop = [segments[members[0]]]
+        current = ends[members[0]][1]
+        while remaining:
+            index = next(index for index in remaining if current in ends[index])
+            remaining.remove(index)
+            if ends[index][0] == current:
+                loop.append(segments[index])
+                current = ends[index][1]
+            else:
+                loop.append(segments[index].reversed())
+                current = ends[index][0]
+        loops.append(loop)
+    return loops
+
+class Sketch(Base):
+    def __init__(self, component: 'Component', frame: _Frame, referencePlane):
+        self.parentComponent = component
+        self.referencePlane = referencePlane
+        self._frame = frame
+        self._curves: list[SketchCurve] = []
+        self._profiles: Profiles = None
+        self.name = 'Sketch{}'.format(component.sketches.count + 1)
+        self.isVisible = True
+        self.isComputeDeferred = False
+        self.sketchCurves = SketchCurves(self)
+        self.sketchPoints = SketchPoints(self)
+        self.geometricConstraints = GeometricConstraints(self)
+        self.sketchDimensions = SketchDimensions(self)
+        self.originPoint = SketchPoint(self, (0.0, 0.0, 0.0))
+        self.originPoint.isFixed = True
+
+    def _changed(self):
+        self._profiles = None
+
+    def _point(self, value) -> SketchPoint:
+        return value if isinstance(value, SketchPoint) else SketchPoint(self, _tuple(value))
+
+    def _project(self, face: BRepFace) -> int:
+        for edge in face._edges:
+            points = [self._frame.toSketch(point) for point in edge._points]
+            closed = _length(_sub(points[0], points[-1])) <= TOLERANCE and len(points) > 2
+            if closed:
+                center = tuple(sum(point[i] for point in points[:-1]) / (len(points) - 1) for i in range(3))
+                curve = SketchCircle(self, SketchPoint(self, center), _length(_sub(points[0], center)))
+            elif edge._kind == 'arc' and len(points) > 2:
+                curve = _arcThroughPoints(self, points)
+            else:
+                curve = SketchLine(self, SketchPoint(self, points[0]), SketchPoint(self, points[-1]))
+            curve.isReference = True
+            self._curves.append(curve)
+        return len(face._edges)
+
+    @property
+    def origin(self) -> Point3D:
+        return Point3D(*self._frame.origin)
+
+    @property
+    def xDirection(self) -> Vector3D:
+        return Vector3D(*self._frame.xDirection)
+
+    @property
+    def yDirection(self) -> Vector3D:
+        return Vector3D(*self._frame.yDirection)
+
+    @property
+    def transform(self) -> Matrix3D:
+        return self._frame.matrix()
+
+    @property
+    def profiles(self) -> Profiles:
+        if self._profiles is None:
+            curves = [curve for curve in self._curves if not curve.isConstruction]
+            profiles = [Profile(self, [curve._segment()]) for curve in curves if isinstance(curve, SketchCircle)]
+            profiles += [Profile(self, loop) for loop in _closedLoops([curve for curve in curves if not isinstance(curve, SketchCircle)])]
+            self._profiles = Profiles(profiles)
+        return self._profiles
+
+    def modelToSketchSpace(self, point: Point3D) -> Point3D:
+        return Point3D(*self._frame.toSketch(_tuple(point)))
+
+    def sketchToModelSpace(self, point: Point3D) -> Point3D:
+        return Point3D(*self._frame.toModel(_tuple(point)))
+
+    def offset(self, curves: ObjectCollection, directionPoint: Point3D, offset: float) -> ObjectCollection:
+        # offset of the curves' bounding rectangle, towards the direction point
+        curves = _items(curves)
+        points = [point for curve in curves for point in curve._segment().points]
+        box = BoundingBox3D.fromPoints(points)
+        distance = abs(valueOf(offset)) * (-1 if box.contains(Point3D(*_tuple(directionPoint))) else 1)
+        _record('sketchOffset', 'sketch.offset', {'sketch': self.name, 'offset': valueOf(offset)}, curves=len(curves))
+        lines = self.sketchCurves.sketchLines.addTwoPointRectangle(
+            (box.minPoint.x - distance, box.minPoint.y - distance, 0.0),
+            (box.maxPoint.x + distance, box.maxPoint.y + distance, 0.0),
+        )
+        return lines
+
+    def deleteMe(self) -> bool:
+        self.parentComponent.sketches._items.remove(self)
+        return True
+
+def _arcThroughPoints(sketch: Sketch, points: list) -> SketchCurve:
+    (ax, ay, az), (bx, by, _), (cx, cy, _) = points[0], points[len(points) // 2], points[-1]
+    determinant = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if abs(determinant) < TOLERANCE:
+        return SketchLine(sketch, SketchPoint(sketch, points[0]), SketchPoint(sketch, points[-1]))
+    ux = ((ax * ax + ay * ay) * (by - cy) + (bx * bx + by * by) * (cy - ay) + (cx * cx + cy * cy) * (ay - by)) / determinant
+    uy = ((ax * ax + ay * ay) * (cx - bx) + (bx * bx + by * by) * (ax - cx) + (cx * cx + cy * cy) * (bx - ax)) / determinant
+    center = (ux, uy, az)
+    startRadial = _sub(points[0], center)
+    middleRadial = _sub(points[len(points) // 2], center)
+    endRadial = _sub(points[-1], center)
+    sweep = math.atan2(_cross(startRadial, endRadial)[2], _dot(startRadial, endRadial))
+    if _cross(startRadial, middleRadial)[2] * sweep < 0:
+        sweep = sweep - math.copysign(2 * math.pi, sweep)
+    arc = SketchArc(sketch, SketchPoint(sketch, center), SketchPoint(sketch, points[0]), sweep)
+    arc.endSketchPoint = SketchPoint(sketch, points[-1])
+    return arc
+
+def _frameOf(entity) -> _Frame:
+    if isinstance(entity, (ConstructionPlane, Sketch)):
+        return entity._frame
+    if isinstance(entity, BRepFace):
+        return entity._frame()
+    raise ValueError('Unsupported planar entity {}'.format(type(entity).__name__))
+
+class Sketches(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def _create(self, planarEntity, call: str, includeEdges: bool) -> Sketch:
+        sketch = Sketch(self._component, _frameOf(planarEntity), planarEntity)
+        projectedCurves = sketch._project(planarEntity) if includeEdges and isinstance(planarEntity, BRepFace) else 0
+        self._items.append(sketch)
+        self._component._design._addTimelineItem()
+        _record('sketch', call, {'plane': type(planarEntity).__name__}, projectedCurves=projectedCurves)
+        return sketch
+
+    def add(self, planarEntity, occurrence=None) -> Sketch:
+        return self._create(planarEntity, 'sketches.add', True)
+
+    def addWithoutEdges(self, planarEntity, occurrence=None) -> Sketch:
+        return self._create(planarEntity, 'sketches.addWithoutEdges', False)
+
+# construction geometry
+
+class ConstructionPlane(Base):
+    def __init__(self, component: 'Component', frame: _Frame, name: str):
+        self.parentComponent = component
+        self._frame = frame
+        self.name = name
+        self.isLightBulbOn = True
+        self.isVisible = True
+
+    @property
+    def geometry(self) -> Plane:
+        return Plane(self._frame.origin, self._frame.normal, self._frame.xDirection, self._frame.yDirection)
+
+    def deleteMe(self) -> bool:
+        self.parentComponent.constructionPlanes._items.remove(self)
+        return True
+
+class ConstructionPlaneInput(Base):
+    def __init__(self):
+        self._frame: _Frame = None
+        self._definition = {}
+
+    def setByOffset(self, planarEntity, offset: ValueInput) -> bool:
+        self._frame = _frameOf(planarEntity).offset(valueOf(offset))
+        self._definition = {'type': 'offset', 'offset': valueOf(offset)}
+        return True
+
+    def setByPlane(self, plane: Plane) -> bool:
+        self._frame = _Frame.fromNormal(plane.origin.asTuple(), plane.normal.asTuple())
+        self._definition = {'type': 'plane'}
+        return True
+
+    def setByAngle(self, linearEntity, angle: ValueInput, planarEntity) -> bool:
+        # rotation is not modelled, the plane keeps the reference orientation
+        self._frame = _frameOf(planarEntity)
+        self._definition = {'type': 'angle', 'angle': valueOf(angle)}
+        return True
+
+    def setByDistanceOnPath(self, pathEntity, distance: ValueInput) -> bool:
+        raise NotImplementedError('ConstructionPlaneInput.setByDistanceOnPath is not supported by the recording backend')
+
+class ConstructionPlanes(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, occurrence=None) -> ConstructionPlaneInput:
+        return ConstructionPlaneInput()
+
+    def add(self, input: ConstructionPlaneInput) -> ConstructionPlane:
+        plane = ConstructionPlane(self._component, input._frame, 'Plane{}'.format(self.count + 1))
+        self._items.append(plane)
+        self._component._design._addTimelineItem()
+        _record('constructionPlane', 'constructionPlanes.add', input._definition)
+        return plane
+
+class ConstructionAxis(Base):
+    def __init__(self, component: 'Component', origin, direction, name: str):
+        self.parentComponent = component
+        self._origin = origin
+        self._direction = _unit(direction)
+        self.name = name
+        self.isLightBulbOn = True
+        self.isVisible = True
+
+    @property
+    def geometry(self) -> InfiniteLine3D:
+        return InfiniteLine3D(self._origin, self._direction)
+
+class ConstructionAxisInput(Base):
+    def __init__(self):
+        self._origin = None
+        self._direction = None
+        self._definition = {}
+
+    def setByTwoPlanes(self, planarEntityOne, planarEntityTwo) -> bool:
+        first, second = _frameOf(planarEntityOne), _frameOf(planarEntityTwo)
+        n1, n2 = first.normal, second.normal
+        d1, d2 = _dot(n1, first.origin), _dot(n2, second.origin)
+        dot = _dot(n1, n2)
+        determinant = 1 - dot * dot
+        if determinant < TOLERANCE:
+            raise ValueError('Planes are parallel')
+        self._origin = _add(_scale(n1, (d1 - d2 * dot) / determinant), _scale(n2, (d2 - d1 * dot) / determinant))
+        self._direction = _cross(n1, n2)
+        self._definition = {'type': 'twoPlanes'}
+        return True
+
+    def setByNormalToFaceAtPoint(self, face: BRepFace, pointEntity) -> bool:
+        self._origin = pointEntity.worldGeometry.asTuple() if isinstance(pointEntity, SketchPoint) else _tuple(getattr(pointEntity, 'geometry', pointEntity))
+        self._direction = face._normal
+        self._definition = {'type': 'normalToFaceAtPoint'}
+        return True
+
+    def setByEdge(self, edge: BRepEdge) -> bool:
+        self._origin = edge._points[0]
+        self._direction = _sub(edge._points[-1], edge._points[0])
+        self._definition = {'type': 'edge'}
+        return True
+
+    def setByLine(self, line) -> bool:
+        start, end = line.startSketchPoint.worldGeometry.asTuple(), line.endSketchPoint.worldGeometry.asTuple()
+        self._origin = start
+        self._direction = _sub(end, start)
+        self._definition = {'type': 'line'}
+        return True
+
+class ConstructionAxes(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, occurrence=None) -> ConstructionAxisInput:
+        return ConstructionAxisInput()
+
+    def add(self, input: ConstructionAxisInput) -> ConstructionAxis:
+        axis = ConstructionAxis(self._component, input._origin, input._direction, 'Axis{}'.format(self.count + 1))
+        self._items.append(axis)
+        self._component._design._addTimelineItem()
+        _record('constructionAxis', 'constructionAxes.add', input._definition)
+        return axis
+
+class ConstructionPoint(Base):
+    def __init__(self, point, name: str):
+        self._point = point
+        self.name = name
+
+    @property
+    def geometry(self) -> Point3D:
+        return Point3D(*self._point)
+
+def _axisOf(entity) -> tuple[tuple, tuple]:
+    if isinstance(entity, ConstructionAxis):
+        return entity._origin, entity._direction
+    if isinstance(entity, BRepEdge):
+        return entity._points[0], _unit(_sub(entity._points[-1], entity._points[0]))
+    if isinstance(entity, SketchLine):
+        start, end = entity.startSketchPoint.worldGeometry.asTuple(), entity.endSketchPoint.worldGeometry.asTuple()
+        return start, _unit(_sub(end, start))
+    raise ValueError('Unsupported axis entity {}'.format(type(entity).__name__))
+
+# features
+
+class TimelineObject(Base):
+    def __init__(self, index: int):
+        self.index = index
+        self.isSuppressed = False
+
+class Feature(Base):
+    def __init__(self, component: 'Component', record: recorder.OperationRecord, bodies: list[BRepBody] = None, faces: list[BRepFace] = None):
+        self.parentComponent = component
+        self._record = record
+        self._bodies = bodies or []
+        self._faces = faces or []
+        self.healthState = FeatureHealthStates.HealthyFeatureHealthState
+        self.errorOrWarningMessage = ''
+        self.isSuppressed = False
+        self.timelineObject = TimelineObject(component._design._addTimelineItem())
+        self._name = ''
+        component._features.append(self)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+        self._record.name = value
+
+    @property
+    def bodies(self) -> BRepBodies:
+        return BRepBodies(list(self._bodies))
+
+    @property
+    def faces(self) -> BRepFaces:
+        return BRepFaces(list(self._faces))
+
+    def deleteMe(self) -> bool:
+        self.parentComponent._features.remove(self)
+        return True
+
+class DistanceExtentDefinition(Base):
+    def __init__(self, distance: ValueInput):
+        self.distance = distance
+
+    @staticmethod
+    def create(distance: ValueInput) -> 'DistanceExtentDefinition':
+        return DistanceExtentDefinition(distance)
+
+class OffsetStartDefinition(Base):
+    def __init__(self, offset: ValueInput):
+        self.offset = offset
+
+    @staticmethod
+    def create(offset: ValueInput) -> 'OffsetStartDefinition':
+        return OffsetStartDefinition(offset)
+
+class ProfilePlaneStartDefinition(Base):
+    @staticmethod
+    def create() -> 'ProfilePlaneStartDefinition':
+        return ProfilePlaneStartDefinition()
+
+class ExtrudeFeatureInput(Base):
+    def __init__(self, profile, operation: int):
+        self.profile = profile
+        self.operation = operation
+        self.participantBodies = []
+        self.startExtent = ProfilePlaneStartDefinition()
+        self.isSolid = True
+        self.creationOccurrence = None
+        self._sides: list[tuple[float, int]] = []
+        self._taperAngles: list[float] = []
+
+    def setOneSideExtent(self, extent: DistanceExtentDefinition, direction: int, taperAngle: ValueInput = None) -> bool:
+        self._sides = [(valueOf(extent.distance), direction)]
+        self._taperAngles = [valueOf(taperAngle)] if taperAngle is not None else []
+        return True
+
+    def setTwoSidesExtent(self, sideOneExtent: DistanceExtentDefinition, sideTwoExtent: DistanceExtentDefinition, sideOneTaperAngle: ValueInput = None, sideTwoTaperAngle: ValueInput = None) -> bool:
+        self._sides = [(valueOf(sideOneExtent.distance), ExtentDirections.PositiveExtentDirection), (valueOf(sideTwoExtent.distance), ExtentDirections.NegativeExtentDirection)]
+        self._taperAngles = [valueOf(angle) for angle in (sideOneTaperAngle, sideTwoTaperAngle) if angle is not None]
+        return True
+
+    def setSymmetricExtent(self, distance: ValueInput, isFullLength: bool, taperAngle: ValueInput = None) -> bool:
+        half = valueOf(distance) / 2 if isFullLength else valueOf(distance)
+        self._sides = [(half, ExtentDirections.PositiveExtentDirection), (half, ExtentDirections.NegativeExtentDirection)]
+        return True
+
+    def setDistanceExtent(self, isSymmetric: bool, distance: ValueInput) -> bool:
+        if isSymmetric:
+            return self.setSymmetricExtent(distance, True)
+        self._sides = [(valueOf(distance), ExtentDirections.PositiveExtentDirection)]
+        return True
+
+    def _span(self, normal) -> tuple[tuple, tuple]:
+        """
+        Returns (start offset, extent vector) along the profile normal
+        """
+        startOffset = valueOf(self.startExtent.offset) if isinstance(self.startExtent, OffsetStartDefinition) else 0.0
+        low, high = 0.0, 0.0
+        for distance, direction in self._sides or [(0.0, ExtentDirections.PositiveExtentDirection)]:
+            if direction == ExtentDirections.NegativeExtentDirection:
+                distance = -distance
+            low, high = min(low, distance), max(high, distance)
+            if len(self._sides) == 1:
+                low, high = 0.0, distance
+        return _scale(normal, startOffset + low), _scale(normal, high - low)
+
+def _profileHoles(profile: Profile) -> list[list[_Segment]]:
+    """
+    Loops of the same sketch inside the profile, Fusion leaves them out of the profile region
+    """
+    outline = _loopPoints(profile._segments)
+    frame = profile.parentSketch._frame
+    holes = []
+    for other in profile.parentSketch.profiles:
+        points = _loopPoints(other._segments)
+        if other is not profile and abs(_loopArea(points, (0.0, 0.0, 1.0))) < abs(_loopArea(outline, (0.0, 0.0, 1.0))) and all(_isInsidePolygon(outline, point[0], point[1]) for point in points):
+            holes.append([segment.mapped(frame.toModel) for segment in other._segments])
+    return holes
+
+def _prismSolid(segments: list[_Segment], normal, start, extent, holes: list[list[_Segment]], face: BRepFace) -> '_PrismShape':
+    frame = _Frame.fromNormal(segments[0].points[0], normal)
+    loops = [[frame.toSketch(point)[:2] for point in _loopPoints(loop)] for loop in [segments] + holes]
+    low, high = sorted((_dot(start, frame.normal), _dot(_add(start, extent), frame.normal)))
+    section = face.body._solid if face is not None and face.body is not None else None
+    if face is not None and section is None:
+        return None
+    return _PrismShape(frame, loops, low, high, section)
+
+def _combinedSolid(target: '_Shape', tool: '_Shape', operation: int) -> '_Shape':
+    if target is None or tool is None:
+        return None
+    booleanType = {
+        FeatureOperations.JoinFeatureOperation: BooleanTypes.UnionBooleanType,
+        FeatureOperations.CutFeatureOperation: BooleanTypes.DifferenceBooleanType,
+    }.get(operation, BooleanTypes.IntersectionBooleanType)
+    return _BooleanShape(booleanType, target, tool)
+
+def _profileLoops(profile) -> list[tuple[list[_Segment], tuple, BRepFace]]:
+    loops = []
+    for item in _items(profile):
+        if isinstance(item, Profile):
+            segments, normal = item._extrusionLoop()
+            loops.append((segments, normal, None))
+        elif isinstance(item, BRepFace) and item._segments:
+            loops.append((item._segments, item._normal, item))
+        else:
+            raise ValueError('Unsupported extrude profile {}'.format(type(item).__name__))
+    return loops
+
+class ExtrudeFeature(Feature):
+    def __init__(self, component: 'Component', record: recorder.OperationRecord, bodies: list[BRepBody], startFaces: list[BRepFace], endFaces: list[BRepFace], sideFaces: list[BRepFace]):
+        super().__init__(component, record, bodies, startFaces + endFaces + sideFaces)
+        self._startFaces = startFaces
+        self._endFaces = endFaces
+        self._sideFaces = sideFaces
+
+    @property
+    def startFaces(self) -> BRepFaces:
+        return BRepFaces(list(self._startFaces))
+
+    @property
+    def endFaces(self) -> BRepFaces:
+        return BRepFaces(list(self._endFaces))
+
+    @property
+    def sideFaces(self) -> BRepFaces:
+        return BRepFaces(list(self._sideFaces))
+
+class ExtrudeFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, profile, operation: int) -> ExtrudeFeatureInput:
+        return ExtrudeFeatureInput(profile, operation)
+
+    def addSimple(self, profile, distance: ValueInput, operation: int) -> ExtrudeFeature:
+        input = self.createInput(profile, operation)
+        input.setDistanceExtent(False, distance)
+        return self._add(input, 'extrudeFeatures.addSimple')
+
+    def add(self, input: ExtrudeFeatureInput) -> ExtrudeFeature:
+        return self._add(input, 'extrudeFeatures.add')
+
+    def _add(self, input: ExtrudeFeatureInput, call: str) -> ExtrudeFeature:
+        component = self._component
+        loops = _profileLoops(input.profile)
+        operation = input.operation
+        participants = [body for body in _items(input.participantBodies) if body in component._bodies]
+        prisms = []
+        for item, (segments, normal, face) in zip(_items(input.profile), loops):
+            start, extent = input._span(normal)
+            holes = _profileHoles(item) if isinstance(item, Profile) else []
+            prisms.append((_buildPrism(segments, start, extent), face, _prismSolid(segments, normal, start, extent, holes, face)))
+
+        bodies: list[BRepBody] = []
+        if operation in (FeatureOperations.NewBodyFeatureOperation, FeatureOperations.NewComponentFeatureOperation):
+            for (startFaces, endFaces, sideFaces), _, solid in prisms:
+                body = component._addBody(BRepBody(component, startFaces + endFaces + sideFaces))
+                body._solid = solid
+                bodies.append(body)
+        elif operation == FeatureOperations.JoinFeatureOperation:
+            for (startFaces, endFaces, sideFaces), face, solid in prisms:
+                target = participants[0] if participants else (face.body if face is not None and face.body in component._bodies else None)
+                if target is None:
+                    target = component._addBody(BRepBody(component))
+                    target._solid = solid
+                else:
+                    target._solid = _combinedSolid(target._solid, solid, operation)
+                target._addFaces(startFaces + endFaces + sideFaces)
+                if target not in bodies:
+                    bodies.append(target)
+        elif operation == FeatureOperations.CutFeatureOperation:
+            targets = participants or list(component._bodies)
+            for (startFaces, endFaces, sideFaces), _, solid in prisms:
+                toolFaces = startFaces + endFaces + sideFaces
+                for index, target in enumerate(targets):
+                    target._addFaces(toolFaces if index == 0 else _copyFaces(toolFaces))
+                    target._solid = _combinedSolid(target._solid, solid, operation)
+            bodies = targets
+        else:
+            bodies = participants or list(component._bodies)
+            for body in bodies:
+                body._touch()
+                for _, _, solid in prisms:
+                    body._solid = _combinedSolid(body._solid, solid, operation)
+
+        record = _record(
+            'extrude',
+            call,
+            {
+                'operation': _OPERATION_NAMES.get(operation, operation),
+                'sides': [distance for distance, _ in input._sides],
+                'taperAngles': input._taperAngles,
+                'startOffset': valueOf(input.startExtent.offset) if isinstance(input.startExtent, OffsetStartDefinition) else 0.0,
+            },
+            profiles=len(loops),
+            profileCurves=sum(len(segments) for segments, _, _ in loops),
+            participantBodies=len(participants) if operation not in (FeatureOperations.NewBodyFeatureOperation, FeatureOperations.NewComponentFeatureOperation) else 0,
+            participantFaces=sum(len(body._faces) for body in participants),
+        )
+        (startFaces, endFaces, sideFaces), _, _ = prisms[0] if prisms else (([], [], []), None, None)
+        feature = ExtrudeFeature(component, record, bodies, startFaces, endFaces, sideFaces)
+        self._items.append(feature)
+        return feature
+
+class FilletEdgeSetInputs(_Collection):
+    def addConstantRadiusEdgeSet(self, edges, radius: ValueInput, isTangentChain: bool):
+        self._items.append((_items(edges), valueOf(radius), isTangentChain))
+        return self._items[-1]
+
+    def addChordLengthEdgeSet(self, edges, chordLength: ValueInput, isTangentChain: bool):
+        return self.addConstantRadiusEdgeSet(edges, chordLength, isTangentChain)
+
+class FilletFeatureInput(Base):
+    def __init__(self):
+        self.isRollingBallCorner = True
+        self.isTangentChain = True
+        self.isG2 = False
+        self.edgeSetInputs = FilletEdgeSetInputs()
+
+    def addConstantRadiusEdgeSet(self, edges, radius: ValueInput, isTangentChain: bool) -> bool:
+        self.edgeSetInputs.addConstantRadiusEdgeSet(edges, radius, isTangentChain)
+        return True
+
+def _expandEdges(edgeSets) -> list[BRepEdge]:
+    edges: dict[int, BRepEdge] = {}
+    for items, _, isTangentChain in edgeSets:
+        for edge in items:
+            for item in (edge.tangentiallyConnectedEdges if isTangentChain else [edge]):
+                edges[id(item)] = item
+    return list(edges.values())
+
+def _bodiesOfEdges(edges: list[BRepEdge]) -> list[BRepBody]:
+    bodies: dict[int, BRepBody] = {}
+    for edge in edges:
+        if edge.body is not None:
+            bodies[id(edge.body)] = edge.body
+    return list(bodies.values())
+
+def _blendSolid(edge: BRepEdge, size: float, isRound: bool):
+    # the material goes off the body solid, measured from a planar face the edge bounds
+    body = edge.body
+    face = next((face for face in edge._faces if face._kind == 'plane'), None)
+    if body is None or body._solid is None or face is None or size <= 0:
+        return
+    body._solid = _BooleanShape(BooleanTypes.DifferenceBooleanType, body._solid, _EdgeBlendShape(edge._points, face._points[0], face._normal, size, isRound))
+
+def _edgeFeature(component: 'Component', kind: str, call: str, edgeSets, featureType: type) -> Feature:
+    edges = _expandEdges(edgeSets)
+    bodies = _bodiesOfEdges(edges)
+    for body in bodies:
+        body._touch()
+    for edgeSet in edgeSets:
+        for edge in _expandEdges([edgeSet]):
+            _blendSolid(edge, edgeSet[1], kind == 'fillet')
+    record = _record(
+        kind,
+        call,
+        {'sizes': [size for _, size, _ in edgeSets], 'tangentChains': [isTangentChain for _, _, isTangentChain in edgeSets]},
+        edges=len(edges),
+        bodyFaces=sum(len(body._faces) for body in bodies),
+    )
+    return featureType(component, record, bodies)
+
+class FilletFeature(Feature):
+    pass
+
+class FilletFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self) -> FilletFeatureInput:
+        return FilletFeatureInput()
+
+    def add(self, input: FilletFeatureInput) -> FilletFeature:
+        feature = _edgeFeature(self._component, 'fillet', 'filletFeatures.add', list(input.edgeSetInputs), FilletFeature)
+        self._items.append(feature)
+        return feature
+
+class ChamferEdgeSets(_Collection):
+    def addEqualDistanceChamferEdgeSet(self, edges, distance: ValueInput, isTangentChain: bool):
+        self._items.append((_items(edges), valueOf(distance), isTangentChain))
+        return self._items[-1]
+
+    def addTwoDistancesChamferEdgeSet(self, edges, distanceOne: ValueInput, distanceTwo: ValueInput, isFlipped: bool, isTangentChain: bool):
+        self._items.append((_items(edges), valueOf(distanceOne), isTangentChain))
+        return self._items[-1]
+
+    def addDistanceAndAngleChamferEdgeSet(self, edges, distance: ValueInput, angle: ValueInput, isFlipped: bool, isTangentChain: bool):
+        self._items.append((_items(edges), valueOf(distance), isTangentChain))
+        return self._items[-1]
+
+class ChamferFeatureInput(Base):
+    def __init__(self, edges=None, isTangentChain: bool = True):
+        self.chamferEdgeSets = ChamferEdgeSets()
+        self._edges = _items(edges)
+        self._isTangentChain = isTangentChain
+
+    def setToEqualDistance(self, distance: ValueInput) -> bool:
+        self.chamferEdgeSets.addEqualDistanceChamferEdgeSet(self._edges, distance, self._isTangentChain)
+        return True
+
+class ChamferFeature(Feature):
+    pass
+
+class ChamferFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, edges, isTangentChain: bool) -> ChamferFeatureInput:
+        return ChamferFeatureInput(edges, isTangentChain)
+
+    def createInput2(self) -> ChamferFeatureInput:
+        return ChamferFeatureInput()
+
+    def add(self, input: ChamferFeatureInput) -> ChamferFeature:
+        feature = _edgeFeature(self._component, 'chamfer', 'chamferFeatures.add', list(input.chamferEdgeSets), ChamferFeature)
+        self._items.append(feature)
+        return feature
+
+class CombineFeatureInput(Base):
+    def __init__(self, targetBody: BRepBody, toolBodies):
+        self.targetBody = targetBody
+        self.toolBodies = toolBodies
+        self.operation = FeatureOperations.JoinFeatureOperation
+        self.isKeepToolBodies = False
+        self.isNewComponent = False
+
+class CombineFeature(Feature):
+    pass
+
+class CombineFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, targetBody: BRepBody, toolBodies) -> CombineFeatureInput:
+        return CombineFeatureInput(targetBody, toolBodies)
+
+    def add(self, input: CombineFeatureInput) -> CombineFeature:
+        component = self._component
+        target = input.targetBody
+        tools = [tool for tool in _items(input.toolBodies) if tool is not target]
+        record = _record(
+            'combine',
+            'combineFeatures.add',
+            {'operation': _OPERATION_NAMES.get(input.operation, input.operation), 'isKeepToolBodies': input.isKeepToolBodies},
+            toolBodies=len(tools),
+            toolFaces=sum(len(tool._faces) for tool in tools),
+            targetFaces=len(target._faces),
+        )
+        for tool in tools:
+            target._solid = _combinedSolid(target._solid, tool._solid, input.operation)
+            if input.operation == FeatureOperations.IntersectFeatureOperation:
+                continue
+            if input.isKeepToolBodies or input.operation == FeatureOperations.CutFeatureOperation:
+                target._addFaces(_copyFaces(tool._faces))
+            else:
+                target._addFaces(tool._faces)
+                tool._faces = []
+        target._touch()
+        if not input.isKeepToolBodies:
+            for tool in tools:
+                component._removeBody(tool)
+        feature = CombineFeature(component, record, [target])
+        self._items.append(feature)
+        return feature
+
+def _patternBodies(component: 'Component', entities, matrices: list[Matrix3D]) -> list[BRepBody]:
+    bodies = []
+    for matrix in matrices:
+        for entity in _items(entities):
+            if isinstance(entity, BRepBody):
+                body = component._addBody(BRepBody(component, _copyFaces(entity._faces, matrix)))
+                body._solid = entity._solid.transformed(matrix) if entity._solid is not None else None
+                bodies.append(body)
+    return bodies
+
+def _translation(vector) -> Matrix3D:
+    matrix = Matrix3D()
+    matrix.translation = Vector3D(*vector)
+    return matrix
+
+def _patternOffsets(quantity: int, distance: float, distanceType: int, isSymmetric: bool) -> list[float]:
+    step = distance / max(1, quantity - 1) if distanceType == PatternDistanceType.ExtentPatternDistanceType else distance
+    shift = -step * (quantity - 1) / 2 if isSymmetric else 0.0
+    return [shift + step * index for index in range(quantity)]
+
+class RectangularPatternFeatureInput(Base):
+    def __init__(self, inputEntities, directionOneEntity, quantityOne: ValueInput, distanceOne: ValueInput, patternDistanceType: int):
+        self.inputEntities = inputEntities
+        self.directionOneEntity = directionOneEntity
+        self.quantityOne = quantityOne
+        self.distanceOne = distanceOne
+        self.patternDistanceType = patternDistanceType
+        self.directionTwoEntity = None
+        self.quantityTwo = ValueInput.createByReal(1)
+        self.distanceTwo = ValueInput.createByReal(0)
+        self.isSymmetricInDirectionOne = False
+        self.isSymmetricInDirectionTwo = False
+        self.patternComputeOption = PatternComputeOptions.OptimizedPatternCompute
+
+class RectangularPatternFeature(Feature):
+    pass
+
+class RectangularPatternFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, inputEntities, directionOneEntity, quantityOne: ValueInput, distanceOne: ValueInput, patternDistanceType: int) -> RectangularPatternFeatureInput:
+        return RectangularPatternFeatureInput(inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType)
+
+    def add(self, input: RectangularPatternFeatureInput) -> RectangularPatternFeature:
+        quantityOne = int(round(valueOf(input.quantityOne)))
+        quantityTwo = int(round(valueOf(input.quantityTwo))) if input.directionTwoEntity is not None else 1
+        _, directionOne = _axisOf(input.directionOneEntity)
+        _, directionTwo = _axisOf(input.directionTwoEntity) if input.directionTwoEntity is not None else (None, (0.0, 0.0, 0.0))
+        offsetsOne = _patternOffsets(quantityOne, valueOf(input.distanceOne), input.patternDistanceType, input.isSymmetricInDirectionOne)
+        offsetsTwo = _patternOffsets(quantityTwo, valueOf(input.distanceTwo), input.patternDistanceType, input.isSymmetricInDirectionTwo)
+        matrices = [
+            _translation(_add(_scale(directionOne, offsetOne), _scale(directionTwo, offsetTwo)))
+            for i, offsetOne in enumerate(offsetsOne)
+            for j, offsetTwo in enumerate(offsetsTwo)
+            if (i, j) != (0, 0)
+        ]
+        bodies = _patternBodies(self._component, input.inputEntities, matrices)
+        record = _record(
+            'rectangularPattern',
+            'rectangularPatternFeatures.add',
+            {'quantities': [quantityOne, quantityTwo], 'distances': [valueOf(input.distanceOne), valueOf(input.distanceTwo)]},
+            entities=len(_items(input.inputEntities)),
+            instances=len(bodies),
+            instanceFaces=sum(len(body._faces) for body in bodies),
+        )
+        feature = RectangularPatternFeature(self._component, record, bodies)
+        self._items.append(feature)
+        return feature
+
+class CircularPatternFeatureInput(Base):
+    def __init__(self, inputEntities, axis):
+        self.inputEntities = inputEntities
+        self.axis = axis
+        self.quantity = ValueInput.createByReal(3)
+        self.totalAngle = ValueInput.createByString('360 deg')
+        self.isSymmetric = False
+        self.patternComputeOption = PatternComputeOptions.OptimizedPatternCompute
+
+class CircularPatternFeature(Feature):
+    pass
+
+class CircularPatternFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, inputEntities, axis) -> CircularPatternFeatureInput:
+        return CircularPatternFeatureInput(inputEntities, axis)
+
+    def add(self, input: CircularPatternFeatureInput) -> CircularPatternFeature:
+        quantity = int(round(valueOf(input.quantity)))
+        totalAngle = valueOf(input.totalAngle)
+        isFullCircle = math.isclose(abs(totalAngle), 2 * math.pi, abs_tol=TOLERANCE)
+        step = totalAngle / quantity if isFullCircle else totalAngle / max(1, quantity - 1)
+        origin, direction = _axisOf(input.axis)
+        matrices = []
+        for index in range(1, quantity):
+            matrix = Matrix3D()
+            matrix.setToRotation(step * index, Vector3D(*direction), Point3D(*origin))
+            matrices.append(matrix)
+        bodies = _patternBodies(self._component, input.inputEntities, matrices)
+        record = _record(
+            'circularPattern',
+            'circularPatternFeatures.add',
+            {'quantity': quantity, 'totalAngle': totalAngle},
+            entities=len(_items(input.inputEntities)),
+            instances=len(bodies),
+            instanceFaces=sum(len(body._faces) for body in bodies),
+        )
+        feature = CircularPatternFeature(self._component, record, bodies)
+        self._items.append(feature)
+        return feature
+
+class MirrorFeatureInput(Base):
+    def __init__(self, inputEntities, mirrorPlane):
+        self.inputEntities = inputEntities
+        self.mirrorPlane = mirrorPlane
+        self.patternComputeOption = PatternComputeOptions.OptimizedPatternCompute
+
+class MirrorFeature(Feature):
+    pass
+
+class MirrorFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, inputEntities, mirrorPlane) -> MirrorFeatureInput:
+        return MirrorFeatureInput(inputEntities, mirrorPlane)
+
+    def add(self, input: MirrorFeatureInput) -> MirrorFeature:
+        frame = _frameOf(input.mirrorPlane)
+        n, d = frame.normal, _dot(frame.normal, frame.origin)
+        rows = [[(1.0 if i == j else 0.0) - 2 * n[i] * n[j] for j in range(3)] + [2 * d * n[i]] for i in range(3)]
+        bodies = _patternBodies(self._component, input.inputEntities, [Matrix3D(rows + [[0.0, 0.0, 0.0, 1.0]])])
+        record = _record('mirror', 'mirrorFeatures.add', {}, bodies=len(bodies))
+        feature = MirrorFeature(self._component, record, bodies)
+        self._items.append(feature)
+        return feature
+
+class MoveFeatureInput(Base):
+    def __init__(self, inputEntities, transform: Matrix3D = None):
+        self.inputEntities = inputEntities
+        self.transform = transform or Matrix3D()
+
+    def defineAsFreeMove(self, transform: Matrix3D) -> bool:
+        self.transform = transform
+        return True
+
+    def defineAsTranslateXYZ(self, xDistance: ValueInput, yDistance: ValueInput, zDistance: ValueInput, isDesignSpace: bool) -> bool:
+        self.transform = _translation((valueOf(xDistance), valueOf(yDistance), valueOf(zDistance)))
+        return True
+
+class MoveFeature(Feature):
+    pass
+
+class MoveFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, inputEntities, transform: Matrix3D) -> MoveFeatureInput:
+        return MoveFeatureInput(inputEntities, transform)
+
+    def createInput2(self, inputEntities) -> MoveFeatureInput:
+        return MoveFeatureInput(inputEntities)
+
+    def add(self, input: MoveFeatureInput) -> MoveFeature:
+        bodies = [entity for entity in _items(input.inputEntities) if isinstance(entity, BRepBody)]
+        for body in bodies:
+            body._transform(input.transform)
+        record = _record('move', 'moveFeatures.add', {}, bodies=len(bodies))
+        feature = MoveFeature(self._component, record, bodies)
+        self._items.append(feature)
+        return feature
+
+class LoftSections(_Collection):
+    def add(self, entity):
+        self._items.append(entity)
+        return entity
+
+class LoftFeatureInput(Base):
+    def __init__(self, operation: int):
+        self.operation = operation
+        self.loftSections = LoftSections()
+        self.isSolid = True
+        self.isClosed = False
+
+class LoftFeature(Feature):
+    pass
+
+class LoftFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, operation: int) -> LoftFeatureInput:
+        return LoftFeatureInput(operation)
+
+    def add(self, input: LoftFeatureInput) -> LoftFeature:
+        sections = list(input.loftSections)
+        loops = [_profileLoops(section)[0][0] for section in sections]
+        first, last = loops[0], loops[-1]
+        firstPoints, lastPoints = _loopPoints(first), _loopPoints(last)
+        center = lambda points: tuple(sum(point[i] for point in points) / len(points) for i in range(3))
+        extent = _sub(center(lastPoints), center(firstPoints))
+        # sides pair up segment by segment when the sections match, otherwise the first section is swept
+        topSegments = last if len(first) == len(last) and all(a.kind == b.kind and len(a.points) == len(b.points) for a, b in zip(first, last)) else None
+        startFaces, endFaces, sideFaces = _buildPrism(first, (0.0, 0.0, 0.0), extent, topSegments)
+        bodies = [self._component._addBody(BRepBody(self._component, startFaces + endFaces + sideFaces))]
+        record = _record('loft', 'loftFeatures.add', {'operation': _OPERATION_NAMES.get(input.operation, input.operation)}, sections=len(sections))
+        feature = LoftFeature(self._component, record, bodies, startFaces + endFaces + sideFaces)
+        self._items.append(feature)
+        return feature
+
+class ShellFeatureInput(Base):
+    def __init__(self, inputEntities, isTangentChain: bool):
+        self.inputEntities = inputEntities
+        self.isTangentChain = isTangentChain
+        self.insideThickness = ValueInput.createByReal(0)
+        self.outsideThickness = ValueInput.createByReal(0)
+
+class ShellFeature(Feature):
+    pass
+
+class ShellFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, inputEntities, isTangentChain: bool = True) -> ShellFeatureInput:
+        return ShellFeatureInput(inputEntities, isTangentChain)
+
+    def add(self, input: ShellFeatureInput) -> ShellFeature:
+        entities = _items(input.inputEntities)
+        bodies = []
+        for entity in entities:
+            body = entity if isinstance(entity, BRepBody) else entity.body
+            if body not in bodies:
+                bodies.append(body)
+        for body in bodies:
+            body._touch()
+            body._solid = None
+        record = _record(
+            'shell',
+            'shellFeatures.add',
+            {'insideThickness': valueOf(input.insideThickness), 'outsideThickness': valueOf(input.outsideThickness)},
+            bodyFaces=sum(len(body._faces) for body in bodies),
+        )
+        feature = ShellFeature(self._component, record, bodies)
+        self._items.append(feature)
+        return feature
+
+class SplitBodyFeatureInput(Base):
+    def __init__(self, splitBodies, splittingTool, isSplittingToolExtended: bool):
+        self.splitBodies = splitBodies
+        self.splittingTool = splittingTool
+        self.isSplittingToolExtended = isSplittingToolExtended
+
+class SplitBodyFeature(Feature):
+    pass
+
+class SplitBodyFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, splitBodies, splittingTool, isSplittingToolExtended: bool) -> SplitBodyFeatureInput:
+        return SplitBodyFeatureInput(splitBodies, splittingTool, isSplittingToolExtended)
+
+    def add(self, input: SplitBodyFeatureInput) -> SplitBodyFeature:
+        frame = _frameOf(input.splittingTool)
+        capSegments = input.splittingTool._segments if isinstance(input.splittingTool, BRepFace) else None
+        resultBodies = []
+        bodyFaces = 0
+        for body in _items(input.splitBodies):
+            bodyFaces += len(body._faces)
+            below, above = [], []
+            for face in body._faces:
+                distances = [_dot(_sub(point, frame.origin), frame.normal) for point in face._points]
+                if max(distances) <= TOLERANCE:
+                    below.append(face)
+                elif min(distances) >= -TOLERANCE:
+                    above.append(face)
+                else:
+                    below.append(face)
+                    above.extend(_copyFaces([face]))
+            if capSegments:
+                # both halves get the splitting face as their new cap
+                below.extend(_copyFaces([input.splittingTool]))
+                above.extend(_copyFaces([input.splittingTool]))
+            body._faces = []
+            body._addFaces(below)
+            body._solid = None
+            resultBodies.append(body)
+            if above:
+                resultBodies.append(self._component._addBody(BRepBody(self._component, above)))
+        record = _record('splitBody', 'splitBodyFeatures.add', {'isSplittingToolExtended': input.isSplittingToolExtended}, bodyFaces=bodyFaces)
+        feature = SplitBodyFeature(self._component, record, resultBodies)
+        self._items.append(feature)
+        return feature
+
+class RemoveFeature(Feature):
+    pass
+
+class RemoveFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def add(self, itemToRemove) -> RemoveFeature:
+        if isinstance(itemToRemove, BRepBody):
+            self._component._removeBody(itemToRemove)
+        record = _record('remove', 'removeFeatures.add', {'entity': type(itemToRemove).__name__})
+        feature = RemoveFeature(self._component, record)
+        self._items.append(feature)
+        return feature
+
+class BaseFeature(Feature):
+    def __init__(self, component: 'Component', record: recorder.OperationRecord):
+        super().__init__(component, record)
+        self.isEditing = False
+
+    def startEdit(self) -> bool:
+        self.isEditing = True
+        return True
+
+    def finishEdit(self) -> bool:
+        self.isEditing = False
+        return True
+
+class BaseFeatures(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+
+    def add(self) -> BaseFeature:
+        feature = BaseFeature(self._component, _record('feature', 'baseFeatures.add'))
+        self._items.append(feature)
+        return feature
+
+class _GenericFeatureInput(Base):
+    def __init__(self, call: str, args: tuple):
+        self.call = call
+        self.args = args
+
+class _GenericFeatures(_Collection):
+    """
+    Feature collections without a geometric model, calls are recorded and produce no bodies
+    """
+    def __init__(self, component: 'Component', name: str):
+        super().__init__()
+        self._component = component
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        if not attribute.startswith('createInput'):
+            raise AttributeError(attribute)
+        return lambda *args, **kwargs: _GenericFeatureInput(attribute, args)
+
+    def add(self, input, *args) -> Feature:
+        record = _record('feature', '{}.add'.format(self._name))
+        feature = Feature(self._component, record)
+        self._items.append(feature)
+        return feature
+
+class Features(_Collection):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+        self.extrudeFeatures = ExtrudeFeatures(component)
+        self.filletFeatures = FilletFeatures(component)
+        self.chamferFeatures = ChamferFeatures(component)
+        self.combineFeatures = CombineFeatures(component)
+        self.rectangularPatternFeatures = RectangularPatternFeatures(component)
+        self.circularPatternFeatures = CircularPatternFeatures(component)
+        self.mirrorFeatures = MirrorFeatures(component)
+        self.moveFeatures = MoveFeatures(component)
+        self.loftFeatures = LoftFeatures(component)
+        self.shellFeatures = ShellFeatures(component)
+        self.splitBodyFeatures = SplitBodyFeatures(component)
+        self.removeFeatures = RemoveFeatures(component)
+        self.baseFeatures = BaseFeatures(component)
+
+    @property
+    def _items(self):
+        return list(self._component._features)
+
+    @_items.setter
+    def _items(self, value):
+        pass
+
+    def __getattr__(self, name: str):
+        if not name.endswith('Features'):
+            raise AttributeError(name)
+        collection = _GenericFeatures(self._component, name)
+        setattr(self, name, collection)
+        return collection
+
+# temporary bodies
+
+class _Shape():
+    """
+    Solid the temporary BRep manager works on, kept as a CSG tree so point membership is exact
+    """
+    def contains(self, point) -> bool:
+        raise NotImplementedError()
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        raise NotImplementedError()
+
+    def transformed(self, matrix: Matrix3D) -> '_Shape':
+        raise NotImplementedError()
+
+    def faceCount(self) -> int:
+        raise NotImplementedError()
+
+class _BoxShape(_Shape):
+    def __init__(self, center, axes: list, halfSizes: list[float]):
+        self.center = center
+        self.axes = axes
+        self.halfSizes = halfSizes
+
+    def contains(self, point) -> bool:
+        offset = _sub(point, self.center)
+        return all(abs(_dot(offset, axis)) <= half + TOLERANCE for axis, half in zip(self.axes, self.halfSizes))
+
+    def corners(self) -> list:
+        corners = []
+        for signs in [(i, j, k) for i in (-1, 1) for j in (-1, 1) for k in (-1, 1)]:
+            corner = self.center
+            for sign, axis, half in zip(signs, self.axes, self.halfSizes):
+                corner = _add(corner, _scale(axis, sign * half))
+            corners.append(corner)
+        return corners
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        xs, ys, zs = zip(*self.corners())
+        return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+
+    def transformed(self, matrix: Matrix3D) -> '_BoxShape':
+        return _BoxShape(matrix.transformPoint(self.center), [_unit(matrix.transformVector(axis)) for axis in self.axes], list(self.halfSizes))
+
+    def faceCount(self) -> int:
+        return 6
+
+class _ConeShape(_Shape):
+    def __init__(self, start, startRadius: float, end, endRadius: float):
+        self.start = start
+        self.startRadius = startRadius
+        self.end = end
+        self.endRadius = endRadius
+
+    def contains(self, point) -> bool:
+        axis = _sub(self.end, self.start)
+        height = _length(axis)
+        if height <= TOLERANCE:
+            return False
+        direction = _scale(axis, 1 / height)
+        along = _dot(_sub(point, self.start), direction)
+        if along < -TOLERANCE or along > height + TOLERANCE:
+            return False
+        radius = self.startRadius + (self.endRadius - self.startRadius) * min(1.0, max(0.0, along / height))
+        return _length(_sub(_sub(point, self.start), _scale(direction, along))) <= radius + TOLERANCE
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        radius = max(self.startRadius, self.endRadius)
+        return (
+            tuple(min(a, b) - radius for a, b in zip(self.start, self.end)),
+            tuple(max(a, b) + radius for a, b in zip(self.start, self.end)),
+        )
+
+    def transformed(self, matrix: Matrix3D) -> '_ConeShape':
+        return _ConeShape(matrix.transformPoint(self.start), self.startRadius, matrix.transformPoint(self.end), self.endRadius)
+
+    def faceCount(self) -> int:
+        return 3
+
+class _SphereShape(_Shape):
+    def __init__(self, center, radius: float):
+        self.center = center
+        self.radius = radius
+
+    def contains(self, point) -> bool:
+        return _length(_sub(point, self.center)) <= self.radius + TOLERANCE
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        return _sub(self.center, (self.radius,) * 3), _add(self.center, (self.radius,) * 3)
+
+    def transformed(self, matrix: Matrix3D) -> '_SphereShape':
+        return _SphereShape(matrix.transformPoint(self.center), self.radius)
+
+    def faceCount(self) -> int:
+        return 1
+
+class _PrismShape(_Shape):
+    """
+    Loops in frame coordinates swept along the frame normal from low to high, loops after the first are holes.
+    Extrusions of a body face are limited to the section of the body solid below the face
+    """
+    def __init__(self, frame: _Frame, loops: list[list[tuple]], low: float, high: float, section: _Shape = None):
+        self.frame = frame
+        self.loops = loops
+        self.low = low
+        self.high = high
+        self.section = section
+
+    def contains(self, point) -> bool:
+        x, y, z = self.frame.toSketch(point)
+        if z < self.low - TOLERANCE or z > self.high + TOLERANCE:
+            return False
+        if sum(1 for loop in self.loops if _isInsidePolygon(loop, x, y)) % 2 == 0:
+            return False
+        return self.section is None or self.section.contains(self.frame.toModel((x, y, -SECTION_DEPTH)))
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        points = [self.frame.toModel((x, y, z)) for x, y in self.loops[0] for z in (self.low, self.high)]
+        return tuple(map(min, *points)), tuple(map(max, *points))
+
+    def remainingBounds(self, targetMin: tuple, targetMax: tuple) -> tuple[tuple, tuple]:
+        """
+        Bounds of what is left of the target after cutting the prism off it. Only narrowed for axis aligned
+        rectangular outlines covering the target across: without holes they cut off a slab like a box, with holes
+        running through the whole target only the holes can keep anything
+        """
+        outline = self.loops[0]
+        xs, ys = [x for x, _ in outline], [y for _, y in outline]
+        isRectangle = abs(abs(_loopArea([(x, y, 0.0) for x, y in outline], (0.0, 0.0, 1.0))) - (max(xs) - min(xs)) * (max(ys) - min(ys))) <= TOLERANCE
+        isAligned = all(max(abs(value) for value in axis) > 1 - TOLERANCE for axis in (self.frame.xDirection, self.frame.yDirection, self.frame.normal))
+        if self.section is not None or not isRectangle or not isAligned:
+            return targetMin, targetMax
+        toolMin, toolMax = self.bounds()
+        axis = max(range(3), key=lambda index: abs(self.frame.normal[index]))
+        covers = [toolMin[index] <= targetMin[index] + TOLERANCE and toolMax[index] >= targetMax[index] - TOLERANCE for index in range(3)]
+        if not all(covers[index] for index in range(3) if index != axis):
+            return targetMin, targetMax
+        if len(self.loops) > 1:
+            if not covers[axis]:
+                return targetMin, targetMax
+            holePoints = [self.frame.toModel((x, y, z)) for loop in self.loops[1:] for x, y in loop for z in (self.low, self.high)]
+            return tuple(map(max, targetMin, map(min, *holePoints))), tuple(map(min, targetMax, map(max, *holePoints)))
+        minPoint, maxPoint = list(targetMin), list(targetMax)
+        if toolMin[axis] <= targetMin[axis] + TOLERANCE < toolMax[axis]:
+            minPoint[axis] = min(toolMax[axis], targetMax[axis])
+        elif toolMin[axis] < targetMax[axis] - TOLERANCE <= toolMax[axis]:
+            maxPoint[axis] = max(toolMin[axis], targetMin[axis])
+        return tuple(minPoint), tuple(maxPoint)
+
+    def transformed(self, matrix: Matrix3D) -> '_PrismShape':
+        frame = _Frame(
+            matrix.transformPoint(self.frame.origin),
+            matrix.transformVector(self.frame.xDirection),
+            matrix.transformVector(self.frame.yDirection),
+            matrix.transformVector(self.frame.normal),
+        )
+        return _PrismShape(frame, self.loops, self.low, self.high, self.section.transformed(matrix) if self.section is not None else None)
+
+    def faceCount(self) -> int:
+        return sum(len(loop) for loop in self.loops) + 2
+
+class _EdgeBlendShape(_Shape):
+    """
+    Material a fillet (isRound) or a chamfer of size takes off a convex edge, points are placed by their depth
+    below a planar face the edge bounds and their distance to the edge within that plane
+    """
+    def __init__(self, points: list, planePoint, normal, size: float, isRound: bool):
+        self.normal = _unit(normal)
+        self.offset = _dot(planePoint, self.normal)
+        self.points = [_sub(point, _scale(self.normal, _dot(point, self.normal) - self.offset)) for point in points]
+        self.size = size
+        self.isRound = isRound
+
+    def contains(self, point) -> bool:
+        depth = self.offset - _dot(point, self.normal)
+        if depth < -TOLERANCE or depth >= self.size:
+            return False
+        projected = _add(point, _scale(self.normal, depth))
+        distance = min(_segmentDistance(projected, self.points[i], self.points[i + 1]) for i in range(len(self.points) - 1))
+        if distance >= self.size:
+            return False
+        if not self.isRound:
+            return depth + distance < self.size
+        return (self.size - depth) ** 2 + (self.size - distance) ** 2 > self.size ** 2
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        return (
+            tuple(min(values) - self.size for values in zip(*self.points)),
+            tuple(max(values) + self.size for values in zip(*self.points)),
+        )
+
+    def transformed(self, matrix: Matrix3D) -> '_EdgeBlendShape':
+        points = [matrix.transformPoint(point) for point in self.points]
+        return _EdgeBlendShape(points, points[0], matrix.transformVector(self.normal), self.size, self.isRound)
+
+    def faceCount(self) -> int:
+        return 1
+
+class _BooleanShape(_Shape):
+    def __init__(self, booleanType: int, target: _Shape, tool: _Shape):
+        self.booleanType = booleanType
+        self.target = target
+        self.tool = tool
+
+    def contains(self, point) -> bool:
+        if self.booleanType == BooleanTypes.UnionBooleanType:
+            return self.target.contains(point) or self.tool.contains(point)
+        if self.booleanType == BooleanTypes.IntersectionBooleanType:
+            return self.target.contains(point) and self.tool.contains(point)
+        return self.target.contains(point) and not self.tool.contains(point)
+
+    def bounds(self) -> tuple[tuple, tuple]:
+        targetMin, targetMax = self.target.bounds()
+        if self.booleanType == BooleanTypes.DifferenceBooleanType:
+            return self._trimmedBounds(targetMin, targetMax)
+        toolMin, toolMax = self.tool.bounds()
+        if self.booleanType == BooleanTypes.UnionBooleanType:
+            return tuple(map(min, targetMin, toolMin)), tuple(map(max, targetMax, toolMax))
+        return tuple(map(max, targetMin, toolMin)), tuple(map(min, targetMax, toolMax))
+
+    def _trimmedBounds(self, targetMin: tuple, targetMax: tuple) -> tuple[tuple, tuple]:
+        # differences keep the target bounds, except for a slab cut off by an axis aligned box
+        if isinstance(self.tool, _PrismShape):
+            return self.tool.remainingBounds(targetMin, targetMax)
+        if not isinstance(self.tool, _BoxShape) or any(abs(abs(_dot(axis, unit)) - 1) > TOLERANCE for axis, unit in zip(self.tool.axes, [(1, 0, 0), (0, 1, 0), (0, 0, 1)])):
+            return targetMin, targetMax
+        toolMin, toolMax = self.tool.bounds()
+        covers = [toolMin[axis] <= targetMin[axis] + TOLERANCE and toolMax[axis] >= targetMax[axis] - TOLERANCE for axis in range(3)]
+        if sum(covers) != 2:
+            return targetMin, targetMax
+        axis = covers.index(False)
+        minPoint, maxPoint = list(targetMin), list(targetMax)
+        if toolMin[axis] <= targetMin[axis] + TOLERANCE < toolMax[axis]:
+            minPoint[axis] = min(toolMax[axis], targetMax[axis])
+        elif toolMin[axis] < targetMax[axis] - TOLERANCE <= toolMax[axis]:
+            maxPoint[axis] = max(toolMin[axis], targetMin[axis])
+        return tuple(minPoint), tuple(maxPoint)
+
+    def transformed(self, matrix: Matrix3D) -> '_BooleanShape':
+        return _BooleanShape(self.booleanType, self.target.transformed(matrix), self.tool.transformed(matrix))
+
+    def faceCount(self) -> int:
+        return self.target.faceCount() + self.tool.faceCount()
+
+class TemporaryBRepBody(Base):
+    """
+    Body made by TemporaryBRepManager, lives outside of any component until bRepBodies.add
+    """
+    def __init__(self, shape: _Shape):
+        self._shape = shape
+        self.isSolid = True
+        self.isTemporary = True
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        minPoint, maxPoint = self._shape.bounds()
+        return BoundingBox3D(Point3D(*minPoint), Point3D(*maxPoint))
+
+    def _contains(self, point) -> bool:
+        return self._shape.contains(_tuple(point))
+
+class TemporaryBRepManager(Base):
+    _instance = None
+
+    @staticmethod
+    def get() -> 'TemporaryBRepManager':
+        if TemporaryBRepManager._instance is None:
+            TemporaryBRepManager._instance = TemporaryBRepManager()
+        return TemporaryBRepManager._instance
+
+    def createBox(self, box) -> TemporaryBRepBody:
+        axes = [_unit(box.lengthDirection.asTuple()), _unit(box.widthDirection.asTuple()), _unit(box.heightDirection.asTuple())]
+        _record('temporaryBRep', 'createBox')
+        return TemporaryBRepBody(_BoxShape(box.centerPoint.asTuple(), axes, [box.length / 2, box.width / 2, box.height / 2]))
+
+    def createCylinderOrCone(self, pointOne, pointOneRadius: float, pointTwo, pointTwoRadius: float) -> TemporaryBRepBody:
+        _record('temporaryBRep', 'createCylinderOrCone')
+        return TemporaryBRepBody(_ConeShape(_tuple(pointOne), pointOneRadius, _tuple(pointTwo), pointTwoRadius))
+
+    def createSphere(self, center, radius: float) -> TemporaryBRepBody:
+        _record('temporaryBRep', 'createSphere')
+        return TemporaryBRepBody(_SphereShape(_tuple(center), radius))
+
+    def copy(self, body) -> TemporaryBRepBody:
+        shape = getattr(body, '_shape', None)
+        if shape is None:
+            # bodies made by features only have faces, their copy is the bounding box
+            bounds = body.boundingBox
+            minPoint, maxPoint = bounds.minPoint.asTuple(), bounds.maxPoint.asTuple()
+            center = tuple((low + high) / 2 for low, high in zip(minPoint, maxPoint))
+            shape = _BoxShape(center, [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)], [(high - low) / 2 for low, high in zip(minPoint, maxPoint)])
+        _record('temporaryBRep', 'copy', faces=shape.faceCount())
+        return TemporaryBRepBody(shape)
+
+    def transform(self, body: TemporaryBRepBody, transform: Matrix3D) -> bool:
+        _record('temporaryBRep', 'transform', faces=body._shape.faceCount())
+        body._shape = body._shape.transformed(transform)
+        return True
+
+    def booleanOperation(self, targetBody: TemporaryBRepBody, toolBody: TemporaryBRepBody, booleanType: int) -> bool:
+        _record(
+            'temporaryBRep',
+            'booleanOperation',
+            {'booleanType': booleanType},
+            targetFaces=targetBody._shape.faceCount(),
+            toolFaces=toolBody._shape.faceCount(),
+        )
+        targetBody._shape = _BooleanShape(booleanType, targetBody._shape, toolBody._shape)
+        return True
+
+# document structure
+
+class CustomGraphicsCoordinates(Base):
+    def __init__(self, coordinates: list[float]):
+        self.coordinates = list(coordinates)
+
+    @staticmethod
+    def create(coordinates: list[float]) -> 'CustomGraphicsCoordinates':
+        return CustomGraphicsCoordinates(coordinates)
+
+    @property
+    def coordinateCount(self) -> int:
+        return len(self.coordinates) // 3
+
+class CustomGraphicsBasicMaterialColorEffect(Base):
+    def __init__(self, color):
+        self.color = color
+
+    @staticmethod
+    def create(color) -> 'CustomGraphicsBasicMaterialColorEffect':
+        return CustomGraphicsBasicMaterialColorEffect(color)
+
+class CustomGraphicsMesh(Base):
+    def __init__(self, group: 'CustomGraphicsGroup', coordinates: CustomGraphicsCoordinates, vertexIndexList: list[int]):
+        self._group = group
+        self.coordinates = coordinates
+        self.vertexIndexList = list(vertexIndexList)
+        self.color = None
+        self.isSelectable = True
+
+    @property
+    def isValid(self) -> bool:
+        return self._group.isValid
+
+class CustomGraphicsGroup(Base):
+    def __init__(self, groups: 'CustomGraphicsGroups'):
+        self._groups = groups
+        self._items: list[CustomGraphicsMesh] = []
+        self._isDeleted = False
+
+    @property
+    def isValid(self) -> bool:
+        return not self._isDeleted
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def addMesh(self, coordinates: CustomGraphicsCoordinates, vertexIndexList: list[int], normalVectors: list[float], normalIndexList: list[int]) -> CustomGraphicsMesh:
+        mesh = CustomGraphicsMesh(self, coordinates, vertexIndexList)
+        self._items.append(mesh)
+        _record('customGraphics', 'customGraphicsGroup.addMesh', vertices=coordinates.coordinateCount, triangles=len(vertexIndexList) // 3)
+        return mesh
+
+    def deleteMe(self) -> bool:
+        self._isDeleted = True
+        self._groups._remove(self)
+        return True
+
+class CustomGraphicsGroups(_Collection):
+    def add(self) -> CustomGraphicsGroup:
+        group = CustomGraphicsGroup(self)
+        self._items.append(group)
+        return group
+
+    def _remove(self, group: CustomGraphicsGroup):
+        if group in self._items:
+            self._items.remove(group)
+
+class Component(Base):
+    def __init__(self, design: 'Design', name: str = 'Component'):
+        self._design = design
+        self.name = name
+        self._bodies: list[BRepBody] = []
+        self._features: list[Feature] = []
+        self._bodyCounter = 0
+        self.features = Features(self)
+        self.sketches = Sketches(self)
+        self.constructionPlanes = ConstructionPlanes(self)
+        self.constructionAxes = ConstructionAxes(self)
+        self.occurrences = Occurrences(design)
+        self.xYConstructionPlane = ConstructionPlane(self, _XY_FRAME, 'XY')
+        self.xZConstructionPlane = ConstructionPlane(self, _XZ_FRAME, 'XZ')
+        self.yZConstructionPlane = ConstructionPlane(self, _YZ_FRAME, 'YZ')
+        self.xConstructionAxis = ConstructionAxis(self, (0.0, 0.0, 0.0), (1.0, 0.0, 0.0), 'X')
+        self.yConstructionAxis = ConstructionAxis(self, (0.0, 0.0, 0.0), (0.0, 1.0, 0.0), 'Y')
+        self.zConstructionAxis = ConstructionAxis(self, (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), 'Z')
+        self.originConstructionPoint = ConstructionPoint((0.0, 0.0, 0.0), 'Origin')
+        self.customGraphicsGroups = CustomGraphicsGroups()
+
+    @property
+    def parentDesign(self) -> 'Design':
+        return self._design
+
+    @property
+    def bRepBodies(self) -> BRepBodies:
+        return BRepBodies(list(self._bodies), self)
+
+    def _nextBodyName(self) -> str:
+        self._bodyCounter += 1
+        return 'Body{}'.format(self._bodyCounter)
+
+    def _addBody(self, body: BRepBody) -> BRepBody:
+        self._bodies.append(body)
+        return body
+
+    def _removeBody(self, body: BRepBody):
+        if body in self._bodies:
+            self._bodies.remove(body)
+        body._isDeleted = True
+
+class Occurrence(Base):
+    def __init__(self, component: Component, transform: Matrix3D):
+        self.component = component
+        self.transform = transform
+        self.name = component.name + ':1'
+        self.timelineObject = TimelineObject(component._design._addTimelineItem())
+        self.isLightBulbOn = True
+
+    def activate(self) -> bool:
+        self.component._design.activeComponent = self.component
+        return True
+
+    def deleteMe(self) -> bool:
+        self.component._design.rootComponent.occurrences._items.remove(self)
+        _record('occurrence', 'occurrence.deleteMe')
+        return True
+
+class Occurrences(_Collection):
+    def __init__(self, design: 'Design'):
+        super().__init__()
+        self._design = design
+
+    def addNewComponent(self, transform: Matrix3D) -> Occurrence:
+        occurrence = Occurrence(Component(self._design), transform)
+        self._items.append(occurrence)
+        _record('occurrence', 'occurrences.addNewComponent')
+        return occurrence
+
+class TimelineGroup(Base):
+    def __init__(self, startIndex: int, endIndex: int):
+        self.startIndex = startIndex
+        self.endIndex = endIndex
+        self.name = ''
+        self.isCollapsed = True
+
+class TimelineGroups(_Collection):
+    def add(self, startIndex: int, endIndex: int) -> TimelineGroup:
+        group = TimelineGroup(startIndex, endIndex)
+        self._items.append(group)
+        return group
+
+class Timeline(Base):
+    def __init__(self):
+        self.count = 0
+        self.timelineGroups = TimelineGroups()
+        self.markerPosition = 0
+
+class Design(Base):
+    def __init__(self, designType: int = DesignTypes.ParametricDesignType):
+        self.designType = designType
+        self.timeline = Timeline()
+        self.rootComponent = Component(self, 'root')
+        self.activeComponent = self.rootComponent
+
+    def _addTimelineItem(self) -> int:
+        index = self.timeline.count
+        if self.designType == DesignTypes.DirectDesignType:
+            # no history, nothing lands in the timeline
+            return index
+        self.timeline.count += 1
+        self.timeline.markerPosition = self.timeline.count
+        return index
+
+def __getattr__(name: str):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    placeholder = unsupported('adsk.fusion', name)
+    globals()[name] = placeholder
+    return placeholder
@@ -0,0 +1,182 @@
+import argparse
+import json
+import sys
+
+from . import core, fusion, install, loadAddinModule, newComponent, newDesign
+from .recorder import Recorder, CostModel
+
+# Runs the Fusion generators against the recording backend and reports operation counts and the
+# modelled runtime, manifests use the batch renderer format:
+#   python -m lib.fakeAdsk.harness manifest.json --costs costs.json --report operations.json
+
+def _modules():
+    return {
+        'batchGenerator': loadAddinModule('lib.gridfinityUtils.batchGenerator'),
+        'baseGenerator': loadAddinModule('lib.gridfinityUtils.baseGenerator'),
+        'binBodyGenerator': loadAddinModule('lib.gridfinityUtils.binBodyGenerator'),
+        'directBinGenerator': loadAddinModule('lib.gridfinityUtils.directBinGenerator'),
+        'baseplateGenerator': loadAddinModule('lib.gridfinityUtils.baseplateGenerator'),
+        'geometryUtils': loadAddinModule('lib.gridfinityUtils.geometryUtils'),
+        'shelledBinGenerator': loadAddinModule('lib.gridfinityUtils.shelledBinGenerator'),
+        'operationGraph': loadAddinModule('lib.gridfinityUtils.operationGraph'),
+        'fusionExecutor': loadAddinModule('lib.gridfinityUtils.fusionExecutor'),
+        'graphOptimizer': loadAddinModule('lib.gridfinityUtils.graphOptimizer'),
+        'planSerializer': loadAddinModule('lib.gridfinityUtils.planSerializer'),
+    }
+
+def _binInputs(spec: dict, isLowFidelity: bool, modules: dict):
+    batchGenerator = modules['batchGenerator']
+    spec = batchGenerator.normalizeSpec(dict(spec, type=batchGenerator.BATCH_ITEM_BIN))
+    isShelled = spec['binType'] == batchGenerator.BIN_TYPE_SHELLED
+    # shelled bins start from a solid body, same as the command
+    binBodyInput, baseInput = batchGenerator.createBinInputs(dict(spec, binType=batchGenerator.BIN_TYPE_SOLID) if isShelled else spec)
+    if isShelled:
+        modules['shelledBinGenerator'].applyShelledBinType(baseInput, binBodyInput)
+    baseInput.isLowFidelity = binBodyInput.isLowFidelity = isLowFidelity
+    # components are created at the origin
+    baseInput.originPoint = modules['geometryUtils'].createOffsetPoint(core.Point3D.create(0, 0, 0), byX=-binBodyInput.xyClearance, byY=-binBodyInput.xyClearance)
+    binName = 'Gridfinity bin {}x{}x{}'.format(int(binBodyInput.binLength), int(binBodyInput.binWidth), int(binBodyInput.binHeight))
+    return spec, binName, binBodyInput, baseInput, isShelled
+
+def _planBin(spec: dict, isLowFidelity: bool, modules: dict, log):
+    spec, binName, binBodyInput, baseInput, _ = _binInputs(spec, isLowFidelity, modules)
+    graph = modules['binBodyGenerator'].planGridfinityBin(binName, baseInput, binBodyInput, spec['generateBase'], spec['generateBody'])
+    optimization = modules['graphOptimizer'].optimize(graph)
+    if optimization.featuresSaved > 0:
+        for line in optimization.lines():
+            log(line)
+    return graph
+
+def planItem(spec: dict, isLowFidelity: bool = False):
+    """
+    Operation graph the create bin or baseplate command would run for a batch manifest spec
+    """
+    install()
+    modules = _modules()
+    batchGenerator = modules['batchGenerator']
+    itemType = str(spec.get('type', '')).strip().lower()
+    if itemType == 'bin':
+        return _planBin(spec, isLowFidelity, modules, lambda line: None)
+    if itemType == 'baseplate':
+        baseplateInput = batchGenerator.createBaseplateInput(batchGenerator.normalizeSpec(dict(spec, type=batchGenerator.BATCH_ITEM_BASEPLATE)))
+        baseplateInput.isLowFidelity = isLowFidelity
+        return modules['baseplateGenerator'].planOptimizedBaseplate(baseplateInput)
+    raise ValueError('Unknown item type "{}", expected bin or baseplate'.format(spec.get('type', '')))
+
+def recordBin(spec: dict, recorder: Recorder = None, isLowFidelity: bool = False, graph = None) -> Recorder:
+    """
+    Replays generateBin from the create bin command for a batch manifest spec, isLowFidelity replays the fast preview.
+    graph runs a saved plan instead of planning the spec
+    """
+    recorder = install(recorder)
+    modules = _modules()
+    spec, binName, binBodyInput, baseInput, isShelled = _binInputs(spec, isLowFidelity, modules)
+    generateBody = spec['generateBody']
+
+    des = newDesign()
+    occurrence = newComponent(binName)
+    component = occurrence.component
+
+    if graph is None:
+        graph = _planBin(spec, isLowFidelity, modules, recorder.log)
+    executor = modules['fusionExecutor'].FusionExecutor(component).run(graph)
+    if generateBody:
+        binBody = executor.body(graph.outputs[modules['binBodyGenerator'].BIN_BODY_OUTPUT])
+
+    if isShelled and generateBody and not isLowFidelity:
+        binBody = modules['shelledBinGenerator'].shellGridfinityBin(binBody, binBodyInput, spec['hasTab'], component)
+
+    des.timeline.timelineGroups.add(occurrence.timelineObject.index, des.timeline.count - 1).name = binName
+    return recorder
+
+def recordDirectBin(spec: dict, recorder: Recorder = None) -> Recorder:
+    """
+    Replays generateBin in a design with history disabled, where the bin is built with TemporaryBRepManager
+    """
+    recorder = install(recorder)
+    modules = _modules()
+    batchGenerator = modules['batchGenerator']
+    directBinGenerator = modules['directBinGenerator']
+    spec = batchGenerator.normalizeSpec(dict(spec, type=batchGenerator.BATCH_ITEM_BIN))
+    isShelled = spec['binType'] == batchGenerator.BIN_TYPE_SHELLED
+    unsupportedOptions = directBinGenerator.unsupportedBinOptions(spec['hasMagnetCutouts'] and spec['hasMagnetCutoutsTabs'], isShelled)
+    if len(unsupportedOptions) > 0:
+        raise ValueError('Direct designs do not support {}'.format(', '.join(unsupportedOptions)))
+    binBodyInput, baseInput = batchGenerator.createBinInputs(spec)
+    xyClearance = binBodyInput.xyClearance
+
+    newDesign(fusion.DesignTypes.DirectDesignType)
+    binName = 'Gridfinity bin {}x{}x{}'.format(int(binBodyInput.binLength), int(binBodyInput.binWidth), int(binBodyInput.binHeight))
+    occurrence = newComponent(binName)
+    component = occurrence.component
+    baseInput.originPoint = modules['geometryUtils'].createOffsetPoint(component.originConstructionPoint.geometry, byX=-xyClearance, byY=-xyClearance)
+    binBody = directBinGenerator.createDirectGridfinityBin(binBodyInput, baseInput, spec['generateBase'], spec['generateBody'], component)
+    if binBody is not None:
+        binBody.name = binName
+    return recorder
+
+def recordBaseplate(spec: dict, recorder: Recorder = None, isLowFidelity: bool = False, graph = None) -> Recorder:
+    """
+    Replays generateBaseplate from the create baseplate command for a batch manifest spec, isLowFidelity replays the fast preview.
+    graph runs a saved plan instead of planning the spec
+    """
+    recorder = install(recorder)
+    modules = _modules()
+    batchGenerator = modules['batchGenerator']
+    spec = batchGenerator.normalizeSpec(dict(spec, type=batchGenerator.BATCH_ITEM_BASEPLATE))
+    baseplateInput = batchGenerator.createBaseplateInput(spec)
+    baseplateInput.isLowFidelity = isLowFidelity
+
+    des = newDesign()
+    name = 'Gridfinity baseplate {}x{}'.format(int(baseplateInput.baseplateLength), int(baseplateInput.baseplateWidth))
+    occurrence = newComponent(name)
+    modules['baseplateGenerator'].createGridfinityBaseplate(baseplateInput, occurrence.component, graph)
+    des.timeline.timelineGroups.add(occurrence.timelineObject.index, des.timeline.count - 1).name = name
+    return recorder
+
+def recordItem(spec: dict, costModel: CostModel = None, isLowFidelity: bool = False) -> Recorder:
+    itemType = str(spec.get('type', '')).strip().lower()
+    recorder = Recorder(costModel)
+    if itemType == 'bin':
+        return recordBin(spec, recorder, isLowFidelity)
+    if itemType == 'baseplate':
+        return recordBaseplate(spec, recorder, isLowFidelity)
+    raise ValueError('Unknown item type "{}", expected bin or baseplate'.format(spec.get('type', '')))
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Count Fusion operations and estimate generation time without Fusion')
+    parser.add_argument('manifest', help='JSON or CSV manifest in the batch renderer format')
+    parser.add_argument('--costs', help='JSON cost model overrides, {"kind": {"base": s, "perUnit": {"counter": s}}}')
+    parser.add_argument('--report', help='write every recorded operation to this JSON file')
+    parser.add_argument('--preview', action='store_true', help='replay the fast preview instead of the full model')
+    args = parser.parse_args(argv)
+
+    install()
+    costModel = CostModel.fromJson(args.costs) if args.costs else None
+    items = loadAddinModule('lib.gridfinityUtils.batchGenerator').loadManifest(args.manifest)
+    report = []
+    failures = 0
+    for index, spec in enumerate(items):
+        name = spec.get('name') or '{}-{}'.format(spec.get('type', 'item'), index)
+        try:
+            recorder = recordItem(spec, costModel, args.preview)
+        except Exception as err:
+            failures += 1
+            print('FAILED item {} {}: {}: {}'.format(index, name, type(err).__name__, err), file=sys.stderr)
+            continue
+        summary = recorder.summary()
+        print('{:>6} ops {:>4} combine tools {:8.3f}s  {}  {}'.format(
+            summary['operations'],
+            int(summary['combineToolBodies']),
+            summary['estimatedSeconds'],
+            name,
+            ' '.join('{}={}'.format(kind, count) for kind, count in summary['counts'].items()),
+        ), flush=True)
+        report.append(dict(recorder.toDict(), index=index, name=name))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump({'items': report}, file, indent=2)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import argparse
+import sys
+from dataclasses import dataclass, field
+
+from . import core, harness, loadAddinModule
+from .recorder import CostModel
+
+# Parity check between the direct modelling bin (TemporaryBRepManager, designs without history)
+# and the parametric one, on the recording backend:
+#   python -m lib.fakeAdsk.parity
+#   python -m lib.fakeAdsk.parity manifest.json
+#
+# For every bin the parametric path is recorded as generateBin runs it (planGridfinityBin through
+# the FusionExecutor) and the direct path is recorded in a direct design. The direct path has to
+# insert as many bodies as the parametric one, without timeline features. Both are compared on the
+# solids the recording backend keeps next to the faces: bounding boxes must match and the volumes,
+# estimated on one grid of probe points, must agree. The backend approximates the material fillets
+# and chamfers take off, hence the volume tolerance. Bins the headless mesh covers are probed
+# against the mesh as well (binMeshGenerator follows the parametric generators).
+
+PARITY_BOUNDING_BOX_TOLERANCE = 0.001
+PARITY_VOLUME_TOLERANCE = 0.03
+# probe points per axis for the volume estimate
+PARITY_VOLUME_SAMPLES = 24
+PARITY_MIN_AGREEMENT = 0.97
+PARITY_PROBE_COLUMNS = 13
+PARITY_PROBE_LEVELS = 17
+# keeps probes off the mesh vertices, rays through an edge would count twice
+PARITY_PROBE_JITTER = (0.00731, 0.00419, 0.00257)
+# operations allowed in a direct design, the component itself and the in memory modelling
+PARITY_DIRECT_OPERATION_KINDS = {'occurrence', 'temporaryBRep'}
+
+PARITY_DEFAULT_SPECS = [
+    {'name': 'plain 1x1', 'binWidth': 1, 'binLength': 1},
+    {'name': 'magnets and screws 2x3', 'binWidth': 2, 'binLength': 3, 'hasMagnetCutouts': True, 'hasScrewHoles': True},
+    {'name': 'uniform compartments with scoop and tabs', 'binWidth': 3, 'binLength': 2, 'binHeight': 6, 'compartmentsX': 3, 'compartmentsY': 2, 'hasScoop': True, 'hasTab': True},
+    {'name': 'custom compartments', 'binWidth': 3, 'binLength': 3, 'compartmentsGridType': 'Custom grid', 'compartmentsX': 3, 'compartmentsY': 3, 'compartments': [
+        {'positionX': 0, 'positionY': 0, 'width': 2, 'length': 1, 'depth': 2.0},
+        {'positionX': 2, 'positionY': 0, 'width': 1, 'length': 3},
+        {'positionX': 0, 'positionY': 1, 'width': 2, 'length': 2, 'depth': 1.5},
+    ]},
+    {'name': 'lip notches', 'binWidth': 2, 'binLength': 2, 'hasLipNotches': True},
+    {'name': 'no lip', 'binWidth': 2, 'binLength': 1, 'hasLip': False, 'hasScoop': True},
+    {'name': 'solid', 'binWidth': 2, 'binLength': 2, 'binType': 'Solid'},
+    {'name': 'base only', 'binWidth': 2, 'binLength': 2, 'generateBody': False, 'hasScrewHoles': True},
+    {'name': 'body only', 'binWidth': 2, 'binLength': 2, 'generateBase': False},
+]
+
+@dataclass
+class ParityResult:
+    name: str
+    parametricFeatures: int = 0
+    parametricSeconds: float = 0.0
+    parametricBodies: int = 0
+    parametricVolume: float = 0.0
+    directOperations: int = 0
+    directSeconds: float = 0.0
+    directVolume: float = 0.0
+    bodies: int = 0
+    timelineItems: int = 0
+    agreement: float = 0.0
+    probes: int = 0
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def isOk(self) -> bool:
+        return len(self.problems) == 0
+
+def _activeComponent():
+    return core.Application.get().activeProduct.rootComponent.occurrences.item(0).component
+
+def _bounds(bodies: list) -> tuple[tuple, tuple]:
+    boxes = [body._solid.bounds() for body in bodies]
+    return tuple(min(values) for values in zip(*[low for low, _ in boxes])), tuple(max(values) for values in zip(*[high for _, high in boxes]))
+
+def _contains(bodies: list, point) -> bool:
+    return any(body._solid.contains(point) for body in bodies)
+
+def _probeVolume(bodies: list, minPoint: tuple, maxPoint: tuple) -> float:
+    """
+    Volume of the bodies from the share of a grid of probe points over minPoint..maxPoint inside them
+    """
+    sizes = [high - low for low, high in zip(minPoint, maxPoint)]
+    steps = [[low + size * (i + 0.5) / PARITY_VOLUME_SAMPLES + jitter for i in range(PARITY_VOLUME_SAMPLES)] for low, size, jitter in zip(minPoint, sizes, PARITY_PROBE_JITTER)]
+    inside = sum(1 for x in steps[0] for y in steps[1] for z in steps[2] if _contains(bodies, (x, y, z)))
+    return inside / PARITY_VOLUME_SAMPLES ** 3 * sizes[0] * sizes[1] * sizes[2]
+
+def _meshCrossings(model, x: float, y: float) -> list[list[float]]:
+    """
+    Heights where a vertical ray through (x, y) crosses each shell of the model
+    """
+    crossings = []
+    for mesh, (dx, dy, dz) in model.parts:
+        px, py = x - dx, y - dy
+        heights = []
+        vertices = mesh.vertices
+        for (a, b, c) in mesh.triangles:
+            (ax, ay, az), (bx, by, bz), (cx, cy, cz) = vertices[a], vertices[b], vertices[c]
+            if px < min(ax, bx, cx) or px > max(ax, bx, cx) or py < min(ay, by, cy) or py > max(ay, by, cy):
+                continue
+            area = (bx - ax) * (cy - ay) - (cx - ax) * (by - ay)
+            if abs(area) < 1e-12:
+                continue
+            u = ((bx - px) * (cy - py) - (cx - px) * (by - py)) / area
+            v = ((cx - px) * (ay - py) - (ax - px) * (cy - py)) / area
+            w = 1 - u - v
+            if min(u, v, w) < 0:
+                continue
+            heights.append(u * az + v * bz + w * cz + dz)
+        crossings.append(heights)
+    return crossings
+
+def _isInsideMesh(crossings: list[list[float]], z: float) -> bool:
+    return any(sum(1 for height in heights if height > z) % 2 == 1 for heights in crossings)
+
+def _createMeshModel(spec: dict):
+    batchGenerator = loadAddinModule('lib.gridfinityUtils.batchGenerator')
+    binMeshGenerator = loadAddinModule('lib.gridfinityUtils.binMeshGenerator')
+    spec = batchGenerator.normalizeSpec(dict(spec, type=batchGenerator.BATCH_ITEM_BIN))
+    binBodyInput, baseInput = batchGenerator.createBinInputs(spec)
+    if binMeshGenerator.unsupportedMeshOptions(binBodyInput, baseInput, spec['generateBase'], spec['generateBody']):
+        return None
+    return binMeshGenerator.createGridfinityBinMesh(binBodyInput, baseInput, spec['generateBase'], spec['generateBody'])
+
+def compareSolids(directBodies: list, parametricBodies: list, result: ParityResult):
+    directMin, directMax = _bounds(directBodies)
+    parametricMin, parametricMax = _bounds(parametricBodies)
+    for axis, name in enumerate('xyz'):
+        if abs(directMin[axis] - parametricMin[axis]) > PARITY_BOUNDING_BOX_TOLERANCE or abs(directMax[axis] - parametricMax[axis]) > PARITY_BOUNDING_BOX_TOLERANCE:
+            result.problems.append('bounding box {} {:.4f}..{:.4f}, parametric {:.4f}..{:.4f}'.format(name, directMin[axis], directMax[axis], parametricMin[axis], parametricMax[axis]))
+
+    minPoint, maxPoint = tuple(map(min, directMin, parametricMin)), tuple(map(max, directMax, parametricMax))
+    result.directVolume = _probeVolume(directBodies, minPoint, maxPoint)
+    result.parametricVolume = _probeVolume(parametricBodies, minPoint, maxPoint)
+    if abs(result.directVolume - result.parametricVolume) > PARITY_VOLUME_TOLERANCE * result.parametricVolume:
+        result.problems.append('volume {:.3f}, parametric {:.3f}'.format(result.directVolume, result.parametricVolume))
+
+def compareShape(bodies: list, model, result: ParityResult):
+    directMin, directMax = _bounds(bodies)
+    meshMin, meshMax = model.boundingBox()
+    for axis, name in enumerate('xyz'):
+        if abs(directMin[axis] - meshMin[axis]) > PARITY_BOUNDING_BOX_TOLERANCE or abs(directMax[axis] - meshMax[axis]) > PARITY_BOUNDING_BOX_TOLERANCE:
+            result.problems.append('bounding box {} {:.4f}..{:.4f}, expected {:.4f}..{:.4f}'.format(name, directMin[axis], directMax[axis], meshMin[axis], meshMax[axis]))
+
+    matches = 0
+    for i in range(PARITY_PROBE_COLUMNS):
+        x = meshMin[0] + (meshMax[0] - meshMin[0]) * (i + 0.5) / PARITY_PROBE_COLUMNS + PARITY_PROBE_JITTER[0]
+        for j in range(PARITY_PROBE_COLUMNS):
+            y = meshMin[1] + (meshMax[1] - meshMin[1]) * (j + 0.5) / PARITY_PROBE_COLUMNS + PARITY_PROBE_JITTER[1]
+            crossings = _meshCrossings(model, x, y)
+            for k in range(PARITY_PROBE_LEVELS):
+                z = meshMin[2] + (meshMax[2] - meshMin[2]) * (k + 0.5) / PARITY_PROBE_LEVELS + PARITY_PROBE_JITTER[2]
+                result.probes += 1
+                if _contains(bodies, (x, y, z)) == _isInsideMesh(crossings, z):
+                    matches += 1
+    result.agreement = matches / result.probes if result.probes else 0.0
+    if result.agreement < PARITY_MIN_AGREEMENT:
+        result.problems.append('{:.1%} of probe points agree with the mesh, expected at least {:.0%}'.format(result.agreement, PARITY_MIN_AGREEMENT))
+
+def checkParity(spec: dict, costModel: CostModel = None) -> ParityResult:
+    result = ParityResult(spec.get('name') or 'bin')
+    parametric = harness.recordBin(spec, harness.Recorder(costModel)).summary()
+    parametricBodies = list(_activeComponent().bRepBodies)
+    result.parametricFeatures = parametric['features']
+    result.parametricSeconds = parametric['estimatedSeconds']
+    result.parametricBodies = len(parametricBodies)
+
+    recorder = harness.recordDirectBin(spec, harness.Recorder(costModel))
+    design = core.Application.get().activeProduct
+    bodies = list(_activeComponent().bRepBodies)
+    summary = recorder.summary()
+    result.directOperations = summary['operations']
+    result.directSeconds = summary['estimatedSeconds']
+    result.bodies = len(bodies)
+    result.timelineItems = design.timeline.count
+    if result.bodies != result.parametricBodies:
+        result.problems.append('{} bodies inserted, the parametric bin has {}'.format(result.bodies, result.parametricBodies))
+    if result.timelineItems != 0:
+        result.problems.append('{} timeline items in a direct design'.format(result.timelineItems))
+    features = {kind: count for kind, count in summary['counts'].items() if kind not in PARITY_DIRECT_OPERATION_KINDS}
+    if features:
+        result.problems.append('features in a direct design: {}'.format(' '.join('{}={}'.format(kind, count) for kind, count in features.items())))
+    if len(bodies) == 0 or len(parametricBodies) == 0:
+        return result
+    # lofts, shells and splits leave parametric bodies without a solid
+    if all(body._solid is not None for body in parametricBodies):
+        compareSolids(bodies, parametricBodies, result)
+    # bins with options the mesh leaves out are only compared with the parametric bin
+    model = _createMeshModel(spec)
+    if model is not None:
+        compareShape(bodies, model, result)
+    return result
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare the direct modelling bin with the parametric one on the recording backend')
+    parser.add_argument('manifest', nargs='?', help='bins to compare in the batch renderer format, a built in set by default')
+    parser.add_argument('--costs', help='JSON cost model overrides')
+    args = parser.parse_args(argv)
+
+    harness.install()
+    costModel = CostModel.fromJson(args.costs) if args.costs else None
+    specs = PARITY_DEFAULT_SPECS
+    if args.manifest:
+        items = loadAddinModule('lib.gridfinityUtils.batchGenerator').loadManifest(args.manifest)
+        specs = [spec for spec in items if str(spec.get('type', 'bin')).strip().lower() == 'bin']
+
+    failures = 0
+    for index, spec in enumerate(specs):
+        try:
+            result = checkParity(dict(spec, name=spec.get('name') or 'bin-{}'.format(index)), costModel)
+        except Exception as err:
+            failures += 1
+            print('FAILED {:<44} {}: {}'.format(spec.get('name') or 'bin-{}'.format(index), type(err).__name__, err), flush=True)
+            continue
+        failures += 0 if result.isOk else 1
+        print('{:<4} {:<44} parametric {:>4} features {:7.3f}s {:8.3f}cm3  direct {:>5} ops {:7.3f}s {:8.3f}cm3  {:.1%} of {} probes agree'.format(
+            'ok' if result.isOk else 'FAIL',
+            result.name,
+            result.parametricFeatures,
+            result.parametricSeconds,
+            result.parametricVolume,
+            result.directOperations,
+            result.directSeconds,
+            result.directVolume,
+            result.agreement,
+            result.probes,
+        ), flush=True)
+        for problem in result.problems:
+            print('     {}'.format(problem), flush=True)
+    print('{} bins, {} failed'.format(len(specs), failures))
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Records the feature calls the generators make against the fake adsk modules.
+# Every call becomes an OperationRecord with a JSON friendly summary of its arguments, a set of
+# size counters (tool bodies, edges, profile curves...) and a modelled cost. Costs are
+# base + sum(perUnit * counter) in seconds. The defaults are rough guesses meant for comparing
+# configurations, calibrate them against real Fusion timings (CostModel.fromJson) before trusting
+# absolute numbers.
+
+@dataclass
+class OperationCost:
+    base: float = 0.0
+    perUnit: dict[str, float] = field(default_factory=dict)
+
+    def evaluate(self, counters: dict[str, float]) -> float:
+        return self.base + sum(weight * counters.get(name, 0) for name, weight in self.perUnit.items())
+
+DEFAULT_OPERATION_COSTS = {
+    'sketch': OperationCost(0.010, {'projectedCurves': 0.001}),
+    'sketchCurve': OperationCost(0.001),
+    'sketchOffset': OperationCost(0.004, {'curves': 0.001}),
+    'sketchConstraint': OperationCost(0.0005),
+    'sketchDimension': OperationCost(0.002),
+    'constructionPlane': OperationCost(0.004),
+    'constructionAxis': OperationCost(0.004),
+    'extrude': OperationCost(0.030, {'profileCurves': 0.002, 'participantBodies': 0.010, 'participantFaces': 0.0005}),
+    'fillet': OperationCost(0.050, {'edges': 0.010, 'bodyFaces': 0.0005}),
+    'chamfer': OperationCost(0.040, {'edges': 0.008, 'bodyFaces': 0.0005}),
+    'combine': OperationCost(0.040, {'toolBodies': 0.015, 'toolFaces': 0.0004, 'targetFaces': 0.0004}),
+    'rectangularPattern': OperationCost(0.030, {'instances': 0.008, 'instanceFaces': 0.0002}),
+    'circularPattern': OperationCost(0.030, {'instances': 0.008, 'instanceFaces': 0.0002}),
+    'mirror': OperationCost(0.020, {'bodies': 0.008}),
+    'move': OperationCost(0.010, {'bodies': 0.004}),
+    'loft': OperationCost(0.060, {'sections': 0.010}),
+    'shell': OperationCost(0.200, {'bodyFaces': 0.002}),
+    'splitBody': OperationCost(0.060, {'bodyFaces': 0.001}),
+    'remove': OperationCost(0.005),
+    'occurrence': OperationCost(0.020),
+    'feature': OperationCost(0.030),
+    'temporaryBRep': OperationCost(0.001, {'targetFaces': 0.00002, 'toolFaces': 0.00002}),
+    'customGraphics': OperationCost(0.002, {'triangles': 0.0000002}),
+}
+DEFAULT_UNKNOWN_OPERATION_COST = OperationCost(0.010)
+
+# operations that live inside a sketch, everything else is a timeline feature
+SKETCH_OPERATION_KINDS = {'sketchCurve', 'sketchOffset', 'sketchConstraint', 'sketchDimension'}
+# in memory TemporaryBRepManager calls and custom graphics, they never reach the timeline either
+TEMPORARY_OPERATION_KINDS = {'temporaryBRep', 'customGraphics'}
+
+class CostModel():
+    def __init__(self, costs: dict[str, OperationCost] = None, unknownCost: OperationCost = DEFAULT_UNKNOWN_OPERATION_COST):
+        self.costs = dict(DEFAULT_OPERATION_COSTS)
+        if costs:
+            self.costs.update(costs)
+        self.unknownCost = unknownCost
+
+    def evaluate(self, kind: str, counters: dict[str, float]) -> float:
+        return self.costs.get(kind, self.unknownCost).evaluate(counters)
+
+    @classmethod
+    def fromDict(cls, values: dict) -> 'CostModel':
+        """
+        Builds a model from {"kind": {"base": 0.1, "perUnit": {"edges": 0.01}}}, missing kinds keep their defaults
+        """
+        return cls({kind: OperationCost(value.get('base', 0.0), dict(value.get('perUnit', {}))) for kind, value in values.items()})
+
+    @classmethod
+    def fromJson(cls, path: str) -> 'CostModel':
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls.fromDict(json.load(file))
+
+@dataclass
+class OperationRecord:
+    index: int
+    kind: str
+    call: str
+    arguments: dict
+    counters: dict
+    cost: float
+    name: str = ''
+
+    def toDict(self) -> dict:
+        return {
+            'index': self.index,
+            'kind': self.kind,
+            'call': self.call,
+            'name': self.name,
+            'arguments': self.arguments,
+            'counters': self.counters,
+            'cost': self.cost,
+        }
+
+class Recorder():
+    def __init__(self, costModel: CostModel = None):
+        self.costModel = costModel or CostModel()
+        self.operations: list[OperationRecord] = []
+        self.messages: list[str] = []
+        self.startTime = time.perf_counter()
+
+    def reset(self):
+        self.operations = []
+        self.messages = []
+        self.startTime = time.perf_counter()
+
+    def record(self, kind: str, call: str, arguments: dict = None, **counters) -> OperationRecord:
+        operation = OperationRecord(
+            len(self.operations),
+            kind,
+            call,
+            arguments or {},
+            counters,
+            self.costModel.evaluate(kind, counters),
+        )
+        self.operations.append(operation)
+        return operation
+
+    def log(self, message: str):
+        self.messages.append(message)
+
+    def counts(self) -> Counter:
+        return Counter(operation.kind for operation in self.operations)
+
+    def costsByKind(self) -> dict[str, float]:
+        costs: dict[str, float] = {}
+        for operation in self.operations:
+            costs[operation.kind] = costs.get(operation.kind, 0.0) + operation.cost
+        return costs
+
+    def featureCount(self) -> int:
+        return sum(1 for operation in self.operations if operation.kind not in SKETCH_OPERATION_KINDS and operation.kind not in TEMPORARY_OPERATION_KINDS)
+
+    def counterTotal(self, kind: str, counter: str) -> float:
+        return sum(operation.counters.get(counter, 0) for operation in self.operations if operation.kind == kind)
+
+    @property
+    def estimatedSeconds(self) -> float:
+        return sum(operation.cost for operation in self.operations)
+
+    @property
+    def wallSeconds(self) -> float:
+        return time.perf_counter() - self.startTime
+
+    def summary(self) -> dict:
+        return {
+            'operations': len(self.operations),
+            'features': self.featureCount(),
+            'counts': dict(sorted(self.counts().items())),
+            'costs': {kind: round(cost, 6) for kind, cost in sorted(self.costsByKind().items())},
+            'combineToolBodies': self.counterTotal('combine', 'toolBodies'),
+            'estimatedSeconds': round(self.estimatedSeconds, 6),
+        }
+
+    def toDict(self) -> dict:
+        return {
+            'summary': self.summary(),
+            'operations': [operation.toDict() for operation in self.operations],
+            'messages': self.messages,
+        }
+
+# recorder used by the fake modules, replaced by install()
+activeRecorder = Recorder()
+
+def getRecorder() -> Recorder:
+    return activeRecorder
+
+def setRecorder(recorder: Recorder):
+    global activeRecorder
+    activeRecorder = recorder
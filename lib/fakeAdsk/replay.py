@@ -0,0 +1,61 @@
+import argparse
+import sys
+
+from . import install, loadAddinModule
+from .harness import planItem, recordBaseplate, recordBin
+from .recorder import Recorder, CostModel
+
+# Replays plan files saved by the create bin and baseplate commands without Fusion:
+#   python -m lib.fakeAdsk.replay plan.json                    runs the plan, prints operation counts and the modelled runtime
+#   python -m lib.fakeAdsk.replay plan.json --diff other.json  diffs the operations of two plans
+#   python -m lib.fakeAdsk.replay plan.json --replan           diffs the plan against the one this tree makes from its parameters
+
+def replayPlan(path: str, costModel: CostModel = None) -> Recorder:
+    """
+    Runs a plan file through the steps of its command, the plan replaces planning from the dialog values
+    """
+    install()
+    graph, parameters = loadAddinModule('lib.gridfinityUtils.planSerializer').readPlan(path)
+    if not parameters or 'spec' not in parameters:
+        raise ValueError('{} has no parameters to replay'.format(path))
+    spec, isLowFidelity = parameters['spec'], parameters.get('isLowFidelity', False)
+    recorder = Recorder(costModel)
+    if spec.get('type') == 'bin':
+        return recordBin(spec, recorder, isLowFidelity, graph)
+    if spec.get('type') == 'baseplate':
+        return recordBaseplate(spec, recorder, isLowFidelity, graph)
+    raise ValueError('Unknown item type "{}", expected bin or baseplate'.format(spec.get('type', '')))
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Replay or diff saved generation plans without Fusion')
+    parser.add_argument('plan', help='plan file from the plans folder of the add-in')
+    parser.add_argument('--diff', help='print the operations that differ from this plan file')
+    parser.add_argument('--replan', action='store_true', help='print the operations that differ from a fresh plan of the same parameters')
+    parser.add_argument('--costs', help='JSON cost model overrides, {"kind": {"base": s, "perUnit": {"counter": s}}}')
+    args = parser.parse_args(argv)
+
+    install()
+    planSerializer = loadAddinModule('lib.gridfinityUtils.planSerializer')
+    if args.diff or args.replan:
+        graph, parameters = planSerializer.readPlan(args.plan)
+        if args.diff:
+            other, _ = planSerializer.readPlan(args.diff)
+        else:
+            other = planItem(parameters['spec'], parameters.get('isLowFidelity', False))
+        lines = planSerializer.diffPlans(graph, other)
+        for line in lines:
+            print(line)
+        return 1 if lines else 0
+
+    costModel = CostModel.fromJson(args.costs) if args.costs else None
+    summary = replayPlan(args.plan, costModel).summary()
+    print('{:>6} ops {:>4} combine tools {:8.3f}s  {}'.format(
+        summary['operations'],
+        int(summary['combineToolBodies']),
+        summary['estimatedSeconds'],
+        ' '.join('{}={}'.format(kind, count) for kind, count in summary['counts'].items()),
+    ))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
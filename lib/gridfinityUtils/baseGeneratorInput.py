@@ -11,6 +11,7 @@ class BaseGeneratorInput():
         self.magnetCutoutsDiameter = DIMENSION_MAGNET_CUTOUT_DIAMETER
         self.magnetCutoutsDepth = DIMENSION_MAGNET_CUTOUT_DEPTH
         self.cornerFilletRadius = BIN_CORNER_FILLET_RADIUS
+        self.isLowFidelity = False
 
     @property
     def originPoint(self) -> adsk.core.Point3D:
@@ -98,4 +99,12 @@ class BaseGeneratorInput():
 
     @magnetCutoutsDepth.setter
     def magnetCutoutsDepth(self, value: float):
-        self._magnetCutoutsDepth = value
\ No newline at end of file
+        self._magnetCutoutsDepth = value
+
+    @property
+    def isLowFidelity(self) -> bool:
+        return self._isLowFidelity
+
+    @isLowFidelity.setter
+    def isLowFidelity(self, value: bool):
+        self._isLowFidelity = value
@@ -21,6 +21,7 @@ class BaseplateGeneratorInput():
         self.hasClipsRight = False
         self.hasClipsTop = False
         self.hasClipsBottom = False
+        self.isLowFidelity = False
 
     @property
     def baseWidth(self) -> float:
@@ -245,3 +246,11 @@ class BaseplateGeneratorInput():
     @hasClipsBottom.setter
     def hasClipsBottom(self, value: bool):
         self._hasClipsBottom = value
+
+    @property
+    def isLowFidelity(self) -> bool:
+        return self._isLowFidelity
+
+    @isLowFidelity.setter
+    def isLowFidelity(self, value: bool):
+        self._isLowFidelity = value
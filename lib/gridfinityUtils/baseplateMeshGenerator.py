@@ -0,0 +1,381 @@
+import math
+
+from . import const, meshUtils
+from .meshUtils import Mesh, MeshModel
+
+# Fusion free counterpart of createGridfinityBaseplate, input is read duck typed like in binMeshGenerator.
+#
+# The plate is split into zones that tile it: grid cells, padding segments (one per cell along each
+# padded edge) and padding corners. Every zone is a set of closed shells that touch or overlap,
+# built once per distinct variant and stamped over the grid by translation:
+# - cell frame: the material around the socket, four corner blocks and four side prisms,
+#   side prisms carry the clip cutout profile
+# - extended bottom: four quadrant blocks with magnet and screw holes, or for skeletonized plates
+#   four hole pads plus the bars left around the center cutout, bars carry the connection holes
+# The outer corner fillet is limited to the zone holding the corner, the bottom edge chamfer is not modelled.
+
+CORNERS = [(0, 0), (1, 0), (1, 1), (0, 1)] # same order as roundedCornersRing radii
+
+def _holeProfile(input, layout: '_BaseplateLayout') -> list[tuple[float, float]]:
+    # magnet socket from the top of the extension, screw hole through with a chamfered head cutout at the bottom
+    if not layout.hasExtendedBottom:
+        return []
+    top = -const.BIN_BASE_HEIGHT
+    bottom = layout.bottom
+    hasMagnetCutouts = input.hasMagnetCutouts and (input.magnetCutoutsDiameter > input.screwHolesDiameter or not input.hasScrewHoles)
+    magnetDepth = min(input.magnetCutoutsDepth, layout.extensionHeight) if hasMagnetCutouts else 0
+    profile = []
+    if hasMagnetCutouts:
+        profile += [(input.magnetCutoutsDiameter / 2, top), (input.magnetCutoutsDiameter / 2, top - magnetDepth)]
+    screwTop = top - magnetDepth
+    if input.hasScrewHoles and screwTop > bottom:
+        screwRadius = input.screwHolesDiameter / 2
+        profile.append((screwRadius, screwTop))
+        if input.screwHeadCutoutDiameter > input.screwHolesDiameter:
+            headRadius = input.screwHeadCutoutDiameter / 2
+            headHeight = min(const.DIMENSION_SCREW_HEAD_CUTOUT_OFFSET_HEIGHT + headRadius - screwRadius, screwTop - bottom)
+            profile += [
+                (screwRadius, bottom + headHeight),
+                (headRadius, bottom + min(const.DIMENSION_SCREW_HEAD_CUTOUT_OFFSET_HEIGHT, headHeight)),
+                (headRadius, bottom),
+            ]
+        else:
+            profile.append((screwRadius, bottom))
+    return profile
+
+class _BaseplateLayout():
+    def __init__(self, input):
+        clearance = input.xyClearance
+        self.cellWidth = input.baseWidth
+        self.cellLength = input.baseLength
+        self.countX = int(input.baseplateWidth)
+        self.countY = int(input.baseplateLength)
+        self.width = self.countX * self.cellWidth
+        self.length = self.countY * self.cellLength
+        self.socketRadius = input.cornerFilletRadius + clearance
+        # (z, inset) from the top down, the base body used as socket cutout always has the bottom chamfer
+        self.socketProfile = [
+            (0, 0),
+            (-const.BIN_BASE_TOP_SECTION_HEIGH, const.BIN_BASE_TOP_SECTION_HEIGH),
+            (-const.BIN_BASE_HEIGHT + const.BIN_BASE_BOTTOM_SECTION_HEIGH, const.BIN_BASE_TOP_SECTION_HEIGH),
+            (-const.BIN_BASE_HEIGHT, const.BIN_BASE_TOP_SECTION_HEIGH + const.BIN_BASE_BOTTOM_SECTION_HEIGH),
+        ]
+        self.socketBottomInset = self.socketProfile[-1][1]
+        self.outerRadius = max(0, min(input.cornerFilletRadius - clearance, self.socketRadius))
+        self.hasExtendedBottom = input.hasExtendedBottom
+        self.extensionHeight = input.bottomExtensionHeight if input.hasExtendedBottom else 0
+        self.bottom = -const.BIN_BASE_HEIGHT - self.extensionHeight
+        self.hasSkeleton = input.hasExtendedBottom and input.hasSkeletonizedBottom
+        self.hasConnectionHoles = self.hasSkeleton and input.hasConnectionHoles
+        # left, right, bottom, top
+        self.paddings = tuple(max(0, value) if input.hasPadding else 0 for value in (input.paddingLeft, input.paddingRight, input.paddingBottom, input.paddingTop))
+        self.clipSides = tuple(input.hasClips and value for value in (input.hasClipsLeft, input.hasClipsRight, input.hasClipsBottom, input.hasClipsTop))
+        # holes and the skeleton cutout are centered on (width / 2 - clearance, length / 2 - clearance) like in createGridfinityBaseplate
+        self.holesCenterX = self.cellWidth / 2 - clearance
+        self.holesCenterY = self.cellLength / 2 - clearance
+        self.holeXs = (const.DIMENSION_SCREW_HOLES_OFFSET - clearance, self.cellWidth - const.DIMENSION_SCREW_HOLES_OFFSET - clearance)
+        self.holeYs = (const.DIMENSION_SCREW_HOLES_OFFSET - clearance, self.cellLength - const.DIMENSION_SCREW_HOLES_OFFSET - clearance)
+        self.cutoutXs = (self.socketBottomInset, self.holesCenterX * 2 - self.socketBottomInset)
+        self.cutoutYs = (self.socketBottomInset, self.holesCenterY * 2 - self.socketBottomInset)
+        self.holeProfile = _holeProfile(input, self)
+        self.padRadius = max(input.magnetCutoutsDiameter, input.screwHeadCutoutDiameter) / 2 + const.SKELETON_CLEARANCE
+        self.connectionHoleRadius = input.connectionScrewHolesDiameter / 2
+        self.connectionHoleZ = -const.BIN_BASE_HEIGHT - self.extensionHeight / 2
+        self.connectionHoleLength = self.cellWidth / 2
+
+    def isOuterCorner(self, edges: tuple[bool, bool, bool, bool], cornerX: int, cornerY: int) -> bool:
+        return edges[cornerX] and edges[2 + cornerY] and self.paddings[cornerX] == 0 and self.paddings[2 + cornerY] == 0
+
+def _socketInset(layout: _BaseplateLayout, z: float) -> float:
+    for (upperZ, upperInset), (lowerZ, lowerInset) in zip(layout.socketProfile, layout.socketProfile[1:]):
+        if lowerZ <= z <= upperZ:
+            return lowerInset + (upperInset - lowerInset) * (z - lowerZ) / (upperZ - lowerZ)
+    return layout.socketBottomInset
+
+def _sideProfile(layout: _BaseplateLayout) -> list[tuple[float, float]]:
+    # (inset, z) section of the frame along a straight cell side
+    return [(0, -const.BIN_BASE_HEIGHT)] + [(inset, z) for (z, inset) in reversed(layout.socketProfile)]
+
+def _clipProfile(layout: _BaseplateLayout) -> list[tuple[float, float]]:
+    # side section minus the stacked clip cutout parts, which all end at the socket wall, see createClipCutoutBodies
+    tolerance = 10 ** -meshUtils.MESH_VERTEX_DECIMALS
+    part1Bottom = const.CLIP_PART1_Z_INSET - const.CLIP_PART1_DEPTH
+    part2Bottom = const.CLIP_PART2_Z_INSET - const.CLIP_PART2_DEPTH
+    part4Bottom = const.CLIP_PART4_Z_INSET - const.CLIP_PART4_DEPTH
+    profile = [(inset, z) for (inset, z) in _sideProfile(layout) if z < part4Bottom - tolerance]
+    return profile + [
+        (_socketInset(layout, part4Bottom), part4Bottom),
+        (const.CLIP_PART4_EDGE_INSET, part4Bottom),
+        (const.CLIP_PART4_EDGE_INSET, const.CLIP_PART4_Z_INSET),
+        (const.CLIP_PART2_EDGE_INSET, part2Bottom),
+        (const.CLIP_PART2_EDGE_INSET, const.CLIP_PART2_Z_INSET),
+        (const.CLIP_PART1_EDGE_INSET, part1Bottom),
+    ]
+
+def _createFrameCornerMesh(layout: _BaseplateLayout, isOuterCorner: bool) -> Mesh:
+    """
+    Frame between the bottom left corner of a cell and the rounded socket corner
+    """
+    radius = layout.socketRadius
+    corner = meshUtils.arcPoints(layout.outerRadius, layout.outerRadius, layout.outerRadius, math.pi) if isOuterCorner and layout.outerRadius > 0 else [(0, 0)]
+    rings = []
+    for z, inset in reversed(layout.socketProfile):
+        socketArc = meshUtils.arcPoints(radius, radius, radius - inset, -math.pi / 2, meshUtils.MESH_ARC_SEGMENTS, -math.pi / 2)
+        rings.append((corner + [(radius, 0)] + socketArc + [(0, radius)], z))
+    return meshUtils.createLoftMesh(rings, 'Frame corner')
+
+def _createFrameSideMeshes(layout: _BaseplateLayout, sideLength: float, hasClip: bool) -> list[Mesh]:
+    """
+    Frame along the bottom side of a cell, built with the side section in the xy plane and swept along z
+    """
+    start = layout.socketRadius
+    end = sideLength - layout.socketRadius
+    segments = [(start, end, _sideProfile(layout))]
+    if hasClip:
+        clipStart = max(start, sideLength / 2 - const.CLIP_PROFILE_LENGTH / 2)
+        clipEnd = min(end, sideLength / 2 + const.CLIP_PROFILE_LENGTH / 2)
+        segments = [
+            (start, clipStart, _sideProfile(layout)),
+            (clipStart, clipEnd, _clipProfile(layout)),
+            (clipEnd, end, _sideProfile(layout)),
+        ]
+    return [
+        meshUtils.transformMesh(meshUtils.createLoftMesh([(profile, segmentStart), (profile, segmentEnd)]), lambda p: (p[2], p[0], p[1]), 'Frame side')
+        for (segmentStart, segmentEnd, profile) in segments
+        if segmentEnd > segmentStart
+    ]
+
+def _createHoledBlockMesh(
+    outline: list[tuple[float, float]],
+    holeCenter: tuple[float, float],
+    holeProfile: list[tuple[float, float]],
+    zMin: float,
+    zMax: float,
+    name: str = '',
+) -> Mesh:
+    """
+    Convex outline extruded between zMin and zMax with a round hole given as (radius, z) from the top down.
+    Holes not reaching the top or the bottom are blind.
+    """
+    mesh = Mesh(name)
+    [bottomRing, topRing] = meshUtils.addLoft(mesh, [(outline, zMin), (outline, zMax)])
+    if not holeProfile:
+        meshUtils.addPolygon(mesh, bottomRing, False)
+        meshUtils.addPolygon(mesh, topRing, True)
+        return mesh
+    tolerance = 10 ** -meshUtils.MESH_VERTEX_DECIMALS
+    holeRings = meshUtils.addLoft(mesh, [(meshUtils.circleRing(holeCenter[0], holeCenter[1], radius), z) for (radius, z) in holeProfile])
+    if holeProfile[0][1] >= zMax - tolerance:
+        meshUtils.addAnnulus(mesh, holeRings[0], topRing, holeCenter, True)
+    else:
+        meshUtils.addPolygon(mesh, topRing, True)
+        meshUtils.addFan(mesh, holeRings[0], False)
+    if holeProfile[-1][1] <= zMin + tolerance:
+        meshUtils.addAnnulus(mesh, holeRings[-1], bottomRing, holeCenter, False)
+    else:
+        meshUtils.addPolygon(mesh, bottomRing, False)
+        meshUtils.addFan(mesh, holeRings[-1], True)
+    return mesh
+
+def _createBarMesh(
+    layout: _BaseplateLayout,
+    bounds: tuple[float, float, float, float, float, float],
+    holeAxis: int = None,
+    holePosition: float = 0,
+    holeSpan: tuple[float, float] = (0, 0),
+    name: str = 'Bar',
+) -> Mesh:
+    """
+    Box (xMin, yMin, zMin, xMax, yMax, zMax) with a connection screw hole running along x (holeAxis 0)
+    or y (holeAxis 1) within holeSpan, at holePosition on the other horizontal axis
+    """
+    (xMin, yMin, zMin, xMax, yMax, zMax) = bounds
+    if holeAxis is None:
+        return meshUtils.createBoxMesh(*bounds, name)
+    (faceMin, faceMax, alongMin, alongMax) = (xMin, xMax, yMin, yMax) if holeAxis == 1 else (yMin, yMax, xMin, xMax)
+    radius = layout.connectionHoleRadius
+    holeZ = layout.connectionHoleZ
+    holeStart = max(holeSpan[0], alongMin)
+    holeEnd = min(holeSpan[1], alongMax)
+    isFitting = faceMin + radius < holePosition < faceMax - radius and zMin + radius < holeZ < zMax - radius
+    if not isFitting or holeEnd <= holeStart:
+        return meshUtils.createBoxMesh(*bounds, name)
+    # built with the hole along z, then the hole axis and z are swapped back
+    mesh = _createHoledBlockMesh(
+        meshUtils.roundedCornersRing(faceMin, zMin, faceMax, zMax, (0, 0, 0, 0)),
+        (holePosition, holeZ),
+        [(radius, holeEnd), (radius, holeStart)],
+        alongMin,
+        alongMax,
+    )
+    if holeAxis == 1:
+        return meshUtils.transformMesh(mesh, lambda p: (p[0], p[2], p[1]), name)
+    return meshUtils.transformMesh(mesh, lambda p: (p[2], p[0], p[1]), name)
+
+def _createQuadrantMeshes(layout: _BaseplateLayout, outerCorners: list[bool]) -> list[Mesh]:
+    # solid extended bottom, split through the holes center so every quadrant holds one hole
+    splitX, splitY = layout.holesCenterX, layout.holesCenterY
+    meshes = []
+    for (cornerX, cornerY), isOuterCorner in zip(CORNERS, outerCorners):
+        xMin, xMax = (0, splitX) if cornerX == 0 else (splitX, layout.cellWidth)
+        yMin, yMax = (0, splitY) if cornerY == 0 else (splitY, layout.cellLength)
+        radii = [layout.outerRadius if (corner == (cornerX, cornerY) and isOuterCorner) else 0 for corner in CORNERS]
+        meshes.append(_createHoledBlockMesh(
+            meshUtils.roundedCornersRing(xMin, yMin, xMax, yMax, radii),
+            (layout.holeXs[cornerX], layout.holeYs[cornerY]),
+            layout.holeProfile,
+            layout.bottom,
+            -const.BIN_BASE_HEIGHT,
+            'Bottom',
+        ))
+    return meshes
+
+def _createSkeletonMeshes(layout: _BaseplateLayout, outerCorners: list[bool], connectionSides: tuple[bool, bool, bool, bool]) -> list[Mesh]:
+    # skeletonized bottom: hole pads in the cutout corners, corner pieces and bars around the cutout
+    width, length = layout.cellWidth, layout.cellLength
+    top = -const.BIN_BASE_HEIGHT
+    meshes = []
+    cornerSizes = {}
+    for (cornerX, cornerY), isOuterCorner in zip(CORNERS, outerCorners):
+        holeX, holeY = layout.holeXs[cornerX], layout.holeYs[cornerY]
+        xMin, xMax = (layout.cutoutXs[0], holeX + layout.padRadius) if cornerX == 0 else (holeX - layout.padRadius, layout.cutoutXs[1])
+        yMin, yMax = (layout.cutoutYs[0], holeY + layout.padRadius) if cornerY == 0 else (holeY - layout.padRadius, layout.cutoutYs[1])
+        radii = [layout.padRadius if corner == (1 - cornerX, 1 - cornerY) else 0 for corner in CORNERS]
+        meshes.append(_createHoledBlockMesh(meshUtils.roundedCornersRing(xMin, yMin, xMax, yMax, radii), (holeX, holeY), layout.holeProfile, layout.bottom, top, 'Bottom pad'))
+
+        bandX = layout.cutoutXs[0] if cornerX == 0 else width - layout.cutoutXs[1]
+        bandY = layout.cutoutYs[0] if cornerY == 0 else length - layout.cutoutYs[1]
+        # corner pieces reaching into the cutout stay within the pads
+        sizeX = max(bandX, layout.outerRadius if isOuterCorner else 0)
+        sizeY = max(bandY, layout.outerRadius if isOuterCorner else 0)
+        cornerSizes[(cornerX, cornerY)] = (sizeX, sizeY)
+        xMin, xMax = (0, sizeX) if cornerX == 0 else (width - sizeX, width)
+        yMin, yMax = (0, sizeY) if cornerY == 0 else (length - sizeY, length)
+        radii = [layout.outerRadius if (corner == (cornerX, cornerY) and isOuterCorner) else 0 for corner in CORNERS]
+        meshes.append(meshUtils.createLoftMesh([(meshUtils.roundedCornersRing(xMin, yMin, xMax, yMax, radii), z) for z in (layout.bottom, top)], 'Bottom corner'))
+
+    [isLeft, isRight, isBottom, isTop] = connectionSides
+    bars = [
+        ((0, cornerSizes[(0, 0)][1], layout.bottom, layout.cutoutXs[0], length - cornerSizes[(0, 1)][1], top), isLeft, 0, layout.holesCenterY),
+        ((layout.cutoutXs[1], cornerSizes[(1, 0)][1], layout.bottom, width, length - cornerSizes[(1, 1)][1], top), isRight, 0, layout.holesCenterY),
+        ((cornerSizes[(0, 0)][0], 0, layout.bottom, width - cornerSizes[(1, 0)][0], layout.cutoutYs[0], top), isBottom, 1, layout.holesCenterX),
+        ((cornerSizes[(0, 1)][0], layout.cutoutYs[1], layout.bottom, width - cornerSizes[(1, 1)][0], length, top), isTop, 1, layout.holesCenterX),
+    ]
+    for bounds, hasHole, holeAxis, holePosition in bars:
+        if hasHole:
+            meshes.append(_createBarMesh(layout, bounds, holeAxis, holePosition, (-math.inf, math.inf), 'Bottom bar'))
+        else:
+            meshes.append(_createBarMesh(layout, bounds, name='Bottom bar'))
+    return meshes
+
+def _createCellModel(layout: _BaseplateLayout, edges: tuple[bool, bool, bool, bool]) -> MeshModel:
+    """
+    One grid cell at the origin, edges tells which of its left, right, bottom, top sides are on the plate edge
+    """
+    model = MeshModel('Baseplate cell')
+    width, length = layout.cellWidth, layout.cellLength
+    outerCorners = [layout.isOuterCorner(edges, cornerX, cornerY) for (cornerX, cornerY) in CORNERS]
+    for (cornerX, cornerY), isOuterCorner in zip(CORNERS, outerCorners):
+        model.addPart(meshUtils.transformMesh(
+            _createFrameCornerMesh(layout, isOuterCorner),
+            lambda p, cornerX=cornerX, cornerY=cornerY: (width - p[0] if cornerX else p[0], length - p[1] if cornerY else p[1], p[2]),
+        ))
+    clipSides = [edge and hasClip for edge, hasClip in zip(edges, layout.clipSides)]
+    sides = [
+        (length, clipSides[0], lambda p: (p[1], p[0], p[2])),
+        (length, clipSides[1], lambda p: (width - p[1], p[0], p[2])),
+        (width, clipSides[2], lambda p: p),
+        (width, clipSides[3], lambda p: (p[0], length - p[1], p[2])),
+    ]
+    for sideLength, hasClip, transform in sides:
+        for mesh in _createFrameSideMeshes(layout, sideLength, hasClip):
+            model.addPart(meshUtils.transformMesh(mesh, transform))
+
+    if layout.hasSkeleton:
+        connectionSides = tuple(edge and layout.hasConnectionHoles for edge in edges)
+        for mesh in _createSkeletonMeshes(layout, outerCorners, connectionSides):
+            model.addPart(mesh)
+    elif layout.hasExtendedBottom:
+        for mesh in _createQuadrantMeshes(layout, outerCorners):
+            model.addPart(mesh)
+    return model
+
+def _createPaddingSegmentMeshes(
+    layout: _BaseplateLayout,
+    sideLength: float,
+    padding: float,
+    holePosition: float,
+    holeDepth: float,
+    isStartCorner: bool,
+    isEndCorner: bool,
+) -> list[Mesh]:
+    """
+    Padding next to one cell, with x along the plate edge and y pointing away from the grid
+    """
+    radius = min(layout.outerRadius, padding, sideLength / 2)
+    start = radius if isStartCorner else 0
+    end = sideLength - radius if isEndCorner else sideLength
+    meshes = []
+    if isStartCorner:
+        meshes.append(meshUtils.createLoftMesh([(meshUtils.roundedCornersRing(0, 0, start, padding, (0, 0, 0, radius)), z) for z in (layout.bottom, 0)], 'Padding'))
+    if isEndCorner:
+        meshes.append(meshUtils.createLoftMesh([(meshUtils.roundedCornersRing(end, 0, sideLength, padding, (0, 0, radius, 0)), z) for z in (layout.bottom, 0)], 'Padding'))
+    bounds = (start, 0, layout.bottom, end, padding, 0)
+    if layout.hasConnectionHoles and holeDepth > 0:
+        meshes.append(_createBarMesh(layout, bounds, 1, holePosition, (0, holeDepth), 'Padding'))
+    else:
+        meshes.append(_createBarMesh(layout, bounds, name='Padding'))
+    return meshes
+
+def _addPadding(model: MeshModel, layout: _BaseplateLayout):
+    [left, right, bottom, top] = layout.paddings
+    width, length = layout.width, layout.length
+    # plate edge, padding, cells along it, cell size, holes position, hole depth past the edge, transform
+    sides = [
+        (left, layout.countY, layout.cellLength, layout.holesCenterY, layout.connectionHoleLength - layout.cutoutXs[0], lambda p: (-p[1], p[0], p[2])),
+        (right, layout.countY, layout.cellLength, layout.holesCenterY, layout.cutoutXs[1] + layout.connectionHoleLength - layout.cellWidth, lambda p: (width + p[1], p[0], p[2])),
+        (bottom, layout.countX, layout.cellWidth, layout.holesCenterX, layout.connectionHoleLength - layout.cutoutYs[0], lambda p: (p[0], -p[1], p[2])),
+        (top, layout.countX, layout.cellWidth, layout.holesCenterX, layout.cutoutYs[1] + layout.connectionHoleLength - layout.cellLength, lambda p: (p[0], length + p[1], p[2])),
+    ]
+    for index, (padding, count, cellSize, holePosition, holeDepth, transform) in enumerate(sides):
+        if padding <= 0:
+            continue
+        # the paddings across the plate corners decide whether the segment ends hold a rounded plate corner
+        [startPadding, endPadding] = (bottom, top) if index < 2 else (left, right)
+        isAlongX = index >= 2
+        segments = {}
+        for i in range(count):
+            key = (i == 0 and startPadding == 0, i == count - 1 and endPadding == 0)
+            if key not in segments:
+                segments[key] = [
+                    meshUtils.transformMesh(mesh, transform)
+                    for mesh in _createPaddingSegmentMeshes(layout, cellSize, padding, holePosition, holeDepth, *key)
+                ]
+            for mesh in segments[key]:
+                model.addPart(mesh, (i * cellSize, 0, 0) if isAlongX else (0, i * cellSize, 0))
+
+    for (cornerX, cornerY) in CORNERS:
+        paddingX, paddingY = layout.paddings[cornerX], layout.paddings[2 + cornerY]
+        if paddingX <= 0 or paddingY <= 0:
+            continue
+        xMin, xMax = (-paddingX, 0) if cornerX == 0 else (width, width + paddingX)
+        yMin, yMax = (-paddingY, 0) if cornerY == 0 else (length, length + paddingY)
+        radius = min(layout.outerRadius, paddingX, paddingY)
+        radii = [radius if corner == (cornerX, cornerY) else 0 for corner in CORNERS]
+        model.addPart(meshUtils.createLoftMesh([(meshUtils.roundedCornersRing(xMin, yMin, xMax, yMax, radii), z) for z in (layout.bottom, 0)], 'Padding corner'))
+
+def createGridfinityBaseplateMesh(input, name: str = '') -> MeshModel:
+    """
+    Headless equivalent of createGridfinityBaseplate: cell variants stamped over the grid plus the padding
+    """
+    layout = _BaseplateLayout(input)
+    model = MeshModel(name or 'Gridfinity baseplate {}x{}'.format(int(input.baseplateLength), int(input.baseplateWidth)))
+    cells: dict[tuple[bool, bool, bool, bool], MeshModel] = {}
+    for i in range(layout.countX):
+        for j in range(layout.countY):
+            edges = (i == 0, i == layout.countX - 1, j == 0, j == layout.countY - 1)
+            if edges not in cells:
+                cells[edges] = _createCellModel(layout, edges)
+            model.addModel(cells[edges], (i * layout.cellWidth, j * layout.cellLength, 0))
+    _addPadding(model, layout)
+    return model
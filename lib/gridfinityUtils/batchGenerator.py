@@ -0,0 +1,465 @@
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from types import SimpleNamespace
+from typing import Callable
+
+from . import const, meshCache, meshUtils
+from .binMeshGenerator import createGridfinityBinMesh, unsupportedMeshOptions
+from .baseplateMeshGenerator import createGridfinityBaseplateMesh
+
+# Batch renderer for bin and baseplate catalogs, runs without Fusion:
+#   python -m lib.gridfinityUtils.batchGenerator manifest.json --output out --jobs 32
+#
+# A manifest is a JSON list of specs (or {"items": [...]}) or a CSV file with one spec per row.
+# Every spec has a "type" ("bin" or "baseplate") and the fields the create bin / create baseplate
+# dialogs provide, missing fields take the dialog defaults. Lengths are in cm like in the dialogs,
+# the tab angle is in degrees. Optional "name" and "output" (file name) override the generated ones.
+#
+# The meshes do not cover every dialog option yet: shelled bins, lip notches, magnet cutout tabs and print
+# helper grooves around screw holes wider than 70% of the magnet cutouts are not modelled. Items using them
+# fail with the options named instead of rendering a different part, generate those in Fusion.
+
+BATCH_ITEM_BIN = 'bin'
+BATCH_ITEM_BASEPLATE = 'baseplate'
+
+BATCH_FORMAT_STL = 'stl'
+BATCH_FORMAT_3MF = '3mf'
+BATCH_FORMATS = [BATCH_FORMAT_STL, BATCH_FORMAT_3MF]
+
+BIN_TYPE_HOLLOW = 'Hollow'
+BIN_TYPE_SHELLED = 'Shelled'
+BIN_TYPE_SOLID = 'Solid'
+
+BIN_COMPARTMENTS_GRID_TYPE_UNIFORM = 'Uniform'
+BIN_COMPARTMENTS_GRID_TYPE_CUSTOM = 'Custom grid'
+
+BASEPLATE_TYPE_LIGHT = 'Light'
+BASEPLATE_TYPE_FULL = 'Full'
+BASEPLATE_TYPE_SKELETONIZED = 'Skeletonized'
+
+_COMMON_FIELDS = {
+    'type': '',
+    'name': '',
+    'output': '',
+    'format': '',
+}
+
+# same fields and defaults as the create bin dialog
+BIN_SPEC_DEFAULTS = {
+    'baseWidth': const.DIMENSION_DEFAULT_WIDTH_UNIT,
+    'baseLength': const.DIMENSION_DEFAULT_WIDTH_UNIT,
+    'heightUnit': const.DIMENSION_DEFAULT_HEIGHT_UNIT,
+    'xyClearance': const.BIN_XY_CLEARANCE,
+    'binWidth': 2,
+    'binLength': 3,
+    'binHeight': 5.0,
+    'binType': BIN_TYPE_HOLLOW,
+    'wallThickness': const.BIN_WALL_THICKNESS,
+    'hasLip': True,
+    'hasLipNotches': False,
+    'compartmentsX': 1,
+    'compartmentsY': 1,
+    'compartmentsGridType': BIN_COMPARTMENTS_GRID_TYPE_UNIFORM,
+    'compartments': [],
+    'hasScoop': False,
+    'scoopMaxRadius': const.BIN_SCOOP_MAX_RADIUS,
+    'hasTab': False,
+    'tabLength': 1.0,
+    'tabWidth': const.BIN_TAB_WIDTH,
+    'tabPosition': 0.0,
+    'tabAngle': 45.0,
+    'generateBody': True,
+    'generateBase': True,
+    'hasScrewHoles': False,
+    'screwHoleDiameter': const.DIMENSION_SCREW_HOLE_DIAMETER,
+    'hasMagnetCutouts': False,
+    'hasMagnetCutoutsTabs': False,
+    'magnetCutoutDiameter': const.DIMENSION_MAGNET_CUTOUT_DIAMETER,
+    'magnetCutoutDepth': const.DIMENSION_MAGNET_CUTOUT_DEPTH,
+}
+
+# same fields and defaults as the create baseplate dialog (InputState)
+BASEPLATE_SPEC_DEFAULTS = {
+    'baseWidth': const.DIMENSION_DEFAULT_WIDTH_UNIT,
+    'baseLength': const.DIMENSION_DEFAULT_WIDTH_UNIT,
+    'xyClearance': const.BIN_XY_CLEARANCE,
+    'plateWidth': 2,
+    'plateLength': 3,
+    'plateType': BASEPLATE_TYPE_LIGHT,
+    'hasMagnetSockets': True,
+    'magnetSocketSize': const.DIMENSION_MAGNET_CUTOUT_DIAMETER,
+    'magnetSocketDepth': const.DIMENSION_MAGNET_CUTOUT_DEPTH,
+    'hasScrewHoles': True,
+    'screwHoleSize': const.DIMENSION_PLATE_SCREW_HOLE_DIAMETER,
+    'screwHeadSize': const.DIMENSION_SCREW_HEAD_CUTOUT_DIAMETER,
+    'hasPadding': False,
+    'paddingLeft': 0.0,
+    'paddingTop': 0.0,
+    'paddingRight': 0.0,
+    'paddingBottom': 0.0,
+    'extraBottomThickness': const.BASEPLATE_EXTRA_HEIGHT,
+    'verticalClearance': const.BASEPLATE_BIN_Z_CLEARANCE,
+    'hasConnectionHoles': False,
+    'connectionHoleSize': const.DIMENSION_PLATE_CONNECTION_SCREW_HOLE_DIAMETER,
+    'hasClips': False,
+    'hasClipsLeft': True,
+    'hasClipsRight': True,
+    'hasClipsTop': True,
+    'hasClipsBottom': True,
+}
+
+SPEC_DEFAULTS = {
+    BATCH_ITEM_BIN: BIN_SPEC_DEFAULTS,
+    BATCH_ITEM_BASEPLATE: BASEPLATE_SPEC_DEFAULTS,
+}
+
+@dataclass
+class BatchItemResult:
+    index: int
+    name: str
+    path: str
+    seconds: float
+    triangleCount: int = 0
+    isCached: bool = False
+    error: str = ''
+
+    @property
+    def isOk(self) -> bool:
+        return not self.error
+
+def _parseBool(value) -> bool:
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized in ('1', 'true', 'yes', 'y', 'on'):
+            return True
+        if normalized in ('0', 'false', 'no', 'n', 'off', ''):
+            return False
+        raise ValueError('Expected a boolean, got "{}"'.format(value))
+    return bool(value)
+
+def _coerce(key: str, value, default):
+    try:
+        if isinstance(default, bool):
+            return _parseBool(value)
+        if isinstance(default, int):
+            number = float(value)
+            if not number.is_integer():
+                raise ValueError('expected a whole number')
+            return int(number)
+        if isinstance(default, float):
+            return float(value)
+        if isinstance(default, list):
+            return json.loads(value) if isinstance(value, str) else list(value)
+        return str(value)
+    except (TypeError, ValueError) as err:
+        raise ValueError('Invalid value for "{}": {!r} ({})'.format(key, value, err))
+
+def normalizeSpec(spec: dict) -> dict:
+    """
+    Validates a manifest entry and fills in the dialog defaults
+    """
+    itemType = str(spec.get('type', '')).strip().lower()
+    if itemType not in SPEC_DEFAULTS:
+        raise ValueError('Unknown item type "{}", expected one of {}'.format(spec.get('type', ''), ', '.join(SPEC_DEFAULTS)))
+    defaults = SPEC_DEFAULTS[itemType]
+    # empty csv cells fall back to defaults, so one csv can hold bins and baseplates
+    values = {key: value for key, value in spec.items() if value is not None and not (isinstance(value, str) and value.strip() == '')}
+    unknown = [key for key in values if key not in defaults and key not in _COMMON_FIELDS]
+    if unknown:
+        raise ValueError('Unknown {} fields: {}'.format(itemType, ', '.join(sorted(unknown))))
+
+    normalized = dict(_COMMON_FIELDS)
+    normalized.update(defaults)
+    for key, value in values.items():
+        normalized[key] = _coerce(key, value, normalized[key])
+    normalized['type'] = itemType
+    normalized['format'] = normalized['format'].lower()
+    if normalized['format'] and normalized['format'] not in BATCH_FORMATS:
+        raise ValueError('Unknown format "{}", expected one of {}'.format(normalized['format'], ', '.join(BATCH_FORMATS)))
+    return normalized
+
+def _uniformCompartments(countX: int, countY: int) -> list[SimpleNamespace]:
+    return [SimpleNamespace(positionX=i, positionY=j, width=1, length=1, depth=9999999999999) for i in range(countX) for j in range(countY)]
+
+def createBinInputs(spec: dict) -> tuple[SimpleNamespace, SimpleNamespace]:
+    """
+    Mirrors generateBin in the create bin command, returns (binBodyInput, baseInput)
+    """
+    isHollow = spec['binType'] == BIN_TYPE_HOLLOW
+    isSolid = spec['binType'] == BIN_TYPE_SOLID
+    isShelled = spec['binType'] == BIN_TYPE_SHELLED
+    if not (isHollow or isSolid or isShelled):
+        raise ValueError('Unknown bin type "{}"'.format(spec['binType']))
+    if isShelled:
+        raise ValueError('Shelled bins are not supported by the headless generator')
+
+    baseInput = SimpleNamespace(
+        baseWidth=spec['baseWidth'],
+        baseLength=spec['baseLength'],
+        xyClearance=spec['xyClearance'],
+        hasScrewHoles=spec['hasScrewHoles'],
+        hasMagnetCutouts=spec['hasMagnetCutouts'],
+        hasMagnetCutoutsTabs=spec['hasMagnetCutoutsTabs'],
+        hasBottomChamfer=True,
+        screwHolesDiameter=spec['screwHoleDiameter'],
+        magnetCutoutsDiameter=spec['magnetCutoutDiameter'],
+        magnetCutoutsDepth=spec['magnetCutoutDepth'],
+        cornerFilletRadius=const.BIN_CORNER_FILLET_RADIUS,
+        isLowFidelity=False,
+    )
+
+    if spec['compartmentsGridType'] == BIN_COMPARTMENTS_GRID_TYPE_UNIFORM:
+        compartments = _uniformCompartments(spec['compartmentsX'], spec['compartmentsY'])
+    elif spec['compartmentsGridType'] == BIN_COMPARTMENTS_GRID_TYPE_CUSTOM:
+        compartments = [
+            SimpleNamespace(
+                positionX=compartment.get('positionX', 0),
+                positionY=compartment.get('positionY', 0),
+                width=compartment.get('width', 1),
+                length=compartment.get('length', 1),
+                depth=compartment.get('depth', 9999999999999),
+            )
+            for compartment in spec['compartments']
+        ]
+    else:
+        raise ValueError('Unknown compartments grid type "{}"'.format(spec['compartmentsGridType']))
+
+    binBodyInput = SimpleNamespace(
+        hasLip=spec['hasLip'],
+        hasLipNotches=spec['hasLipNotches'],
+        binWidth=spec['binWidth'],
+        binLength=spec['binLength'],
+        binHeight=spec['binHeight'],
+        baseWidth=spec['baseWidth'],
+        baseLength=spec['baseLength'],
+        heightUnit=spec['heightUnit'],
+        xyClearance=spec['xyClearance'],
+        binCornerFilletRadius=const.BIN_CORNER_FILLET_RADIUS - spec['xyClearance'],
+        isSolid=isSolid or isShelled,
+        wallThickness=spec['wallThickness'],
+        hasScoop=spec['hasScoop'] and isHollow,
+        scoopMaxRadius=spec['scoopMaxRadius'],
+        hasTab=spec['hasTab'] and isHollow,
+        tabLength=spec['tabLength'],
+        tabWidth=spec['tabWidth'],
+        tabPosition=spec['tabPosition'],
+        tabOverhangAngle=math.radians(spec['tabAngle']),
+        compartmentsByX=spec['compartmentsX'],
+        compartmentsByY=spec['compartmentsY'],
+        compartments=compartments,
+        isLowFidelity=False,
+    )
+    return binBodyInput, baseInput
+
+def createBaseplateInput(spec: dict) -> SimpleNamespace:
+    """
+    Mirrors generateBaseplate in the create baseplate command
+    """
+    if spec['plateType'] not in (BASEPLATE_TYPE_LIGHT, BASEPLATE_TYPE_FULL, BASEPLATE_TYPE_SKELETONIZED):
+        raise ValueError('Unknown baseplate type "{}"'.format(spec['plateType']))
+    return SimpleNamespace(
+        baseWidth=spec['baseWidth'],
+        baseLength=spec['baseLength'],
+        xyClearance=spec['xyClearance'],
+        baseplateWidth=spec['plateWidth'],
+        baseplateLength=spec['plateLength'],
+        hasExtendedBottom=not spec['plateType'] == BASEPLATE_TYPE_LIGHT,
+        hasSkeletonizedBottom=spec['plateType'] == BASEPLATE_TYPE_SKELETONIZED,
+        hasMagnetCutouts=spec['hasMagnetSockets'],
+        magnetCutoutsDiameter=spec['magnetSocketSize'],
+        magnetCutoutsDepth=spec['magnetSocketDepth'],
+        hasScrewHoles=spec['hasScrewHoles'],
+        screwHolesDiameter=spec['screwHoleSize'],
+        screwHeadCutoutDiameter=spec['screwHeadSize'],
+        hasPadding=spec['hasPadding'],
+        paddingLeft=spec['paddingLeft'],
+        paddingTop=spec['paddingTop'],
+        paddingRight=spec['paddingRight'],
+        paddingBottom=spec['paddingBottom'],
+        bottomExtensionHeight=spec['extraBottomThickness'],
+        binZClearance=spec['verticalClearance'],
+        hasConnectionHoles=spec['hasConnectionHoles'],
+        connectionScrewHolesDiameter=spec['connectionHoleSize'],
+        cornerFilletRadius=const.BIN_CORNER_FILLET_RADIUS,
+        hasClips=spec['hasClips'],
+        hasClipsLeft=spec['hasClipsLeft'],
+        hasClipsRight=spec['hasClipsRight'],
+        hasClipsTop=spec['hasClipsTop'],
+        hasClipsBottom=spec['hasClipsBottom'],
+        isLowFidelity=False,
+    )
+
+def unsupportedItemOptions(spec: dict) -> list[str]:
+    """
+    Options of a normalized spec the headless generators can not build, empty when the item renders as specified
+    """
+    if spec['type'] != BATCH_ITEM_BIN:
+        return []
+    if spec['binType'] == BIN_TYPE_SHELLED:
+        return ['shelled bin type']
+    binBodyInput, baseInput = createBinInputs(spec)
+    return unsupportedMeshOptions(binBodyInput, baseInput, spec['generateBase'], spec['generateBody'])
+
+def createItemFactory(spec: dict) -> tuple[str, Callable[[], meshUtils.MeshModel]]:
+    """
+    Cache key of a normalized spec and the function that builds its mesh.
+    Raises ValueError for items with options listed by unsupportedItemOptions, they would render wrong
+    """
+    unsupportedOptions = unsupportedItemOptions(spec)
+    if unsupportedOptions:
+        raise ValueError('The headless generator does not support {}'.format(', '.join(unsupportedOptions)))
+    if spec['type'] == BATCH_ITEM_BIN:
+        binBodyInput, baseInput = createBinInputs(spec)
+        parameters = meshCache.canonicalBinParameters(binBodyInput, baseInput, spec['generateBase'], spec['generateBody'])
+        factory = lambda: createGridfinityBinMesh(binBodyInput, baseInput, spec['generateBase'], spec['generateBody'])
+    else:
+        baseplateInput = createBaseplateInput(spec)
+        parameters = meshCache.canonicalBaseplateParameters(baseplateInput)
+        factory = lambda: createGridfinityBaseplateMesh(baseplateInput)
+    return meshCache.cacheKey(parameters), factory
+
+def createItemModel(spec: dict, cache: meshCache.MeshCache = None) -> meshUtils.MeshModel:
+    key, factory = createItemFactory(spec)
+    model = cache.getOrCreate(key, factory) if cache else factory()
+    if spec['name']:
+        model.name = spec['name']
+    return model
+
+def loadManifest(path: str) -> list[dict]:
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as file:
+            return [dict(row) for row in csv.DictReader(file)]
+    with open(path, encoding='utf-8') as file:
+        manifest = json.load(file)
+    items = manifest.get('items') if isinstance(manifest, dict) else manifest
+    if not isinstance(items, list):
+        raise ValueError('Manifest must be a list of items or an object with an "items" list')
+    return items
+
+def _fileName(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_') or 'gridfinity'
+
+# one cache per worker process, they share the cache directory
+_workerCache: meshCache.MeshCache = None
+
+def _initWorkerCache(directory: str, maxBytes: int):
+    global _workerCache
+    _workerCache = meshCache.MeshCache(directory, maxBytes) if directory else None
+
+def renderItem(index: int, spec: dict, path: str, format: str) -> BatchItemResult:
+    """
+    Builds and writes one manifest item, errors are reported in the result instead of raised
+    """
+    start = time.perf_counter()
+    name = str(spec.get('name', '') or '')
+    try:
+        spec = normalizeSpec(spec)
+        hits = _workerCache.hits if _workerCache else 0
+        model = createItemModel(spec, _workerCache)
+        isCached = bool(_workerCache) and _workerCache.hits > hits
+        name = model.name
+        if (spec['format'] or format) == BATCH_FORMAT_3MF:
+            meshUtils.write3mf(model, path)
+        else:
+            meshUtils.writeStl(model, path)
+        return BatchItemResult(index, name, path, time.perf_counter() - start, model.triangleCount, isCached)
+    except Exception as err:
+        return BatchItemResult(index, name, path, time.perf_counter() - start, error='{}: {}'.format(type(err).__name__, err))
+
+def _outputPaths(items: list[dict], outputDir: str, format: str) -> list[str]:
+    paths = []
+    used = set()
+    for index, spec in enumerate(items):
+        itemFormat = str(spec.get('format', '') or format).lower()
+        fileName = spec.get('output') or '{}.{}'.format(_fileName(str(spec.get('name') or '{}-{}'.format(spec.get('type', 'item'), index))), itemFormat)
+        if fileName in used:
+            root, extension = os.path.splitext(fileName)
+            fileName = '{}-{}{}'.format(root, index, extension)
+        used.add(fileName)
+        paths.append(os.path.join(outputDir, fileName))
+    return paths
+
+def runBatch(
+    items: list[dict],
+    outputDir: str,
+    format: str = BATCH_FORMAT_STL,
+    jobs: int = 0,
+    onResult=None,
+    cacheDir: str = None,
+    cacheMaxBytes: int = meshCache.MESH_CACHE_DEFAULT_MAX_BYTES,
+) -> list[BatchItemResult]:
+    """
+    Renders all items, in parallel processes unless jobs is 1. Results are returned in manifest order
+    """
+    os.makedirs(outputDir, exist_ok=True)
+    paths = _outputPaths(items, outputDir, format)
+    results: list[BatchItemResult] = []
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        _initWorkerCache(cacheDir, cacheMaxBytes)
+        for index, spec in enumerate(items):
+            result = renderItem(index, spec, paths[index], format)
+            results.append(result)
+            if onResult:
+                onResult(result)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_initWorkerCache, initargs=(cacheDir, cacheMaxBytes)) as executor:
+            futures = [executor.submit(renderItem, index, spec, paths[index], format) for index, spec in enumerate(items)]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if onResult:
+                    onResult(result)
+    return sorted(results, key=lambda result: result.index)
+
+def _printResult(result: BatchItemResult):
+    if result.isOk:
+        print('{:6} {:8.3f}s {:>9} tris  {}'.format('cached' if result.isCached else 'ok', result.seconds, result.triangleCount, result.path), flush=True)
+    else:
+        print('FAILED {:8.3f}s item {} {}: {}'.format(result.seconds, result.index, result.name, result.error), flush=True)
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Render gridfinity bins and baseplates from a manifest without Fusion',
+        epilog='Not supported yet: shelled bins, lip notches, magnet cutout tabs and print helper grooves around screw holes '
+            'wider than 70% of the magnet cutouts. Items using them fail, generate those in Fusion.',
+    )
+    parser.add_argument('manifest', help='JSON or CSV manifest')
+    parser.add_argument('-o', '--output', default='.', help='output folder')
+    parser.add_argument('-f', '--format', choices=BATCH_FORMATS, default=BATCH_FORMAT_STL, help='default output format')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='worker processes, defaults to the cpu count')
+    parser.add_argument('--cache', help='mesh cache folder, repeated parameter sets are not regenerated')
+    parser.add_argument('--cache-size', type=int, default=meshCache.MESH_CACHE_DEFAULT_MAX_BYTES // (1024 * 1024), help='mesh cache size cap in MB')
+    parser.add_argument('--report', help='write per item results to this JSON file')
+    args = parser.parse_args(argv)
+
+    items = loadManifest(args.manifest)
+    start = time.perf_counter()
+    results = runBatch(items, args.output, args.format, args.jobs, _printResult, args.cache, args.cache_size * 1024 * 1024)
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if not result.isOk]
+    print('{} items, {} failed, {} from cache, {:.2f}s total, {:.3f}s per item cpu'.format(
+        len(results),
+        len(failures),
+        sum(1 for result in results if result.isCached),
+        elapsed,
+        sum(result.seconds for result in results) / max(1, len(results)),
+    ))
+    for result in failures:
+        print('  item {} {}: {}'.format(result.index, result.name, result.error), file=sys.stderr)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump({'elapsed': elapsed, 'items': [asdict(result) for result in results]}, file, indent=2)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
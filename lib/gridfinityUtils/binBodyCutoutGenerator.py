@@ -2,87 +2,121 @@ import adsk.core, adsk.fusion, traceback
 import os
 import math
 
-from ...lib.gridfinityUtils import geometryUtils
 from ...lib import fusion360utils as futil
-from ...lib.gridfinityUtils import filletUtils
-from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils
-from .baseGeneratorInput import BaseGeneratorInput
+from . import const
+from . import operationGraph as og
 from .binBodyCutoutGeneratorInput import BinBodyCutoutGeneratorInput
+from .fusionExecutor import FusionExecutor
 from ... import config
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-def getInnerCutoutScoopFace(
-    innerCutout: adsk.fusion.BRepBody
-    ) -> tuple[adsk.fusion.BRepFace, adsk.fusion.BRepFace]:
-    innerCutoutYNormalFaces = [face for face in innerCutout.faces if faceUtils.isYNormal(face)]
-    scoopFace = min(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
-    oppositeFace = max(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
-    return (scoopFace, oppositeFace)
+def getScoopRadius(input: BinBodyCutoutGeneratorInput) -> float:
+    return min(input.scoopMaxRadius, input.height) if min(input.scoopMaxRadius, input.height) >= input.filletRadius else input.filletRadius
+
+def planGridfinityBinBodyCutout(
+    input: BinBodyCutoutGeneratorInput,
+    graph: og.OperationGraph,
+) -> og.Ref:
+    origin = og.point(input.origin)
+    with graph.stage('compartment cutout'):
+        cutoutConstructionPlane = graph.constructionPlane(og.PLANE_XY, origin[2])
+        innerCutoutSketch = graph.sketch(
+            cutoutConstructionPlane,
+            [og.Rectangle(input.width, input.length, (origin[0], origin[1], 0), og.POINT_SKETCH)],
+            name='Inner cutout sketch',
+        )
+        innerCutout = graph.extrude(
+            og.Profile(innerCutoutSketch),
+            input.height,
+            direction=og.DIRECTION_NEGATIVE,
+            name='Inner cutout extrude',
+            bodyName='Inner cutout',
+        )
+        innerCutoutBody = innerCutout.body(0)
+
+        # scoop
+        if input.hasScoop:
+            with graph.stage('scoop fillet'):
+                scoopFace = og.FaceNormalTo(innerCutoutBody, og.AXIS_Y)
+                graph.fillet([og.BottomHorizontalEdge(scoopFace)], getScoopRadius(input), isTangentChain=False, isInputTangentChain=True)
+        # fillet inner cutout
+        if input.hasCornerFillet:
+            with graph.stage('fillet'):
+                graph.fillet([og.EdgesCollinearTo(innerCutoutBody, og.AXIS_Z)], input.filletRadius, isInputTangentChain=True)
+        if input.hasBottomFillet:
+            with graph.stage('bottom fillet'):
+                # faces are picked after the fillets above
+                scoopOppositeFace = og.FaceNormalTo(innerCutoutBody, og.AXIS_Y, isHighest=True)
+                graph.fillet([og.BottomHorizontalEdge(scoopOppositeFace)], input.filletRadius, isInputTangentChain=True)
+
+    return innerCutoutBody
 
 def createGridfinityBinBodyCutout(
     input: BinBodyCutoutGeneratorInput,
     targetComponent: adsk.fusion.Component,
 ):
+    graph = og.OperationGraph('Compartment cutout')
+    innerCutoutBody = planGridfinityBinBodyCutout(input, graph)
+    return FusionExecutor(targetComponent).run(graph).body(innerCutoutBody)
 
-    cutoutPlaneInput: adsk.fusion.ConstructionPlaneInput = targetComponent.constructionPlanes.createInput()
-    cutoutPlaneInput.setByOffset(
-        targetComponent.xYConstructionPlane,
-        adsk.core.ValueInput.createByReal(input.origin.z)
-    )
-    cutoutConstructionPlane = targetComponent.constructionPlanes.add(cutoutPlaneInput)
-    innerCutoutSketch: adsk.fusion.Sketch = targetComponent.sketches.add(cutoutConstructionPlane)
-    innerCutoutSketch.name = 'Inner cutout sketch'
-    sketchUtils.createRectangle(
-        input.width,
-        input.length,
-        adsk.core.Point3D.create(input.origin.x, input.origin.y, 0),
-        innerCutoutSketch,
-    )
-
-    innerCutout = extrudeUtils.simpleDistanceExtrude(
-        innerCutoutSketch.profiles.item(0),
-        adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
-        input.height,
-        adsk.fusion.ExtentDirections.NegativeExtentDirection,
-        [],
-        targetComponent,
-    )
-    innerCutout.name = 'Inner cutout extrude'
-    innerCutoutBody = innerCutout.bodies.item(0)
-    innerCutoutBody.name = 'Inner cutout'
-
-    # scoop
-    if input.hasScoop:
-        [innerCutoutScoopFace, innerCutoputScoopOppositeFace] = getInnerCutoutScoopFace(innerCutoutBody)
-        scoopEdge = faceUtils.getBottomHorizontalEdge(innerCutoutScoopFace.edges)
-        scoopMaxRadius = min(input.scoopMaxRadius, input.height) if min(input.scoopMaxRadius, input.height) >= input.filletRadius else input.filletRadius
-        filletUtils.createFillet(
-            [scoopEdge],
-            scoopMaxRadius,
-            False,
-            targetComponent
+def planGridfinityBinBodyCutouts(
+    inputs: list[BinBodyCutoutGeneratorInput],
+    graph: og.OperationGraph,
+) -> list[og.Ref]:
+    """
+    Same cutouts as planGridfinityBinBodyCutout for compartments sharing the top plane and depth.
+    All rectangles go into one sketch and one extrude, each fillet step is a single feature for every cutout,
+    so the feature count does not depend on the number of compartments.
+    Inputs must share origin z, height, scoop and fillet settings, bodies are returned in the order of inputs
+    """
+    input = inputs[0]
+    origins = [og.point(cutoutInput.origin) for cutoutInput in inputs]
+    with graph.stage('compartment cutouts'):
+        cutoutConstructionPlane = graph.constructionPlane(og.PLANE_XY, origins[0][2])
+        innerCutoutSketch = graph.sketch(
+            cutoutConstructionPlane,
+            [og.Rectangle(cutoutInput.width, cutoutInput.length, (origin[0], origin[1], 0), og.POINT_SKETCH) for cutoutInput, origin in zip(inputs, origins)],
+            name='Inner cutouts sketch',
         )
-    # fillet inner cutout
-    [innerCutoutScoopFace, innerCutoputScoopOppositeFace] = getInnerCutoutScoopFace(innerCutoutBody)
-    innerCutoutVerticalFaces = faceUtils.getVerticalEdges(innerCutoutBody.faces)
-    filletUtils.createFillet(
-        innerCutoutVerticalFaces,
-        input.filletRadius,
-        True,
-        targetComponent
-    )
-    if input.hasBottomFillet:
-        # recalculate faces after fillet
-        [innerCutoutScoopFace, innerCutoputScoopOppositeFace] = getInnerCutoutScoopFace(innerCutoutBody)
-        scoopOppositeEdge = faceUtils.getBottomHorizontalEdge(innerCutoputScoopOppositeFace.edges)
-
-        filletUtils.createFillet(
-            [scoopOppositeEdge],
-            input.filletRadius,
-            True,
-            targetComponent
+        innerCutout = graph.extrude(
+            og.Profile(innerCutoutSketch, None),
+            input.height,
+            direction=og.DIRECTION_NEGATIVE,
+            name='Inner cutouts extrude',
+            bodyName='Inner cutout',
+            bodyAnchors=[(origin[0], origin[1]) for origin in origins],
         )
+        innerCutoutBodies = [innerCutout.body(index) for index in range(len(inputs))]
 
-    return innerCutoutBody
+        # scoop
+        if input.hasScoop:
+            with graph.stage('scoop fillet', count=len(inputs)):
+                graph.fillet(
+                    [og.BottomHorizontalEdge(og.FaceNormalTo(body, og.AXIS_Y)) for body in innerCutoutBodies],
+                    getScoopRadius(input),
+                    isTangentChain=False,
+                    isInputTangentChain=True,
+                )
+        # fillet inner cutouts
+        if input.hasCornerFillet:
+            with graph.stage('fillet', count=len(inputs)):
+                graph.fillet([og.EdgesCollinearTo(body, og.AXIS_Z) for body in innerCutoutBodies], input.filletRadius, isInputTangentChain=True)
+        if input.hasBottomFillet:
+            with graph.stage('bottom fillet', count=len(inputs)):
+                graph.fillet(
+                    [og.BottomHorizontalEdge(og.FaceNormalTo(body, og.AXIS_Y, isHighest=True)) for body in innerCutoutBodies],
+                    input.filletRadius,
+                    isInputTangentChain=True,
+                )
+
+    return innerCutoutBodies
+
+def createGridfinityBinBodyCutouts(
+    inputs: list[BinBodyCutoutGeneratorInput],
+    targetComponent: adsk.fusion.Component,
+) -> list[adsk.fusion.BRepBody]:
+    graph = og.OperationGraph('Compartment cutouts')
+    innerCutoutBodies = planGridfinityBinBodyCutouts(inputs, graph)
+    return FusionExecutor(targetComponent).run(graph).bodies(innerCutoutBodies)
@@ -11,6 +11,7 @@ class BinBodyCutoutGeneratorInput():
         self.tabLength = 1
         self.tabWidth = const.BIN_TAB_WIDTH
         self.hasBottomFillet = True
+        self.hasCornerFillet = True
 
 
     @property
@@ -69,6 +70,14 @@ class BinBodyCutoutGeneratorInput():
     def hasBottomFillet(self, value: float):
         self._hasBottomFillet = value
 
+    @property
+    def hasCornerFillet(self) -> bool:
+        return self._hasCornerFillet
+
+    @hasCornerFillet.setter
+    def hasCornerFillet(self, value: bool):
+        self._hasCornerFillet = value
+
     @property
     def filletRadius(self) -> float:
         return self._filletRadius
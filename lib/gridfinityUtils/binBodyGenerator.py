@@ -4,20 +4,26 @@ import math
 import copy
 
 from ...lib import fusion360utils as futil
-from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, filletUtils, geometryUtils
-from .binBodyCutoutGenerator import createGridfinityBinBodyCutout
+from . import const, extrudeUtils, baseGenerator
+from . import operationGraph as og
+from .binBodyCutoutGenerator import planGridfinityBinBodyCutout, planGridfinityBinBodyCutouts
 from .binBodyCutoutGeneratorInput import BinBodyCutoutGeneratorInput
 from .baseGeneratorInput import BaseGeneratorInput
 from .binBodyGeneratorInput import BinBodyGeneratorInput, BinBodyCompartmentDefinition
 from .binBodyTabGeneratorInput import BinBodyTabGeneratorInput
-from .binBodyTabGenerator import createGridfinityBinBodyTab
+from .binBodyTabGenerator import planGridfinityBinBodyTab
 from .binBodyLipGeneratorInput import BinBodyLipGeneratorInput
-from .binBodyLipGenerator import createGridfinityBinBodyLip
+from .binBodyLipGenerator import planGridfinityBinBodyLip
+from .fusionExecutor import FusionExecutor
+from .generationProgress import GenerationProgress
 from ... import config
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
+# name of the merged bin body ref in the outputs of planGridfinityBin
+BIN_BODY_OUTPUT = 'binBody'
+
 def uniformCompartments(countX, countY):
     compartments: list[BinBodyCompartmentDefinition] = []
     for i in range(countX):
@@ -25,180 +31,263 @@ def uniformCompartments(countX, countY):
             compartments.append(BinBodyCompartmentDefinition(i, j, 1, 1))
     return compartments
 
-def createGridfinityBinBody(
-    input: BinBodyGeneratorInput,
-    targetComponent: adsk.fusion.Component,
-) -> tuple[adsk.fusion.BRepBody, adsk.fusion.BRepBody]:
+def isUniformLayout(compartments: list[BinBodyCompartmentDefinition], countX: int, countY: int) -> bool:
+    """
+    True when compartments fill the grid with identical 1x1 cells, as uniformCompartments does
+    """
+    if len(compartments) != countX * countY or len(compartments) < 2:
+        return False
+    positions = set((compartment.positionX, compartment.positionY) for compartment in compartments)
+    return positions == set((i, j) for i in range(countX) for j in range(countY)) \
+        and all(compartment.width == 1 and compartment.length == 1 and compartment.depth == compartments[0].depth for compartment in compartments)
+
+def planGridfinityBin(
+    name: str,
+    baseInput: BaseGeneratorInput,
+    binBodyInput: BinBodyGeneratorInput,
+    generateBase: bool,
+    generateBody: bool,
+) -> og.OperationGraph:
+    """
+    Base pattern and bin body merged into one body named after the bin, as the create bin command builds it
+    """
+    graph = og.OperationGraph(name)
+    if generateBase:
+        baseBodies = baseGenerator.planBaseBodyPattern(baseInput, binBodyInput.binWidth, binBodyInput.binLength, graph)
+    if generateBody:
+        graph.outputs[BIN_BODY_OUTPUT] = planGridfinityBinBody(binBodyInput, graph)
+
+    # merge everything, base bodies join the bin body in the same combine feature as the lip and tabs
+    if generateBody and generateBase:
+        graph.booleans.join(graph.outputs[BIN_BODY_OUTPUT], baseBodies)
+    graph.flushBooleans()
+    if generateBody and generateBase:
+        graph.nameBody(graph.outputs[BIN_BODY_OUTPUT], name)
+
+    # cutting the merged body gives the same shape as cutting every body before the merge
+    if generateBody or generateBase:
+        baseGenerator.planBaseClearanceCut(baseInput, binBodyInput.binWidth, binBodyInput.binLength, graph)
+    return graph
 
+def planGridfinityBinBody(
+    input: BinBodyGeneratorInput,
+    graph: og.OperationGraph,
+) -> og.Ref:
+    """
+    Cuts and merges are queued on graph.booleans, the caller can queue more joins on the bin body before they are flushed
+    """
     actualBodyWidth = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
     actualBodyLength = (input.baseLength * input.binLength) - input.xyClearance * 2.0
     binHeightWithoutBase = input.binHeight - 1
     binBodyTotalHeight = binHeightWithoutBase * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
-    features: adsk.fusion.Features = targetComponent.features
-    binBodyExtrude = extrudeUtils.createBox(
-        actualBodyWidth,
-        actualBodyLength,
-        binBodyTotalHeight,
-        targetComponent,
-        targetComponent.xYConstructionPlane
-    )
-    binBody = binBodyExtrude.bodies.item(0)
-    binBody.name = 'Bin body'
-
-    bodiesToMerge: list[adsk.fusion.BRepBody] = []
-    bodiesToSubtract: list[adsk.fusion.BRepBody] = []
-
-    # round corners
-    filletUtils.filletEdgesByLength(
-        binBodyExtrude.faces,
-        input.binCornerFilletRadius,
-        binBodyTotalHeight,
-        targetComponent,
-    ).name = 'Bin body corner fillets'
-
-    if input.hasLip:
-        lipOriginPoint = adsk.core.Point3D.create(
-            0,
-            0,
-            binHeightWithoutBase * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
+
+    with graph.stage('bin body'):
+        binBodyExtrude = extrudeUtils.planBox(
+            actualBodyWidth,
+            actualBodyLength,
+            binBodyTotalHeight,
+            graph,
+            bodyName='Bin body',
         )
-        lipInput = BinBodyLipGeneratorInput()
-        lipInput.baseLength = input.baseLength
-        lipInput.baseWidth = input.baseWidth
-        lipInput.binLength = input.binLength
-        lipInput.binWidth = input.binWidth
-        lipInput.hasLipNotches = input.hasLipNotches
-        lipInput.xyClearance = input.xyClearance
-        lipInput.binCornerFilletRadius = input.binCornerFilletRadius
-        lipInput.origin = lipOriginPoint
-        lipBody = createGridfinityBinBodyLip(lipInput, targetComponent)
-
-        if input.wallThickness < const.BIN_LIP_WALL_THICKNESS:
-            lipBottomChamferSize = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, input.binCornerFilletRadius - input.wallThickness)
-            lipBottomChamferExtrude = extrudeUtils.createBoxAtPoint(
-                actualBodyWidth - input.wallThickness * 2,
-                (actualBodyLength - input.wallThickness - const.BIN_LIP_WALL_THICKNESS + input.xyClearance) if input.hasScoop else (actualBodyLength - input.wallThickness * 2),
-                lipBottomChamferSize,
-                targetComponent,
-                adsk.core.Point3D.create(
-                    input.wallThickness,
-                    (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasScoop else input.wallThickness,
-                    lipOriginPoint.z,
+        binBody = binBodyExtrude.body(0)
+
+        bodiesToMerge: list[og.Ref] = []
+        bodiesToSubtract: list[og.Ref] = []
+
+        # low fidelity previews keep the envelope and compartment blocks only, no fillets, chamfers, scoops or tabs
+        hasCosmeticFeatures = not input.isLowFidelity
+
+        if hasCosmeticFeatures:
+            with graph.stage('body fillet'):
+                # round corners
+                graph.fillet(
+                    [og.EdgesByLength(og.FeatureFaces(binBodyExtrude), binBodyTotalHeight, const.DEFAULT_FILTER_TOLERANCE)],
+                    input.binCornerFilletRadius,
+                    name='Bin body corner fillets',
                 )
-            )
-            lipBottomChamferExtrude.name = 'Lip bottom chamfer extrude'
-            filletUtils.filletEdgesByLength(
-                lipBottomChamferExtrude.faces,
-                lipBottomChamferSize,
-                lipBottomChamferSize,
-                targetComponent,
-            )
-            lipBottomChamferExtrudeTopFace = faceUtils.getTopFace(lipBottomChamferExtrude.bodies.item(0))
-            scoopSideEdge = min([edge for edge in lipBottomChamferExtrudeTopFace.edges if geometryUtils.isCollinearToX(edge)], key=lambda x: x.boundingBox.minPoint.y)
-
-            edgesToChamfer = list(scoopSideEdge.tangentiallyConnectedEdges)[3:] if input.hasScoop else scoopSideEdge.tangentiallyConnectedEdges
-            chamferFeatures: adsk.fusion.ChamferFeatures = features.chamferFeatures
-            bottomLipChamferInput = chamferFeatures.createInput2()
-            bottomLipChamferEdges = commonUtils.objectCollectionFromList(edgesToChamfer)
-            bottomLipChamferInput.chamferEdgeSets.addEqualDistanceChamferEdgeSet(
-                bottomLipChamferEdges,
-                adsk.core.ValueInput.createByReal(lipBottomChamferSize),
-                False)
-            chamferFeatures.add(bottomLipChamferInput)
-            combineUtils.cutBody(lipBody, commonUtils.objectCollectionFromList(lipBottomChamferExtrude.bodies), targetComponent)
-
-        bodiesToMerge.append(lipBody)
-
-    if not input.isSolid:
-        compartmentsMinX = input.wallThickness
-        compartmentsMaxX = actualBodyWidth - input.wallThickness
-        compartmentsMinY = (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasLip and input.hasScoop else input.wallThickness
-        compartmentsMaxY = actualBodyLength - input.wallThickness
-
-        totalCompartmentsWidth = compartmentsMaxX - compartmentsMinX
-        totalCompartmentsLength = compartmentsMaxY - compartmentsMinY
-        
-        compartmentWidthUnit = (totalCompartmentsWidth - (input.compartmentsByX - 1) * input.wallThickness) / input.compartmentsByX
-        compartmentLengthUnit = (totalCompartmentsLength - (input.compartmentsByY - 1) * input.wallThickness) / input.compartmentsByY
-
-        for compartment in input.compartments:
-            compartmentX = compartmentsMinX + compartment.positionX * (compartmentWidthUnit + input.wallThickness)
-            compartmentY = compartmentsMinY + compartment.positionY * (compartmentLengthUnit + input.wallThickness)
-            compartmentOriginPoint = adsk.core.Point3D.create(
-                compartmentX,
-                compartmentY,
-                binBodyTotalHeight
-            )
-            compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
-            compartmentLength = compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
-            compartmentDepth = min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
-
-            compartmentTabInput = BinBodyTabGeneratorInput()
-            tabOriginPoint = adsk.core.Point3D.create(
-                compartmentOriginPoint.x + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth,
-                compartmentOriginPoint.y + compartmentLength,
-                compartmentOriginPoint.z,
-            )
-            compartmentTabInput.origin = tabOriginPoint
-            compartmentTabInput.length = max(0, min(input.tabLength, input.binWidth)) * input.baseWidth
-            compartmentTabInput.width = input.tabWidth
-            compartmentTabInput.overhangAngle = input.tabOverhangAngle
-            compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
-
-            [compartmentMerges, compartmentCuts] = createCompartment(
-                input.wallThickness,
-                compartmentOriginPoint,
-                compartmentWidth,
-                compartmentLength,
-                compartmentDepth,
-                input.binCornerFilletRadius - input.wallThickness,
-                input.hasScoop,
-                input.scoopMaxRadius,
-                input.hasTab,
-                compartmentTabInput,
-                targetComponent,
-            )
-            bodiesToSubtract = bodiesToSubtract + compartmentCuts
-            bodiesToMerge = bodiesToMerge + compartmentMerges
-
-        if len(input.compartments) > 1:
-            compartmentsTopClearance = createCompartmentCutout(
-                input.wallThickness,
-                adsk.core.Point3D.create(
-                    compartmentsMinX,
-                    compartmentsMinY,
-                    binBodyTotalHeight
-                ),
-                actualBodyWidth - input.wallThickness * 2,
-                actualBodyLength - input.wallThickness - compartmentsMinY,
-                const.BIN_TAB_TOP_CLEARANCE,
-                input.binCornerFilletRadius - input.wallThickness,
-                False,
+
+        if input.hasLip:
+            lipOriginPoint = (
+                0,
                 0,
-                False,
-                targetComponent,
+                binHeightWithoutBase * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
             )
-            bodiesToSubtract.append(compartmentsTopClearance)
+            lipInput = BinBodyLipGeneratorInput()
+            lipInput.baseLength = input.baseLength
+            lipInput.baseWidth = input.baseWidth
+            lipInput.binLength = input.binLength
+            lipInput.binWidth = input.binWidth
+            lipInput.hasLipNotches = input.hasLipNotches
+            lipInput.xyClearance = input.xyClearance
+            lipInput.binCornerFilletRadius = input.binCornerFilletRadius
+            lipInput.isLowFidelity = input.isLowFidelity
+            lipInput.origin = lipOriginPoint
+            lipBody = planGridfinityBinBodyLip(lipInput, graph)
 
-    if len(bodiesToSubtract) > 0:
-        combineUtils.cutBody(
-            binBody,
-            commonUtils.objectCollectionFromList(bodiesToSubtract),
-            targetComponent
-        )
-    if len(bodiesToMerge) > 0:
-        combineUtils.joinBodies(
-            binBody,
-            commonUtils.objectCollectionFromList(bodiesToMerge),
-            targetComponent
-        )
+            if input.wallThickness < const.BIN_LIP_WALL_THICKNESS and hasCosmeticFeatures:
+                lipBottomChamferSize = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, input.binCornerFilletRadius - input.wallThickness)
+                lipBottomChamferExtrude = extrudeUtils.planBoxAtPoint(
+                    actualBodyWidth - input.wallThickness * 2,
+                    (actualBodyLength - input.wallThickness - const.BIN_LIP_WALL_THICKNESS + input.xyClearance) if input.hasScoop else (actualBodyLength - input.wallThickness * 2),
+                    lipBottomChamferSize,
+                    graph,
+                    (
+                        input.wallThickness,
+                        (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasScoop else input.wallThickness,
+                        lipOriginPoint[2],
+                    ),
+                    name='Lip bottom chamfer extrude',
+                )
+                graph.fillet(
+                    [og.EdgesByLength(og.FeatureFaces(lipBottomChamferExtrude), lipBottomChamferSize, const.DEFAULT_FILTER_TOLERANCE)],
+                    lipBottomChamferSize,
+                )
+                scoopSideEdge = og.FrontEdge(og.TopFace(lipBottomChamferExtrude.body(0)))
+                graph.chamfer(
+                    [og.TangentEdges(scoopSideEdge, 3 if input.hasScoop else 0)],
+                    lipBottomChamferSize,
+                    isTangentChain=False,
+                )
+                # same combine feature as the lip cut
+                graph.booleans.cut(lipBody, [lipBottomChamferExtrude.bodies])
+
+            bodiesToMerge.append(lipBody)
+
+        if not input.isSolid:
+            compartmentsMinX = input.wallThickness
+            compartmentsMaxX = actualBodyWidth - input.wallThickness
+            compartmentsMinY = (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasLip and input.hasScoop else input.wallThickness
+            compartmentsMaxY = actualBodyLength - input.wallThickness
+
+            totalCompartmentsWidth = compartmentsMaxX - compartmentsMinX
+            totalCompartmentsLength = compartmentsMaxY - compartmentsMinY
+            
+            compartmentWidthUnit = (totalCompartmentsWidth - (input.compartmentsByX - 1) * input.wallThickness) / input.compartmentsByX
+            compartmentLengthUnit = (totalCompartmentsLength - (input.compartmentsByY - 1) * input.wallThickness) / input.compartmentsByY
+
+            # uniform grids build the first compartment only and pattern it over the grid
+            isUniform = isUniformLayout(input.compartments, input.compartmentsByX, input.compartmentsByY)
+            compartments = [BinBodyCompartmentDefinition(0, 0, 1, 1, input.compartments[0].depth)] if isUniform else input.compartments
+
+            compartmentCutoutInputs: list[BinBodyCutoutGeneratorInput] = []
+            compartmentTabInputs: list[BinBodyTabGeneratorInput] = []
+            for compartment in compartments:
+                compartmentX = compartmentsMinX + compartment.positionX * (compartmentWidthUnit + input.wallThickness)
+                compartmentY = compartmentsMinY + compartment.positionY * (compartmentLengthUnit + input.wallThickness)
+                compartmentOriginPoint = (
+                    compartmentX,
+                    compartmentY,
+                    binBodyTotalHeight
+                )
+                compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
+                compartmentLength = compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
+                compartmentDepth = min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
+
+                compartmentTabInput = BinBodyTabGeneratorInput()
+                tabOriginPoint = (
+                    compartmentX + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth,
+                    compartmentY + compartmentLength,
+                    binBodyTotalHeight,
+                )
+                compartmentTabInput.origin = tabOriginPoint
+                compartmentTabInput.length = max(0, min(input.tabLength, input.binWidth)) * input.baseWidth
+                compartmentTabInput.width = input.tabWidth
+                compartmentTabInput.overhangAngle = input.tabOverhangAngle
+                compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
+                compartmentTabInputs.append(compartmentTabInput)
+
+                cutoutInput = createCompartmentCutoutInput(
+                    compartmentOriginPoint,
+                    compartmentWidth,
+                    compartmentLength,
+                    compartmentDepth,
+                    input.binCornerFilletRadius - input.wallThickness,
+                    input.hasScoop and hasCosmeticFeatures,
+                    input.scoopMaxRadius,
+                    hasCosmeticFeatures,
+                    hasCosmeticFeatures,
+                )
+                compartmentCutoutInputs.append(cutoutInput)
+
+            # compartments sharing a depth are cut with one sketch, one extrude and one feature per fillet step
+            cutoutInputsByDepth: dict[float, list[BinBodyCutoutGeneratorInput]] = {}
+            for cutoutInput in compartmentCutoutInputs:
+                cutoutInputsByDepth.setdefault(round(cutoutInput.height, 6), []).append(cutoutInput)
+            cutoutBodies: dict[int, og.Ref] = {}
+            for depth, cutoutInputs in cutoutInputsByDepth.items():
+                with graph.stage('compartments {}cm deep'.format(depth), count=len(cutoutInputs)):
+                    for cutoutInput, cutoutBody in zip(cutoutInputs, planGridfinityBinBodyCutouts(cutoutInputs, graph)):
+                        cutoutBodies[id(cutoutInput)] = cutoutBody
+            compartmentCutoutBodies = [cutoutBodies[id(cutoutInput)] for cutoutInput in compartmentCutoutInputs]
+
+            # label tabs
+            compartmentTabBodies: list[og.Ref] = []
+            if input.hasTab and hasCosmeticFeatures:
+                for index, (tabInput, cutoutBody) in enumerate(zip(compartmentTabInputs, compartmentCutoutBodies)):
+                    with graph.stage('compartment {} tab'.format(index + 1)):
+                        compartmentTabBodies.append(planCompartmentTab(tabInput, cutoutBody, graph))
+
+            if isUniform:
+                with graph.stage('pattern', count=len(input.compartments)):
+                    patternDistances = (compartmentWidthUnit + input.wallThickness, compartmentLengthUnit + input.wallThickness)
+                    patternQuantities = (input.compartmentsByX, input.compartmentsByY)
+                    cutoutPattern = graph.rectangularPattern(
+                        compartmentCutoutBodies,
+                        patternQuantities,
+                        patternDistances,
+                        name='Compartment cutouts pattern',
+                    )
+                    compartmentCutoutBodies = compartmentCutoutBodies + [cutoutPattern.bodies]
+                    if len(compartmentTabBodies) > 0:
+                        tabPattern = graph.rectangularPattern(
+                            compartmentTabBodies,
+                            patternQuantities,
+                            patternDistances,
+                            name='Compartment tabs pattern',
+                        )
+                        compartmentTabBodies = compartmentTabBodies + [tabPattern.bodies]
+
+            bodiesToSubtract = bodiesToSubtract + compartmentCutoutBodies
+            bodiesToMerge = bodiesToMerge + compartmentTabBodies
+
+            if len(input.compartments) > 1:
+                with graph.stage('compartments top clearance'):
+                    compartmentsTopClearance = planCompartmentCutout(
+                        input.wallThickness,
+                        (
+                            compartmentsMinX,
+                            compartmentsMinY,
+                            binBodyTotalHeight
+                        ),
+                        actualBodyWidth - input.wallThickness * 2,
+                        actualBodyLength - input.wallThickness - compartmentsMinY,
+                        const.BIN_TAB_TOP_CLEARANCE,
+                        input.binCornerFilletRadius - input.wallThickness,
+                        False,
+                        0,
+                        False,
+                        graph,
+                        hasCosmeticFeatures,
+                    )
+                    bodiesToSubtract.append(compartmentsTopClearance)
+
+        graph.booleans.cut(binBody, bodiesToSubtract)
+        graph.booleans.join(binBody, bodiesToMerge)
 
     return binBody
 
+def createGridfinityBinBody(
+    input: BinBodyGeneratorInput,
+    targetComponent: adsk.fusion.Component,
+    progress: GenerationProgress = None,
+) -> adsk.fusion.BRepBody:
+    graph = og.OperationGraph('Bin body')
+    binBody = planGridfinityBinBody(input, graph)
+    return FusionExecutor(targetComponent).run(graph, progress).body(binBody)
 
-def createCompartmentCutout(
-        wallThickness: float,
-        originPoint: adsk.core.Point3D,
+
+def createCompartmentCutoutInput(
+        originPoint: og.Point,
         width: float,
         length: float,
         depth: float,
@@ -206,8 +295,8 @@ def createCompartmentCutout(
         hasScoop: bool,
         scoopMaxRadius: float,
         hasBottomFillet: bool,
-        targetComponent: adsk.fusion.Component,
-    ) -> adsk.fusion.BRepBody:
+        hasCornerFillet: bool = True,
+    ) -> BinBodyCutoutGeneratorInput:
 
     innerCutoutFilletRadius = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, cornerFilletRadius)
     innerCutoutInput = BinBodyCutoutGeneratorInput()
@@ -219,28 +308,24 @@ def createCompartmentCutout(
     innerCutoutInput.scoopMaxRadius = scoopMaxRadius
     innerCutoutInput.filletRadius = innerCutoutFilletRadius
     innerCutoutInput.hasBottomFillet = hasBottomFillet
+    innerCutoutInput.hasCornerFillet = hasCornerFillet
+    return innerCutoutInput
 
-    return createGridfinityBinBodyCutout(innerCutoutInput, targetComponent)
-
-def createCompartment(
+def planCompartmentCutout(
         wallThickness: float,
-        originPoint: adsk.core.Point3D,
+        originPoint: og.Point,
         width: float,
         length: float,
         depth: float,
         cornerFilletRadius: float,
         hasScoop: bool,
         scoopMaxRadius: float,
-        hasTab: bool,
-        tabInput: BinBodyTabGeneratorInput,
-        targetComponent: adsk.fusion.Component,
-    ) -> tuple[list[adsk.fusion.BRepBody], list[adsk.fusion.BRepBody]]:
-
-    bodiesToMerge: list[adsk.fusion.BRepBody] = []
-    bodiesToSubtract: list[adsk.fusion.BRepBody] = []
+        hasBottomFillet: bool,
+        graph: og.OperationGraph,
+        hasCornerFillet: bool = True,
+    ) -> og.Ref:
 
-    innerCutoutBody = createCompartmentCutout(
-        wallThickness,
+    innerCutoutInput = createCompartmentCutoutInput(
         originPoint,
         width,
         length,
@@ -248,21 +333,18 @@ def createCompartment(
         cornerFilletRadius,
         hasScoop,
         scoopMaxRadius,
-        True,
-        targetComponent,
+        hasBottomFillet,
+        hasCornerFillet,
     )
-    bodiesToSubtract.append(innerCutoutBody)
+    return planGridfinityBinBodyCutout(innerCutoutInput, graph)
 
-    # label tab
-    if hasTab:
-        tabBody = createGridfinityBinBodyTab(tabInput, targetComponent)
-
-        intersectTabInput = targetComponent.features.combineFeatures.createInput(
-            tabBody,
-            commonUtils.objectCollectionFromList([innerCutoutBody]),
-            )
-        intersectTabInput.operation = adsk.fusion.FeatureOperations.IntersectFeatureOperation
-        intersectTabInput.isKeepToolBodies = True
-        intersectTabFeature = targetComponent.features.combineFeatures.add(intersectTabInput)
-        bodiesToMerge = bodiesToMerge + [body for body in list(intersectTabFeature.bodies) if not body.revisionId == innerCutoutBody.revisionId]
-    return (bodiesToMerge, bodiesToSubtract)
\ No newline at end of file
+def planCompartmentTab(
+        tabInput: BinBodyTabGeneratorInput,
+        innerCutoutBody: og.Ref,
+        graph: og.OperationGraph,
+    ) -> og.Ref:
+    """
+    Label tab trimmed to the compartment, the cutout body is kept for the compartment cut
+    """
+    tabBody = planGridfinityBinBodyTab(tabInput, graph)
+    return graph.combine(tabBody, [innerCutoutBody], og.OPERATION_INTERSECT, isKeepToolBodies=True).bodies
@@ -67,6 +67,7 @@ class BinBodyGeneratorInput():
         self.compartmentsByX = 1
         self.compartmentsByY = 1
         self.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
+        self.isLowFidelity = False
 
     @property
     def baseWidth(self) -> float:
@@ -243,3 +244,11 @@ class BinBodyGeneratorInput():
     @compartments.setter
     def compartments(self, value: list[BinBodyCompartmentDefinition]):
         self._compartments = value
+
+    @property
+    def isLowFidelity(self) -> bool:
+        return self._isLowFidelity
+
+    @isLowFidelity.setter
+    def isLowFidelity(self, value: bool):
+        self._isLowFidelity = value
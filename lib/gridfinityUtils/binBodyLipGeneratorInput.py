@@ -8,6 +8,7 @@ class BinBodyLipGeneratorInput():
         self.hasLip = False
         self.hasLipNotches = False
         self.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
+        self.isLowFidelity = False
 
     @property
     def baseWidth(self) -> float:
@@ -79,4 +80,12 @@ class BinBodyLipGeneratorInput():
 
     @origin.setter
     def origin(self, value: adsk.core.Point3D):
-        self._originUnit = value
\ No newline at end of file
+        self._originUnit = value
+
+    @property
+    def isLowFidelity(self) -> bool:
+        return self._isLowFidelity
+
+    @isLowFidelity.setter
+    def isLowFidelity(self, value: bool):
+        self._isLowFidelity = value
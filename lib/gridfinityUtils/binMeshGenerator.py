@@ -0,0 +1,611 @@
+import math
+
+from . import const, meshUtils
+from .meshUtils import Mesh, MeshModel
+
+# Fusion free counterpart of createBaseBodyPattern + createGridfinityBinBody.
+# Input objects are read duck typed (BaseGeneratorInput, BinBodyGeneratorInput or anything
+# exposing the same attributes) so this module never imports adsk.
+#
+# A bin is one closed manifold shell. The base cells hang under the body and share its bottom face
+# at z=0, compartments are pockets sunk into the body and label tabs are notches in the pocket walls.
+# Faces meeting each other are stitched through shared points: every ring of the body carries the
+# same breaks (base cell corners and centers, grid lines, pocket corners, tab ends), so the edges of
+# the flat faces between them line up exactly.
+# Lip notches and magnet cutout tabs are not modelled, bins using them are rejected.
+
+def _uniqueBreaks(values: list[float]) -> list[float]:
+    return sorted({round(value, meshUtils.MESH_VERTEX_DECIMALS): value for value in values}.values())
+
+def _baseCellRing(
+    input,
+    inset: float,
+    originX: float = 0,
+    originY: float = 0,
+    xBreaks: list[float] = [],
+    yBreaks: list[float] = [],
+) -> list[tuple[float, float]]:
+    clearance = input.xyClearance
+    return meshUtils.roundedRectangleRing(
+        originX - clearance + inset,
+        originY - clearance + inset,
+        originX + input.baseWidth - clearance - inset,
+        originY + input.baseLength - clearance - inset,
+        input.cornerFilletRadius - inset,
+        xBreaks=_uniqueBreaks([originX + input.baseWidth / 2 - clearance] + xBreaks),
+        yBreaks=_uniqueBreaks([originY + input.baseLength / 2 - clearance] + yBreaks),
+    )
+
+def _quadrants(mesh: Mesh, ring: list[int], centerX: float, centerY: float) -> list[list[int]]:
+    tolerance = const.DEFAULT_FILTER_TOLERANCE
+    splits = [
+        i for i, index in enumerate(ring)
+        if math.isclose(mesh.vertices[index][0], centerX, abs_tol=tolerance) or math.isclose(mesh.vertices[index][1], centerY, abs_tol=tolerance)
+    ]
+    center = mesh.addVertex(centerX, centerY, mesh.vertices[ring[0]][2])
+    quadrants = []
+    for start, end in zip(splits, splits[1:] + [splits[0] + len(ring)]):
+        quadrants.append([ring[i % len(ring)] for i in range(start, end + 1)] + [center])
+    return quadrants
+
+def _addHoledCap(
+    mesh: Mesh,
+    ring: list[int],
+    holes: list[tuple[tuple[float, float], list[int]]],
+    centerX: float,
+    centerY: float,
+    isUp: bool,
+):
+    for outline in _quadrants(mesh, ring, centerX, centerY):
+        quadrantX = sum(mesh.vertices[i][0] for i in outline) / len(outline)
+        quadrantY = sum(mesh.vertices[i][1] for i in outline) / len(outline)
+        holeCenter, hole = min(holes, key=lambda h: math.hypot(h[0][0] - quadrantX, h[0][1] - quadrantY))
+        meshUtils.addAnnulus(mesh, hole, outline, holeCenter, isUp)
+
+def _hasPrintHelperGroove(input) -> bool:
+    # same condition planSingleGridfinityBaseBody adds the groove on
+    return input.hasMagnetCutouts and input.hasScrewHoles \
+        and (const.BIN_BASE_HEIGHT - input.magnetCutoutsDepth) > const.BIN_MAGNET_HOLE_GROOVE_DEPTH
+
+def _grooveOutlines(screwRadius: float, magnetRadius: float) -> list[list[tuple[float, float]]]:
+    """
+    Magnet circle, slot, square bridge and screw circle of the print helper groove, in hole space with u
+    along the slot. Each outline holds the points the next one meets it at.
+    """
+    segments = meshUtils.MESH_CIRCLE_SEGMENTS
+    chordAngle = math.asin(screwRadius / magnetRadius)
+    angles = _uniqueBreaks([math.pi * 2 * i / segments for i in range(segments)] + [
+        chordAngle, math.pi - chordAngle, math.pi + chordAngle, math.pi * 2 - chordAngle,
+    ])
+    tolerance = 10 ** -meshUtils.MESH_VERTEX_DECIMALS
+
+    def arc(fromAngle: float, toAngle: float) -> list[tuple[float, float]]:
+        inRange = [a for a in angles if fromAngle - tolerance <= a <= toAngle + tolerance] + \
+            [a + math.pi * 2 for a in angles if fromAngle - tolerance <= a + math.pi * 2 <= toAngle + tolerance]
+        return [(magnetRadius * math.cos(a), magnetRadius * math.sin(a)) for a in inRange]
+
+    magnet = [(magnetRadius * math.cos(a), magnetRadius * math.sin(a)) for a in angles]
+    slot = arc(-chordAngle + math.pi * 2, chordAngle + math.pi * 2) + [(screwRadius, screwRadius), (0, screwRadius), (-screwRadius, screwRadius)] + \
+        arc(math.pi - chordAngle, math.pi + chordAngle) + [(-screwRadius, -screwRadius), (0, -screwRadius), (screwRadius, -screwRadius)]
+    square = [
+        (screwRadius, 0), (screwRadius, screwRadius), (0, screwRadius), (-screwRadius, screwRadius),
+        (-screwRadius, 0), (-screwRadius, -screwRadius), (0, -screwRadius), (screwRadius, -screwRadius),
+    ]
+    return [magnet, slot, square, meshUtils.circleRing(0, 0, screwRadius)]
+
+def _holeSegments(input) -> list[tuple[list[tuple[float, float]], float, float]]:
+    """
+    Hole column of a base cell from the top down as (outline in hole space, top z, bottom z)
+    """
+    baseHeight = const.BIN_BASE_HEIGHT
+    screwRadius = input.screwHolesDiameter / 2
+    magnetRadius = input.magnetCutoutsDiameter / 2
+    hasMagnetCutouts = input.hasMagnetCutouts and input.magnetCutoutsDiameter > input.screwHolesDiameter
+    magnetZ = -baseHeight + min(input.magnetCutoutsDepth, baseHeight)
+    if not hasMagnetCutouts:
+        return [(meshUtils.circleRing(0, 0, screwRadius), 0, -baseHeight)] if input.hasScrewHoles else []
+    if not input.hasScrewHoles:
+        return [(meshUtils.circleRing(0, 0, magnetRadius), magnetZ, -baseHeight)]
+    if not _hasPrintHelperGroove(input):
+        return [(meshUtils.circleRing(0, 0, screwRadius), 0, magnetZ), (meshUtils.circleRing(0, 0, magnetRadius), magnetZ, -baseHeight)]
+    # slot then square bridge, each half the groove depth
+    magnet, slot, square, screw = _grooveOutlines(screwRadius, magnetRadius)
+    layerHeight = const.BIN_MAGNET_HOLE_GROOVE_DEPTH / 2
+    return [
+        (screw, 0, magnetZ + layerHeight * 2),
+        (square, magnetZ + layerHeight * 2, magnetZ + layerHeight),
+        (slot, magnetZ + layerHeight, magnetZ),
+        (magnet, magnetZ, -baseHeight),
+    ]
+
+def _addHole(
+    mesh: Mesh,
+    segments: list[tuple[list[tuple[float, float]], float, float]],
+    center: tuple[float, float],
+    direction: tuple[float, float],
+) -> tuple[list[int], list[int]]:
+    """
+    Lofts the hole column walls and the ceilings where it widens, returns its top and bottom rings
+    """
+    (centerX, centerY), (dx, dy) = center, direction
+    rings = []
+    for outline, topZ, bottomZ in segments:
+        points = [(centerX + u * dx - v * dy, centerY + u * dy + v * dx) for (u, v) in outline]
+        top, bottom = meshUtils.addLoft(mesh, [(points, topZ), (points, bottomZ)])
+        if rings:
+            meshUtils.addRegion(mesh, top, [rings[-1][1]], False)
+        rings.append((top, bottom))
+    return rings[0][0], rings[-1][1]
+
+def _addBaseCell(
+    mesh: Mesh,
+    input,
+    originX: float,
+    originY: float,
+    xBreaks: list[float],
+    yBreaks: list[float],
+    isCapped: bool,
+) -> list[int]:
+    """
+    Base cell with its top at z=0, placed like createSingleGridfinityBaseBody places the cell at
+    originX, originY. Sides are trimmed to the xy clearance like cutBaseClearance does. The top ring
+    is returned open unless isCapped, for the bin body to close.
+    """
+    clearance = input.xyClearance
+    baseHeight = const.BIN_BASE_HEIGHT
+    bottomInset = const.BIN_BASE_TOP_SECTION_HEIGH + (const.BIN_BASE_BOTTOM_SECTION_HEIGH if input.hasBottomChamfer else 0)
+    profile = [
+        (-baseHeight, bottomInset),
+        (-baseHeight + const.BIN_BASE_BOTTOM_SECTION_HEIGH, const.BIN_BASE_TOP_SECTION_HEIGH),
+        (-const.BIN_BASE_TOP_SECTION_HEIGH, const.BIN_BASE_TOP_SECTION_HEIGH),
+        (-clearance, clearance),
+        (0, clearance),
+    ]
+    [bottomRing, *_, topRing] = meshUtils.addLoft(mesh, [(_baseCellRing(input, inset, originX, originY, xBreaks, yBreaks), z) for (z, inset) in profile])
+
+    centerX = originX + input.baseWidth / 2 - clearance
+    centerY = originY + input.baseLength / 2 - clearance
+    holeCenters = [
+        (originX + x, originY + y)
+        for x in (const.DIMENSION_SCREW_HOLES_OFFSET - clearance, input.baseWidth - const.DIMENSION_SCREW_HOLES_OFFSET - clearance)
+        for y in (const.DIMENSION_SCREW_HOLES_OFFSET - clearance, input.baseLength - const.DIMENSION_SCREW_HOLES_OFFSET - clearance)
+    ]
+    segments = _holeSegments(input)
+    if not segments:
+        meshUtils.addFan(mesh, bottomRing, False)
+        if isCapped:
+            meshUtils.addFan(mesh, topRing, True)
+        return topRing
+
+    bottomHoles = []
+    topHoles = []
+    for (holeX, holeY) in holeCenters:
+        # the groove slot runs across the line to the cell center, like the rotated and patterned groove
+        radial = math.hypot(holeX - centerX, holeY - centerY)
+        direction = ((centerY - holeY) / radial, (holeX - centerX) / radial)
+        holeTop, holeBottom = _addHole(mesh, segments, (holeX, holeY), direction)
+        bottomHoles.append(((holeX, holeY), holeBottom))
+        if isCapped and segments[0][1] == 0:
+            topHoles.append(((holeX, holeY), holeTop))
+        else:
+            # ceiling of a magnet cutout, or of a screw hole closed by the bin body
+            meshUtils.addFan(mesh, holeTop, False)
+    _addHoledCap(mesh, bottomRing, bottomHoles, centerX, centerY, False)
+    if topHoles:
+        _addHoledCap(mesh, topRing, topHoles, centerX, centerY, True)
+    elif isCapped:
+        meshUtils.addFan(mesh, topRing, True)
+    return topRing
+
+def _filletOffset(radius: float, height: float) -> float:
+    if height >= radius:
+        return 0
+    return radius - math.sqrt(max(0, radius ** 2 - (radius - height) ** 2))
+
+def _filletHeights(radius: float) -> list[float]:
+    return [radius * (1 - math.cos(math.pi / 2 * i / meshUtils.MESH_ARC_SEGMENTS)) for i in range(meshUtils.MESH_ARC_SEGMENTS + 1)]
+
+def _tabFillet(tab: tuple[float, float, float, float, float]) -> tuple[float, float, float]:
+    # front edge fillet of the tab as (radius, tip angle, distance from the tip to the tangent points)
+    (_, _, _, width, height) = tab
+    tipAngle = math.atan2(height, width)
+    radius = const.BIN_TAB_EDGE_FILLET_RADIUS
+    return radius, tipAngle, radius / math.tan(tipAngle / 2)
+
+def _tabFilletHeights(tab: tuple[float, float, float, float, float]) -> list[float]:
+    (_, _, topZ, _, _) = tab
+    radius, tipAngle, _ = _tabFillet(tab)
+    return [topZ - radius + radius * math.cos((math.pi - tipAngle) * i / meshUtils.MESH_ARC_SEGMENTS) for i in range(meshUtils.MESH_ARC_SEGMENTS + 1)]
+
+def _tabDepth(tab: tuple[float, float, float, float, float], z: float) -> float:
+    (_, _, topZ, width, height) = tab
+    if z > topZ + const.DEFAULT_FILTER_TOLERANCE:
+        return 0
+    radius, tipAngle, tangentDistance = _tabFillet(tab)
+    if z > topZ - tangentDistance * math.sin(tipAngle):
+        # on the fillet, its center is radius below the front end of the flat top
+        return width - tangentDistance + math.sqrt(max(0, radius ** 2 - (z - topZ + radius) ** 2))
+    return width * max(0, min(1, (z - topZ + height) / height))
+
+def _notchRing(ring: list[tuple[float, float]], backY: float, tabStart: float, tabEnd: float, notchY: float) -> list[tuple[float, float]]:
+    # tab ends are doubled breaks, the inner point of each pair and everything between moves onto the tab face
+    tolerance = 10 ** -meshUtils.MESH_VERTEX_DECIMALS
+    onTab = [i for i, (x, y) in enumerate(ring) if abs(y - backY) < tolerance and tabStart - tolerance < x < tabEnd + tolerance]
+    first, last = onTab[0], onTab[-1]
+    return [(x, notchY) if first < i < last else (x, y) for i, (x, y) in enumerate(ring)]
+
+def _pocketRings(
+    xMin: float,
+    yMin: float,
+    xMax: float,
+    yMax: float,
+    topZ: float,
+    floorZ: float,
+    cornerRadius: float,
+    hasScoop: bool,
+    scoopMaxRadius: float,
+    xBreaks: list[float],
+    yBreaks: list[float],
+    tab: tuple[float, float, float, float, float] = None,
+) -> list[tuple[list[tuple[float, float]], float]]:
+    """
+    Compartment cutout outline from topZ down to the floor, mirroring createGridfinityBinBodyCutout:
+    vertical fillets, bottom fillet, the scoop on the -Y wall and the label tab on the +Y wall
+    """
+    depth = topZ - floorZ
+    cornerRadius = min(cornerRadius, (xMax - xMin) / 2, (yMax - yMin) / 2)
+    filletRadius = min(cornerRadius, depth)
+    scoopRadius = filletRadius
+    if hasScoop:
+        scoopRadius = min(scoopMaxRadius, depth) if min(scoopMaxRadius, depth) >= filletRadius else filletRadius
+        scoopRadius = max(filletRadius, min(scoopRadius, yMax - yMin - filletRadius))
+    heights = [h for h in _filletHeights(filletRadius) + _filletHeights(scoopRadius) if h < depth] + [depth]
+    if tab is not None:
+        (tabStart, tabEnd, tabTop, _, tabHeight) = tab
+        tolerance = const.DEFAULT_FILTER_TOLERANCE
+        heights += [h - floorZ for h in _tabFilletHeights(tab) + [tabTop - tabHeight] if floorZ + tolerance < h < topZ - tolerance]
+    rings = []
+    for height in sorted(set(heights), reverse=True):
+        offset = _filletOffset(filletRadius, height)
+        scoopOffset = _filletOffset(scoopRadius, height)
+        ring = meshUtils.roundedRectangleRing(
+            xMin + offset,
+            yMin + scoopOffset,
+            xMax - offset,
+            yMax - offset,
+            cornerRadius - offset,
+            xBreaks=xBreaks,
+            yBreaks=yBreaks,
+            keepBreaks=True,
+        )
+        z = floorZ + height
+        if tab is not None:
+            if math.isclose(z, tabTop, abs_tol=tolerance) and height < depth - tolerance:
+                # the tab top is a step in the wall
+                rings.append((ring, z))
+            backY = yMax - offset
+            # never past the middle of the pocket, the parametric tab is trimmed to the cutout
+            notchY = max(min(backY, yMax - _tabDepth(tab, z)), (yMin + scoopOffset + backY) / 2)
+            ring = _notchRing(ring, backY, tabStart, tabEnd, notchY)
+        rings.append((ring, z))
+    return rings
+
+def _baseBreaks(unit: float, count: int, clearance: float, radius: float) -> list[float]:
+    # corner arc ends and center of every base cell top and the middle of the gaps between cells
+    breaks = []
+    for i in range(count):
+        cellMin, cellMax = i * unit, (i + 1) * unit - clearance * 2
+        breaks += [cellMin + radius, (cellMin + cellMax) / 2, cellMax - radius]
+        if i < count - 1:
+            breaks.append(cellMax + clearance)
+    return breaks
+
+class _BinBodyLayout():
+    def __init__(self, input):
+        self.width = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
+        self.length = (input.baseLength * input.binLength) - input.xyClearance * 2.0
+        self.height = (input.binHeight - 1) * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
+        self.topHeight = self.height + (const.BIN_LIP_EXTRA_HEIGHT - const.BIN_LIP_TOP_RECESS_HEIGHT if input.hasLip else 0)
+        self.cornerRadius = input.binCornerFilletRadius
+        self.wall = input.wallThickness
+        self.minX = input.wallThickness
+        self.maxX = self.width - input.wallThickness
+        self.minY = (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasLip and input.hasScoop else input.wallThickness
+        self.maxY = self.length - input.wallThickness
+        self.countX = int(input.compartmentsByX)
+        self.countY = int(input.compartmentsByY)
+        self.unitWidth = (self.maxX - self.minX - (self.countX - 1) * self.wall) / self.countX
+        self.unitLength = (self.maxY - self.minY - (self.countY - 1) * self.wall) / self.countY
+        self.pocketRadius = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, self.cornerRadius - self.wall)
+        # grid lines run through the middle of the walls between compartments
+        self.gridX = [self.minX - self.wall / 2 + i * (self.unitWidth + self.wall) for i in range(self.countX + 1)]
+        self.gridY = [self.minY - self.wall / 2 + i * (self.unitLength + self.wall) for i in range(self.countY + 1)]
+
+        self.tabs = {}
+        xBreaks = _baseBreaks(input.baseWidth, int(input.binWidth), input.xyClearance, self.cornerRadius) + self.gridX[1:-1]
+        yBreaks = _baseBreaks(input.baseLength, int(input.binLength), input.xyClearance, self.cornerRadius) + self.gridY[1:-1]
+        if not input.isSolid:
+            for index, compartment in enumerate(input.compartments):
+                (xMin, yMin, xMax, yMax) = self.pocketBounds(compartment)
+                radius = min(self.pocketRadius, (xMax - xMin) / 2, (yMax - yMin) / 2)
+                xBreaks += [xMin + radius, xMax - radius]
+                yBreaks += [yMin + radius, yMax - radius]
+                tab = _tabProfile(input, self, (xMin, yMin, xMax, yMax)) if input.hasTab else None
+                if tab is not None:
+                    self.tabs[index] = tab
+                    xBreaks += [tab[0], tab[1]]
+        # every ring of the body gets all breaks, tab ends twice so the tab face can pull one of them in
+        self.xBreaks = sorted(_uniqueBreaks(xBreaks) + [tab[i] for tab in self.tabs.values() for i in (0, 1)])
+        self.yBreaks = _uniqueBreaks(yBreaks)
+
+    def outerRing(self, inset: float = 0) -> list[tuple[float, float]]:
+        return meshUtils.roundedRectangleRing(
+            inset,
+            inset,
+            self.width - inset,
+            self.length - inset,
+            self.cornerRadius - inset,
+            xBreaks=self.xBreaks,
+            yBreaks=self.yBreaks,
+            keepBreaks=True,
+        )
+
+    def interiorRing(self) -> list[tuple[float, float]]:
+        return meshUtils.roundedRectangleRing(
+            self.minX,
+            self.minY,
+            self.maxX,
+            self.maxY,
+            self.pocketRadius,
+            xBreaks=self.xBreaks,
+            yBreaks=self.yBreaks,
+            keepBreaks=True,
+        )
+
+    def pocketBounds(self, compartment) -> tuple[float, float, float, float]:
+        xMin = self.gridX[int(compartment.positionX)] + self.wall / 2
+        yMin = self.gridY[int(compartment.positionY)] + self.wall / 2
+        return (
+            xMin,
+            yMin,
+            xMin + self.unitWidth * compartment.width + (compartment.width - 1) * self.wall,
+            yMin + self.unitLength * compartment.length + (compartment.length - 1) * self.wall,
+        )
+
+def _tabProfile(input, layout: _BinBodyLayout, pocketBounds: tuple[float, float, float, float]) -> tuple[float, float, float, float, float]:
+    """
+    Label tab on the +Y wall of a pocket as (start x, end x, top z, width, height), None when it
+    does not fit. The tab narrows from width at its top to nothing at height below it, the front
+    edge fillet rounds its tip.
+    """
+    (xMin, yMin, xMax, yMax) = pocketBounds
+    tabStart = xMin + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth
+    tabEnd = tabStart + max(0, min(input.tabLength, input.binWidth)) * input.baseWidth
+    # keep to the straight part of the wall, the tab is intersected with the compartment cutout
+    tabStart = max(tabStart, xMin + layout.pocketRadius)
+    tabEnd = min(tabEnd, xMax - layout.pocketRadius)
+    if tabEnd - tabStart <= const.DEFAULT_FILTER_TOLERANCE:
+        return None
+    tabWidth = input.tabWidth + const.BIN_TAB_EDGE_FILLET_RADIUS / math.tan((math.radians(90) - input.tabOverhangAngle) / 2)
+    tabHeight = tabWidth / math.tan(input.tabOverhangAngle)
+    return (tabStart, tabEnd, layout.height - const.BIN_TAB_TOP_CLEARANCE, tabWidth, tabHeight)
+
+def _lipRings(input, layout: _BinBodyLayout) -> list[tuple[list[tuple[float, float]], float]]:
+    # lip cutout is a base body profile raised by the base height, see createGridfinityBinBodyLip
+    cutoutTop = layout.height + const.BIN_BASE_HEIGHT
+    chamferBottom = cutoutTop - const.BIN_BASE_TOP_SECTION_HEIGH
+    lipInset = const.BIN_BASE_TOP_SECTION_HEIGH - input.xyClearance * 2
+    rings = [
+        (layout.outerRing(cutoutTop - layout.topHeight - input.xyClearance * 2), layout.topHeight),
+        (layout.outerRing(lipInset), chamferBottom),
+    ]
+    if layout.wall < lipInset:
+        rings.append((layout.outerRing(lipInset), layout.height + lipInset - layout.wall))
+    else:
+        rings.append((layout.outerRing(lipInset), layout.height))
+    return rings
+
+def _compartmentGrid(input, layout: _BinBodyLayout) -> list[list[int]]:
+    grid = [[None] * layout.countY for _ in range(layout.countX)]
+    for index, compartment in enumerate(input.compartments):
+        for i in range(int(compartment.positionX), int(compartment.positionX + compartment.width)):
+            for j in range(int(compartment.positionY), int(compartment.positionY + compartment.length)):
+                if not (0 <= i < layout.countX and 0 <= j < layout.countY):
+                    raise ValueError('Compartment {} is outside of the compartments grid'.format(index + 1))
+                if grid[i][j] is not None:
+                    raise ValueError('Compartments {} and {} overlap'.format(grid[i][j] + 1, index + 1))
+                grid[i][j] = index
+    if min(layout.unitWidth, layout.unitLength) < layout.pocketRadius * 2:
+        raise ValueError('Compartments are too small for the {:.2f}mm corner fillet'.format(layout.pocketRadius * 10))
+    return grid
+
+def _tileOutline(
+    bounds: tuple[float, float, float, float],
+    radius: float,
+    corners: tuple[bool, bool, bool, bool],
+    xBreaks: list[float],
+    yBreaks: list[float],
+) -> list[tuple[float, float]]:
+    """
+    Counter clockwise outline of a rectangle with the given corners, in order bottom right, top right,
+    top left, bottom left, rounded like roundedRectangleRing rounds them. Sides carry every break on them.
+    """
+    (xMin, yMin, xMax, yMax) = bounds
+    tolerance = 10 ** -meshUtils.MESH_VERTEX_DECIMALS
+
+    def between(values, low, high, isReversed):
+        inner = [v for v in _uniqueBreaks(values) if low + tolerance < v < high - tolerance]
+        return list(reversed(inner)) if isReversed else inner
+
+    (isBottomRight, isTopRight, isTopLeft, isBottomLeft) = corners
+    bottomRight = meshUtils.arcPoints(xMax - radius, yMin + radius, radius, -math.pi / 2) if isBottomRight else [(xMax, yMin)]
+    topRight = meshUtils.arcPoints(xMax - radius, yMax - radius, radius, 0) if isTopRight else [(xMax, yMax)]
+    topLeft = meshUtils.arcPoints(xMin + radius, yMax - radius, radius, math.pi / 2) if isTopLeft else [(xMin, yMax)]
+    bottomLeft = meshUtils.arcPoints(xMin + radius, yMin + radius, radius, math.pi) if isBottomLeft else [(xMin, yMin)]
+    return bottomRight + \
+        [(xMax, y) for y in between(yBreaks, bottomRight[-1][1], topRight[0][1], False)] + \
+        topRight + \
+        [(x, yMax) for x in between(xBreaks, topLeft[0][0], topRight[-1][0], True)] + \
+        topLeft + \
+        [(xMin, y) for y in between(yBreaks, bottomLeft[0][1], topLeft[-1][1], True)] + \
+        bottomLeft + \
+        [(x, yMin) for x in between(xBreaks, bottomLeft[-1][0], bottomRight[0][0], False)]
+
+def _frameOutline(layout: _BinBodyLayout, columns: tuple[int, int], rows: tuple[int, int]) -> list[tuple[float, float]]:
+    """
+    Outline of a grid region on top of the dividers, bounded by the grid lines and the interior ring
+    """
+    isLeft, isRight = columns[0] == 0, columns[1] == layout.countX
+    isBottom, isTop = rows[0] == 0, rows[1] == layout.countY
+    bounds = (
+        layout.minX if isLeft else layout.gridX[columns[0]],
+        layout.minY if isBottom else layout.gridY[rows[0]],
+        layout.maxX if isRight else layout.gridX[columns[1]],
+        layout.maxY if isTop else layout.gridY[rows[1]],
+    )
+    corners = (isRight and isBottom, isRight and isTop, isLeft and isTop, isLeft and isBottom)
+    return _tileOutline(bounds, layout.pocketRadius, corners, layout.xBreaks, layout.yBreaks)
+
+def _addPocket(mesh: Mesh, input, layout: _BinBodyLayout, index: int, topZ: float, outerRings: list = []) -> list[int]:
+    """
+    Lofts the pocket of a compartment from topZ down, after outerRings when given, and closes its floor.
+    Returns the top ring, None when the compartment is too shallow for a pocket.
+    """
+    compartment = input.compartments[index]
+    floorZ = layout.height - min(layout.height - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
+    if floorZ >= topZ - const.DEFAULT_FILTER_TOLERANCE:
+        return None
+    (xMin, yMin, xMax, yMax) = layout.pocketBounds(compartment)
+    pocketRings = _pocketRings(
+        xMin,
+        yMin,
+        xMax,
+        yMax,
+        topZ,
+        floorZ,
+        layout.pocketRadius,
+        input.hasScoop,
+        input.scoopMaxRadius,
+        layout.xBreaks,
+        layout.yBreaks,
+        layout.tabs.get(index),
+    )
+    rings = meshUtils.addLoft(mesh, outerRings + pocketRings)
+    meshUtils.addRegion(mesh, rings[-1], [], True)
+    return rings[len(outerRings)]
+
+def _addBinBody(mesh: Mesh, input, layout: _BinBodyLayout) -> list[int]:
+    """
+    Bin body above z=0: walls, lip and compartments. Returns the open bottom ring.
+    """
+    outerRings = [(layout.outerRing(), 0), (layout.outerRing(), layout.topHeight)]
+    if input.hasLip:
+        outerRings += _lipRings(input, layout)
+
+    if input.isSolid:
+        if input.hasLip:
+            outerRings.append((layout.interiorRing(), layout.height))
+        rings = meshUtils.addLoft(mesh, outerRings)
+        meshUtils.addFan(mesh, rings[-1], True)
+        return rings[0]
+
+    compartments = list(input.compartments)
+    isSingleCompartment = len(compartments) == 1 \
+        and compartments[0].positionX == 0 and compartments[0].positionY == 0 \
+        and compartments[0].width == layout.countX and compartments[0].length == layout.countY
+    if isSingleCompartment:
+        bottomRing = meshUtils.addRing(mesh, outerRings[0][0], 0)
+        if _addPocket(mesh, input, layout, 0, layout.height, outerRings) is None:
+            rings = meshUtils.addLoft(mesh, outerRings + [(layout.interiorRing(), layout.height)])
+            meshUtils.addFan(mesh, rings[-1], True)
+        return bottomRing
+
+    # dividers stop below the walls, the rest of the interior is one open space
+    grid = _compartmentGrid(input, layout)
+    coreTop = layout.height - const.BIN_TAB_TOP_CLEARANCE
+    outerRings += [(layout.interiorRing(), layout.height), (layout.interiorRing(), coreTop)]
+    rings = meshUtils.addLoft(mesh, outerRings)
+    for i in range(layout.countX):
+        for j in range(layout.countY):
+            if grid[i][j] is None:
+                meshUtils.addRegion(mesh, meshUtils.addRing(mesh, _frameOutline(layout, (i, i + 1), (j, j + 1)), coreTop), [], True)
+    for index, compartment in enumerate(compartments):
+        columns = (int(compartment.positionX), int(compartment.positionX + compartment.width))
+        rows = (int(compartment.positionY), int(compartment.positionY + compartment.length))
+        frame = meshUtils.addRing(mesh, _frameOutline(layout, columns, rows), coreTop)
+        pocketTop = _addPocket(mesh, input, layout, index, coreTop)
+        meshUtils.addRegion(mesh, frame, [pocketTop] if pocketTop is not None else [], True)
+    return rings[0]
+
+def _addBinBottom(mesh: Mesh, baseInput, layout: _BinBodyLayout, binWidth: int, binLength: int):
+    """
+    Base cells under the body with the face at z=0 around them, split into a tile per cell
+    that runs to the middle of the gaps between the cells
+    """
+    clearance = baseInput.xyClearance
+    for i in range(binWidth):
+        for j in range(binLength):
+            originX, originY = i * baseInput.baseWidth, j * baseInput.baseLength
+            cellTop = _addBaseCell(mesh, baseInput, originX, originY, layout.xBreaks, layout.yBreaks, False)
+            isLeft, isRight, isBottom, isTop = i == 0, i == binWidth - 1, j == 0, j == binLength - 1
+            bounds = (
+                0 if isLeft else originX - clearance,
+                0 if isBottom else originY - clearance,
+                layout.width if isRight else originX + baseInput.baseWidth - clearance,
+                layout.length if isTop else originY + baseInput.baseLength - clearance,
+            )
+            corners = (isRight and isBottom, isRight and isTop, isLeft and isTop, isLeft and isBottom)
+            tile = meshUtils.addRing(mesh, _tileOutline(bounds, layout.cornerRadius, corners, layout.xBreaks, layout.yBreaks), 0)
+            meshUtils.addRegion(mesh, tile, [cellTop], False)
+
+def unsupportedMeshOptions(binBodyInput, baseInput, generateBase: bool = True, generateBody: bool = True) -> list[str]:
+    """
+    Enabled bin options the mesh does not model, empty when the mesh covers the bin
+    """
+    options = []
+    if generateBody and binBodyInput.hasLip and binBodyInput.hasLipNotches:
+        options.append('lip notches')
+    if generateBase and baseInput.hasMagnetCutouts and baseInput.hasMagnetCutoutsTabs:
+        options.append('magnet cutout tabs')
+    # the square bridge of the groove has to fit in the magnet cutout
+    if generateBase and _hasPrintHelperGroove(baseInput) \
+            and baseInput.screwHolesDiameter < baseInput.magnetCutoutsDiameter <= baseInput.screwHolesDiameter * math.sqrt(2):
+        options.append('print helper grooves around screw holes wider than 70% of the magnet cutouts')
+    return options
+
+def createGridfinityBinMesh(
+    binBodyInput,
+    baseInput,
+    generateBase: bool = True,
+    generateBody: bool = True,
+    name: str = '',
+) -> MeshModel:
+    """
+    Headless equivalent of generateBin: base cells patterned over the bin footprint joined to the bin body,
+    as one closed shell. Raises ValueError for bins lower than 1u and for options listed by unsupportedMeshOptions
+    """
+    if binBodyInput.binHeight < 1:
+        raise ValueError('Bin height has to be at least 1u, got {}'.format(binBodyInput.binHeight))
+    unsupportedOptions = unsupportedMeshOptions(binBodyInput, baseInput, generateBase, generateBody)
+    if unsupportedOptions:
+        raise ValueError('The headless bin mesh does not model {}'.format(', '.join(unsupportedOptions)))
+    if generateBase and generateBody \
+            and not math.isclose(baseInput.cornerFilletRadius - baseInput.xyClearance, binBodyInput.binCornerFilletRadius, abs_tol=const.DEFAULT_FILTER_TOLERANCE):
+        raise ValueError('The headless bin mesh needs the bin corner radius to match the base cell top')
+    name = name or 'Gridfinity bin {}x{}x{}'.format(int(binBodyInput.binLength), int(binBodyInput.binWidth), int(binBodyInput.binHeight))
+    mesh = Mesh(name)
+    binWidth, binLength = int(binBodyInput.binWidth), int(binBodyInput.binLength)
+    if generateBody:
+        layout = _BinBodyLayout(binBodyInput)
+        bottomRing = _addBinBody(mesh, binBodyInput, layout)
+        if generateBase:
+            _addBinBottom(mesh, baseInput, layout, binWidth, binLength)
+        else:
+            meshUtils.addFan(mesh, bottomRing, False)
+    elif generateBase:
+        for i in range(binWidth):
+            for j in range(binLength):
+                _addBaseCell(mesh, baseInput, i * baseInput.baseWidth, j * baseInput.baseLength, [], [], True)
+    model = MeshModel(name)
+    model.addPart(mesh)
+    return model
@@ -1,5 +1,3 @@
-import adsk.core, adsk.fusion, traceback
-
 BIN_XY_CLEARANCE = 0.025
 BIN_CORNER_FILLET_RADIUS = 0.4
 
@@ -0,0 +1,523 @@
+import adsk.core, adsk.fusion, traceback
+import math
+
+from . import const, traceUtils
+from .baseGeneratorInput import BaseGeneratorInput
+from .binBodyGeneratorInput import BinBodyGeneratorInput
+
+# Direct modelling counterpart of generateBin for designs with history disabled.
+# Every part is built in memory with TemporaryBRepManager primitives and booleans, only the finished
+# body is added to the component, so no feature lands in a timeline. Fillets and chamfers are
+# rebuilt from boxes, cylinders, cones and spheres:
+# - base cells, lip and body corners are rounded frustums (fixed corner centers, like the sketches)
+# - compartment bottom fillets and the scoop subtract edge cylinders and corner spheres
+# - label tabs are triangular prisms with an edge cylinder fillet, clipped to their compartment
+# Magnet cutout tabs and shelled bins are not modelled, see unsupportedBinOptions.
+
+# half spaces are boxes this large, far beyond any bin
+DIRECT_HALF_SPACE_SIZE = 1000
+
+def unsupportedBinOptions(hasMagnetCutoutsTabs: bool, isShelled: bool) -> list[str]:
+    """
+    Bin options only the parametric generators can build, empty when the direct path covers the bin
+    """
+    options = []
+    if isShelled:
+        options.append('shelled bin type')
+    if hasMagnetCutoutsTabs and not isShelled:
+        options.append('magnet cutout tabs')
+    return options
+
+def _box(
+    xMin: float,
+    yMin: float,
+    zMin: float,
+    xMax: float,
+    yMax: float,
+    zMax: float,
+) -> adsk.fusion.BRepBody:
+    return adsk.fusion.TemporaryBRepManager.get().createBox(adsk.core.OrientedBoundingBox3D.create(
+        adsk.core.Point3D.create((xMin + xMax) / 2, (yMin + yMax) / 2, (zMin + zMax) / 2),
+        adsk.core.Vector3D.create(1, 0, 0),
+        adsk.core.Vector3D.create(0, 1, 0),
+        xMax - xMin,
+        yMax - yMin,
+        zMax - zMin,
+    ))
+
+def _halfSpace(point: tuple[float, float, float], normal: tuple[float, float, float]) -> adsk.fusion.BRepBody:
+    """
+    Everything on the normal side of the plane through point, within DIRECT_HALF_SPACE_SIZE
+    """
+    normalVector = adsk.core.Vector3D.create(*normal)
+    normalVector.normalize()
+    sideVector = normalVector.crossProduct(adsk.core.Vector3D.create(0, 0, 1))
+    if sideVector.length < const.DEFAULT_FILTER_TOLERANCE:
+        sideVector = adsk.core.Vector3D.create(1, 0, 0)
+    sideVector.normalize()
+    size = DIRECT_HALF_SPACE_SIZE
+    return adsk.fusion.TemporaryBRepManager.get().createBox(adsk.core.OrientedBoundingBox3D.create(
+        adsk.core.Point3D.create(
+            point[0] + normalVector.x * size / 2,
+            point[1] + normalVector.y * size / 2,
+            point[2] + normalVector.z * size / 2,
+        ),
+        normalVector,
+        sideVector,
+        size,
+        size,
+        size,
+    ))
+
+def _cylinder(start: tuple[float, float, float], end: tuple[float, float, float], startRadius: float, endRadius: float = None) -> adsk.fusion.BRepBody:
+    return adsk.fusion.TemporaryBRepManager.get().createCylinderOrCone(
+        adsk.core.Point3D.create(*start),
+        startRadius,
+        adsk.core.Point3D.create(*end),
+        startRadius if endRadius is None else endRadius,
+    )
+
+def _boolean(target: adsk.fusion.BRepBody, tools: list[adsk.fusion.BRepBody], booleanType: int) -> adsk.fusion.BRepBody:
+    tbm = adsk.fusion.TemporaryBRepManager.get()
+    for tool in tools:
+        tbm.booleanOperation(target, tool, booleanType)
+    return target
+
+def _cut(target: adsk.fusion.BRepBody, tools: list[adsk.fusion.BRepBody]) -> adsk.fusion.BRepBody:
+    return _boolean(target, tools, adsk.fusion.BooleanTypes.DifferenceBooleanType)
+
+def _join(target: adsk.fusion.BRepBody, tools: list[adsk.fusion.BRepBody]) -> adsk.fusion.BRepBody:
+    return _boolean(target, tools, adsk.fusion.BooleanTypes.UnionBooleanType)
+
+def _moved(body: adsk.fusion.BRepBody, byX: float, byY: float, byZ: float = 0) -> adsk.fusion.BRepBody:
+    tbm = adsk.fusion.TemporaryBRepManager.get()
+    movedBody = tbm.copy(body)
+    transform = adsk.core.Matrix3D.create()
+    transform.translation = adsk.core.Vector3D.create(byX, byY, byZ)
+    tbm.transform(movedBody, transform)
+    return movedBody
+
+def roundedFrustum(
+    bottomBounds: tuple[float, float, float, float],
+    topBounds: tuple[float, float, float, float],
+    bottomRadius: float,
+    topRadius: float,
+    zBottom: float,
+    zTop: float,
+) -> adsk.fusion.BRepBody:
+    """
+    Rounded rectangle (xMin, yMin, xMax, yMax) at zBottom lofted to topBounds at zTop with straight sides.
+    Corner arcs keep the centers of the bottom outline and go from bottomRadius to topRadius, the way
+    the base and lip sketches are chamfered
+    """
+    (bx0, by0, bx1, by1) = bottomBounds
+    (tx0, ty0, tx1, ty1) = topBounds
+    height = zTop - zBottom
+    body = _box(min(bx0, tx0), min(by0, ty0), zBottom, max(bx1, tx1), max(by1, ty1), zTop)
+
+    # tapered sides, normals point out of the solid
+    sideCuts = []
+    for (bottomValue, topValue, sign, axis) in [(bx0, tx0, -1, 0), (bx1, tx1, 1, 0), (by0, ty0, -1, 1), (by1, ty1, 1, 1)]:
+        taper = topValue - bottomValue
+        if abs(taper) < const.DEFAULT_FILTER_TOLERANCE:
+            continue
+        point = [0.0, 0.0, zBottom]
+        point[axis] = bottomValue
+        normal = [0.0, 0.0, -taper * sign]
+        normal[axis] = height * sign
+        sideCuts.append(_halfSpace(tuple(point), tuple(normal)))
+    _cut(body, sideCuts)
+
+    bottomRadius = max(0, bottomRadius)
+    topRadius = max(0, topRadius)
+    if max(bottomRadius, topRadius) < const.DEFAULT_FILTER_TOLERANCE:
+        return body
+    cornerCuts = []
+    for (xSign, ySign) in [(-1, -1), (1, -1), (1, 1), (-1, 1)]:
+        centerX = (bx0 + bottomRadius) if xSign < 0 else (bx1 - bottomRadius)
+        centerY = (by0 + bottomRadius) if ySign < 0 else (by1 - bottomRadius)
+        outerX = min(bx0, tx0) if xSign < 0 else max(bx1, tx1)
+        outerY = min(by0, ty0) if ySign < 0 else max(by1, ty1)
+        cornerBlock = _box(min(centerX, outerX), min(centerY, outerY), zBottom, max(centerX, outerX), max(centerY, outerY), zTop)
+        _cut(cornerBlock, [_cylinder((centerX, centerY, zBottom), (centerX, centerY, zTop), bottomRadius, topRadius)])
+        cornerCuts.append(cornerBlock)
+    return _cut(body, cornerCuts)
+
+def roundedPrism(
+    bounds: tuple[float, float, float, float],
+    radius: float,
+    zBottom: float,
+    zTop: float,
+) -> adsk.fusion.BRepBody:
+    return roundedFrustum(bounds, bounds, radius, radius, zBottom, zTop)
+
+def _inset(bounds: tuple[float, float, float, float], inset: float) -> tuple[float, float, float, float]:
+    return (bounds[0] + inset, bounds[1] + inset, bounds[2] - inset, bounds[3] - inset)
+
+def createBaseProfileBody(
+    bounds: tuple[float, float, float, float],
+    topZ: float,
+    cornerFilletRadius: float,
+    hasBottomChamfer: bool,
+) -> adsk.fusion.BRepBody:
+    """
+    Same outline createSingleGridfinityBaseBody extrudes down from topZ: chamfered top section,
+    straight mid section and the optional bottom chamfer
+    """
+    topHeight = const.BIN_BASE_TOP_SECTION_HEIGH
+    bottomHeight = const.BIN_BASE_BOTTOM_SECTION_HEIGH
+    bottomZ = topZ - const.BIN_BASE_HEIGHT
+    topSection = roundedFrustum(_inset(bounds, topHeight), bounds, cornerFilletRadius - topHeight, cornerFilletRadius, topZ - topHeight, topZ)
+    midSectionBottom = bottomZ + bottomHeight if hasBottomChamfer else bottomZ
+    sections = [roundedPrism(_inset(bounds, topHeight), cornerFilletRadius - topHeight, midSectionBottom, topZ - topHeight)]
+    if hasBottomChamfer:
+        sections.append(roundedFrustum(
+            _inset(bounds, topHeight + bottomHeight),
+            _inset(bounds, topHeight),
+            cornerFilletRadius - topHeight - bottomHeight,
+            cornerFilletRadius - topHeight,
+            bottomZ,
+            midSectionBottom,
+        ))
+    return _join(topSection, sections)
+
+def _createHoleCutout(input: BaseGeneratorInput, center: tuple[float, float], bottomZ: float) -> adsk.fusion.BRepBody:
+    (x, y) = center
+    cutouts = []
+    if input.hasScrewHoles:
+        cutouts.append(_cylinder((x, y, bottomZ), (x, y, bottomZ + const.BIN_BASE_HEIGHT), input.screwHolesDiameter / 2))
+    if input.hasMagnetCutouts:
+        cutouts.append(_cylinder((x, y, bottomZ), (x, y, bottomZ + input.magnetCutoutsDepth), input.magnetCutoutsDiameter / 2))
+        if input.hasScrewHoles and (const.BIN_BASE_HEIGHT - input.magnetCutoutsDepth) > const.BIN_MAGNET_HOLE_GROOVE_DEPTH:
+            # print helper groove: a slot then a square bridge above the magnet, turned by 45 degrees
+            grooveZ = bottomZ + input.magnetCutoutsDepth
+            grooveHalfDepth = const.BIN_MAGNET_HOLE_GROOVE_DEPTH / 2
+            magnetRadius = input.magnetCutoutsDiameter / 2
+            screwRadius = input.screwHolesDiameter / 2
+            grooveLayers = _box(x - magnetRadius, y - screwRadius, grooveZ, x + magnetRadius, y + screwRadius, grooveZ + grooveHalfDepth)
+            _join(grooveLayers, [_box(x - screwRadius, y - screwRadius, grooveZ + grooveHalfDepth, x + screwRadius, y + screwRadius, grooveZ + grooveHalfDepth * 2)])
+            groove = _cylinder((x, y, grooveZ), (x, y, grooveZ + const.BIN_MAGNET_HOLE_GROOVE_DEPTH), magnetRadius)
+            _boolean(groove, [grooveLayers], adsk.fusion.BooleanTypes.IntersectionBooleanType)
+            rotation = adsk.core.Matrix3D.create()
+            rotation.setToRotation(math.radians(-45), adsk.core.Vector3D.create(0, 0, 1), adsk.core.Point3D.create(x, y, 0))
+            adsk.fusion.TemporaryBRepManager.get().transform(groove, rotation)
+            cutouts.append(groove)
+    return _join(cutouts[0], cutouts[1:])
+
+@traceUtils.traced('direct base cell')
+def createDirectBaseCell(input: BaseGeneratorInput) -> adsk.fusion.BRepBody:
+    origin = input.originPoint
+    bounds = (origin.x, origin.y, origin.x + input.baseWidth, origin.y + input.baseLength)
+    cell = createBaseProfileBody(bounds, origin.z, input.cornerFilletRadius, input.hasBottomChamfer)
+    if input.hasScrewHoles or input.hasMagnetCutouts:
+        tbm = adsk.fusion.TemporaryBRepManager.get()
+        holeCutout = _createHoleCutout(
+            input,
+            (origin.x + const.DIMENSION_SCREW_HOLES_OFFSET, origin.y + const.DIMENSION_SCREW_HOLES_OFFSET),
+            origin.z - const.BIN_BASE_HEIGHT,
+        )
+        # same circular pattern around the cell center as the parametric base
+        cellCenter = adsk.core.Point3D.create((bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2, 0)
+        holeCutouts = [holeCutout]
+        for index in range(1, 4):
+            rotatedCutout = tbm.copy(holeCutout)
+            rotation = adsk.core.Matrix3D.create()
+            rotation.setToRotation(math.radians(90 * index), adsk.core.Vector3D.create(0, 0, 1), cellCenter)
+            tbm.transform(rotatedCutout, rotation)
+            holeCutouts.append(rotatedCutout)
+        _cut(cell, holeCutouts)
+    return cell
+
+@traceUtils.traced('direct base')
+def createDirectBaseBodies(
+    input: BaseGeneratorInput,
+    basesXCount: int,
+    basesYCount: int,
+    isJoined: bool = True,
+) -> list[adsk.fusion.BRepBody]:
+    """
+    Base cells over the bin footprint trimmed to the clearance outline, like createBaseBodyPattern + cutBaseClearance.
+    Joined into one body, or one body per cell like the pattern leaves them when there is no bin body to join
+    """
+    cell = createDirectBaseCell(input)
+    cells = [
+        _moved(cell, i * input.baseWidth, j * input.baseLength)
+        for i in range(int(basesXCount))
+        for j in range(int(basesYCount))
+        if i > 0 or j > 0
+    ]
+    if isJoined:
+        with traceUtils.span('direct base join', count=len(cells) + 1):
+            cells = [_join(cell, cells)]
+    else:
+        cells.insert(0, cell)
+    origin = input.originPoint
+    clearanceOutline = roundedPrism(
+        (
+            origin.x + input.xyClearance,
+            origin.y + input.xyClearance,
+            origin.x + input.baseWidth * basesXCount - input.xyClearance,
+            origin.y + input.baseLength * basesYCount - input.xyClearance,
+        ),
+        input.cornerFilletRadius - input.xyClearance,
+        origin.z - const.BIN_BASE_HEIGHT,
+        origin.z,
+    )
+    # the outline is only a tool, every cell can be trimmed with it
+    return [_boolean(body, [clearanceOutline], adsk.fusion.BooleanTypes.IntersectionBooleanType) for body in cells]
+
+def createDirectCompartmentCutout(
+    bounds: tuple[float, float, float, float],
+    topZ: float,
+    depth: float,
+    filletRadius: float,
+    hasScoop: bool,
+    scoopMaxRadius: float,
+    hasBottomFillet: bool,
+) -> adsk.fusion.BRepBody:
+    """
+    Same shape as createGridfinityBinBodyCutout: vertical fillets, the scoop along the -Y bottom edge
+    and the bottom fillet on the other edges. Radii are clamped to the pocket like _pocketRings does
+    """
+    (x0, y0, x1, y1) = bounds
+    floorZ = topZ - depth
+    filletRadius = min(filletRadius, (x1 - x0) / 2, (y1 - y0) / 2)
+    cutout = roundedPrism(bounds, filletRadius, floorZ, topZ)
+    if not (hasBottomFillet or hasScoop):
+        return cutout
+
+    bottomRadius = min(filletRadius, depth) if hasBottomFillet else 0
+    scoopRadius = bottomRadius
+    if hasScoop:
+        scoopRadius = min(scoopMaxRadius, depth) if min(scoopMaxRadius, depth) >= filletRadius else filletRadius
+        scoopRadius = max(filletRadius, min(scoopRadius, y1 - y0 - filletRadius, depth))
+
+    wasteCuts = []
+    def edgeWaste(start: tuple[float, float, float], end: tuple[float, float, float], block: tuple, radius: float):
+        waste = _box(*block)
+        _cut(waste, [_cylinder(start, end, radius)])
+        wasteCuts.append(waste)
+
+    if scoopRadius > const.DEFAULT_FILTER_TOLERANCE:
+        # scoop runs the full width, the vertical fillets trim its ends
+        edgeWaste(
+            (x0, y0 + scoopRadius, floorZ + scoopRadius),
+            (x1, y0 + scoopRadius, floorZ + scoopRadius),
+            (x0, y0, floorZ, x1, y0 + scoopRadius, floorZ + scoopRadius),
+            scoopRadius,
+        )
+    if bottomRadius > const.DEFAULT_FILTER_TOLERANCE:
+        r = bottomRadius
+        sideStartY = y0 if hasScoop else y0 + r
+        edgeWaste((x0 + r, sideStartY, floorZ + r), (x0 + r, y1 - r, floorZ + r), (x0, sideStartY, floorZ, x0 + r, y1 - r, floorZ + r), r)
+        edgeWaste((x1 - r, sideStartY, floorZ + r), (x1 - r, y1 - r, floorZ + r), (x1 - r, sideStartY, floorZ, x1, y1 - r, floorZ + r), r)
+        edgeWaste((x0 + r, y1 - r, floorZ + r), (x1 - r, y1 - r, floorZ + r), (x0 + r, y1 - r, floorZ, x1 - r, y1, floorZ + r), r)
+        if not hasScoop:
+            edgeWaste((x0 + r, y0 + r, floorZ + r), (x1 - r, y0 + r, floorZ + r), (x0 + r, y0, floorZ, x1 - r, y0 + r, floorZ + r), r)
+        tbm = adsk.fusion.TemporaryBRepManager.get()
+        corners = [(x0 + r, y1 - r, -1, 1), (x1 - r, y1 - r, 1, 1)]
+        if not hasScoop:
+            corners += [(x0 + r, y0 + r, -1, -1), (x1 - r, y0 + r, 1, -1)]
+        for (centerX, centerY, xSign, ySign) in corners:
+            waste = _box(
+                min(centerX, centerX + xSign * r),
+                min(centerY, centerY + ySign * r),
+                floorZ,
+                max(centerX, centerX + xSign * r),
+                max(centerY, centerY + ySign * r),
+                floorZ + r,
+            )
+            _cut(waste, [tbm.createSphere(adsk.core.Point3D.create(centerX, centerY, floorZ + r), r)])
+            wasteCuts.append(waste)
+    return _cut(cutout, wasteCuts)
+
+def createDirectTab(
+    origin: tuple[float, float, float],
+    length: float,
+    width: float,
+    overhangAngle: float,
+    topClearance: float,
+) -> adsk.fusion.BRepBody:
+    """
+    Label tab prism from createGridfinityBinBodyTab with its front edge fillet, origin is the top back corner
+    on the compartment wall
+    """
+    (x, y, z) = origin
+    tabTopZ = z - topClearance
+    # the fillet takes the tip off the triangle, the flat top keeps the requested width
+    tipAngle = math.radians(90) - overhangAngle
+    filletRadius = const.BIN_TAB_EDGE_FILLET_RADIUS
+    filletTangentDistance = filletRadius / math.tan(tipAngle / 2)
+    tabWidth = width + filletTangentDistance
+    tabHeight = tabWidth / math.tan(overhangAngle)
+    frontY = y - tabWidth
+    tab = _box(x, frontY, tabTopZ - tabHeight, x + length, y, tabTopZ)
+    # overhang face from the bottom of the back wall to the front edge
+    overhangWaste = _halfSpace((x, y, tabTopZ - tabHeight), (0, -tabHeight, -tabWidth))
+    # tip between the two tangent lines of the fillet, the lower one is on the overhang face
+    filletWaste = _box(x, frontY, tabTopZ - filletTangentDistance * math.sin(tipAngle), x + length, frontY + filletTangentDistance, tabTopZ)
+    _cut(filletWaste, [_cylinder(
+        (x, frontY + filletTangentDistance, tabTopZ - filletRadius),
+        (x + length, frontY + filletTangentDistance, tabTopZ - filletRadius),
+        filletRadius,
+    )])
+    return _cut(tab, [overhangWaste, filletWaste])
+
+@traceUtils.traced('direct lip')
+def createDirectLip(input: BinBodyGeneratorInput, width: float, length: float, bottomZ: float) -> adsk.fusion.BRepBody:
+    clearance = input.xyClearance
+    lipTopZ = bottomZ + const.BIN_LIP_EXTRA_HEIGHT
+    lip = roundedPrism((0, 0, width, length), input.binCornerFilletRadius, bottomZ, lipTopZ)
+    lipCutoutRadius = input.binCornerFilletRadius + clearance * 2
+    lipCutouts = []
+    if input.hasLipNotches:
+        cellCutout = createBaseProfileBody(
+            (-clearance * 2, -clearance * 2, input.baseWidth, input.baseLength),
+            bottomZ + const.BIN_BASE_HEIGHT,
+            lipCutoutRadius,
+            False,
+        )
+        lipCutouts = [cellCutout] + [
+            _moved(cellCutout, i * input.baseWidth, j * input.baseLength)
+            for i in range(int(input.binWidth))
+            for j in range(int(input.binLength))
+            if i > 0 or j > 0
+        ]
+        lipCutouts.append(roundedPrism(
+            (
+                input.wallThickness - clearance,
+                input.wallThickness - clearance,
+                width - input.wallThickness + clearance,
+                length - input.wallThickness + clearance,
+            ),
+            input.binCornerFilletRadius - input.wallThickness + clearance,
+            bottomZ,
+            lipTopZ,
+        ))
+    else:
+        lipCutouts.append(createBaseProfileBody(
+            (-clearance * 2, -clearance * 2, input.baseWidth * input.binWidth, input.baseLength * input.binLength),
+            bottomZ + const.BIN_BASE_HEIGHT,
+            lipCutoutRadius,
+            False,
+        ))
+    if const.BIN_LIP_TOP_RECESS_HEIGHT > const.DEFAULT_FILTER_TOLERANCE:
+        lipCutouts.append(_box(0, 0, lipTopZ - const.BIN_LIP_TOP_RECESS_HEIGHT, width, length, lipTopZ))
+
+    if input.wallThickness < const.BIN_LIP_WALL_THICKNESS:
+        # chamfer from the compartment walls up to the lip, the scoop side stays straight
+        chamferSize = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, input.binCornerFilletRadius - input.wallThickness)
+        chamferBounds = (
+            input.wallThickness,
+            (const.BIN_LIP_WALL_THICKNESS - clearance) if input.hasScoop else input.wallThickness,
+            width - input.wallThickness,
+            length - input.wallThickness,
+        )
+        chamferTopBounds = (
+            chamferBounds[0] + chamferSize,
+            chamferBounds[1] if input.hasScoop else chamferBounds[1] + chamferSize,
+            chamferBounds[2] - chamferSize,
+            chamferBounds[3] - chamferSize,
+        )
+        lipCutouts.append(roundedFrustum(chamferBounds, chamferTopBounds, chamferSize, 0, bottomZ, bottomZ + chamferSize))
+    with traceUtils.span('direct lip cut', tools=len(lipCutouts)):
+        return _cut(lip, lipCutouts)
+
+@traceUtils.traced('direct bin body')
+def createDirectBinBody(input: BinBodyGeneratorInput) -> adsk.fusion.BRepBody:
+    """
+    Bin walls, lip, compartments and tabs from createGridfinityBinBody as one temporary body
+    """
+    actualBodyWidth = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
+    actualBodyLength = (input.baseLength * input.binLength) - input.xyClearance * 2.0
+    binBodyTotalHeight = (input.binHeight - 1) * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
+    binBody = roundedPrism((0, 0, actualBodyWidth, actualBodyLength), input.binCornerFilletRadius, 0, binBodyTotalHeight)
+
+    bodiesToMerge: list[adsk.fusion.BRepBody] = []
+    bodiesToSubtract: list[adsk.fusion.BRepBody] = []
+    if input.hasLip:
+        bodiesToMerge.append(createDirectLip(input, actualBodyWidth, actualBodyLength, binBodyTotalHeight))
+
+    if not input.isSolid:
+        compartmentsMinX = input.wallThickness
+        compartmentsMaxX = actualBodyWidth - input.wallThickness
+        compartmentsMinY = (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasLip and input.hasScoop else input.wallThickness
+        compartmentsMaxY = actualBodyLength - input.wallThickness
+        compartmentWidthUnit = (compartmentsMaxX - compartmentsMinX - (input.compartmentsByX - 1) * input.wallThickness) / input.compartmentsByX
+        compartmentLengthUnit = (compartmentsMaxY - compartmentsMinY - (input.compartmentsByY - 1) * input.wallThickness) / input.compartmentsByY
+        cutoutFilletRadius = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, input.binCornerFilletRadius - input.wallThickness)
+        tbm = adsk.fusion.TemporaryBRepManager.get()
+
+        with traceUtils.span('direct compartments', count=len(input.compartments)):
+            for compartment in input.compartments:
+                compartmentX = compartmentsMinX + compartment.positionX * (compartmentWidthUnit + input.wallThickness)
+                compartmentY = compartmentsMinY + compartment.positionY * (compartmentLengthUnit + input.wallThickness)
+                compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
+                compartmentLength = compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
+                compartmentDepth = min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
+                cutout = createDirectCompartmentCutout(
+                    (compartmentX, compartmentY, compartmentX + compartmentWidth, compartmentY + compartmentLength),
+                    binBodyTotalHeight,
+                    compartmentDepth,
+                    cutoutFilletRadius,
+                    input.hasScoop,
+                    input.scoopMaxRadius,
+                    True,
+                )
+                bodiesToSubtract.append(cutout)
+                if input.hasTab:
+                    tab = createDirectTab(
+                        (
+                            compartmentX + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth,
+                            compartmentY + compartmentLength,
+                            binBodyTotalHeight,
+                        ),
+                        max(0, min(input.tabLength, input.binWidth)) * input.baseWidth,
+                        input.tabWidth,
+                        input.tabOverhangAngle,
+                        const.BIN_TAB_TOP_CLEARANCE,
+                    )
+                    _boolean(tab, [tbm.copy(cutout)], adsk.fusion.BooleanTypes.IntersectionBooleanType)
+                    bodiesToMerge.append(tab)
+
+        if len(input.compartments) > 1:
+            bodiesToSubtract.append(createDirectCompartmentCutout(
+                (compartmentsMinX, compartmentsMinY, actualBodyWidth - input.wallThickness, actualBodyLength - input.wallThickness),
+                binBodyTotalHeight,
+                const.BIN_TAB_TOP_CLEARANCE,
+                cutoutFilletRadius,
+                False,
+                0,
+                False,
+            ))
+
+    with traceUtils.span('direct compartments cut', tools=len(bodiesToSubtract)):
+        _cut(binBody, bodiesToSubtract)
+    with traceUtils.span('direct merge', tools=len(bodiesToMerge)):
+        _join(binBody, bodiesToMerge)
+    return binBody
+
+@traceUtils.traced('direct bin')
+def createDirectGridfinityBin(
+    binBodyInput: BinBodyGeneratorInput,
+    baseInput: BaseGeneratorInput,
+    generateBase: bool,
+    generateBody: bool,
+    targetComponent: adsk.fusion.Component,
+) -> adsk.fusion.BRepBody:
+    """
+    Builds the bin in memory and adds it to targetComponent as a single body, for direct modelling designs.
+    Without a bin body every base cell is added as a body of its own and None is returned, like the parametric bin
+    """
+    if not generateBody:
+        if generateBase:
+            baseBodies = createDirectBaseBodies(baseInput, binBodyInput.binWidth, binBodyInput.binLength, isJoined=False)
+            with traceUtils.span('direct insert', count=len(baseBodies)):
+                for baseBody in baseBodies:
+                    targetComponent.bRepBodies.add(baseBody)
+        return None
+    binBody = createDirectBinBody(binBodyInput)
+    if generateBase:
+        _join(binBody, createDirectBaseBodies(baseInput, binBodyInput.binWidth, binBodyInput.binLength))
+    with traceUtils.span('direct insert'):
+        return targetComponent.bRepBodies.add(binBody)
@@ -1,9 +1,40 @@
 import adsk.core, adsk.fusion, traceback
 import os
 import math
+from typing import Callable
 
 from . import const
 
+class EdgeSetBuilder():
+    """
+    Collects edges of faces once each by tempId, edges shared by two faces are only tested once.
+    candidateCount is the number of distinct edges tested
+    """
+    def __init__(self):
+        self.edges: list[adsk.fusion.BRepEdge] = []
+        self.candidateCount = 0
+        self._visited: set[int] = set()
+
+    def addMatching(self, faces: adsk.fusion.BRepFaces, predicate: Callable[[adsk.fusion.BRepEdge], bool]) -> 'EdgeSetBuilder':
+        for face in faces:
+            for edge in face.edges:
+                if edge.tempId in self._visited:
+                    continue
+                self._visited.add(edge.tempId)
+                self.candidateCount += 1
+                if predicate(edge):
+                    self.edges.append(edge)
+        return self
+
+    def addByLength(self, faces: adsk.fusion.BRepFaces, length: float, tolerance: float) -> 'EdgeSetBuilder':
+        return self.addMatching(faces, lambda edge: math.isclose(edge.length, length, abs_tol=tolerance))
+
+    def toObjectCollection(self) -> adsk.core.ObjectCollection:
+        collection = adsk.core.ObjectCollection.create()
+        for edge in self.edges:
+            collection.add(edge)
+        return collection
+
 def matches(edge1: adsk.fusion.BRepEdge, edge2: adsk.fusion.BRepEdge):
     [_, start1, end1] = edge1.evaluator.getEndPoints()
     [_, start2, end2] = edge2.evaluator.getEndPoints()
@@ -15,12 +46,7 @@ def selectEdgesByLength(
     filterEdgeLength: float,
     filterEdgeTolerance: float,
     ):
-    filteredEdges = adsk.core.ObjectCollection.create()
-    for face in faces:
-        for edge in face.edges:
-            if math.isclose(edge.length, filterEdgeLength, abs_tol=filterEdgeTolerance):
-                filteredEdges.add(edge)
-    return filteredEdges
+    return EdgeSetBuilder().addByLength(faces, filterEdgeLength, filterEdgeTolerance).toObjectCollection()
 
 def excludeEdges(edges: list[adsk.fusion.BRepEdge], toExclude: list[adsk.fusion.BRepEdge]):
     toExcludeIds = [edge.tempId for edge in toExclude]
@@ -2,6 +2,7 @@ import adsk.core, adsk.fusion, traceback
 import os
 
 from . import sketchUtils
+from . import operationGraph as og
 
 def simpleDistanceExtrude(
     profile: adsk.core.Base,
@@ -84,3 +85,35 @@ def createBoxAtPoint(
         adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
     extrude.name = 'Simple box at point extrude'
     return extrude
+
+def planBox(
+    width: float,
+    length: float,
+    height: float,
+    graph: og.OperationGraph,
+    targetPlane = og.PLANE_XY,
+    name: str = 'Simple box extrude',
+    bodyName: str = '',
+    ) -> og.Ref:
+    """
+    createBox as graph operations, returns the extrude
+    """
+    recSketch = graph.sketch(targetPlane, [og.Rectangle(width, length)], name='Simple box sketch')
+    return graph.extrude(og.Profile(recSketch), height, extent=og.EXTENT_SIMPLE, name=name, bodyName=bodyName)
+
+def planBoxAtPoint(
+    width: float,
+    length: float,
+    height: float,
+    graph: og.OperationGraph,
+    originPoint: og.Point,
+    name: str = 'Simple box at point extrude',
+    bodyName: str = '',
+    ) -> og.Ref:
+    """
+    createBoxAtPoint as graph operations, returns the extrude
+    """
+    originPoint = og.point(originPoint)
+    boxConstructionPlane = graph.constructionPlane(og.PLANE_XY, originPoint[2], name='Simple box at point construction plane')
+    recSketch = graph.sketch(boxConstructionPlane, [og.Rectangle(width, length, originPoint)], name='Simple box at point sketch')
+    return graph.extrude(og.Profile(recSketch), height, extent=og.EXTENT_SIMPLE, name=name, bodyName=bodyName)
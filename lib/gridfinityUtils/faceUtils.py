@@ -3,7 +3,7 @@ import adsk.core, adsk.fusion, traceback
 import os
 
 from .const import DEFAULT_FILTER_TOLERANCE
-from . import geometryUtils
+from . import geometryUtils, topologySnapshot, edgeUtils
 
 
 def minByArea(faces: adsk.fusion.BRepFaces):
@@ -32,12 +32,10 @@ def isZNormal(face: adsk.fusion.BRepFace):
     return math.isclose(face.boundingBox.minPoint.z, face.boundingBox.maxPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE)
 
 def getBottomFace(body: adsk.fusion.BRepBody):
-    horizontalFaces = [face for face in body.faces if isZNormal(face)]
-    return min(horizontalFaces, key=lambda x: x.boundingBox.minPoint.z)
+    return topologySnapshot.snapshotOf(body).lowestFaceNormalTo(topologySnapshot.AXIS_Z)
 
 def getTopFace(body: adsk.fusion.BRepBody):
-    horizontalFaces = [face for face in body.faces if isZNormal(face)]
-    return max(horizontalFaces, key=lambda x: x.boundingBox.minPoint.z)
+    return topologySnapshot.snapshotOf(body).highestFaceNormalTo(topologySnapshot.AXIS_Z)
 
 def getTopHorizontalEdge(edges: adsk.fusion.BRepEdges):
     horizontalEdges = [edge for edge in edges if geometryUtils.isHorizontal(edge)]
@@ -50,9 +48,4 @@ def getBottomHorizontalEdge(edges: adsk.fusion.BRepEdges):
 def getVerticalEdges(
     faces: adsk.fusion.BRepFaces,
     ):
-    filteredEdges: list[adsk.fusion.BRepEdge] = []
-    for face in faces:
-        for edge in face.edges:
-            if geometryUtils.isCollinearToZ(edge):
-                filteredEdges.append(edge)
-    return filteredEdges
+    return edgeUtils.EdgeSetBuilder().addMatching(faces, geometryUtils.isCollinearToZ).edges
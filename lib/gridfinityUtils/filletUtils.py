@@ -2,7 +2,7 @@ import adsk.core, adsk.fusion, traceback
 import os
 import math
 
-from . import edgeUtils, faceUtils, commonUtils, const
+from . import edgeUtils, faceUtils, commonUtils, const, traceUtils
 
 def createFillet(
     edges: list[adsk.fusion.BRepEdge],
@@ -32,9 +32,10 @@ def filletEdgesByLength(
     filletFeatures: adsk.fusion.FilletFeatures = features.filletFeatures
     bottomFilletInput = filletFeatures.createInput()
     bottomFilletInput.isRollingBallCorner = True
-    bottomFilletEdges = edgeUtils.selectEdgesByLength(faces, filterEdgeLength, const.DEFAULT_FILTER_TOLERANCE)
-    bottomFilletInput.edgeSetInputs.addConstantRadiusEdgeSet(bottomFilletEdges, adsk.core.ValueInput.createByReal(radius), True)
-    return filletFeatures.add(bottomFilletInput)
+    bottomFilletEdges = edgeUtils.EdgeSetBuilder().addByLength(faces, filterEdgeLength, const.DEFAULT_FILTER_TOLERANCE)
+    with traceUtils.span('fillet edges by length', edges=len(bottomFilletEdges.edges), candidates=bottomFilletEdges.candidateCount):
+        bottomFilletInput.edgeSetInputs.addConstantRadiusEdgeSet(bottomFilletEdges.toObjectCollection(), adsk.core.ValueInput.createByReal(radius), True)
+        return filletFeatures.add(bottomFilletInput)
 
 def chamferEdgesByLength(
     faces: adsk.fusion.BRepFaces,
@@ -43,12 +44,13 @@ def chamferEdgesByLength(
     filterEdgeTolerance: float,
     targetComponent: adsk.fusion.Component,
 ):
-    chamferEdges = edgeUtils.selectEdgesByLength(faces, filterEdgeLength, filterEdgeTolerance)
-    return createChamfer(
-        chamferEdges,
-        distance,
-        targetComponent,
-    )
+    chamferEdges = edgeUtils.EdgeSetBuilder().addByLength(faces, filterEdgeLength, filterEdgeTolerance)
+    with traceUtils.span('chamfer edges by length', edges=len(chamferEdges.edges), candidates=chamferEdges.candidateCount):
+        return createChamfer(
+            chamferEdges.toObjectCollection(),
+            distance,
+            targetComponent,
+        )
 
 def createChamfer(
     edges: adsk.core.ObjectCollection,
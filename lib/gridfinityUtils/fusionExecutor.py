@@ -0,0 +1,550 @@
+import dataclasses
+import math
+
+import adsk.core, adsk.fusion
+
+from ...lib import fusion360utils as futil
+from . import commonUtils, edgeUtils, faceUtils, geometryUtils, patternUtils, sketchUtils, topologySnapshot, traceUtils
+from . import operationGraph as og
+from .generationProgress import GenerationProgress
+
+# Runs an operation graph as timeline features (or direct edits) in a component. Faces and edges are
+# resolved right before the operation that needs them, bodies are captured when their feature is created.
+# Completed operations are checkpointed per stage: when a fillet or chamfer fails, the operations its
+# stage already ran are rolled back and the stage runs again with the fallbacks below, so one bad edge
+# does not throw away the rest of the model.
+
+# fallbacks of a failing fillet or chamfer, in order: its size scaled by each factor without tangent
+# chains, then left out
+FALLBACK_SIZE_FACTORS = (1.0, 0.5, 0.25)
+
+_OPERATIONS = {
+    og.OPERATION_NEW_BODY: adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
+    og.OPERATION_JOIN: adsk.fusion.FeatureOperations.JoinFeatureOperation,
+    og.OPERATION_CUT: adsk.fusion.FeatureOperations.CutFeatureOperation,
+    og.OPERATION_INTERSECT: adsk.fusion.FeatureOperations.IntersectFeatureOperation,
+}
+
+_DIRECTIONS = {
+    og.DIRECTION_POSITIVE: adsk.fusion.ExtentDirections.PositiveExtentDirection,
+    og.DIRECTION_NEGATIVE: adsk.fusion.ExtentDirections.NegativeExtentDirection,
+}
+
+_SNAPSHOT_AXES = {
+    og.AXIS_X: topologySnapshot.AXIS_X,
+    og.AXIS_Y: topologySnapshot.AXIS_Y,
+    og.AXIS_Z: topologySnapshot.AXIS_Z,
+}
+
+class StageSpans():
+    """
+    Keeps one trace span open per stage of the operation running, shared by the executors
+    """
+    def __init__(self, graph: og.OperationGraph):
+        self.graph = graph
+        self._open: list[tuple[int, object]] = []
+
+    def enter(self, stage):
+        path = self.graph.stagePath(stage)
+        common = 0
+        while common < len(self._open) and common < len(path) and self._open[common][0] == path[common]:
+            common += 1
+        self._close(common)
+        for index in path[common:]:
+            stageSpan = traceUtils.span(self.graph.stages[index].name, **self.graph.stages[index].args)
+            stageSpan.__enter__()
+            self._open.append((index, stageSpan))
+
+    def close(self):
+        self._close(0)
+
+    def _close(self, depth: int):
+        while len(self._open) > depth:
+            self._open.pop()[1].__exit__(None, None, None)
+
+class FusionExecutor():
+    def __init__(self, targetComponent: adsk.fusion.Component):
+        self.targetComponent = targetComponent
+        self.failed: set[int] = set()
+        self.aliases: dict[int, list[og.Ref]] = {}
+        # ids of the operations that ran and were kept, in order
+        self.completed: list[int] = []
+        # one line per fillet or chamfer that only ran with a fallback or was left out
+        self.recoveries: list[str] = []
+        self._entities: dict[int, object] = {}
+        self._bodies: dict[int, list[adsk.fusion.BRepBody]] = {}
+        self._sketchPoints: dict[int, dict[str, adsk.fusion.SketchPoint]] = {}
+
+    def run(self, graph: og.OperationGraph, progress: GenerationProgress = None) -> 'FusionExecutor':
+        """
+        Runs every operation in order, queued booleans are flushed into the graph first.
+        progress is updated on every stage change and raises GenerationCancelledException there
+        """
+        graph.flushBooleans()
+        self.aliases = graph.aliases
+        stages = StageSpans(graph)
+        operations = graph.operations
+        if progress is not None:
+            progress.start(len(operations))
+        try:
+            # first operation of the stage running, top level operations are their own checkpoint
+            checkpoint = 0
+            for position, operation in enumerate(operations):
+                if progress is not None and (position == 0 or operation.stage != operations[position - 1].stage):
+                    progress.update(position, ' / '.join(graph.stages[index].name for index in graph.stagePath(operation.stage)) or graph.name)
+                stages.enter(operation.stage)
+                if operation.stage is None or operation.stage != operations[checkpoint].stage:
+                    checkpoint = position
+                try:
+                    self.execute(operation)
+                except Exception as err:
+                    if len(_fallbacks(operation)) > 0:
+                        self._recover(graph, operations[checkpoint:position + 1], err)
+                        continue
+                    if not operation.isOptional:
+                        raise
+                    self.failed.add(operation.id)
+                    futil.log(f'{graph.name}: skipped {operation.kind} {operation.name}, {type(err).__name__}: {err}')
+                    continue
+                self.completed.append(operation.id)
+        finally:
+            stages.close()
+            if progress is not None:
+                progress.finish()
+        if graph.booleans.saved > 0:
+            futil.log(f'{graph.name}: {graph.booleans.requested} booleans in {graph.booleans.issued} combine features, {graph.booleans.saved} saved')
+        return self
+
+    def execute(self, operation: og.Operation):
+        getattr(self, '_' + operation.kind)(operation)
+
+    def _recover(self, graph: og.OperationGraph, stageOperations: list[og.Operation], error: Exception):
+        """
+        Rolls back what the stage of the failed last operation ran and runs it again with each fallback of that operation
+        """
+        operation = stageOperations[-1]
+        kept = set(self.completed)
+        earlier = [item for item in stageOperations[:-1] if item.id in kept]
+        self._rollback(earlier)
+        stageName = ' / '.join(graph.stages[index].name for index in graph.stagePath(operation.stage))
+        label = ' '.join(part for part in (operation.kind, operation.name) if part)
+        for fallback in _fallbacks(operation) + [None]:
+            ran: list[og.Operation] = []
+            try:
+                for item in earlier + ([] if fallback is None else [fallback]):
+                    self.execute(item)
+                    ran.append(item)
+            except Exception:
+                self._rollback(ran)
+                if fallback is None:
+                    raise error
+                continue
+            self.completed.extend(item.id for item in ran)
+            if fallback is None:
+                self.failed.add(operation.id)
+                recovery = f'{graph.name}: {stageName}: left out {label}'
+            else:
+                recovery = f'{graph.name}: {stageName}: {label} ran with {_describeFallback(fallback)}'
+            self.recoveries.append(recovery)
+            futil.log(f'{recovery} after {type(error).__name__}: {error}')
+            return
+
+    def _rollback(self, operations: list[og.Operation]):
+        # newest first, so features are deleted from the end of the timeline
+        for operation in reversed(operations):
+            entity = self._entities.pop(operation.id, None)
+            if entity is not None:
+                entity.deleteMe()
+            self._bodies.pop(operation.id, None)
+            self._sketchPoints.pop(operation.id, None)
+            if operation.id in self.completed:
+                self.completed.remove(operation.id)
+
+    def entity(self, ref: og.Ref):
+        """
+        Plane, axis, sketch or feature created by the operation, ref may be taken before optimizer passes
+        """
+        return self._entity(og.resolveRefs(self.aliases, ref)[0])
+
+    def body(self, ref: og.Ref) -> adsk.fusion.BRepBody:
+        """
+        Body of a ref taken while planning, first body when optimizer passes made it stand for several
+        """
+        return self._body(og.resolveRefs(self.aliases, ref)[0])
+
+    def bodies(self, refs) -> list[adsk.fusion.BRepBody]:
+        """
+        Bodies of a Ref or a list of Refs taken while planning, outputs of failed optional operations are left out
+        """
+        return self._bodyList(og.resolveRefs(self.aliases, refs))
+
+    # refs in the graph are rewritten by the optimizer passes, they skip the aliases
+
+    def _entity(self, ref: og.Ref):
+        if ref.op in self.failed:
+            raise ValueError('operation {} failed'.format(ref.op))
+        return self._entities[ref.op]
+
+    def _body(self, ref: og.Ref) -> adsk.fusion.BRepBody:
+        if ref.op in self.failed:
+            raise ValueError('operation {} failed'.format(ref.op))
+        return self._bodies[ref.op][0 if ref.index is None else ref.index]
+
+    def _bodyList(self, refs) -> list[adsk.fusion.BRepBody]:
+        if isinstance(refs, og.Ref):
+            refs = [refs]
+        bodies: list[adsk.fusion.BRepBody] = []
+        for ref in refs:
+            if ref.op in self.failed:
+                continue
+            bodies.extend(self._bodies[ref.op] if ref.index is None else [self._bodies[ref.op][ref.index]])
+        return bodies
+
+    # selectors
+
+    def _plane(self, base):
+        if base == og.PLANE_XY:
+            return self.targetComponent.xYConstructionPlane
+        if base == og.PLANE_XZ:
+            return self.targetComponent.xZConstructionPlane
+        if base == og.PLANE_YZ:
+            return self.targetComponent.yZConstructionPlane
+        if isinstance(base, og.Ref):
+            return self._entity(base)
+        return self._face(base)
+
+    def _axis(self, axis):
+        if axis == og.AXIS_X:
+            return self.targetComponent.xConstructionAxis
+        if axis == og.AXIS_Y:
+            return self.targetComponent.yConstructionAxis
+        if axis == og.AXIS_Z:
+            return self.targetComponent.zConstructionAxis
+        return self._entity(axis)
+
+    def _faces(self, selector) -> list[adsk.fusion.BRepFace]:
+        if isinstance(selector, og.FeatureFaces):
+            return list(self._entity(selector.feature).faces)
+        if isinstance(selector, og.BodyFaces):
+            return list(self._body(selector.body).faces)
+        if isinstance(selector, list):
+            return [self._face(item) for item in selector]
+        return [self._face(selector)]
+
+    def _face(self, selector) -> adsk.fusion.BRepFace:
+        if isinstance(selector, og.EndFace):
+            return self._entity(selector.feature).endFaces.item(selector.index)
+        if isinstance(selector, og.TopFace):
+            return faceUtils.getTopFace(self._body(selector.body))
+        if isinstance(selector, og.BottomFace):
+            return faceUtils.getBottomFace(self._body(selector.body))
+        if isinstance(selector, og.FaceNormalTo):
+            snapshot = topologySnapshot.snapshotOf(self._body(selector.body))
+            axis = _SNAPSHOT_AXES[selector.axis]
+            return snapshot.highestFaceNormalTo(axis) if selector.isHighest else snapshot.lowestFaceNormalTo(axis)
+        if isinstance(selector, og.PlanarFaceAlongZ):
+            return _planarFaceAlongZ(self._body(selector.body), selector.isHighest)
+        raise ValueError('unknown face selector {}'.format(selector))
+
+    def _edges(self, selectors: list) -> edgeUtils.EdgeSetBuilder:
+        edgeSet = edgeUtils.EdgeSetBuilder()
+        for selector in selectors:
+            if isinstance(selector, og.EdgesByLength):
+                edgeSet.addByLength(self._faces(selector.faces), selector.length, selector.tolerance)
+            else:
+                edgeSet.edges.extend(self._edgeList(selector))
+        return edgeSet
+
+    def _edgeList(self, selector) -> list[adsk.fusion.BRepEdge]:
+        if isinstance(selector, og.BodyEdgesByLength):
+            return topologySnapshot.snapshotOf(self._body(selector.body)).edgesByLength(selector.length, selector.tolerance)
+        if isinstance(selector, og.EdgesCollinearTo):
+            return topologySnapshot.snapshotOf(self._body(selector.body)).edgesCollinearTo(_SNAPSHOT_AXES[selector.axis])
+        if isinstance(selector, og.FaceEdges):
+            edges = self._face(selector.face).edges
+            return list(edges) if selector.index is None else [edges.item(selector.index)]
+        if isinstance(selector, og.BottomHorizontalEdge):
+            return [faceUtils.getBottomHorizontalEdge(self._face(selector.face).edges)]
+        if isinstance(selector, og.FrontEdge):
+            return [min([edge for edge in self._face(selector.face).edges if geometryUtils.isCollinearToX(edge)], key=lambda x: x.boundingBox.minPoint.y)]
+        if isinstance(selector, og.TangentEdges):
+            return list(self._edgeList(selector.edge)[0].tangentiallyConnectedEdges)[selector.start:]
+        raise ValueError('unknown edge selector {}'.format(selector))
+
+    def _profile(self, selector):
+        if isinstance(selector, og.Profile):
+            profiles = self._entity(selector.sketch).profiles
+            return commonUtils.objectCollectionFromList(profiles) if selector.index is None else profiles.item(selector.index)
+        if isinstance(selector, og.LeftmostProfile):
+            return min(list(self._entity(selector.sketch).profiles), key=lambda x: x.boundingBox.minPoint.x)
+        return self._face(selector)
+
+    def _sketchPoint(self, selector: og.SketchPoint) -> adsk.fusion.SketchPoint:
+        return self._sketchPoints[selector.sketch.op][selector.name]
+
+    # operations
+
+    def _constructionPlane(self, operation: og.ConstructionPlaneOp):
+        planeInput: adsk.fusion.ConstructionPlaneInput = self.targetComponent.constructionPlanes.createInput()
+        planeInput.setByOffset(self._plane(operation.base), adsk.core.ValueInput.createByReal(operation.offset))
+        plane = self.targetComponent.constructionPlanes.add(planeInput)
+        if operation.name:
+            plane.name = operation.name
+        if not operation.isVisible:
+            plane.isLightBulbOn = False
+        self._entities[operation.id] = plane
+
+    def _constructionAxis(self, operation: og.ConstructionAxisOp):
+        axisInput: adsk.fusion.ConstructionAxisInput = self.targetComponent.constructionAxes.createInput()
+        if operation.planes is not None:
+            axisInput.setByTwoPlanes(self._plane(operation.planes[0]), self._plane(operation.planes[1]))
+        else:
+            axisInput.setByNormalToFaceAtPoint(self._face(operation.face), self._sketchPoint(operation.point))
+        axis = self.targetComponent.constructionAxes.add(axisInput)
+        if operation.name:
+            axis.name = operation.name
+        if not operation.isVisible:
+            axis.isLightBulbOn = False
+        self._entities[operation.id] = axis
+
+    def _sketch(self, operation: og.SketchOp):
+        sketch: adsk.fusion.Sketch = self.targetComponent.sketches.add(self._plane(operation.plane))
+        if operation.name:
+            sketch.name = operation.name
+        points: dict[str, adsk.fusion.SketchPoint] = {}
+        for entity in operation.entities:
+            if isinstance(entity, og.Rectangle):
+                sketchUtils.createRectangle(entity.width, entity.length, _pointOnSketch(sketch, entity.corner, entity.space), sketch)
+            elif isinstance(entity, og.Circle):
+                sketchUtils.createCircle(entity.radius, _pointOnSketch(sketch, entity.center, og.POINT_MODEL_FLAT), sketch)
+            elif isinstance(entity, og.CircleAtPoint):
+                sketchUtils.createCircleAtPoint(entity.radius, adsk.core.Point3D.create(*entity.center), sketch)
+            elif isinstance(entity, og.TabAtCircleEdge):
+                sketchUtils.createTabAtCircleEdge(entity.radius, adsk.core.Point3D.create(*entity.center), sketch)
+            elif isinstance(entity, og.SkeletonCutout):
+                points['axisPoint'] = sketchUtils.createSkeletonCutout(
+                    entity.radius,
+                    adsk.core.Point3D.create(*entity.center),
+                    entity.arcRadius,
+                    entity.cellCenterX,
+                    entity.cellCenterY,
+                    sketch,
+                )
+            elif isinstance(entity, og.ConnectionHole):
+                sketchUtils.createConnectionHole(entity.radius, sketch)
+            elif isinstance(entity, og.Polygon):
+                sketchUtils.createPolygon(adsk.core.Point3D.create(*entity.origin), entity.offsets, sketch)
+            elif isinstance(entity, og.TabProfile):
+                sketchUtils.createTabProfile(adsk.core.Point3D.create(*entity.origin), entity.width, entity.height, sketch)
+            elif isinstance(entity, og.ClearanceOutline):
+                sketchUtils.createClearanceOutline(
+                    entity.width,
+                    entity.length,
+                    adsk.core.Point3D.create(*entity.corner),
+                    entity.filletRadius,
+                    adsk.core.Point3D.create(*entity.offsetDirection),
+                    sketch,
+                )
+            else:
+                raise ValueError('unknown sketch entity {}'.format(entity))
+        self._entities[operation.id] = sketch
+        self._sketchPoints[operation.id] = points
+
+    def _extrude(self, operation: og.ExtrudeOp):
+        extrudeFeatures = self.targetComponent.features.extrudeFeatures
+        profile = self._profile(operation.profile)
+        featureOperation = _OPERATIONS[operation.operation]
+        if operation.extent == og.EXTENT_SIMPLE:
+            feature = extrudeFeatures.addSimple(profile, adsk.core.ValueInput.createByReal(operation.distance), featureOperation)
+        else:
+            extrudeInput = extrudeFeatures.createInput(profile, featureOperation)
+            extrudeInput.participantBodies = list(self.targetComponent.bRepBodies) if operation.participants == og.ALL_BODIES else self._bodyList(list(operation.participants))
+            if operation.startOffset != 0:
+                extrudeInput.startExtent = adsk.fusion.OffsetStartDefinition.create(adsk.core.ValueInput.createByReal(operation.startOffset))
+            extent = adsk.fusion.DistanceExtentDefinition.create(adsk.core.ValueInput.createByReal(operation.distance))
+            if operation.extent == og.EXTENT_TWO_SIDES:
+                extrudeInput.setTwoSidesExtent(extent, adsk.fusion.DistanceExtentDefinition.create(adsk.core.ValueInput.createByReal(operation.distance)))
+            elif operation.taperAngle is None:
+                extrudeInput.setOneSideExtent(extent, _DIRECTIONS[operation.direction])
+            else:
+                extrudeInput.setOneSideExtent(extent, _DIRECTIONS[operation.direction], adsk.core.ValueInput.createByReal(operation.taperAngle))
+            feature = extrudeFeatures.add(extrudeInput)
+        if operation.name:
+            feature.name = operation.name
+        bodies = list(feature.bodies)
+        if operation.bodyAnchors is not None:
+            # profile order is not guaranteed, match bodies back to the anchors by position
+            unmatched = bodies
+            bodies = []
+            for x, y in operation.bodyAnchors:
+                body = min(unmatched, key=lambda item: abs(item.boundingBox.minPoint.x - x) + abs(item.boundingBox.minPoint.y - y))
+                unmatched.remove(body)
+                bodies.append(body)
+        if operation.bodyName:
+            for body in bodies:
+                body.name = operation.bodyName
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = bodies
+
+    def _fillet(self, operation: og.FilletOp):
+        filletFeatures = self.targetComponent.features.filletFeatures
+        filletInput = filletFeatures.createInput()
+        filletInput.isRollingBallCorner = True
+        if operation.isInputTangentChain:
+            filletInput.isTangentChain = True
+        edgeSet = self._edges(operation.edges)
+        with traceUtils.span('fillet', edges=len(edgeSet.edges), candidates=edgeSet.candidateCount):
+            filletInput.edgeSetInputs.addConstantRadiusEdgeSet(edgeSet.toObjectCollection(), adsk.core.ValueInput.createByReal(operation.radius), operation.isTangentChain)
+            feature = filletFeatures.add(filletInput)
+        _checkHealth(feature)
+        if operation.name:
+            feature.name = operation.name
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = []
+
+    def _chamfer(self, operation: og.ChamferOp):
+        chamferFeatures = self.targetComponent.features.chamferFeatures
+        chamferInput = chamferFeatures.createInput2()
+        edgeSet = self._edges(operation.edges)
+        with traceUtils.span('chamfer', edges=len(edgeSet.edges), candidates=edgeSet.candidateCount):
+            chamferInput.chamferEdgeSets.addEqualDistanceChamferEdgeSet(edgeSet.toObjectCollection(), adsk.core.ValueInput.createByReal(operation.distance), operation.isTangentChain)
+            feature = chamferFeatures.add(chamferInput)
+        _checkHealth(feature)
+        if operation.name:
+            feature.name = operation.name
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = []
+
+    def _rectangularPattern(self, operation: og.RectangularPatternOp):
+        feature = patternUtils.recPattern(
+            commonUtils.objectCollectionFromList(self._bodyList(operation.entities)),
+            tuple(self._axis(direction) for direction in operation.directions),
+            operation.distances,
+            operation.quantities,
+            self.targetComponent,
+        )
+        if operation.name:
+            feature.name = operation.name
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = list(feature.bodies)
+
+    def _circularPattern(self, operation: og.CircularPatternOp):
+        feature = patternUtils.circPattern(
+            commonUtils.objectCollectionFromList(self._bodyList(operation.entities)),
+            self._axis(operation.axis),
+            operation.quantity,
+            self.targetComponent,
+        )
+        if operation.name:
+            feature.name = operation.name
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = list(feature.bodies)
+
+    def _combine(self, operation: og.CombineOp):
+        combineFeatures = self.targetComponent.features.combineFeatures
+        tools = self._bodyList(operation.tools)
+        combineInput = combineFeatures.createInput(self._body(operation.target), commonUtils.objectCollectionFromList(tools))
+        combineInput.operation = _OPERATIONS[operation.operation]
+        if operation.isKeepToolBodies:
+            combineInput.isKeepToolBodies = True
+        feature = combineFeatures.add(combineInput)
+        if operation.name:
+            feature.name = operation.name
+        bodies = list(feature.bodies)
+        if operation.isKeepToolBodies:
+            toolRevisions = set(tool.revisionId for tool in tools)
+            bodies = [body for body in bodies if body.revisionId not in toolRevisions]
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = bodies
+
+    def _move(self, operation: og.MoveOp):
+        moveFeatures = self.targetComponent.features.moveFeatures
+        moveInput = moveFeatures.createInput2(commonUtils.objectCollectionFromList(self._bodyList(operation.entities)))
+        transform = adsk.core.Matrix3D.create()
+        transform.setToRotation(math.radians(operation.angle), adsk.core.Vector3D.create(0, 0, 1.0), adsk.core.Point3D.create(*operation.center))
+        moveInput.defineAsFreeMove(transform)
+        feature = moveFeatures.add(moveInput)
+        if operation.name:
+            feature.name = operation.name
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = list(feature.bodies)
+
+    def _mirror(self, operation: og.MirrorOp):
+        mirrorFeatures = self.targetComponent.features.mirrorFeatures
+        mirrorInput = mirrorFeatures.createInput(commonUtils.objectCollectionFromList(self._bodyList(operation.entities)), self._plane(operation.plane))
+        feature = mirrorFeatures.add(mirrorInput)
+        if operation.name:
+            feature.name = operation.name
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = list(feature.bodies)
+
+    def _loft(self, operation: og.LoftOp):
+        loftFeatures = self.targetComponent.features.loftFeatures
+        loftInput = loftFeatures.createInput(_OPERATIONS[operation.operation])
+        for section in operation.sections:
+            loftInput.loftSections.add(self._face(section))
+        feature = loftFeatures.add(loftInput)
+        if operation.name:
+            feature.name = operation.name
+        bodies = list(feature.bodies)
+        if operation.bodyName:
+            for body in bodies:
+                body.name = operation.bodyName
+        self._entities[operation.id] = feature
+        self._bodies[operation.id] = bodies
+
+    def _name(self, operation: og.NameOp):
+        self._body(operation.target).name = operation.name
+        self._bodies[operation.id] = []
+
+def _fallbacks(operation: og.Operation) -> list[og.Operation]:
+    if isinstance(operation, og.FilletOp):
+        sizeField, changes = 'radius', {'isTangentChain': False, 'isInputTangentChain': False}
+    elif isinstance(operation, og.ChamferOp):
+        sizeField, changes = 'distance', {'isTangentChain': False}
+    else:
+        return []
+    fallbacks: list[og.Operation] = []
+    for factor in FALLBACK_SIZE_FACTORS:
+        fallback = dataclasses.replace(operation, **{sizeField: getattr(operation, sizeField) * factor}, **changes)
+        fallback.id, fallback.stage, fallback.isOptional = operation.id, operation.stage, operation.isOptional
+        if fallback != operation and fallback not in fallbacks:
+            fallbacks.append(fallback)
+    return fallbacks
+
+def _describeFallback(operation: og.Operation) -> str:
+    size = 'radius {:.4g}'.format(operation.radius) if isinstance(operation, og.FilletOp) else 'distance {:.4g}'.format(operation.distance)
+    return size + ('' if operation.isTangentChain else ' without tangent chain')
+
+def _checkHealth(feature):
+    # edge features can come back in an error state instead of raising
+    if feature.healthState == adsk.fusion.FeatureHealthStates.ErrorFeatureHealthState:
+        message = feature.errorOrWarningMessage
+        feature.deleteMe()
+        raise RuntimeError(message or 'feature computation failed')
+
+def _pointOnSketch(sketch: adsk.fusion.Sketch, point, space: str) -> adsk.core.Point3D:
+    if point is None:
+        return sketch.originPoint.geometry
+    if space == og.POINT_SKETCH:
+        return adsk.core.Point3D.create(*point)
+    if space == og.POINT_SKETCH_PLANE:
+        point = (point[0], point[1], sketch.origin.z)
+    pointOnSketch = sketch.modelToSketchSpace(adsk.core.Point3D.create(*point))
+    if space == og.POINT_MODEL_FLAT:
+        pointOnSketch.z = 0
+    return pointOnSketch
+
+def _planarFaceAlongZ(body: adsk.fusion.BRepBody, isHighest: bool) -> adsk.fusion.BRepFace:
+    # faces without a plane normal (cylinders, cones) are skipped
+    candidates: list[tuple[float, adsk.fusion.BRepFace]] = []
+    for face in body.faces:
+        normal = getattr(face.geometry, 'normal', None)
+        if normal is None or abs(normal.x) >= 0.01 or abs(normal.y) >= 0.01:
+            continue
+        box = face.boundingBox
+        candidates.append((box.maxPoint.z if isHighest else box.minPoint.z, face))
+    if len(candidates) == 0:
+        raise ValueError('no planar face along z')
+    # first face wins on ties
+    return (max if isHighest else min)(candidates, key=lambda x: x[0])[1]
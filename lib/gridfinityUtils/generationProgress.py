@@ -0,0 +1,42 @@
+import adsk, adsk.core
+
+# Keeps Fusion responsive while a long graph runs. The executor reports every stage it enters, the
+# progress dialog shows the stage name and how many operations ran, Fusion gets to process its
+# events in between and a Cancel press stops the run at the next stage.
+
+# runs shorter than this never show the dialog
+PROGRESS_DELAY_SECONDS = 1
+
+app = adsk.core.Application.get()
+
+class GenerationCancelledException(Exception):
+    pass
+
+class GenerationProgress():
+    def __init__(self, title: str):
+        self.title = title
+        self.isCancelled = False
+        self._dialog: adsk.core.ProgressDialog = None
+
+    def start(self, total: int):
+        self._dialog = app.userInterface.createProgressDialog()
+        self._dialog.isCancelButtonShown = True
+        self._dialog.show(self.title, 'Starting', 0, max(1, total), PROGRESS_DELAY_SECONDS)
+
+    def update(self, done: int, stageName: str):
+        """
+        Shows the stage and lets Fusion process events, raises GenerationCancelledException once Cancel was pressed
+        """
+        if self._dialog is None:
+            return
+        self._dialog.progressValue = done
+        self._dialog.message = '{} (%v of %m operations)'.format(stageName)
+        adsk.doEvents()
+        if self._dialog.wasCancelled:
+            self.isCancelled = True
+            raise GenerationCancelledException('{} cancelled at {}'.format(self.title, stageName))
+
+    def finish(self):
+        if self._dialog is not None:
+            self._dialog.hide()
+            self._dialog = None
@@ -0,0 +1,641 @@
+import math
+from collections import Counter
+from dataclasses import dataclass, fields, is_dataclass, replace
+
+from . import operationGraph as og
+from .const import DEFAULT_FILTER_TOLERANCE
+
+# Passes over a planned operation graph, run before an executor. Every pass keeps the shape of the
+# bodies and only saves features:
+# - construction planes at the same offset from the same base become one
+# - a combine following another on the same target with the same operation merges into it
+# - extrudes of disjoint rectangles and circles on the same plane become one multi-profile extrude
+# - cut tools entirely outside the target bounding box are dropped along with the features making them
+# Operation ids stay stable, refs to removed operations are rewritten in the graph and kept in
+# graph.aliases for refs the caller took while planning.
+
+# operations only making entities for later operations, dropped along with their last user
+_ENTITY_KINDS = (og.ConstructionPlaneOp, og.ConstructionAxisOp, og.SketchOp)
+
+_PLANE_AXES = {
+    og.PLANE_XY: 2,
+    og.PLANE_XZ: 1,
+    og.PLANE_YZ: 0,
+}
+
+_AXIS_DIRECTIONS = {
+    og.AXIS_X: (1.0, 0.0),
+    og.AXIS_Y: (0.0, 1.0),
+}
+
+@dataclass
+class PassReport:
+    name: str
+    before: Counter
+    after: Counter
+    changes: int
+
+    @property
+    def featuresBefore(self) -> int:
+        return featureCount(self.before)
+
+    @property
+    def featuresAfter(self) -> int:
+        return featureCount(self.after)
+
+@dataclass
+class OptimizationReport:
+    graphName: str
+    passes: list[PassReport]
+
+    @property
+    def featuresSaved(self) -> int:
+        if len(self.passes) == 0:
+            return 0
+        return self.passes[0].featuresBefore - self.passes[-1].featuresAfter
+
+    def lines(self) -> list[str]:
+        lines = []
+        for passReport in self.passes:
+            changedKinds = sorted(kind for kind in set(passReport.before) | set(passReport.after) if passReport.before[kind] != passReport.after[kind])
+            lines.append('{}: {} {} -> {} operations, {} changes{}'.format(
+                self.graphName,
+                passReport.name,
+                passReport.featuresBefore,
+                passReport.featuresAfter,
+                passReport.changes,
+                ''.join(', {} {} -> {}'.format(kind, passReport.before[kind], passReport.after[kind]) for kind in changedKinds),
+            ))
+        return lines
+
+def featureCount(counts: Counter) -> int:
+    """
+    Operations turning into timeline items, body names are not
+    """
+    return sum(count for kind, count in counts.items() if kind != og.NameOp.kind)
+
+def optimize(graph: og.OperationGraph, passes: list = None) -> OptimizationReport:
+    """
+    Runs the passes in order over graph, DEFAULT_PASSES by default
+    """
+    graph.flushBooleans()
+    reports: list[PassReport] = []
+    for optimizerPass in DEFAULT_PASSES if passes is None else passes:
+        before = graph.countByKind()
+        changes = optimizerPass(graph)
+        reports.append(PassReport(optimizerPass.__name__, before, graph.countByKind(), changes))
+    return OptimizationReport(graph.name, reports)
+
+# rewriting refs
+
+class _NotRewritable(Exception):
+    pass
+
+def _mapped(ref: og.Ref, remap: dict[int, list[og.Ref]]):
+    refs = remap.get(ref.op)
+    if refs is None:
+        return None
+    return list(refs) if ref.index is None else [refs[ref.index]]
+
+def _rewriteValue(value, remap: dict[int, list[og.Ref]]):
+    """
+    value with its refs replaced, a ref standing for several spreads into the list holding it
+    """
+    if isinstance(value, og.Ref):
+        mapped = _mapped(value, remap)
+        if mapped is None:
+            return value
+        if len(mapped) != 1:
+            raise _NotRewritable(value)
+        return mapped[0]
+    if isinstance(value, list):
+        items = []
+        for item in value:
+            mapped = _mapped(item, remap) if isinstance(item, og.Ref) else None
+            if mapped is None:
+                items.append(_rewriteValue(item, remap))
+            else:
+                items.extend(mapped)
+        return items
+    if isinstance(value, tuple):
+        return tuple(_rewriteValue(item, remap) for item in value)
+    if is_dataclass(value) and not isinstance(value, type):
+        changes = {}
+        for valueField in fields(value):
+            item = getattr(value, valueField.name)
+            rewritten = _rewriteValue(item, remap)
+            if rewritten is not item:
+                changes[valueField.name] = rewritten
+        return replace(value, **changes) if len(changes) > 0 else value
+    return value
+
+def _rewrite(graph: og.OperationGraph, remap: dict[int, list[og.Ref]], removed: set[int]) -> bool:
+    """
+    Rewrites every ref through remap and drops the removed operations, leaves the graph alone and
+    returns False when a ref standing for several bodies sits where one is expected
+    """
+    try:
+        rewrittenOperations = []
+        for operation in graph.operations:
+            if operation.id in removed:
+                continue
+            rewrittenOperations.append((operation, {
+                operationField.name: _rewriteValue(getattr(operation, operationField.name), remap)
+                for operationField in fields(operation)
+            }))
+        aliases = {opId: _rewriteValue(list(refs), remap) for opId, refs in graph.aliases.items()}
+    except _NotRewritable:
+        return False
+    for operation, values in rewrittenOperations:
+        for name, value in values.items():
+            setattr(operation, name, value)
+    for opId, refs in remap.items():
+        aliases.setdefault(opId, list(refs))
+    graph.aliases = aliases
+    graph.operations = [operation for operation in graph.operations if operation.id not in removed]
+    return True
+
+def _position(graph: og.OperationGraph, operation: og.Operation) -> int:
+    # operations compare by value, look them up by id
+    return next(index for index, item in enumerate(graph.operations) if item.id == operation.id)
+
+def _referrers(graph: og.OperationGraph) -> dict[int, list[int]]:
+    """
+    Ids of the operations referring to each operation
+    """
+    referrers: dict[int, list[int]] = {}
+    for operation in graph.operations:
+        for opId in og.referencedOps(operation):
+            referrers.setdefault(opId, []).append(operation.id)
+    return referrers
+
+def _featureRefs(graph: og.OperationGraph) -> set[int]:
+    """
+    Ids of operations whose feature, rather than its bodies, is used by a face selector
+    """
+    found: set[int] = set()
+    def visit(item):
+        if isinstance(item, (og.FeatureFaces, og.EndFace)):
+            found.add(item.feature.op)
+        elif isinstance(item, (list, tuple)):
+            for child in item:
+                visit(child)
+        elif is_dataclass(item) and not isinstance(item, type):
+            for itemField in fields(item):
+                visit(getattr(item, itemField.name))
+    for operation in graph.operations:
+        visit(operation)
+    return found
+
+def _removeUnused(graph: og.OperationGraph, removed: set[int], referrers: dict[int, list[int]]) -> set[int]:
+    """
+    removed plus the planes, axes and sketches only the removed operations used
+    """
+    removed = set(removed)
+    byId = {operation.id: operation for operation in graph.operations}
+    pending = list(removed)
+    while len(pending) > 0:
+        for opId in og.referencedOps(byId[pending.pop()]):
+            operation = byId.get(opId)
+            if operation is None or opId in removed or not isinstance(operation, _ENTITY_KINDS):
+                continue
+            if all(referrer in removed for referrer in referrers.get(opId, [])) and opId not in graph.aliases:
+                removed.add(opId)
+                pending.append(opId)
+    return removed
+
+# passes
+
+def _changesBetween(graph: og.OperationGraph, base, first: og.Operation, last: og.Operation) -> bool:
+    """
+    True when an operation between first and last may change the body a face selector base picks from
+    """
+    byId = {operation.id: operation for operation in graph.operations}
+    chain: set[int] = set()
+    for opId in og.referencedOps(base):
+        chain |= _bodyChain(byId, og.Ref(opId))
+    between = graph.operations[_position(graph, first) + 1:_position(graph, last)]
+    return any(len(og.referencedOps(operation) & chain) > 0 or og.usesAllBodies(operation) for operation in between)
+
+def dedupeConstructionPlanes(graph: og.OperationGraph) -> int:
+    """
+    Later planes at the same offset from the same base are replaced by the first one. Planes on a
+    face only while nothing in between touched the body the face is picked from
+    """
+    changes = 0
+    planesByBase: dict[object, list[og.ConstructionPlaneOp]] = {}
+    for operation in list(graph.operations):
+        if not isinstance(operation, og.ConstructionPlaneOp) or operation.isOptional:
+            continue
+        planes = planesByBase.setdefault(operation.base, [])
+        match = next((plane for plane in planes if math.isclose(plane.offset, operation.offset, abs_tol=DEFAULT_FILTER_TOLERANCE)), None)
+        if match is not None and not (operation.base in _PLANE_AXES or isinstance(operation.base, og.Ref)) and _changesBetween(graph, operation.base, match, operation):
+            # the face may have moved, later planes on it compare to this one
+            planes.remove(match)
+            match = None
+        if match is None:
+            planes.append(operation)
+        elif _rewrite(graph, {operation.id: [og.Ref(match.id)]}, {operation.id}):
+            match.isVisible = match.isVisible or operation.isVisible
+            changes += 1
+    return changes
+
+def _bodyChain(byId: dict[int, og.Operation], target: og.Ref) -> set[int]:
+    """
+    Operation making the target body and the combines that changed it since
+    """
+    chain = {target.op}
+    operation = byId.get(target.op)
+    while isinstance(operation, og.CombineOp):
+        chain.add(operation.target.op)
+        operation = byId.get(operation.target.op)
+    return chain
+
+def mergeAdjacentCombines(graph: og.OperationGraph) -> int:
+    """
+    Cuts and joins on the body the previous combine changed, with nothing in between reading the
+    body or the tools, go into that combine: (A - B) - C == A - (B + C), (A + B) + C == A + (B + C)
+    """
+    changes = 0
+    for combine in list(graph.operations):
+        if not isinstance(combine, og.CombineOp) or combine.operation == og.OPERATION_INTERSECT:
+            continue
+        if combine.isKeepToolBodies or combine.isOptional:
+            continue
+        byId = {operation.id: operation for operation in graph.operations}
+        chain = _bodyChain(byId, combine.target)
+        toolOps = og.referencedOps(combine.tools)
+        previous = None
+        for operation in reversed(graph.operations[:_position(graph, combine)]):
+            if operation.id in toolOps or (operation.id in chain and not isinstance(operation, og.CombineOp)):
+                break
+            if len(og.referencedOps(operation) & (chain | toolOps)) > 0 or og.usesAllBodies(operation):
+                previous = operation
+                break
+        if (
+            not isinstance(previous, og.CombineOp)
+            or previous.operation != combine.operation
+            or previous.isKeepToolBodies
+            or previous.isOptional
+            or previous.target.op not in chain
+            or any(opId > previous.id for opId in toolOps)
+        ):
+            continue
+        if _rewrite(graph, {combine.id: [og.Ref(previous.id, 0)]}, {combine.id}):
+            previous.tools.extend(combine.tools)
+            changes += 1
+    return changes
+
+def _footprint(entity) -> tuple[float, float, float, float]:
+    """
+    xMin, yMin, xMax, yMax of a rectangle or circle sketched on an XY parallel plane
+    """
+    if isinstance(entity, og.Circle):
+        return (entity.center[0] - entity.radius, entity.center[1] - entity.radius, entity.center[0] + entity.radius, entity.center[1] + entity.radius)
+    x, y = (0.0, 0.0) if entity.corner is None else (entity.corner[0], entity.corner[1])
+    return (min(x, x + entity.width), min(y, y + entity.length), max(x, x + entity.width), max(y, y + entity.length))
+
+def _areApart(boxes: list[tuple]) -> bool:
+    dimensions = len(boxes[0]) // 2 if len(boxes) > 0 else 0
+    for i, first in enumerate(boxes):
+        for second in boxes[i + 1:]:
+            if not any(first[axis + dimensions] + DEFAULT_FILTER_TOLERANCE < second[axis] or second[axis + dimensions] + DEFAULT_FILTER_TOLERANCE < first[axis] for axis in range(dimensions)):
+                return False
+    return True
+
+def _xyPlanes(graph: og.OperationGraph) -> set:
+    planes = {og.PLANE_XY}
+    for operation in graph.operations:
+        if isinstance(operation, og.ConstructionPlaneOp) and isinstance(operation.base, (str, og.Ref)) and operation.base in planes:
+            planes.add(og.Ref(operation.id))
+    return planes
+
+def _foldableExtrude(operation, sketches: dict[int, og.SketchOp], xyPlanes: set):
+    """
+    Sketch and body anchors of a new body extrude of a whole sketch of disjoint rectangles and circles, None otherwise
+    """
+    if not isinstance(operation, og.ExtrudeOp) or operation.isOptional or operation.operation != og.OPERATION_NEW_BODY:
+        return None
+    if not isinstance(operation.profile, og.Profile):
+        return None
+    sketch = sketches.get(operation.profile.sketch.op)
+    if sketch is None or sketch.isOptional or not isinstance(sketch.plane, (str, og.Ref)) or sketch.plane not in xyPlanes:
+        return None
+    if len(sketch.entities) == 0 or not all(isinstance(entity, (og.Rectangle, og.Circle)) for entity in sketch.entities):
+        return None
+    # a single profile is the whole sketch when there is only one
+    if operation.profile.index is not None and (operation.profile.index != 0 or len(sketch.entities) != 1):
+        return None
+    footprints = [_footprint(entity) for entity in sketch.entities]
+    if not _areApart(footprints):
+        return None
+    if operation.bodyAnchors is not None:
+        anchors = list(operation.bodyAnchors)
+    elif len(footprints) == 1:
+        anchors = [(footprints[0][0], footprints[0][1])]
+    else:
+        # body order of several profiles is up to Fusion, refs by index would not hold after folding
+        return None
+    if len(anchors) != len(footprints):
+        return None
+    return sketch, anchors, footprints
+
+def _extrudeSignature(operation: og.ExtrudeOp, sketch: og.SketchOp) -> tuple:
+    return (
+        sketch.plane,
+        operation.distance,
+        operation.extent,
+        operation.direction,
+        repr(operation.participants),
+        operation.startOffset,
+        operation.taperAngle,
+        operation.bodyName,
+    )
+
+def foldExtrudes(graph: og.OperationGraph) -> int:
+    """
+    New body extrudes of rectangles and circles on the same plane and with the same extent fold into
+    the first one, its sketch takes the other profiles. Bodies keep their order through body anchors
+    """
+    changes = 0
+    featureRefs = _featureRefs(graph)
+    xyPlanes = _xyPlanes(graph)
+    firstBySignature: dict[tuple, og.ExtrudeOp] = {}
+    for extrude in list(graph.operations):
+        sketches = {operation.id: operation for operation in graph.operations if isinstance(operation, og.SketchOp)}
+        foldable = _foldableExtrude(extrude, sketches, xyPlanes)
+        if foldable is None or extrude.id in featureRefs:
+            continue
+        sketch, anchors, footprints = foldable
+        signature = _extrudeSignature(extrude, sketch)
+        first = firstBySignature.get(signature)
+        if first is None:
+            firstBySignature[signature] = extrude
+            continue
+        firstFoldable = _foldableExtrude(first, sketches, xyPlanes)
+        if firstFoldable is None:
+            firstBySignature[signature] = extrude
+            continue
+        firstSketch, firstAnchors, firstFootprints = firstFoldable
+        referrers = _referrers(graph)
+        between = graph.operations[_position(graph, first) + 1:_position(graph, extrude)]
+        if (
+            not _areApart(firstFootprints + footprints)
+            or referrers.get(firstSketch.id, []) != [first.id]
+            or referrers.get(sketch.id, []) != [extrude.id]
+            or sketch.id in graph.aliases
+            or any(og.usesAllBodies(operation) for operation in between)
+        ):
+            continue
+        firstCount = len(firstAnchors)
+        remap = {
+            first.id: [og.Ref(first.id, index) for index in range(firstCount)],
+            extrude.id: [og.Ref(first.id, firstCount + index) for index in range(len(anchors))],
+        }
+        if _rewrite(graph, remap, {extrude.id, sketch.id}):
+            firstSketch.entities.extend(sketch.entities)
+            first.profile = og.Profile(first.profile.sketch, None)
+            first.bodyAnchors = firstAnchors + anchors
+            changes += 1
+    return changes
+
+class _BodyBounds():
+    """
+    Upper bounds of body bounding boxes (xMin, yMin, zMin, xMax, yMax, zMax) through the graph, None where unknown.
+    Bodies are keyed by the operation making them and their index there
+    """
+    def __init__(self):
+        self.planes: dict[int, tuple[int, float]] = {}
+        self.axes: dict[int, tuple[float, float]] = {}
+        self.sketches: dict[int, tuple[float, list]] = {}
+        self.outputs: dict[int, list] = {}
+        self.boxes: dict[tuple[int, int], tuple] = {}
+
+    def keys(self, refs) -> list:
+        """
+        Body keys of a ref or refs, None when any count is unknown
+        """
+        keys = []
+        for ref in [refs] if isinstance(refs, og.Ref) else refs:
+            outputs = self.outputs.get(ref.op)
+            if outputs is None:
+                return None
+            keys.extend(outputs if ref.index is None else outputs[ref.index:ref.index + 1])
+        return keys
+
+    def boxesOf(self, refs) -> list:
+        keys = self.keys(refs)
+        return None if keys is None else [self.boxes.get(key) for key in keys]
+
+    def _plane(self, base):
+        if base in _PLANE_AXES:
+            return (_PLANE_AXES[base], 0.0)
+        if isinstance(base, og.Ref):
+            return self.planes.get(base.op)
+        return None
+
+    def _newBodies(self, operation: og.Operation, boxes: list):
+        self.outputs[operation.id] = [(operation.id, index) for index in range(len(boxes))]
+        for index, box in enumerate(boxes):
+            self.boxes[(operation.id, index)] = box
+
+    def visit(self, operation: og.Operation):
+        self.outputs[operation.id] = []
+        if isinstance(operation, og.ConstructionPlaneOp):
+            plane = self._plane(operation.base)
+            if plane is not None:
+                self.planes[operation.id] = (plane[0], plane[1] + operation.offset)
+        elif isinstance(operation, og.ConstructionAxisOp):
+            planes = [self._plane(plane) for plane in operation.planes] if operation.planes is not None else []
+            if len(planes) == 2 and None not in planes and set(plane[0] for plane in planes) == {0, 1}:
+                point = dict(planes)
+                self.axes[operation.id] = (point[0], point[1])
+        elif isinstance(operation, og.SketchOp):
+            plane = self._plane(operation.plane)
+            if plane is not None and plane[0] == 2 and all(isinstance(entity, (og.Rectangle, og.Circle)) for entity in operation.entities):
+                self.sketches[operation.id] = (plane[1], operation.entities)
+        elif isinstance(operation, og.ExtrudeOp):
+            self._extrude(operation)
+        elif isinstance(operation, og.RectangularPatternOp):
+            self._rectangularPattern(operation)
+        elif isinstance(operation, og.CircularPatternOp):
+            self._circularPattern(operation)
+        elif isinstance(operation, og.CombineOp):
+            self._combine(operation)
+        elif isinstance(operation, og.MoveOp):
+            keys = self.keys(operation.entities) or []
+            for key in keys:
+                self.boxes[key] = _rotated(self.boxes.get(key), math.radians(operation.angle), operation.center)
+            self.outputs[operation.id] = keys
+        elif isinstance(operation, og.MirrorOp):
+            boxes = self.boxesOf(operation.entities)
+            plane = self._plane(operation.plane)
+            if boxes is None:
+                self.outputs[operation.id] = None
+            else:
+                self._newBodies(operation, [None if box is None or plane is None else _mirrored(box, *plane) for box in boxes])
+        elif isinstance(operation, og.LoftOp):
+            self._newBodies(operation, [None])
+
+    def _extrude(self, operation: og.ExtrudeOp):
+        sketch = self.sketches.get(operation.profile.sketch.op) if isinstance(operation.profile, og.Profile) else None
+        if operation.operation != og.OPERATION_NEW_BODY:
+            if operation.operation == og.OPERATION_JOIN:
+                # joined participants grow, nothing is known about them any more
+                participants = list(self.boxes) if operation.participants == og.ALL_BODIES else (self.keys(list(operation.participants)) or list(self.boxes))
+                for key in participants:
+                    self.boxes[key] = None
+            self.outputs[operation.id] = None
+            return
+        if sketch is None:
+            self.outputs[operation.id] = None
+            return
+        z, entities = sketch
+        if operation.profile.index is not None:
+            if len(entities) != 1:
+                self.outputs[operation.id] = None
+                return
+        if operation.extent == og.EXTENT_SIMPLE:
+            zRange = (z, z + operation.distance)
+        elif operation.extent == og.EXTENT_TWO_SIDES:
+            zRange = (z - operation.distance, z + operation.distance)
+        else:
+            start = z + operation.startOffset
+            zRange = (start, start + operation.distance) if operation.direction == og.DIRECTION_POSITIVE else (start - operation.distance, start)
+        if operation.taperAngle:
+            self._newBodies(operation, [None] * len(entities))
+            return
+        boxes = [footprint[:2] + (min(zRange),) + footprint[2:] + (max(zRange),) for footprint in (_footprint(entity) for entity in entities)]
+        if operation.bodyAnchors is not None and len(operation.bodyAnchors) == len(boxes):
+            unmatched = boxes
+            boxes = []
+            for x, y in operation.bodyAnchors:
+                box = min(unmatched, key=lambda item: abs(item[0] - x) + abs(item[1] - y))
+                unmatched.remove(box)
+                boxes.append(box)
+        elif len(boxes) > 1:
+            # which profile becomes which body is up to Fusion
+            boxes = [_union(boxes)] * len(boxes)
+        self._newBodies(operation, boxes)
+
+    def _rectangularPattern(self, operation: og.RectangularPatternOp):
+        boxes = self.boxesOf(operation.entities)
+        if boxes is None:
+            self.outputs[operation.id] = None
+            return
+        directions = [_AXIS_DIRECTIONS.get(direction) for direction in operation.directions]
+        copies = []
+        for i in range(int(operation.quantities[0])):
+            for j in range(int(operation.quantities[1])):
+                if (i, j) == (0, 0):
+                    continue
+                for box in boxes:
+                    if box is None or None in directions:
+                        copies.append(None)
+                        continue
+                    dx = directions[0][0] * operation.distances[0] * i + directions[1][0] * operation.distances[1] * j
+                    dy = directions[0][1] * operation.distances[0] * i + directions[1][1] * operation.distances[1] * j
+                    copies.append((box[0] + dx, box[1] + dy, box[2], box[3] + dx, box[4] + dy, box[5]))
+        self._newBodies(operation, copies)
+
+    def _circularPattern(self, operation: og.CircularPatternOp):
+        boxes = self.boxesOf(operation.entities)
+        if boxes is None:
+            self.outputs[operation.id] = None
+            return
+        center = self.axes.get(operation.axis.op)
+        copies = []
+        for index in range(1, operation.quantity):
+            for box in boxes:
+                copies.append(None if center is None else _rotated(box, 2 * math.pi * index / operation.quantity, center))
+        self._newBodies(operation, copies)
+
+    def _combine(self, operation: og.CombineOp):
+        targets = self.keys(operation.target)
+        if targets is None or len(targets) == 0:
+            self.outputs[operation.id] = None
+            return
+        if operation.operation == og.OPERATION_JOIN:
+            boxes = self.boxesOf(operation.tools)
+            self.boxes[targets[0]] = None if boxes is None else _union([self.boxes.get(targets[0])] + boxes)
+        # cuts and intersections only shrink the target, its box stays an upper bound
+        self.outputs[operation.id] = targets[:1]
+
+def _union(boxes: list):
+    if len(boxes) == 0 or None in boxes:
+        return None
+    dimensions = len(boxes[0]) // 2
+    return tuple(min(box[axis] for box in boxes) for axis in range(dimensions)) + tuple(max(box[axis + dimensions] for box in boxes) for axis in range(dimensions))
+
+def _rotated(box, angle: float, center):
+    """
+    Box around box turned by angle around the z axis through center
+    """
+    if box is None:
+        return None
+    cos, sin = math.cos(angle), math.sin(angle)
+    corners = [
+        (center[0] + (x - center[0]) * cos - (y - center[1]) * sin, center[1] + (x - center[0]) * sin + (y - center[1]) * cos)
+        for x in (box[0], box[3])
+        for y in (box[1], box[4])
+    ]
+    return (min(x for x, _ in corners), min(y for _, y in corners), box[2], max(x for x, _ in corners), max(y for _, y in corners), box[5])
+
+def _mirrored(box, axis: int, offset: float):
+    low, high = list(box[:3]), list(box[3:])
+    low[axis], high[axis] = 2 * offset - box[axis + 3], 2 * offset - box[axis]
+    return tuple(low) + tuple(high)
+
+def dropOutsideTools(graph: og.OperationGraph) -> int:
+    """
+    Cut tools made only for one cut and lying entirely outside the target bounding box are dropped
+    with the features making them, a cut left without tools goes as well
+    """
+    bounds = _BodyBounds()
+    referrers = _referrers(graph)
+    drops: list[tuple[og.CombineOp, og.Ref]] = []
+    for operation in graph.operations:
+        if isinstance(operation, og.CombineOp) and operation.operation == og.OPERATION_CUT and not operation.isKeepToolBodies and not operation.isOptional:
+            targetBoxes = bounds.boxesOf(operation.target)
+            targetBox = targetBoxes[0] if targetBoxes is not None and len(targetBoxes) > 0 else None
+            for tool in operation.tools:
+                toolBoxes = bounds.boxesOf(tool)
+                if targetBox is None or toolBoxes is None or len(toolBoxes) == 0 or None in toolBoxes:
+                    continue
+                if not all(_areApart([targetBox, box]) for box in toolBoxes):
+                    continue
+                maker = next(item for item in graph.operations if item.id == tool.op)
+                if not isinstance(maker, (og.ExtrudeOp, og.RectangularPatternOp, og.CircularPatternOp, og.MirrorOp)) or maker.isOptional:
+                    continue
+                if isinstance(maker, og.ExtrudeOp) and maker.operation != og.OPERATION_NEW_BODY:
+                    continue
+                # every body of the maker goes, and nothing else may use them
+                if tool.index is not None and len(bounds.keys(og.Ref(tool.op))) != 1:
+                    continue
+                if referrers.get(tool.op, []) != [operation.id] or operation.tools.count(tool) != 1 or tool.op in graph.aliases:
+                    continue
+                drops.append((operation, tool))
+        bounds.visit(operation)
+
+    changes = 0
+    for combine, tool in drops:
+        toolIndex = combine.tools.index(tool)
+        del combine.tools[toolIndex]
+        removed = _removeUnused(graph, {tool.op}, _referrers(graph))
+        remap = {}
+        if len(combine.tools) == 0:
+            remap[combine.id] = [combine.target]
+            removed.add(combine.id)
+        if _rewrite(graph, remap, removed):
+            changes += 1
+        else:
+            combine.tools.insert(toolIndex, tool)
+    return changes
+
+# tools outside their target are dropped before folding could merge them into a kept extrude
+DEFAULT_PASSES = [
+    dedupeConstructionPlanes,
+    mergeAdjacentCombines,
+    dropOutsideTools,
+    foldExtrudes,
+]
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+from .meshUtils import MeshModel
+
+# Content addressed cache for headless generator results.
+# Inputs are reduced to the parameters that actually change the mesh (floats rounded, switched off
+# features dropped) and hashed, so equivalent requests share one entry. Entries live in a small in
+# memory LRU in front of a directory of pickled MeshModels that is trimmed to a size cap, least
+# recently used first. The directory can be shared by several processes.
+
+MESH_CACHE_VERSION = 3 # bump when the mesh generators change their output
+MESH_CACHE_DECIMALS = 5
+MESH_CACHE_DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+MESH_CACHE_MEMORY_ENTRIES = 64
+MESH_CACHE_FILE_EXTENSION = '.mesh'
+
+def _canonicalValue(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        # 2 and 2.0 hash the same, -0.0 becomes 0.0
+        return round(float(value), MESH_CACHE_DECIMALS) + 0.0
+    if isinstance(value, (list, tuple)):
+        return [_canonicalValue(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _canonicalValue(item) for key, item in value.items()}
+    raise TypeError('Unsupported parameter type {}'.format(type(value).__name__))
+
+def canonicalBinParameters(binBodyInput, baseInput, generateBase: bool = True, generateBody: bool = True) -> dict:
+    """
+    Parameters createGridfinityBinMesh output depends on
+    """
+    parameters = {
+        'kind': 'bin',
+        'binWidth': binBodyInput.binWidth,
+        'binLength': binBodyInput.binLength,
+        'binHeight': binBodyInput.binHeight,
+        'generateBase': generateBase,
+        'generateBody': generateBody,
+    }
+    if generateBase:
+        hasMagnetCutouts = baseInput.hasMagnetCutouts and baseInput.magnetCutoutsDiameter > baseInput.screwHolesDiameter
+        parameters['base'] = {
+            'baseWidth': baseInput.baseWidth,
+            'baseLength': baseInput.baseLength,
+            'xyClearance': baseInput.xyClearance,
+            'cornerFilletRadius': baseInput.cornerFilletRadius,
+            'hasBottomChamfer': baseInput.hasBottomChamfer,
+            'hasScrewHoles': baseInput.hasScrewHoles,
+            'hasMagnetCutouts': hasMagnetCutouts,
+        }
+        if baseInput.hasScrewHoles or hasMagnetCutouts:
+            parameters['base']['screwHolesDiameter'] = baseInput.screwHolesDiameter
+        if hasMagnetCutouts:
+            parameters['base']['magnetCutoutsDiameter'] = baseInput.magnetCutoutsDiameter
+            parameters['base']['magnetCutoutsDepth'] = baseInput.magnetCutoutsDepth
+    if generateBody:
+        body = {
+            'baseWidth': binBodyInput.baseWidth,
+            'baseLength': binBodyInput.baseLength,
+            'heightUnit': binBodyInput.heightUnit,
+            'xyClearance': binBodyInput.xyClearance,
+            'binCornerFilletRadius': binBodyInput.binCornerFilletRadius,
+            'wallThickness': binBodyInput.wallThickness,
+            'hasLip': binBodyInput.hasLip,
+            'isSolid': binBodyInput.isSolid,
+        }
+        if not binBodyInput.isSolid:
+            body['compartmentsByX'] = binBodyInput.compartmentsByX
+            body['compartmentsByY'] = binBodyInput.compartmentsByY
+            body['compartments'] = [
+                [compartment.positionX, compartment.positionY, compartment.width, compartment.length, compartment.depth]
+                for compartment in binBodyInput.compartments
+            ]
+            body['hasScoop'] = binBodyInput.hasScoop
+            if binBodyInput.hasScoop:
+                body['scoopMaxRadius'] = binBodyInput.scoopMaxRadius
+            body['hasTab'] = binBodyInput.hasTab
+            if binBodyInput.hasTab:
+                body['tabLength'] = binBodyInput.tabLength
+                body['tabWidth'] = binBodyInput.tabWidth
+                body['tabPosition'] = binBodyInput.tabPosition
+                body['tabOverhangAngle'] = binBodyInput.tabOverhangAngle
+        parameters['body'] = body
+    return _canonicalValue(parameters)
+
+def canonicalBaseplateParameters(input) -> dict:
+    """
+    Parameters createGridfinityBaseplateMesh output depends on
+    """
+    parameters = {
+        'kind': 'baseplate',
+        'baseWidth': input.baseWidth,
+        'baseLength': input.baseLength,
+        'xyClearance': input.xyClearance,
+        'baseplateWidth': input.baseplateWidth,
+        'baseplateLength': input.baseplateLength,
+        'cornerFilletRadius': input.cornerFilletRadius,
+        'hasExtendedBottom': input.hasExtendedBottom,
+        'hasPadding': input.hasPadding,
+        'hasClips': input.hasClips,
+    }
+    if input.hasExtendedBottom:
+        hasSkeleton = input.hasSkeletonizedBottom
+        parameters['hasSkeletonizedBottom'] = hasSkeleton
+        parameters['bottomExtensionHeight'] = input.bottomExtensionHeight
+        parameters['hasMagnetCutouts'] = input.hasMagnetCutouts
+        parameters['hasScrewHoles'] = input.hasScrewHoles
+        if input.hasMagnetCutouts or input.hasScrewHoles:
+            parameters['screwHolesDiameter'] = input.screwHolesDiameter
+        if input.hasMagnetCutouts:
+            parameters['magnetCutoutsDiameter'] = input.magnetCutoutsDiameter
+            parameters['magnetCutoutsDepth'] = input.magnetCutoutsDepth
+        if input.hasScrewHoles:
+            parameters['screwHeadCutoutDiameter'] = input.screwHeadCutoutDiameter
+        if hasSkeleton:
+            parameters['hasConnectionHoles'] = input.hasConnectionHoles
+            if input.hasConnectionHoles:
+                parameters['connectionScrewHolesDiameter'] = input.connectionScrewHolesDiameter
+    if input.hasPadding:
+        parameters['paddings'] = [max(0, value) for value in (input.paddingLeft, input.paddingRight, input.paddingBottom, input.paddingTop)]
+    if input.hasClips:
+        parameters['clips'] = [input.hasClipsLeft, input.hasClipsRight, input.hasClipsBottom, input.hasClipsTop]
+    return _canonicalValue(parameters)
+
+def cacheKey(parameters: dict) -> str:
+    payload = json.dumps({'version': MESH_CACHE_VERSION, 'parameters': parameters}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _copyModel(model: MeshModel) -> MeshModel:
+    # meshes are shared, only the part list is copied so callers can rename or extend the result
+    copy = MeshModel(model.name)
+    copy.parts = list(model.parts)
+    return copy
+
+class MeshCache():
+    def __init__(
+        self,
+        directory: str = None,
+        maxBytes: int = MESH_CACHE_DEFAULT_MAX_BYTES,
+        memoryEntries: int = MESH_CACHE_MEMORY_ENTRIES,
+    ):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.memoryEntries = memoryEntries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, MeshModel] = OrderedDict()
+        self._diskBytes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._diskBytes = sum(size for _, size, _ in self._diskEntries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + MESH_CACHE_FILE_EXTENSION)
+
+    def _diskEntries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        for folder in os.scandir(self.directory):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if not entry.name.endswith(MESH_CACHE_FILE_EXTENSION):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _remember(self, key: str, model: MeshModel):
+        self._memory[key] = model
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memoryEntries:
+            self._memory.popitem(last=False)
+
+    def _discard(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        self._diskBytes -= size
+
+    def get(self, key: str) -> MeshModel:
+        model = self._memory.get(key)
+        if model is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return _copyModel(model)
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as file:
+                    model = pickle.load(file)
+                # mtime marks recent use for eviction, atime is often disabled
+                os.utime(path)
+            except FileNotFoundError:
+                model = None
+            except Exception:
+                # truncated entries and pickles of an older class layout are misses, they are rebuilt
+                model = None
+                self._discard(path)
+            if model is not None:
+                self._remember(key, model)
+                self.hits += 1
+                return _copyModel(model)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, model: MeshModel):
+        self._remember(key, model)
+        if not self.directory:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write aside and rename so concurrent readers never see a partial entry
+        handle, temporaryPath = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(handle, 'wb') as file:
+            pickle.dump(model, file, pickle.HIGHEST_PROTOCOL)
+        self._diskBytes += os.path.getsize(temporaryPath)
+        try:
+            # the entry replaced no longer counts
+            self._diskBytes -= os.path.getsize(path)
+        except FileNotFoundError:
+            pass
+        os.replace(temporaryPath, path)
+        if self._diskBytes > self.maxBytes:
+            self.evict()
+
+    def getOrCreate(self, key: str, factory) -> MeshModel:
+        model = self.get(key)
+        if model is None:
+            model = factory()
+            self.put(key, model)
+            model = _copyModel(model)
+        return model
+
+    def evict(self):
+        """
+        Removes least recently used entries until the directory is below the size cap
+        """
+        entries = sorted(self._diskEntries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._diskBytes = total
+
+    def clear(self):
+        self._memory.clear()
+        if self.directory:
+            for path, _, _ in self._diskEntries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        self._diskBytes = 0
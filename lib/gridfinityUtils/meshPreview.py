@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import adsk.core, adsk.fusion
+
+from ...lib import fusion360utils as futil
+from . import meshUtils
+
+# Command previews drawn as custom graphics from the headless mesh generators instead of timeline features.
+# Meshes are built on a worker thread, kept by parameter hash and handed back to the main thread with
+# a custom event, the Fusion API is only touched on the main thread. Nothing is added to the timeline,
+# the graphics group is removed on the next preview, on execute and when the command closes.
+
+MESH_PREVIEW_CACHE_ENTRIES = 16
+MESH_PREVIEW_COLOR = (96, 144, 208, 255)
+
+app = adsk.core.Application.get()
+
+@dataclass
+class PreviewMesh:
+    coordinates: list[float]
+    indices: list[int]
+    seconds: float
+
+    @property
+    def triangleCount(self) -> int:
+        return len(self.indices) // 3
+
+class MeshPreview():
+    def __init__(self, eventId: str, cacheEntries: int = MESH_PREVIEW_CACHE_ENTRIES):
+        self.eventId = eventId
+        self.cacheEntries = cacheEntries
+        self._meshes: OrderedDict[str, PreviewMesh] = OrderedDict()
+        self._errors: dict[str, str] = {}
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._requestedKey: str = None
+        self._group: adsk.fusion.CustomGraphicsGroup = None
+        self._event: adsk.core.CustomEvent = None
+        self._handlers = []
+        self._onReady: Callable[[], None] = None
+
+    @property
+    def isBuilding(self) -> bool:
+        return self._requestedKey is not None and self._requestedKey in self._pending
+
+    def isCached(self, key: str) -> bool:
+        with self._lock:
+            return key in self._meshes
+
+    def register(self, onReady: Callable[[], None] = None):
+        """
+        onReady runs on the main thread after a background build finished
+        """
+        self._onReady = onReady
+        if self._event is not None:
+            return
+        self._event = app.registerCustomEvent(self.eventId)
+        futil.add_handler(self._event, self._onMeshReady, local_handlers=self._handlers)
+
+    def unregister(self):
+        self.clear()
+        self._onReady = None
+        if self._event is None:
+            return
+        for handler in self._handlers:
+            self._event.remove(handler)
+        app.unregisterCustomEvent(self.eventId)
+        self._event = None
+        self._handlers = []
+
+    def show(self, key: str, factory: Callable[[], meshUtils.MeshModel]) -> bool:
+        """
+        Draws the mesh for key, True when it was cached and is on screen already.
+        Otherwise it is built in the background and drawn when ready, unless another key was requested meanwhile
+        """
+        self._requestedKey = key
+        with self._lock:
+            mesh = self._meshes.get(key)
+            if mesh is not None:
+                self._meshes.move_to_end(key)
+            isBuilding = key in self._pending
+            if mesh is None and not isBuilding:
+                self._pending.add(key)
+        if mesh is not None:
+            self._draw(mesh)
+            return True
+        if not isBuilding:
+            threading.Thread(target=self._build, args=(key, factory), name='mesh preview', daemon=True).start()
+        return False
+
+    def clear(self):
+        """
+        Removes the preview graphics and drops the pending request, built meshes stay cached
+        """
+        self._requestedKey = None
+        self._removeGraphics()
+
+    def _build(self, key: str, factory: Callable[[], meshUtils.MeshModel]):
+        # worker thread, no Fusion API calls here
+        start = time.perf_counter()
+        mesh = None
+        error = None
+        try:
+            coordinates, indices = meshUtils.toIndexedArrays(factory())
+            mesh = PreviewMesh(coordinates, indices, time.perf_counter() - start)
+        except Exception as err:
+            error = '{}: {}'.format(type(err).__name__, err)
+        with self._lock:
+            self._pending.discard(key)
+            if mesh is not None:
+                self._meshes[key] = mesh
+                while len(self._meshes) > self.cacheEntries:
+                    self._meshes.popitem(last=False)
+            else:
+                self._errors[key] = error
+        app.fireCustomEvent(self.eventId, key)
+
+    def _onMeshReady(self, args: adsk.core.CustomEventArgs):
+        key = args.additionalInfo
+        with self._lock:
+            mesh = self._meshes.get(key)
+            error = self._errors.pop(key, None)
+        if error is not None:
+            futil.log(f'Mesh preview failed, {error}')
+        if mesh is not None and key == self._requestedKey:
+            futil.log(f'Mesh preview built in {mesh.seconds * 1000:.1f}ms, {mesh.triangleCount} triangles')
+            self._draw(mesh)
+        if self._onReady is not None:
+            self._onReady()
+
+    def _draw(self, mesh: PreviewMesh):
+        self._removeGraphics()
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        group = design.rootComponent.customGraphicsGroups.add()
+        graphicsMesh = group.addMesh(adsk.fusion.CustomGraphicsCoordinates.create(mesh.coordinates), mesh.indices, [], [])
+        graphicsMesh.color = adsk.fusion.CustomGraphicsBasicMaterialColorEffect.create(adsk.core.Color.create(*MESH_PREVIEW_COLOR))
+        graphicsMesh.isSelectable = False
+        self._group = group
+        app.activeViewport.refresh()
+
+    def _removeGraphics(self):
+        if self._group is not None and self._group.isValid:
+            self._group.deleteMe()
+        self._group = None
@@ -0,0 +1,637 @@
+import math
+import struct
+import zipfile
+
+# Helpers for building triangle meshes without a Fusion session.
+# All coordinates are in cm, like the rest of the generators.
+
+MESH_ARC_SEGMENTS = 8
+MESH_CIRCLE_SEGMENTS = 32
+MESH_VERTEX_DECIMALS = 7
+MESH_EXPORT_SCALE = 10.0 # cm -> mm
+
+class Mesh():
+    def __init__(self, name: str = ''):
+        self.name = name
+        self.vertices: list[tuple[float, float, float]] = []
+        self.triangles: list[tuple[int, int, int]] = []
+        self._vertexIndex: dict[tuple[float, float, float], int] = {}
+
+    def addVertex(self, x: float, y: float, z: float) -> int:
+        # coincident points are welded so collapsed quads and arcs stay manifold
+        key = (round(x, MESH_VERTEX_DECIMALS), round(y, MESH_VERTEX_DECIMALS), round(z, MESH_VERTEX_DECIMALS))
+        index = self._vertexIndex.get(key)
+        if index is None:
+            index = len(self.vertices)
+            self._vertexIndex[key] = index
+            self.vertices.append((x, y, z))
+        return index
+
+    def addTriangle(self, a: int, b: int, c: int):
+        if a == b or b == c or a == c:
+            return
+        self.triangles.append((a, b, c))
+
+    def addQuad(self, a: int, b: int, c: int, d: int):
+        corners = [index for i, index in enumerate((a, b, c, d)) if index != (a, b, c, d)[i - 1]]
+        if len(corners) == 4:
+            self.addTriangle(corners[0], corners[1], corners[2])
+            self.addTriangle(corners[0], corners[2], corners[3])
+        elif len(corners) == 3:
+            self.addTriangle(*corners)
+
+    def isClosed(self) -> bool:
+        # every directed edge has to be used exactly once and matched by its reverse
+        edges: dict[tuple[int, int], int] = {}
+        for (a, b, c) in self.triangles:
+            for edge in ((a, b), (b, c), (c, a)):
+                edges[edge] = edges.get(edge, 0) + 1
+        return all(count == 1 and edges.get((edge[1], edge[0]), 0) == 1 for edge, count in edges.items())
+
+    def volume(self) -> float:
+        total = 0.0
+        for (a, b, c) in self.triangles:
+            (ax, ay, az), (bx, by, bz), (cx, cy, cz) = self.vertices[a], self.vertices[b], self.vertices[c]
+            total += ax * (by * cz - bz * cy) - ay * (bx * cz - bz * cx) + az * (bx * cy - by * cx)
+        return total / 6.0
+
+    def boundingBox(self) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
+        xs, ys, zs = zip(*self.vertices)
+        return ((min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs)))
+
+class MeshModel():
+    """
+    Set of closed shells placed by translation, so identical shells (e.g. baseplate cells) are stored
+    once and instanced. A bin is a single watertight shell, baseplate zones are separate shells that
+    touch or overlap and are never merged.
+    """
+    def __init__(self, name: str = ''):
+        self.name = name
+        self.parts: list[tuple[Mesh, tuple[float, float, float]]] = []
+
+    def addPart(self, mesh: Mesh, offset: tuple[float, float, float] = (0, 0, 0)):
+        self.parts.append((mesh, tuple(offset)))
+
+    def addModel(self, model: 'MeshModel', offset: tuple[float, float, float] = (0, 0, 0)):
+        for mesh, (dx, dy, dz) in model.parts:
+            self.addPart(mesh, (dx + offset[0], dy + offset[1], dz + offset[2]))
+
+    @property
+    def meshes(self) -> list[Mesh]:
+        unique: list[Mesh] = []
+        for mesh, _ in self.parts:
+            if not any(mesh is known for known in unique):
+                unique.append(mesh)
+        return unique
+
+    @property
+    def triangleCount(self) -> int:
+        return sum(len(mesh.triangles) for mesh, _ in self.parts)
+
+    def isClosed(self) -> bool:
+        return all(mesh.isClosed() for mesh in self.meshes)
+
+    def iterateTriangles(self):
+        for mesh, (dx, dy, dz) in self.parts:
+            vertices = mesh.vertices
+            for (a, b, c) in mesh.triangles:
+                yield tuple((vertices[i][0] + dx, vertices[i][1] + dy, vertices[i][2] + dz) for i in (a, b, c))
+
+    def boundingBox(self) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
+        minPoint = [math.inf] * 3
+        maxPoint = [-math.inf] * 3
+        for mesh, offset in self.parts:
+            meshMin, meshMax = mesh.boundingBox()
+            for axis in range(3):
+                minPoint[axis] = min(minPoint[axis], meshMin[axis] + offset[axis])
+                maxPoint[axis] = max(maxPoint[axis], meshMax[axis] + offset[axis])
+        return (tuple(minPoint), tuple(maxPoint))
+
+def arcPoints(
+    centerX: float,
+    centerY: float,
+    radius: float,
+    startAngle: float,
+    segments: int = MESH_ARC_SEGMENTS,
+    sweep: float = math.pi / 2,
+) -> list[tuple[float, float]]:
+    return [
+        (centerX + radius * math.cos(startAngle + sweep * i / segments), centerY + radius * math.sin(startAngle + sweep * i / segments))
+        for i in range(segments + 1)
+    ]
+
+def circleRing(
+    centerX: float,
+    centerY: float,
+    radius: float,
+    segments: int = MESH_CIRCLE_SEGMENTS,
+) -> list[tuple[float, float]]:
+    return arcPoints(centerX, centerY, radius, 0, segments, math.pi * 2)[:-1]
+
+def roundedRectangleRing(
+    xMin: float,
+    yMin: float,
+    xMax: float,
+    yMax: float,
+    radius: float,
+    segments: int = MESH_ARC_SEGMENTS,
+    xBreaks: list[float] = [],
+    yBreaks: list[float] = [],
+    keepBreaks: bool = False,
+) -> list[tuple[float, float]]:
+    """
+    Counter clockwise outline starting at the bottom right corner arc. Every ring built with the same
+    segment count and breaks has the same number of points, so rings can be lofted into each other.
+    Breaks add extra points on the straight sides. Breaks off the sides are dropped, or with keepBreaks
+    moved onto the nearest end of the side, so rings of different sizes still get the same point count.
+    """
+    radius = max(0, min(radius, (xMax - xMin) / 2, (yMax - yMin) / 2))
+    tolerance = 10 ** -MESH_VERTEX_DECIMALS
+    if keepBreaks:
+        sideX = sorted(min(max(x, xMin + radius), xMax - radius) for x in xBreaks)
+        sideY = sorted(min(max(y, yMin + radius), yMax - radius) for y in yBreaks)
+    else:
+        sideX = sorted(x for x in xBreaks if xMin + radius + tolerance < x < xMax - radius - tolerance)
+        sideY = sorted(y for y in yBreaks if yMin + radius + tolerance < y < yMax - radius - tolerance)
+    ring: list[tuple[float, float]] = []
+    ring += arcPoints(xMax - radius, yMin + radius, radius, -math.pi / 2, segments)
+    ring += [(xMax, y) for y in sideY]
+    ring += arcPoints(xMax - radius, yMax - radius, radius, 0, segments)
+    ring += [(x, yMax) for x in reversed(sideX)]
+    ring += arcPoints(xMin + radius, yMax - radius, radius, math.pi / 2, segments)
+    ring += [(xMin, y) for y in reversed(sideY)]
+    ring += arcPoints(xMin + radius, yMin + radius, radius, math.pi, segments)
+    ring += [(x, yMin) for x in sideX]
+    return ring
+
+def roundedCornersRing(
+    xMin: float,
+    yMin: float,
+    xMax: float,
+    yMax: float,
+    radii: tuple[float, float, float, float],
+    segments: int = MESH_ARC_SEGMENTS,
+) -> list[tuple[float, float]]:
+    """
+    Counter clockwise outline with its own radius per corner, in order bottom left, bottom right,
+    top right, top left. Sharp corners are a single point.
+    """
+    corners = [
+        (xMin, yMin, 1, 1, math.pi),
+        (xMax, yMin, -1, 1, -math.pi / 2),
+        (xMax, yMax, -1, -1, 0),
+        (xMin, yMax, 1, -1, math.pi / 2),
+    ]
+    ring: list[tuple[float, float]] = []
+    for (x, y, directionX, directionY, startAngle), radius in zip(corners, radii):
+        if radius > 0:
+            ring += arcPoints(x + directionX * radius, y + directionY * radius, radius, startAngle, segments)
+        else:
+            ring.append((x, y))
+    return ring
+
+def addRing(mesh: Mesh, ring: list[tuple[float, float]], z: float) -> list[int]:
+    return [mesh.addVertex(x, y, z) for (x, y) in ring]
+
+def addLoft(
+    mesh: Mesh,
+    rings: list[tuple[list[tuple[float, float]], float]],
+    isClosed: bool = False,
+) -> list[list[int]]:
+    """
+    Connects rings of equal point count. Normals face right of the profile direction:
+    going up along an outer wall faces outwards, going down along a pocket wall faces into the pocket.
+    """
+    indexRings = [addRing(mesh, ring, z) for (ring, z) in rings]
+    pairs = list(zip(indexRings, indexRings[1:]))
+    if isClosed:
+        pairs.append((indexRings[-1], indexRings[0]))
+    for lower, upper in pairs:
+        count = len(lower)
+        for i in range(count):
+            j = (i + 1) % count
+            mesh.addQuad(lower[i], lower[j], upper[j], upper[i])
+    return indexRings
+
+def _withoutRepeats(indices: list[int]) -> list[int]:
+    return [index for i, index in enumerate(indices) if index != indices[i - 1]]
+
+def addFan(mesh: Mesh, ring: list[int], isUp: bool):
+    ring = _withoutRepeats(ring)
+    if len(ring) < 3:
+        return
+    centerX = sum(mesh.vertices[i][0] for i in ring) / len(ring)
+    centerY = sum(mesh.vertices[i][1] for i in ring) / len(ring)
+    center = mesh.addVertex(centerX, centerY, mesh.vertices[ring[0]][2])
+    for i in range(len(ring)):
+        a, b = ring[i], ring[(i + 1) % len(ring)]
+        if isUp:
+            mesh.addTriangle(center, a, b)
+        else:
+            mesh.addTriangle(center, b, a)
+
+def _orientation(mesh: Mesh, a: int, b: int, c: int) -> float:
+    (ax, ay, _), (bx, by, _), (cx, cy, _) = mesh.vertices[a], mesh.vertices[b], mesh.vertices[c]
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+def _isInTriangle(mesh: Mesh, point: int, a: int, b: int, c: int) -> bool:
+    tolerance = 10 ** -(MESH_VERTEX_DECIMALS * 2)
+    return _orientation(mesh, a, b, point) >= -tolerance \
+        and _orientation(mesh, b, c, point) >= -tolerance \
+        and _orientation(mesh, c, a, point) >= -tolerance
+
+def addPolygon(mesh: Mesh, ring: list[int], isUp: bool):
+    """
+    Ear clipping triangulation of a simple, possibly concave, counter clockwise polygon in the xy plane
+    """
+    remaining = _withoutRepeats(ring)
+    tolerance = 10 ** -(MESH_VERTEX_DECIMALS * 2)
+    while len(remaining) >= 3:
+        count = len(remaining)
+        ear = None
+        for i in range(count):
+            a, b, c = remaining[i - 1], remaining[i], remaining[(i + 1) % count]
+            if _orientation(mesh, a, b, c) <= tolerance:
+                continue
+            if any(_isInTriangle(mesh, point, a, b, c) for point in remaining if point not in (a, b, c)):
+                continue
+            ear = i
+            break
+        if ear is None:
+            # only collinear leftovers, keep the outline closed with a flat triangle
+            ear = max(range(count), key=lambda i: _orientation(mesh, remaining[i - 1], remaining[i], remaining[(i + 1) % count]))
+        a, b, c = remaining[ear - 1], remaining[ear], remaining[(ear + 1) % count]
+        if isUp:
+            mesh.addTriangle(a, b, c)
+        else:
+            mesh.addTriangle(a, c, b)
+        remaining.pop(ear)
+
+def _signedArea(mesh: Mesh, loop: list[int]) -> float:
+    area = 0.0
+    for a, b in zip(loop, loop[1:] + loop[:1]):
+        (ax, ay, _), (bx, by, _) = mesh.vertices[a], mesh.vertices[b]
+        area += ax * by - bx * ay
+    return area / 2
+
+def _isInPolygon(mesh: Mesh, point: int, loop: list[int]) -> bool:
+    x, y, _ = mesh.vertices[point]
+    isInside = False
+    for a, b in zip(loop, loop[1:] + loop[:1]):
+        (ax, ay, _), (bx, by, _) = mesh.vertices[a], mesh.vertices[b]
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            isInside = not isInside
+    return isInside
+
+def _nextInLoop(mesh: Mesh, previous: int, current: int, candidates: list[int]) -> int:
+    # at a vertex where loops touch take the sharpest right turn, keeping the region on the left
+    if len(candidates) == 1:
+        return 0
+    (px, py, _), (cx, cy, _) = mesh.vertices[previous], mesh.vertices[current]
+    back = math.atan2(py - cy, px - cx)
+
+    def clockwiseTurn(index: int) -> float:
+        nx, ny, _ = mesh.vertices[candidates[index]]
+        return (back - math.atan2(ny - cy, nx - cx)) % (math.pi * 2) or math.pi * 2
+    return min(range(len(candidates)), key=clockwiseTurn)
+
+def _regionLoops(mesh: Mesh, outline: list[int], holes: list[list[int]]) -> list[list[int]]:
+    """
+    Boundary loops of the outline minus the holes. Edges a hole shares with the outline cancel out.
+    """
+    edges: dict[tuple[int, int], None] = {}
+    for ring, isHole in [(outline, False)] + [(hole, True) for hole in holes]:
+        ring = _withoutRepeats(ring)
+        if isHole:
+            ring = list(reversed(ring))
+        for a, b in zip(ring, ring[1:] + ring[:1]):
+            if (b, a) in edges:
+                del edges[(b, a)]
+            else:
+                edges[(a, b)] = None
+    outgoing: dict[int, list[int]] = {}
+    for a, b in edges:
+        outgoing.setdefault(a, []).append(b)
+
+    loops = []
+    while outgoing:
+        start = next(iter(outgoing))
+        first = outgoing[start].pop(0)
+        if not outgoing[start]:
+            del outgoing[start]
+        loop = [start]
+        previous, current = start, first
+        while True:
+            candidates = outgoing.get(current, [])
+            if current == start:
+                if not candidates or _nextInLoop(mesh, previous, current, candidates + [first]) == len(candidates):
+                    break
+            elif not candidates:
+                raise ValueError('Region outline is not closed')
+            loop.append(current)
+            following = candidates.pop(_nextInLoop(mesh, previous, current, candidates))
+            if not candidates:
+                del outgoing[current]
+            previous, current = current, following
+        loops.append(loop)
+    return loops
+
+def _isOnSegment(mesh: Mesh, point: int, a: int, b: int) -> bool:
+    tolerance = 10 ** -(MESH_VERTEX_DECIMALS * 2)
+    (px, py, _), (ax, ay, _), (bx, by, _) = mesh.vertices[point], mesh.vertices[a], mesh.vertices[b]
+    return abs(_orientation(mesh, a, b, point)) <= tolerance \
+        and min(ax, bx) <= px <= max(ax, bx) and min(ay, by) <= py <= max(ay, by)
+
+def _isCrossing(mesh: Mesh, a: int, b: int, c: int, d: int) -> bool:
+    return _orientation(mesh, a, b, c) * _orientation(mesh, a, b, d) < 0 \
+        and _orientation(mesh, c, d, a) * _orientation(mesh, c, d, b) < 0
+
+def _bridgeHole(mesh: Mesh, polygon: list[int], hole: list[int], otherHoles: list[list[int]]) -> list[int]:
+    """
+    Joins a clockwise hole into a counter clockwise polygon through a cut from its rightmost point
+    to the closest polygon point the cut runs clear to
+    """
+    holeStart = max(range(len(hole)), key=lambda i: mesh.vertices[hole[i]][:2])
+    bridgeEnd = hole[holeStart]
+    rings = [polygon, hole] + otherHoles
+    edges = [(ring[i], ring[(i + 1) % len(ring)]) for ring in rings for i in range(len(ring))]
+    points = {index for ring in rings for index in ring}
+    for i in sorted(range(len(polygon)), key=lambda i: math.dist(mesh.vertices[polygon[i]][:2], mesh.vertices[bridgeEnd][:2])):
+        start = polygon[i]
+        previous, following = polygon[i - 1], polygon[(i + 1) % len(polygon)]
+        # the cut has to leave the polygon point into the polygon
+        if _orientation(mesh, previous, start, following) > 0:
+            isInward = _orientation(mesh, previous, start, bridgeEnd) > 0 and _orientation(mesh, start, following, bridgeEnd) > 0
+        else:
+            isInward = _orientation(mesh, previous, start, bridgeEnd) > 0 or _orientation(mesh, start, following, bridgeEnd) > 0
+        if not isInward:
+            continue
+        if any(_isCrossing(mesh, start, bridgeEnd, a, b) for (a, b) in edges if start not in (a, b) and bridgeEnd not in (a, b)):
+            continue
+        if any(_isOnSegment(mesh, point, start, bridgeEnd) for point in points if point not in (start, bridgeEnd)):
+            continue
+        return polygon[:i + 1] + hole[holeStart:] + hole[:holeStart] + [bridgeEnd] + polygon[i:]
+    raise ValueError('Hole can not be joined into its outline')
+
+def addRegion(mesh: Mesh, outline: list[int], holes: list[list[int]], isUp: bool):
+    """
+    Triangulates the flat region inside a counter clockwise outline and outside counter clockwise holes.
+    Holes may share edges and points with the outline, the region then splits into several polygons.
+    """
+    tolerance = 10 ** -(MESH_VERTEX_DECIMALS * 2)
+    polygons = []
+    innerLoops = []
+    for loop in _regionLoops(mesh, outline, holes):
+        if _signedArea(mesh, loop) < -tolerance:
+            innerLoops.append(loop)
+        else:
+            polygons.append(loop)
+    assignments: list[list[list[int]]] = [[] for _ in polygons]
+    for loop in innerLoops:
+        owner = next((i for i, polygon in enumerate(polygons) if len(polygons) == 1 or _isInPolygon(mesh, loop[0], polygon)), None)
+        if owner is None:
+            raise ValueError('Hole is outside of its outline')
+        assignments[owner].append(loop)
+    for polygon, loops in zip(polygons, assignments):
+        loops = sorted(loops, key=lambda loop: max(mesh.vertices[i][:2] for i in loop), reverse=True)
+        for index, loop in enumerate(loops):
+            polygon = _bridgeHole(mesh, polygon, loop, loops[index + 1:])
+        addPolygon(mesh, polygon, isUp)
+
+def addAnnulus(
+    mesh: Mesh,
+    inner: list[int],
+    outer: list[int],
+    center: tuple[float, float],
+    isUp: bool,
+):
+    """
+    Triangulates a flat region between a convex hole and a convex outline (both counter clockwise)
+    by zipping them together, starting from the points closest in angle around the center.
+    A step is only taken when the new rung does not cut through the hole.
+    """
+    def angularOrder(indices: list[int]) -> list[int]:
+        indices = _withoutRepeats(indices)
+        angles = [math.atan2(mesh.vertices[i][1] - center[1], mesh.vertices[i][0] - center[0]) for i in indices]
+        start = min(range(len(indices)), key=lambda i: angles[i])
+        return indices[start:] + indices[:start]
+
+    inner = angularOrder(inner)
+    outer = angularOrder(outer)
+    innerCount, outerCount = len(inner), len(outer)
+    tolerance = 10 ** -(MESH_VERTEX_DECIMALS * 2)
+
+    def distance(a: int, b: int) -> float:
+        return math.dist(mesh.vertices[a][:2], mesh.vertices[b][:2])
+
+    i = j = 0
+    while i < innerCount or j < outerCount:
+        innerCurrent, innerNext = inner[i % innerCount], inner[(i + 1) % innerCount]
+        outerCurrent, outerNext = outer[j % outerCount], outer[(j + 1) % outerCount]
+        # advancing along the hole needs the current outline point outside the hole edge
+        canAdvanceInner = i < innerCount and _orientation(mesh, innerCurrent, innerNext, outerCurrent) < -tolerance
+        canAdvanceOuter = j < outerCount and _orientation(mesh, outerCurrent, outerNext, innerCurrent) > tolerance \
+            and _orientation(mesh, innerCurrent, innerNext, outerNext) < -tolerance
+        if canAdvanceInner and canAdvanceOuter:
+            advanceInner = distance(innerNext, outerCurrent) <= distance(innerCurrent, outerNext)
+        else:
+            advanceInner = canAdvanceInner or j >= outerCount
+        if advanceInner:
+            triangle = (innerCurrent, outerCurrent, innerNext)
+            i += 1
+        else:
+            triangle = (innerCurrent, outerCurrent, outerNext)
+            j += 1
+        if isUp:
+            mesh.addTriangle(*triangle)
+        else:
+            mesh.addTriangle(triangle[0], triangle[2], triangle[1])
+
+def addConvexTriangle(mesh: Mesh, a: int, b: int, c: int, insidePoint: tuple[float, float, float]):
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz) = mesh.vertices[a], mesh.vertices[b], mesh.vertices[c]
+    normal = ((by - ay) * (cz - az) - (bz - az) * (cy - ay), (bz - az) * (cx - ax) - (bx - ax) * (cz - az), (bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+    outwards = (ax - insidePoint[0], ay - insidePoint[1], az - insidePoint[2])
+    if sum(n * o for n, o in zip(normal, outwards)) >= 0:
+        mesh.addTriangle(a, b, c)
+    else:
+        mesh.addTriangle(a, c, b)
+
+def createConvexPrism(
+    profile: list[tuple[float, float, float]],
+    direction: tuple[float, float, float],
+    name: str = '',
+) -> Mesh:
+    """
+    Closed mesh of a convex planar polygon swept along a direction vector
+    """
+    mesh = Mesh(name)
+    start = [mesh.addVertex(*point) for point in profile]
+    end = [mesh.addVertex(x + direction[0], y + direction[1], z + direction[2]) for (x, y, z) in profile]
+    count = len(profile)
+    insidePoint = tuple(sum(p[axis] for p in profile) / count + direction[axis] / 2 for axis in range(3))
+    for i in range(1, count - 1):
+        addConvexTriangle(mesh, start[0], start[i], start[i + 1], insidePoint)
+        addConvexTriangle(mesh, end[0], end[i], end[i + 1], insidePoint)
+    for i in range(count):
+        j = (i + 1) % count
+        addConvexTriangle(mesh, start[i], start[j], end[j], insidePoint)
+        addConvexTriangle(mesh, start[i], end[j], end[i], insidePoint)
+    return mesh
+
+def createLoftMesh(
+    rings: list[tuple[list[tuple[float, float]], float]],
+    name: str = '',
+) -> Mesh:
+    """
+    Closed mesh of counter clockwise rings lofted bottom to top, capped at both ends
+    """
+    mesh = Mesh(name)
+    indexRings = addLoft(mesh, rings)
+    addPolygon(mesh, indexRings[0], False)
+    addPolygon(mesh, indexRings[-1], True)
+    return mesh
+
+def transformMesh(
+    mesh: Mesh,
+    transform,
+    name: str = '',
+) -> Mesh:
+    """
+    Copy of a mesh with every vertex mapped through an affine transform (moves, axis swaps, mirrors).
+    Triangles are flipped when the transform mirrors, so normals keep facing outwards.
+    """
+    origin = transform((0, 0, 0))
+    axes = [[end - start for start, end in zip(origin, transform(unit))] for unit in ((1, 0, 0), (0, 1, 0), (0, 0, 1))]
+    determinant = axes[0][0] * (axes[1][1] * axes[2][2] - axes[1][2] * axes[2][1]) \
+        - axes[0][1] * (axes[1][0] * axes[2][2] - axes[1][2] * axes[2][0]) \
+        + axes[0][2] * (axes[1][0] * axes[2][1] - axes[1][1] * axes[2][0])
+    result = Mesh(name or mesh.name)
+    indices = [result.addVertex(*transform(vertex)) for vertex in mesh.vertices]
+    for (a, b, c) in mesh.triangles:
+        if determinant > 0:
+            result.addTriangle(indices[a], indices[b], indices[c])
+        else:
+            result.addTriangle(indices[a], indices[c], indices[b])
+    return result
+
+def createBoxMesh(
+    xMin: float,
+    yMin: float,
+    zMin: float,
+    xMax: float,
+    yMax: float,
+    zMax: float,
+    name: str = '',
+) -> Mesh:
+    return createConvexPrism(
+        [(xMin, yMin, zMin), (xMax, yMin, zMin), (xMax, yMax, zMin), (xMin, yMax, zMin)],
+        (0, 0, zMax - zMin),
+        name,
+    )
+
+def toIndexedArrays(model: MeshModel) -> tuple[list[float], list[int]]:
+    """
+    Flat xyz coordinates and triangle vertex indices of every part, in the layout CustomGraphicsGroup.addMesh takes
+    """
+    coordinates: list[float] = []
+    indices: list[int] = []
+    for mesh, (dx, dy, dz) in model.parts:
+        vertexBase = len(coordinates) // 3
+        for (x, y, z) in mesh.vertices:
+            coordinates.extend((x + dx, y + dy, z + dz))
+        for triangle in mesh.triangles:
+            indices.extend(vertexBase + index for index in triangle)
+    return coordinates, indices
+
+def toStlBytes(model: MeshModel, scale: float = MESH_EXPORT_SCALE) -> bytes:
+    chunks = [struct.pack('<80sI', (model.name or 'gridfinity').encode('ascii', 'replace')[:80], model.triangleCount)]
+    for (a, b, c) in model.iterateTriangles():
+        ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+        vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+        nx, ny, nz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+        length = math.sqrt(nx * nx + ny * ny + nz * nz) or 1.0
+        chunks.append(struct.pack(
+            '<12fH',
+            nx / length, ny / length, nz / length,
+            a[0] * scale, a[1] * scale, a[2] * scale,
+            b[0] * scale, b[1] * scale, b[2] * scale,
+            c[0] * scale, c[1] * scale, c[2] * scale,
+            0,
+        ))
+    return b''.join(chunks)
+
+def writeStl(model: MeshModel, path: str, scale: float = MESH_EXPORT_SCALE):
+    with open(path, 'wb') as file:
+        file.write(toStlBytes(model, scale))
+
+_3MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>'
+)
+_3MF_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>'
+)
+
+def _xmlEscape(value: str) -> str:
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+def _3mfMeshXml(mesh: Mesh, offset: tuple[float, float, float], scale: float, vertexBase: int = 0) -> tuple[str, str]:
+    dx, dy, dz = offset
+    vertices = ''.join('<vertex x="{:.6g}" y="{:.6g}" z="{:.6g}"/>'.format((x + dx) * scale, (y + dy) * scale, (z + dz) * scale) for (x, y, z) in mesh.vertices)
+    triangles = ''.join('<triangle v1="{}" v2="{}" v3="{}"/>'.format(a + vertexBase, b + vertexBase, c + vertexBase) for (a, b, c) in mesh.triangles)
+    return vertices, triangles
+
+def to3mfModelXml(model: MeshModel, scale: float = MESH_EXPORT_SCALE, isInstanced: bool = True) -> str:
+    """
+    3MF model part. Instanced output stores every distinct mesh once and places it with translate only
+    components of a single assembly object, so repeated base cells cost a few bytes each.
+    Otherwise all shells are merged into one mesh object.
+    """
+    name = _xmlEscape(model.name or 'gridfinity')
+    resources = []
+    if isInstanced:
+        objectIds: dict[int, int] = {}
+        for mesh in model.meshes:
+            objectIds[id(mesh)] = len(objectIds) + 1
+            vertices, triangles = _3mfMeshXml(mesh, (0, 0, 0), scale)
+            resources.append('<object id="{}" type="model" name="{}"><mesh><vertices>{}</vertices><triangles>{}</triangles></mesh></object>'.format(
+                objectIds[id(mesh)], _xmlEscape(mesh.name or 'mesh'), vertices, triangles,
+            ))
+        buildId = len(objectIds) + 1
+        components = ''.join(
+            '<component objectid="{}" transform="1 0 0 0 1 0 0 0 1 {:.6g} {:.6g} {:.6g}"/>'.format(objectIds[id(mesh)], dx * scale, dy * scale, dz * scale)
+            for mesh, (dx, dy, dz) in model.parts
+        )
+        resources.append('<object id="{}" type="model" name="{}"><components>{}</components></object>'.format(buildId, name, components))
+    else:
+        vertexChunks = []
+        triangleChunks = []
+        vertexBase = 0
+        for mesh, offset in model.parts:
+            vertices, triangles = _3mfMeshXml(mesh, offset, scale, vertexBase)
+            vertexChunks.append(vertices)
+            triangleChunks.append(triangles)
+            vertexBase += len(mesh.vertices)
+        buildId = 1
+        resources.append('<object id="1" type="model" name="{}"><mesh><vertices>{}</vertices><triangles>{}</triangles></mesh></object>'.format(
+            name, ''.join(vertexChunks), ''.join(triangleChunks),
+        ))
+    return ''.join([
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<model unit="millimeter" xml:lang="en-US" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">',
+        '<resources>{}</resources>'.format(''.join(resources)),
+        '<build><item objectid="{}"/></build>'.format(buildId),
+        '</model>',
+    ])
+
+def write3mf(model: MeshModel, path: str, scale: float = MESH_EXPORT_SCALE, isInstanced: bool = True):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _3MF_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _3MF_RELATIONSHIPS)
+        archive.writestr('3D/3dmodel.model', to3mfModelXml(model, scale, isInstanced))
@@ -0,0 +1,609 @@
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any, ClassVar
+
+# Generators describe what to build as a graph of typed operations instead of calling the Fusion API
+# directly. Inputs of an operation refer to the outputs of earlier ones, faces and edges are picked by
+# selectors resolved by the executor right before the operation runs, so planning never reads topology
+# and never touches the API. The FusionExecutor then runs the graph against the Fusion API, or against the
+# recording backend in lib/fakeAdsk. Operations are grouped in nested stages which executors time as trace spans.
+
+OPERATION_NEW_BODY = 'newBody'
+OPERATION_JOIN = 'join'
+OPERATION_CUT = 'cut'
+OPERATION_INTERSECT = 'intersect'
+
+DIRECTION_POSITIVE = 'positive'
+DIRECTION_NEGATIVE = 'negative'
+
+EXTENT_SIMPLE = 'simple'
+EXTENT_ONE_SIDE = 'oneSide'
+EXTENT_TWO_SIDES = 'twoSides'
+
+# origin construction planes and axes of the target component
+PLANE_XY = 'xy'
+PLANE_XZ = 'xz'
+PLANE_YZ = 'yz'
+AXIS_X = 'x'
+AXIS_Y = 'y'
+AXIS_Z = 'z'
+
+# extrude participants standing for every body of the component when the extrude runs
+ALL_BODIES = 'allBodies'
+
+# how sketch points are given: sketch space as is, model space, model space dropped onto z=0 of the
+# sketch, or model xy on the sketch plane
+POINT_SKETCH = 'sketch'
+POINT_MODEL = 'model'
+POINT_MODEL_FLAT = 'modelFlat'
+POINT_SKETCH_PLANE = 'sketchPlane'
+
+Point = tuple[float, float, float]
+
+def point(value) -> Point:
+    """
+    Plain tuple for a Point3D or a tuple
+    """
+    if isinstance(value, tuple):
+        return value
+    return (value.x, value.y, value.z)
+
+def offsetPoint(value, byX: float = 0, byY: float = 0, byZ: float = 0) -> Point:
+    x, y, z = point(value)
+    return (x + byX, y + byY, z + byZ)
+
+@dataclass(frozen=True)
+class Ref:
+    """
+    Output of an earlier operation: its plane, axis, sketch or feature, its index-th body or all its bodies when index is None
+    """
+    op: int
+    index: Any = None
+
+    def body(self, index: int = 0) -> 'Ref':
+        return Ref(self.op, index)
+
+    @property
+    def bodies(self) -> 'Ref':
+        return Ref(self.op, None)
+
+# face selectors
+
+@dataclass(frozen=True)
+class FeatureFaces:
+    kind: ClassVar[str] = 'featureFaces'
+    feature: Ref
+
+@dataclass(frozen=True)
+class BodyFaces:
+    kind: ClassVar[str] = 'bodyFaces'
+    body: Ref
+
+@dataclass(frozen=True)
+class EndFace:
+    kind: ClassVar[str] = 'endFace'
+    feature: Ref
+    index: int = 0
+
+@dataclass(frozen=True)
+class TopFace:
+    kind: ClassVar[str] = 'topFace'
+    body: Ref
+
+@dataclass(frozen=True)
+class BottomFace:
+    kind: ClassVar[str] = 'bottomFace'
+    body: Ref
+
+@dataclass(frozen=True)
+class FaceNormalTo:
+    """
+    Lowest (or highest) face of the body flat along axis
+    """
+    kind: ClassVar[str] = 'faceNormalTo'
+    body: Ref
+    axis: str
+    isHighest: bool = False
+
+@dataclass(frozen=True)
+class PlanarFaceAlongZ:
+    """
+    Lowest (or highest) planar face with its normal along z, read from the surface normal
+    """
+    kind: ClassVar[str] = 'planarFaceAlongZ'
+    body: Ref
+    isHighest: bool = False
+
+# edge selectors, each resolves to a list of edges
+
+@dataclass(frozen=True)
+class EdgesByLength:
+    kind: ClassVar[str] = 'edgesByLength'
+    faces: Any
+    length: float
+    tolerance: float
+
+@dataclass(frozen=True)
+class BodyEdgesByLength:
+    kind: ClassVar[str] = 'bodyEdgesByLength'
+    body: Ref
+    length: float
+    tolerance: float
+
+@dataclass(frozen=True)
+class EdgesCollinearTo:
+    kind: ClassVar[str] = 'edgesCollinearTo'
+    body: Ref
+    axis: str
+
+@dataclass(frozen=True)
+class FaceEdges:
+    """
+    All edges of the face, or the index-th one
+    """
+    kind: ClassVar[str] = 'faceEdges'
+    face: Any
+    index: Any = None
+
+@dataclass(frozen=True)
+class BottomHorizontalEdge:
+    kind: ClassVar[str] = 'bottomHorizontalEdge'
+    face: Any
+
+@dataclass(frozen=True)
+class FrontEdge:
+    """
+    Edge of the face along x with the smallest y
+    """
+    kind: ClassVar[str] = 'frontEdge'
+    face: Any
+
+@dataclass(frozen=True)
+class TangentEdges:
+    """
+    Edges tangentially connected to the edge, from start on
+    """
+    kind: ClassVar[str] = 'tangentEdges'
+    edge: Any
+    start: int = 0
+
+# profile and point selectors
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    index-th profile of the sketch, all profiles when index is None
+    """
+    kind: ClassVar[str] = 'profile'
+    sketch: Ref
+    index: Any = 0
+
+@dataclass(frozen=True)
+class LeftmostProfile:
+    kind: ClassVar[str] = 'leftmostProfile'
+    sketch: Ref
+
+@dataclass(frozen=True)
+class SketchPoint:
+    """
+    Point a sketch entity exported by name
+    """
+    kind: ClassVar[str] = 'sketchPoint'
+    sketch: Ref
+    name: str
+
+# sketch entities
+
+@dataclass
+class Rectangle:
+    kind: ClassVar[str] = 'rectangle'
+    width: float
+    length: float
+    # sketch origin when None
+    corner: Any = None
+    space: str = POINT_MODEL
+
+@dataclass
+class Circle:
+    """
+    Dimensioned circle centered on a model point dropped onto the sketch plane
+    """
+    kind: ClassVar[str] = 'circle'
+    center: Point
+    radius: float
+
+@dataclass
+class CircleAtPoint:
+    """
+    Circle dimensioned from the sketch origin, existing curves become construction geometry
+    """
+    kind: ClassVar[str] = 'circleAtPoint'
+    center: Point
+    radius: float
+
+@dataclass
+class TabAtCircleEdge:
+    """
+    CircleAtPoint with a half radius circle on its edge at 45 degrees
+    """
+    kind: ClassVar[str] = 'tabAtCircleEdge'
+    center: Point
+    radius: float
+
+@dataclass
+class SkeletonCutout:
+    """
+    Baseplate skeleton outline around the hole at center, exports 'axisPoint' at the cell center
+    """
+    kind: ClassVar[str] = 'skeletonCutout'
+    center: Point
+    radius: float
+    arcRadius: float
+    cellCenterX: float
+    cellCenterY: float
+
+@dataclass
+class ConnectionHole:
+    """
+    Circle centered between the two horizontal edges of the face the sketch is on
+    """
+    kind: ClassVar[str] = 'connectionHole'
+    radius: float
+
+@dataclass
+class Polygon:
+    """
+    Closed polyline, corners are offsets from origin in sketch space
+    """
+    kind: ClassVar[str] = 'polygon'
+    origin: Point
+    offsets: list[tuple[float, float]]
+
+@dataclass
+class TabProfile:
+    """
+    Label tab triangle with its top back corner at origin, in model space
+    """
+    kind: ClassVar[str] = 'tabProfile'
+    origin: Point
+    width: float
+    height: float
+
+@dataclass
+class ClearanceOutline:
+    """
+    Filleted rectangle offset outwards, the ring between them is the clearance profile
+    """
+    kind: ClassVar[str] = 'clearanceOutline'
+    width: float
+    length: float
+    corner: Point
+    filletRadius: float
+    offsetDirection: Point
+
+# operations, the graph sets id, stage and isOptional when they are added
+
+@dataclass
+class Operation:
+    kind: ClassVar[str] = ''
+
+@dataclass
+class ConstructionPlaneOp(Operation):
+    kind: ClassVar[str] = 'constructionPlane'
+    # origin plane name, plane Ref or face selector
+    base: Any
+    offset: float
+    name: str = ''
+    isVisible: bool = True
+
+@dataclass
+class ConstructionAxisOp(Operation):
+    """
+    Axis through two planes, or normal to face at point
+    """
+    kind: ClassVar[str] = 'constructionAxis'
+    planes: Any = None
+    face: Any = None
+    point: Any = None
+    name: str = ''
+    isVisible: bool = True
+
+@dataclass
+class SketchOp(Operation):
+    kind: ClassVar[str] = 'sketch'
+    # origin plane name, plane Ref or face selector
+    plane: Any
+    entities: list
+    name: str = ''
+
+@dataclass
+class ExtrudeOp(Operation):
+    kind: ClassVar[str] = 'extrude'
+    # profile selector or face selector
+    profile: Any
+    distance: float
+    operation: str = OPERATION_NEW_BODY
+    extent: str = EXTENT_ONE_SIDE
+    direction: str = DIRECTION_POSITIVE
+    participants: Any = ()
+    startOffset: float = 0
+    # None leaves the taper argument out
+    taperAngle: Any = None
+    name: str = ''
+    bodyName: str = ''
+    # bodies are reordered to the nearest bounding box minimum x, y of each anchor when set
+    bodyAnchors: Any = None
+
+@dataclass
+class FilletOp(Operation):
+    kind: ClassVar[str] = 'fillet'
+    edges: list
+    radius: float
+    isTangentChain: bool = True
+    isInputTangentChain: bool = False
+    name: str = ''
+
+@dataclass
+class ChamferOp(Operation):
+    kind: ClassVar[str] = 'chamfer'
+    edges: list
+    distance: float
+    isTangentChain: bool = True
+    name: str = ''
+
+@dataclass
+class RectangularPatternOp(Operation):
+    kind: ClassVar[str] = 'rectangularPattern'
+    entities: list
+    quantities: tuple[int, int]
+    distances: tuple[float, float]
+    directions: tuple[str, str] = (AXIS_X, AXIS_Y)
+    name: str = ''
+
+@dataclass
+class CircularPatternOp(Operation):
+    kind: ClassVar[str] = 'circularPattern'
+    entities: list
+    axis: Ref
+    quantity: int
+    name: str = ''
+
+@dataclass
+class CombineOp(Operation):
+    """
+    Kept tool bodies are left out of the outputs
+    """
+    kind: ClassVar[str] = 'combine'
+    target: Ref
+    tools: list
+    operation: str
+    isKeepToolBodies: bool = False
+    name: str = ''
+
+@dataclass
+class MoveOp(Operation):
+    """
+    Rotation around the z axis through center
+    """
+    kind: ClassVar[str] = 'move'
+    entities: list
+    angle: float
+    center: Point
+    name: str = ''
+
+@dataclass
+class MirrorOp(Operation):
+    kind: ClassVar[str] = 'mirror'
+    entities: list
+    plane: Any
+    name: str = ''
+
+@dataclass
+class LoftOp(Operation):
+    kind: ClassVar[str] = 'loft'
+    sections: list
+    operation: str = OPERATION_NEW_BODY
+    name: str = ''
+    bodyName: str = ''
+
+@dataclass
+class NameOp(Operation):
+    kind: ClassVar[str] = 'name'
+    target: Ref
+    name: str
+
+def referencedOps(value) -> set[int]:
+    """
+    Ids of every operation value refers to, through selectors, entities and lists
+    """
+    found: set[int] = set()
+    def visit(item):
+        if isinstance(item, Ref):
+            found.add(item.op)
+        elif isinstance(item, (list, tuple)):
+            for child in item:
+                visit(child)
+        elif is_dataclass(item) and not isinstance(item, type):
+            for itemField in fields(item):
+                visit(getattr(item, itemField.name))
+    visit(value)
+    return found
+
+def resolveRefs(aliases: dict[int, list[Ref]], refs) -> list[Ref]:
+    """
+    Refs standing for a Ref or a list of Refs taken while planning, after optimizer passes moved their outputs
+    """
+    if isinstance(refs, Ref):
+        refs = [refs]
+    resolved: list[Ref] = []
+    for ref in refs:
+        alias = aliases.get(ref.op)
+        if alias is None:
+            resolved.append(ref)
+        elif ref.index is None:
+            resolved.extend(alias)
+        else:
+            resolved.append(alias[ref.index])
+    return resolved
+
+def usesAllBodies(operation: Operation) -> bool:
+    return isinstance(operation, ExtrudeOp) and operation.participants == ALL_BODIES
+
+@dataclass
+class Stage:
+    name: str
+    parent: Any = None
+    args: dict = field(default_factory=dict)
+
+class PendingBoolean():
+    def __init__(self, operation: str, target: Ref, tools: list[Ref], stage: int):
+        self.operation = operation
+        self.target = target
+        self.tools = tools
+        self.stage = stage
+        self.requests = 1
+
+class BooleanQueue():
+    """
+    Collects cut and join requests and adds them to the graph on flush, requests on the same target and
+    operation go into one combine as long as nothing in between depends on their order. The graph flushes
+    before any operation that refers to a queued target or tool, combines keep the stage of their first request
+    """
+    def __init__(self, graph: 'OperationGraph'):
+        self.graph = graph
+        self.requested = 0
+        self.issued = 0
+        self._pending: list[PendingBoolean] = []
+
+    @property
+    def saved(self) -> int:
+        return self.requested - self.issued
+
+    def cut(self, target: Ref, tools: list[Ref]):
+        self._queue(OPERATION_CUT, target, tools)
+
+    def join(self, target: Ref, tools: list[Ref]):
+        self._queue(OPERATION_JOIN, target, tools)
+
+    def touches(self, opIds: set[int]) -> bool:
+        return any(pending.target.op in opIds or any(tool.op in opIds for tool in pending.tools) for pending in self._pending)
+
+    def _queue(self, operation: str, target: Ref, tools: list[Ref]):
+        tools = list(tools)
+        if len(tools) == 0:
+            return
+        self.requested += 1
+        for pending in reversed(self._pending):
+            if pending.target == target:
+                if pending.operation == operation:
+                    # (A - B) - C == A - (B + C), (A + B) + C == A + (B + C)
+                    pending.tools.extend(tools)
+                    pending.requests += 1
+                    return
+                break
+            # a later request consumes the target or changes one of the tools, keep the order from here
+            if target.op in referencedOps(pending.tools) or pending.target.op in referencedOps(tools):
+                break
+        self._pending.append(PendingBoolean(operation, target, tools, self.graph.currentStage))
+
+    def flush(self) -> list[Ref]:
+        """
+        Adds the queued booleans to the graph in request order, one combine per merged request
+        """
+        pending, self._pending = self._pending, []
+        self.issued += len(pending)
+        return [self.graph.add(CombineOp(item.target, item.tools, item.operation), stage=item.stage) for item in pending]
+
+class OperationGraph():
+    def __init__(self, name: str = ''):
+        self.name = name
+        self.operations: list[Operation] = []
+        self.stages: list[Stage] = []
+        self.booleans = BooleanQueue(self)
+        # outputs of operations rewritten by optimizer passes, by operation id, see resolve
+        self.aliases: dict[int, list[Ref]] = {}
+        # refs callers read after execution by name, kept with the plan when it is saved
+        self.outputs: dict[str, Ref] = {}
+        self._nextId = 0
+        self._stageStack: list[int] = []
+        self._optionalDepth = 0
+
+    @property
+    def currentStage(self) -> Any:
+        return self._stageStack[-1] if len(self._stageStack) > 0 else None
+
+    @contextmanager
+    def stage(self, name: str, **args):
+        self.stages.append(Stage(name, self.currentStage, args))
+        self._stageStack.append(len(self.stages) - 1)
+        try:
+            yield
+        finally:
+            self._stageStack.pop()
+
+    @contextmanager
+    def optional(self):
+        """
+        Operations added here are logged and skipped when they fail, later references to their bodies are dropped
+        """
+        self._optionalDepth += 1
+        try:
+            yield
+        finally:
+            self._optionalDepth -= 1
+
+    def stagePath(self, stage: Any) -> list[int]:
+        path: list[int] = []
+        while stage is not None:
+            path.append(stage)
+            stage = self.stages[stage].parent
+        return list(reversed(path))
+
+    def add(self, operation: Operation, stage: Any = -1) -> Ref:
+        if self.booleans.touches(referencedOps(operation)) or usesAllBodies(operation):
+            self.booleans.flush()
+        operation.id = self._nextId
+        self._nextId += 1
+        operation.stage = self.currentStage if stage == -1 else stage
+        operation.isOptional = self._optionalDepth > 0
+        self.operations.append(operation)
+        return Ref(operation.id)
+
+    def resolve(self, refs) -> list[Ref]:
+        return resolveRefs(self.aliases, refs)
+
+    def flushBooleans(self) -> list[Ref]:
+        return self.booleans.flush()
+
+    def countByKind(self) -> Counter:
+        return Counter(operation.kind for operation in self.operations)
+
+    # shorthands for the common operations
+
+    def constructionPlane(self, base, offset: float, name: str = '', isVisible: bool = True) -> Ref:
+        return self.add(ConstructionPlaneOp(base, offset, name, isVisible))
+
+    def sketch(self, plane, entities: list, name: str = '') -> Ref:
+        return self.add(SketchOp(plane, list(entities), name))
+
+    def extrude(self, profile, distance: float, **options) -> Ref:
+        return self.add(ExtrudeOp(profile, distance, **options))
+
+    def fillet(self, edges: list, radius: float, **options) -> Ref:
+        return self.add(FilletOp(list(edges), radius, **options))
+
+    def chamfer(self, edges: list, distance: float, **options) -> Ref:
+        return self.add(ChamferOp(list(edges), distance, **options))
+
+    def rectangularPattern(self, entities: list[Ref], quantities: tuple[int, int], distances: tuple[float, float], **options) -> Ref:
+        return self.add(RectangularPatternOp(list(entities), quantities, distances, **options))
+
+    def combine(self, target: Ref, tools: list[Ref], operation: str, **options) -> Ref:
+        """
+        Combine added right away, use booleans for cuts and joins that can be merged
+        """
+        return self.add(CombineOp(target, list(tools), operation, **options))
+
+    def nameBody(self, body: Ref, name: str) -> Ref:
+        return self.add(NameOp(body, name))
@@ -0,0 +1,212 @@
+import difflib
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+
+from . import operationGraph as og
+from . import traceUtils
+
+# Operation graphs saved as JSON plans. A plan file holds every operation with its stage, the aliases
+# and named outputs of the graph and the parameters it was planned from, so it can be replayed on any
+# executor, diffed against a plan of another release or shared to reproduce a generation exactly.
+# Dataclasses are written as objects with their class name under 'type', tuples as {'tuple': [...]}
+# since planned values tell points from lists by their type. Floats round trip exactly.
+
+PLAN_FORMAT_VERSION = 1
+PLAN_CACHE_VERSION = 1 # bump when the generators change their plans
+PLAN_CACHE_ENTRIES = 32
+PLAN_SAVE_ENABLED = True
+PLAN_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'plans')
+PLAN_MAX_FILES = 20
+
+_TYPES = {name: value for name, value in vars(og).items() if isinstance(value, type) and is_dataclass(value)}
+
+def _encode(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return {'tuple': [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if is_dataclass(value) and type(value).__name__ in _TYPES:
+        encoded = {'type': type(value).__name__}
+        for valueField in fields(value):
+            encoded[valueField.name] = _encode(getattr(value, valueField.name))
+        return encoded
+    raise TypeError('Unsupported plan value type {}'.format(type(value).__name__))
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if 'tuple' in value:
+        return tuple(_decode(item) for item in value['tuple'])
+    valueType = _TYPES.get(value.get('type'))
+    if valueType is None:
+        raise ValueError('Unknown plan value type {}'.format(value.get('type')))
+    return valueType(**{key: _decode(item) for key, item in value.items() if key != 'type'})
+
+def toDict(graph: og.OperationGraph, parameters: dict = None) -> dict:
+    """
+    Plan of graph as plain JSON values, queued booleans are flushed first
+    """
+    graph.flushBooleans()
+    return {
+        'version': PLAN_FORMAT_VERSION,
+        'name': graph.name,
+        'parameters': parameters,
+        'stages': [
+            {'name': stage.name, 'parent': stage.parent, 'args': {key: _encode(item) for key, item in stage.args.items()}}
+            for stage in graph.stages
+        ],
+        'operations': [
+            {'id': operation.id, 'stage': operation.stage, 'isOptional': operation.isOptional, 'operation': _encode(operation)}
+            for operation in graph.operations
+        ],
+        'aliases': {str(op): _encode(refs) for op, refs in graph.aliases.items()},
+        'outputs': {name: _encode(ref) for name, ref in graph.outputs.items()},
+        'nextId': graph._nextId,
+    }
+
+def fromDict(data: dict) -> og.OperationGraph:
+    """
+    Graph of a plan written by toDict, raises ValueError for plans of another format version
+    """
+    if data.get('version') != PLAN_FORMAT_VERSION:
+        raise ValueError('Unsupported plan format version {}, expected {}'.format(data.get('version'), PLAN_FORMAT_VERSION))
+    graph = og.OperationGraph(data['name'])
+    graph.stages = [og.Stage(stage['name'], stage['parent'], {key: _decode(item) for key, item in stage['args'].items()}) for stage in data['stages']]
+    for item in data['operations']:
+        operation = _decode(item['operation'])
+        operation.id = item['id']
+        operation.stage = item['stage']
+        operation.isOptional = item['isOptional']
+        graph.operations.append(operation)
+    graph.aliases = {int(op): _decode(refs) for op, refs in data['aliases'].items()}
+    graph.outputs = {name: _decode(ref) for name, ref in data['outputs'].items()}
+    graph._nextId = data['nextId']
+    return graph
+
+def dumps(graph: og.OperationGraph, parameters: dict = None) -> str:
+    return json.dumps(toDict(graph, parameters), separators=(',', ':'))
+
+def loads(text: str) -> og.OperationGraph:
+    return fromDict(json.loads(text))
+
+def writePlan(path: str, graph: og.OperationGraph, parameters: dict = None):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(toDict(graph, parameters), file, separators=(',', ':'))
+
+def readPlan(path: str) -> tuple[og.OperationGraph, dict]:
+    """
+    Graph and parameters of a plan file
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    return fromDict(data), data.get('parameters')
+
+def savePlan(graph: og.OperationGraph, parameters: dict = None, directory: str = PLAN_DIRECTORY) -> str:
+    """
+    Writes the plan to the plans folder next to the add-in and keeps the newest PLAN_MAX_FILES,
+    returns its path or '' when saving is disabled. Raises OSError when the folder is not writable
+    """
+    if not PLAN_SAVE_ENABLED:
+        return ''
+    path = traceUtils.tracePath(graph.name or 'plan', directory)
+    writePlan(path, graph, parameters)
+    traceUtils.pruneTraces(directory, PLAN_MAX_FILES)
+    return path
+
+def _describe(value, positions: dict[int, int], position: int) -> str:
+    # refs are written relative to the operation, so inserting an operation only changes the lines that span it
+    if isinstance(value, og.Ref):
+        target = '@{}'.format(positions[value.op] - position) if value.op in positions else '@?{}'.format(value.op)
+        return target if value.index is None else '{}[{}]'.format(target, value.index)
+    if isinstance(value, (list, tuple)):
+        return '[{}]'.format(', '.join(_describe(item, positions, position) for item in value))
+    if is_dataclass(value):
+        return '{}({})'.format(
+            type(value).__name__,
+            ', '.join('{}={}'.format(valueField.name, _describe(getattr(value, valueField.name), positions, position)) for valueField in fields(value)),
+        )
+    return repr(value)
+
+def planLines(graph: og.OperationGraph) -> list[str]:
+    """
+    One line per operation with its stage path, for diffs
+    """
+    graph.flushBooleans()
+    positions = {operation.id: position for position, operation in enumerate(graph.operations)}
+    lines = []
+    for position, operation in enumerate(graph.operations):
+        stagePath = ' / '.join(graph.stages[index].name for index in graph.stagePath(operation.stage))
+        optional = ' optional' if operation.isOptional else ''
+        lines.append('{}{} | {}'.format(stagePath, optional, _describe(operation, positions, position)))
+    return lines
+
+def diffPlans(before: og.OperationGraph, after: og.OperationGraph, context: int = 3) -> list[str]:
+    """
+    Unified diff of the operations of two plans, empty when they are the same
+    """
+    return list(difflib.unified_diff(
+        planLines(before),
+        planLines(after),
+        fromfile=before.name or 'before',
+        tofile=after.name or 'after',
+        n=context,
+        lineterm='',
+    ))
+
+def planKey(parameters: dict) -> str:
+    """
+    Hash of everything a plan depends on, parameters must be plain JSON values
+    """
+    payload = json.dumps({'version': PLAN_CACHE_VERSION, 'parameters': parameters}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class PlanCache():
+    """
+    Small LRU of serialized plans by planKey, every get decodes a fresh graph so executors never share operations
+    """
+    def __init__(self, maxEntries: int = PLAN_CACHE_ENTRIES):
+        self.maxEntries = maxEntries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> og.OperationGraph:
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fromDict(data)
+
+    def put(self, key: str, graph: og.OperationGraph):
+        self._entries[key] = toDict(graph)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def getOrCreate(self, key: str, factory) -> og.OperationGraph:
+        """
+        Cached plan for key, planned by factory on a miss. The graph returned is always the decoded plan
+        """
+        graph = self.get(key)
+        if graph is None:
+            self.put(key, factory())
+            graph = fromDict(self._entries[key])
+        return graph
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,151 @@
+import threading
+from typing import Callable
+
+import adsk.core
+
+from ...lib import fusion360utils as futil
+from . import operationGraph as og
+from .planSerializer import PlanCache
+
+# Plans the item of the dialog on a worker thread while it is being edited, so OK only has to execute
+# a ready plan. Planners are pure, a factory gets the dialog values read on the main thread and a log
+# callback, the worker only runs factories and fires a custom event. Finished plans, their log lines
+# and planning errors are handed over to the plan cache on the main thread. Only the newest request
+# is kept, a plan still running for older values is finished and cached but nobody waits for it.
+
+# OK waits this long for a plan of the same values that is still running, then plans by itself
+PLAN_WAIT_SECONDS = 10
+
+app = adsk.core.Application.get()
+
+PlanFactory = Callable[[Callable[[str], None]], og.OperationGraph]
+
+class PlanWorker():
+    def __init__(self, eventId: str, planCache: PlanCache):
+        self.eventId = eventId
+        self.planCache = planCache
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+        self._requested: tuple[str, PlanFactory] = None
+        self._runningKey: str = None
+        self._results: dict[str, tuple[og.OperationGraph, Exception, list[str]]] = {}
+        self._errors: dict[str, str] = {}
+        self._isStopped = False
+        self._onReady: Callable[[str], None] = None
+        self._event: adsk.core.CustomEvent = None
+        self._handlers = []
+
+    @property
+    def isPlanning(self) -> bool:
+        with self._condition:
+            return self._requested is not None or self._runningKey is not None
+
+    def register(self, onReady: Callable[[str], None] = None):
+        """
+        onReady runs on the main thread with the plan key whenever a plan finished or failed
+        """
+        self._onReady = onReady
+        with self._condition:
+            self._isStopped = False
+        if self._event is not None:
+            return
+        self._event = app.registerCustomEvent(self.eventId)
+        futil.add_handler(self._event, self._onPlanned, local_handlers=self._handlers)
+
+    def unregister(self):
+        # a running plan is left to finish, its result is dropped
+        with self._condition:
+            self._isStopped = True
+            self._requested = None
+            self._results.clear()
+            self._condition.notify_all()
+        self._errors.clear()
+        self._onReady = None
+        if self._event is None:
+            return
+        for handler in self._handlers:
+            self._event.remove(handler)
+        app.unregisterCustomEvent(self.eventId)
+        self._event = None
+        self._handlers = []
+
+    def request(self, key: str, factory: PlanFactory):
+        """
+        Plans key on the worker unless it is cached, failed or already being planned
+        """
+        if key in self.planCache or key in self._errors:
+            return
+        with self._condition:
+            if self._isStopped or key == self._runningKey or key in self._results:
+                return
+            self._requested = (key, factory)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.eventId, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def errorOf(self, key: str) -> str:
+        """
+        Message of the error planning key on the worker raised, empty while it is planned or when it succeeded
+        """
+        self._collect()
+        return self._errors.get(key, '')
+
+    def getOrCreate(self, key: str, factory: PlanFactory) -> og.OperationGraph:
+        """
+        Plan for key from the cache or the worker, planned right here when neither has it.
+        Failed plans are planned again here so their error reaches the caller
+        """
+        with self._condition:
+            if self._requested is not None and self._requested[0] == key:
+                # not started yet, planning here is quicker than waiting for the thread
+                self._requested = None
+            if not self._condition.wait_for(lambda: self._runningKey != key, PLAN_WAIT_SECONDS):
+                futil.log(f'Plan {key[:8]} still running after {PLAN_WAIT_SECONDS}s, planning again')
+        self._collect()
+        self._errors.pop(key, None)
+        return self.planCache.getOrCreate(key, lambda: factory(futil.log))
+
+    def _run(self):
+        # worker thread, runs factories and fires the event, no other Fusion API calls
+        while True:
+            with self._condition:
+                if self._requested is None or self._isStopped:
+                    self._thread = None
+                    return
+                key, factory = self._requested
+                self._requested = None
+                self._runningKey = key
+            messages = []
+            graph, error = None, None
+            try:
+                graph = factory(messages.append)
+            except Exception as err:
+                error = err
+            with self._condition:
+                self._runningKey = None
+                isStopped = self._isStopped
+                if not isStopped:
+                    self._results[key] = (graph, error, messages)
+                self._condition.notify_all()
+            if not isStopped:
+                app.fireCustomEvent(self.eventId, key)
+
+    def _collect(self):
+        # main thread, moves finished plans into the cache
+        with self._condition:
+            results = self._results
+            self._results = {}
+        for key, (graph, error, messages) in results.items():
+            for message in messages:
+                futil.log(message)
+            if error is None:
+                self.planCache.put(key, graph)
+            else:
+                self._errors[key] = str(error)
+                futil.log(f'Plan {key[:8]} failed, {error}')
+
+    def _onPlanned(self, args: adsk.core.CustomEventArgs):
+        self._collect()
+        if self._onReady is not None:
+            self._onReady(args.additionalInfo)
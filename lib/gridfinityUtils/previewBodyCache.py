@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import adsk.core, adsk.fusion
+
+# Feature based previews are rolled back by Fusion before every new preview, so flipping an option
+# back and forth rebuilds every feature each time. Finished previews are kept as temporary BRep
+# copies by preview key, a repeated configuration is restored into a new component with one base
+# feature instead.
+
+PREVIEW_BODY_CACHE_ENTRIES = 8
+
+@dataclass
+class CachedPreview:
+    componentName: str
+    bodies: list[tuple[str, adsk.fusion.BRepBody]]
+
+class PreviewBodyCache():
+    def __init__(self, entries: int = PREVIEW_BODY_CACHE_ENTRIES):
+        self.entries = entries
+        self._previews: OrderedDict[str, CachedPreview] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._previews
+
+    def remember(self, key: str, component: adsk.fusion.Component):
+        """
+        Keeps copies of the component bodies, the component itself goes away with the preview
+        """
+        tempBrepMgr = adsk.fusion.TemporaryBRepManager.get()
+        bodies = [(body.name, tempBrepMgr.copy(body)) for body in component.bRepBodies]
+        self._previews[key] = CachedPreview(component.name, bodies)
+        self._previews.move_to_end(key)
+        while len(self._previews) > self.entries:
+            self._previews.popitem(last=False)
+
+    def restore(self, key: str) -> bool:
+        """
+        Inserts the cached bodies for key into a new component, False when nothing is cached
+        """
+        preview = self._previews.get(key)
+        if preview is None:
+            return False
+        self._previews.move_to_end(key)
+        design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+        occurrence = design.rootComponent.occurrences.addNewComponent(adsk.core.Matrix3D.create())
+        component = occurrence.component
+        component.name = preview.componentName
+        occurrence.activate()
+        tempBrepMgr = adsk.fusion.TemporaryBRepManager.get()
+        baseFeature = None
+        if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+            baseFeature = component.features.baseFeatures.add()
+            baseFeature.startEdit()
+        for name, body in preview.bodies:
+            # inserting consumes the body, the cache keeps its own copy
+            if baseFeature is None:
+                insertedBody = component.bRepBodies.add(tempBrepMgr.copy(body))
+            else:
+                insertedBody = component.bRepBodies.add(tempBrepMgr.copy(body), baseFeature)
+            insertedBody.name = name
+        if baseFeature is not None:
+            baseFeature.finishEdit()
+        return True
+
+    def clear(self):
+        self._previews.clear()
@@ -0,0 +1,101 @@
+import threading
+from typing import Callable
+
+import adsk.core, adsk.fusion
+
+from ...lib import fusion360utils as futil
+from . import meshCache
+
+# Coalesces bursts of dialog changes into one preview. Every preview request carries the hash of
+# the parameters it would build, the preview only runs once the same hash has been requested for
+# a quiet period. Timers run on their own thread and hand back to the main thread with a custom
+# event, requests whose hash changed meanwhile are dropped there.
+
+PREVIEW_QUIET_SECONDS = 0.35
+
+app = adsk.core.Application.get()
+
+class PreviewScheduler():
+    def __init__(self, eventId: str, quietSeconds: float = PREVIEW_QUIET_SECONDS):
+        self.eventId = eventId
+        self.quietSeconds = quietSeconds
+        self._lock = threading.Lock()
+        self._timer: threading.Timer = None
+        self._pendingKey: str = None
+        self._dueKey: str = None
+        self._onDue: Callable[[], None] = None
+        self._event: adsk.core.CustomEvent = None
+        self._handlers = []
+
+    @property
+    def isPending(self) -> bool:
+        with self._lock:
+            return self._pendingKey is not None
+
+    def register(self, onDue: Callable[[], None]):
+        """
+        onDue runs on the main thread once a request settled, usually command.doExecutePreview
+        """
+        self._onDue = onDue
+        if self._event is not None:
+            return
+        self._event = app.registerCustomEvent(self.eventId)
+        futil.add_handler(self._event, self._onQuiet, local_handlers=self._handlers)
+
+    def unregister(self):
+        self.cancel()
+        self._onDue = None
+        if self._event is None:
+            return
+        for handler in self._handlers:
+            self._event.remove(handler)
+        app.unregisterCustomEvent(self.eventId)
+        self._event = None
+        self._handlers = []
+
+    def isDue(self, key: str) -> bool:
+        """
+        True when key has settled and the preview should be built now, otherwise it is (re)scheduled
+        """
+        with self._lock:
+            if key == self._dueKey:
+                self._dueKey = None
+                self._pendingKey = None
+                return True
+            self._dueKey = None
+            self._pendingKey = key
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.quietSeconds, self._onTimer, args=(key,))
+            self._timer.daemon = True
+            self._timer.start()
+        return False
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._pendingKey = None
+            self._dueKey = None
+
+    def _onTimer(self, key: str):
+        # timer thread, no Fusion API calls other than firing the event
+        with self._lock:
+            if key != self._pendingKey:
+                return
+        app.fireCustomEvent(self.eventId, key)
+
+    def _onQuiet(self, args: adsk.core.CustomEventArgs):
+        with self._lock:
+            if args.additionalInfo != self._pendingKey:
+                return
+            self._dueKey = self._pendingKey
+        if self._onDue is not None:
+            self._onDue()
+
+def previewKey(spec: dict, previewMode: str) -> str:
+    """
+    Hash of everything a preview depends on
+    """
+    return meshCache.cacheKey({'previewMode': previewMode, 'spec': spec})
@@ -2,6 +2,7 @@ import adsk.core, adsk.fusion, traceback
 import os
 
 from . import extrudeUtils, sketchUtils
+from . import operationGraph as og
 
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -19,38 +20,10 @@ def simpleCylinder(
     baseConstructionPlane = targetComponent.constructionPlanes.add(baseConstructionPlaneInput)
     cylinderBaseSketch: adsk.fusion.Sketch = targetComponent.sketches.add(baseConstructionPlane)
     cylinderBaseSketch.name = "Simple cylinder sketch"
-    dimensions: adsk.fusion.SketchDimensions = cylinderBaseSketch.sketchDimensions
-    constraints: adsk.fusion.GeometricConstraints = cylinderBaseSketch.geometricConstraints
     centerOnSketch = cylinderBaseSketch.modelToSketchSpace(centerBottom)
     centerOnSketch.z = 0
+    sketchUtils.createCircle(radius, centerOnSketch, cylinderBaseSketch)
 
-    circle = cylinderBaseSketch.sketchCurves.sketchCircles.addByCenterRadius(
-        centerOnSketch,
-        radius,
-    )
-    dimensions.addDiameterDimension(
-        circle,
-        adsk.core.Point3D.create(circle.centerSketchPoint.geometry.x + 1, circle.centerSketchPoint.geometry.y + 1, 0),
-        True,
-    )
-    if centerOnSketch.isEqualTo(cylinderBaseSketch.originPoint.geometry):
-        constraints.addCoincident(cylinderBaseSketch.originPoint, circle.centerSketchPoint)
-    else:
-        dimensions.addDistanceDimension(
-            cylinderBaseSketch.originPoint,
-            circle.centerSketchPoint,
-            adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
-            adsk.core.Point3D.create(circle.centerSketchPoint.geometry.x, 0, 0),
-            True
-        )
-        dimensions.addDistanceDimension(
-            cylinderBaseSketch.originPoint,
-            circle.centerSketchPoint,
-            adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
-            adsk.core.Point3D.create(0, circle.centerSketchPoint.geometry.y, 0),
-            True
-        )
-    
     cylinderExtrude = extrudeUtils.simpleDistanceExtrude(
         cylinderBaseSketch.profiles.item(0),
         adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
@@ -91,4 +64,37 @@ def simpleBox(
         adsk.core.ValueInput.createByReal(height),
         adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
     extrude.name = "Simple box extrude"
-    return extrude.bodies.item(0)
\ No newline at end of file
+    return extrude.bodies.item(0)
+
+def planCylinder(
+    plane,
+    planeOffset: float,
+    height: float,
+    radius: float,
+    centerBottom: og.Point,
+    graph: og.OperationGraph,
+    bodyName: str = '',
+) -> og.Ref:
+    """
+    simpleCylinder as graph operations, returns the cylinder body
+    """
+    baseConstructionPlane = graph.constructionPlane(plane, planeOffset)
+    cylinderBaseSketch = graph.sketch(baseConstructionPlane, [og.Circle(og.point(centerBottom), radius)], name="Simple cylinder sketch")
+    return graph.extrude(og.Profile(cylinderBaseSketch), height, name="Simple cylinder extrude", bodyName=bodyName).body(0)
+
+def planBox(
+    plane,
+    planeOffset: float,
+    width: float,
+    length: float,
+    height: float,
+    originPoint: og.Point,
+    graph: og.OperationGraph,
+    bodyName: str = '',
+) -> og.Ref:
+    """
+    simpleBox as graph operations, returns the box body
+    """
+    boxConstructionPlane = graph.constructionPlane(plane, planeOffset)
+    recSketch = graph.sketch(boxConstructionPlane, [og.Rectangle(width, length, og.point(originPoint), og.POINT_MODEL_FLAT)], name="Simple box sketch")
+    return graph.extrude(og.Profile(recSketch), height, extent=og.EXTENT_SIMPLE, name="Simple box extrude", bodyName=bodyName).body(0)
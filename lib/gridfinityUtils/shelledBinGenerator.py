@@ -0,0 +1,84 @@
+import adsk.core, adsk.fusion, traceback
+
+from . import const, combineUtils, commonUtils, faceUtils, geometryUtils, shellUtils
+from .baseGeneratorInput import BaseGeneratorInput
+from .binBodyGeneratorInput import BinBodyGeneratorInput
+from .binBodyTabGeneratorInput import BinBodyTabGeneratorInput
+from .binBodyTabGenerator import createGridfinityBinBodyTab
+
+# Shelled bins are planned as solid bins, the shell and the label tab are added to the generated body.
+# The create bin command and the fake adsk harness both go through here
+
+def applyShelledBinType(baseGeneratorInput: BaseGeneratorInput, binBodyInput: BinBodyGeneratorInput):
+    """
+    Turns the inputs of a shelled bin into the solid bin it starts from, the shell leaves no room for screw holes and magnet cutouts
+    """
+    binBodyInput.isSolid = True
+    baseGeneratorInput.hasScrewHoles = False
+    baseGeneratorInput.hasMagnetCutouts = False
+    baseGeneratorInput.hasMagnetCutoutsTabs = False
+
+def createShelledTabInput(binBodyInput: BinBodyGeneratorInput) -> BinBodyTabGeneratorInput:
+    compartmentTabInput = BinBodyTabGeneratorInput()
+    compartmentTabInput.origin = adsk.core.Point3D.create(
+        binBodyInput.wallThickness + max(0, min(binBodyInput.tabPosition, binBodyInput.binWidth - binBodyInput.tabLength)) * binBodyInput.baseWidth,
+        const.BIN_LIP_WALL_THICKNESS if binBodyInput.hasLip and binBodyInput.hasScoop else binBodyInput.wallThickness + binBodyInput.binLength * binBodyInput.baseLength - binBodyInput.wallThickness - binBodyInput.xyClearance * 2,
+        (binBodyInput.binHeight - 1) * binBodyInput.heightUnit + max(0, binBodyInput.heightUnit - const.BIN_BASE_HEIGHT),
+    )
+    compartmentTabInput.length = max(0, min(binBodyInput.tabLength, binBodyInput.binWidth)) * binBodyInput.baseWidth - binBodyInput.wallThickness * 2 - binBodyInput.xyClearance * 2
+    compartmentTabInput.width = binBodyInput.tabWidth
+    compartmentTabInput.overhangAngle = binBodyInput.tabOverhangAngle
+    compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
+    return compartmentTabInput
+
+def shellGridfinityBin(
+    binBody: adsk.fusion.BRepBody,
+    binBodyInput: BinBodyGeneratorInput,
+    hasTab: bool,
+    targetComponent: adsk.fusion.Component,
+) -> adsk.fusion.BRepBody:
+    """
+    Shells the solid bin body through its top, the lip is split off first so it stays solid. Returns the shelled bin body
+    """
+    features = targetComponent.features
+    combineFeatures = features.combineFeatures
+    shellThickness = binBodyInput.wallThickness - binBodyInput.xyClearance
+
+    # face.boundingBox.maxPoint.z ~ face.boundingBox.minPoint.z => face horizontal
+    # largest horizontal face
+    horizontalFaces = [face for face in binBody.faces if geometryUtils.isHorizontal(face)]
+    topFace = faceUtils.maxByArea(horizontalFaces)
+    if binBodyInput.hasLip:
+        splitBodyFeatures = features.splitBodyFeatures
+        splitBodyInput = splitBodyFeatures.createInput(
+            binBody,
+            topFace,
+            True
+        )
+        splitBodies = splitBodyFeatures.add(splitBodyInput)
+        bottomBody = min(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
+        topBody = max(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
+        horizontalFaces = [face for face in bottomBody.faces if geometryUtils.isHorizontal(face)]
+        topFace = faceUtils.maxByArea(horizontalFaces)
+        shellUtils.simpleShell([topFace], shellThickness, targetComponent)
+        toolBodies = adsk.core.ObjectCollection.create()
+        toolBodies.add(topBody)
+        combineAfterShellFeatureInput = combineFeatures.createInput(bottomBody, toolBodies)
+        combineFeatures.add(combineAfterShellFeatureInput)
+        binBody = targetComponent.bRepBodies.item(0)
+    else:
+        shellUtils.simpleShell([topFace], shellThickness, targetComponent)
+
+    if hasTab:
+        tabBody = createGridfinityBinBodyTab(createShelledTabInput(binBodyInput), targetComponent)
+        combineInput = combineFeatures.createInput(tabBody, commonUtils.objectCollectionFromList([binBody]))
+        combineInput.operation = adsk.fusion.FeatureOperations.CutFeatureOperation
+        combineInput.isKeepToolBodies = True
+        combineFeature = combineFeatures.add(combineInput)
+        tabBodies = [body for body in combineFeature.bodies if body.faces != binBody.faces]
+        tabMainBody = max([body for body in tabBodies], key=lambda x: x.edges.count)
+        bodiesToRemove = [body for body in tabBodies if body is not tabMainBody]
+        for body in bodiesToRemove:
+            features.removeFeatures.add(body)
+        combineUtils.joinBodies(binBody, commonUtils.objectCollectionFromList([tabMainBody]), targetComponent)
+    return binBody
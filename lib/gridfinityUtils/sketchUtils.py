@@ -2,7 +2,7 @@ import math
 import adsk.core, adsk.fusion, traceback
 import os
 
-from . import const
+from . import const, commonUtils, geometryUtils
 
 def isVertical(line: adsk.fusion.SketchLine):
     return math.isclose(line.startSketchPoint.geometry.x, line.endSketchPoint.geometry.x, abs_tol=const.DEFAULT_FILTER_TOLERANCE)
@@ -88,3 +88,324 @@ def createOffsetProfileSketch(
 def convertToConstruction(curves: adsk.fusion.SketchCurves):
     for curve in curves:
         curve.isConstruction = True
+
+def createCircle(
+    radius: float,
+    center: adsk.core.Point3D,
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    Circle with its diameter and position dimensioned, center in sketch space
+    """
+    dimensions: adsk.fusion.SketchDimensions = sketch.sketchDimensions
+    constraints: adsk.fusion.GeometricConstraints = sketch.geometricConstraints
+    circle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
+        center,
+        radius,
+    )
+    dimensions.addDiameterDimension(
+        circle,
+        adsk.core.Point3D.create(circle.centerSketchPoint.geometry.x + 1, circle.centerSketchPoint.geometry.y + 1, 0),
+        True,
+    )
+    if center.isEqualTo(sketch.originPoint.geometry):
+        constraints.addCoincident(sketch.originPoint, circle.centerSketchPoint)
+    else:
+        dimensions.addDistanceDimension(
+            sketch.originPoint,
+            circle.centerSketchPoint,
+            adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
+            adsk.core.Point3D.create(circle.centerSketchPoint.geometry.x, 0, 0),
+            True
+        )
+        dimensions.addDistanceDimension(
+            sketch.originPoint,
+            circle.centerSketchPoint,
+            adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
+            adsk.core.Point3D.create(0, circle.centerSketchPoint.geometry.y, 0),
+            True
+        )
+    return circle
+
+def createCircleAtPoint(
+    radius: float,
+    circleCenterPoint: adsk.core.Point3D,
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    Circle dimensioned from the sketch origin, center in model space. Existing curves become construction geometry
+    """
+    circleCenterOnSketch = sketch.modelToSketchSpace(circleCenterPoint)
+    dimensions: adsk.fusion.SketchDimensions = sketch.sketchDimensions
+    convertToConstruction(sketch.sketchCurves)
+    circle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
+        adsk.core.Point3D.create(circleCenterOnSketch.x, circleCenterOnSketch.y, 0),
+        radius,
+    )
+    dimensions.addDiameterDimension(
+        circle,
+        adsk.core.Point3D.create(0, circle.centerSketchPoint.geometry.y * 2, 0),
+        True,
+    )
+    dimensions.addDistanceDimension(
+        sketch.originPoint,
+        circle.centerSketchPoint,
+        adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
+        adsk.core.Point3D.create(circle.centerSketchPoint.geometry.x, 0, 0),
+        True
+        )
+    dimensions.addDistanceDimension(
+        sketch.originPoint,
+        circle.centerSketchPoint,
+        adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
+        adsk.core.Point3D.create(0, circle.centerSketchPoint.geometry.y, 0),
+        True
+        )
+    return circle
+
+def createTabAtCircleEdge(
+    radius: float,
+    circleCenterPoint: adsk.core.Point3D,
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    createCircleAtPoint with a half radius circle on its edge at 45 degrees
+    """
+    circle = createCircleAtPoint(radius, circleCenterPoint, sketch)
+    circleCenterOnSketch = geometryUtils.pointToXY(sketch.modelToSketchSpace(circleCenterPoint))
+    angularPointOnSketch = geometryUtils.pointToXY(sketch.modelToSketchSpace(
+        adsk.core.Point3D.create(circleCenterPoint.x + radius, circleCenterPoint.y + radius, circleCenterPoint.z)
+    ))
+    dimensions: adsk.fusion.SketchDimensions = sketch.sketchDimensions
+    constraints: adsk.fusion.GeometricConstraints = sketch.geometricConstraints
+    convertToConstruction(sketch.sketchCurves)
+    verticalConstructionLine = sketch.sketchCurves.sketchLines.addByTwoPoints(
+        circleCenterOnSketch,
+        adsk.core.Point3D.create(circleCenterOnSketch.x, circleCenterOnSketch.y + radius, circleCenterOnSketch.z)
+    )
+    verticalConstructionLine.isConstruction = True
+    diagonalConstructionLine = sketch.sketchCurves.sketchLines.addByTwoPoints(
+        circleCenterOnSketch,
+        angularPointOnSketch,
+    )
+    diagonalConstructionLine.isConstruction = True
+    constraints.addVertical(verticalConstructionLine)
+    dimensions.addAngularDimension(
+        diagonalConstructionLine,
+        verticalConstructionLine,
+        angularPointOnSketch,
+    )
+    constraints.addCoincident(
+        verticalConstructionLine.startSketchPoint,
+        circle.centerSketchPoint,
+    )
+    constraints.addCoincident(
+        verticalConstructionLine.endSketchPoint,
+        circle,
+    )
+    constraints.addCoincident(
+        diagonalConstructionLine.startSketchPoint,
+        circle.centerSketchPoint,
+    )
+    constraints.addCoincident(
+        diagonalConstructionLine.endSketchPoint,
+        circle,
+    )
+    tabCircle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
+        diagonalConstructionLine.endSketchPoint,
+        radius / 2,
+    )
+    dimensions.addRadialDimension(
+        tabCircle,
+        circleCenterOnSketch,
+    )
+    return tabCircle
+
+def createSkeletonCutout(
+    radius: float,
+    circleCenterPoint: adsk.core.Point3D,
+    arcRadius: float,
+    cellCenterX: float,
+    cellCenterY: float,
+    sketch: adsk.fusion.Sketch,
+) -> adsk.fusion.SketchPoint:
+    """
+    Baseplate skeleton outline around the hole at circleCenterPoint reaching to the cell center, returns the cell center point
+    """
+    createCircleAtPoint(radius, circleCenterPoint, sketch)
+    convertToConstruction(sketch.sketchCurves)
+    sketchCurves = sketch.sketchCurves
+    dimensions = sketch.sketchDimensions
+    constraints = sketch.geometricConstraints
+    sketchLines = sketchCurves.sketchLines
+    screwHoleCircle = sketchCurves.sketchCircles.item(0)
+    arcStartingPoint = screwHoleCircle.centerSketchPoint.geometry.asVector()
+    arcStartingPoint.add(adsk.core.Vector3D.create(0, arcRadius, 0))
+    arc = sketchCurves.sketchArcs.addByCenterStartSweep(
+        screwHoleCircle.centerSketchPoint,
+        arcStartingPoint.asPoint(),
+        math.radians(90),
+    )
+
+    verticalEdgeLine = min([line for line in sketchLines if isVertical(line)], key=lambda x: abs(x.startSketchPoint.geometry.x))
+    horizontalEdgeLine = min([line for line in sketchLines if isHorizontal(line)], key=lambda x: abs(x.startSketchPoint.geometry.y))
+
+    line1 = sketchLines.addByTwoPoints(arc.startSketchPoint, adsk.core.Point3D.create(verticalEdgeLine.startSketchPoint.geometry.x, arc.startSketchPoint.geometry.y, 0))
+    line2 = sketchLines.addByTwoPoints(line1.endSketchPoint, adsk.core.Point3D.create(line1.endSketchPoint.geometry.x, cellCenterY, 0))
+    line3 = sketchLines.addByTwoPoints(line2.endSketchPoint, adsk.core.Point3D.create(-cellCenterX, cellCenterY, 0))
+    line4 = sketchLines.addByTwoPoints(line3.endSketchPoint, adsk.core.Point3D.create(line3.endSketchPoint.geometry.x, horizontalEdgeLine.startSketchPoint.geometry.y, 0))
+    line5 = sketchLines.addByTwoPoints(line4.endSketchPoint, adsk.core.Point3D.create(arc.endSketchPoint.geometry.x, line4.endSketchPoint.geometry.y, 0))
+    line6 = sketchLines.addByTwoPoints(line5.endSketchPoint, arc.endSketchPoint)
+
+    constraints.addCoincident(line1.endSketchPoint, verticalEdgeLine)
+    constraints.addCoincident(line6.startSketchPoint, horizontalEdgeLine)
+    constraints.addCoincident(screwHoleCircle.centerSketchPoint, arc.centerSketchPoint)
+    constraints.addHorizontal(line1)
+    constraints.addPerpendicular(line1, line2)
+    constraints.addPerpendicular(line2, line3)
+    constraints.addPerpendicular(line3, line4)
+    constraints.addPerpendicular(line4, line5)
+    constraints.addPerpendicular(line5, line6)
+    constraints.addTangent(arc, line1)
+    constraints.addEqual(line1, line6)
+    constraints.addEqual(line2, line5)
+    dimensions.addRadialDimension(arc, arc.endSketchPoint.geometry, True)
+    dimensions.addDistanceDimension(
+        arc.endSketchPoint,
+        line3.endSketchPoint,
+        adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
+        line2.endSketchPoint.geometry
+        )
+    return line3.endSketchPoint
+
+def createConnectionHole(
+    radius: float,
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    Circle centered between the two horizontal edges of the face the sketch is on
+    """
+    sketchCurves = sketch.sketchCurves
+    dimensions = sketch.sketchDimensions
+    constraints = sketch.geometricConstraints
+    convertToConstruction(sketchCurves)
+    [sketchHorizontalEdge1, sketchHorizontalEdge2] = [line for line in sketchCurves.sketchLines if isHorizontal(line)]
+    line1 = sketchCurves.sketchLines.addByTwoPoints(sketchHorizontalEdge1.startSketchPoint.geometry, sketchHorizontalEdge2.endSketchPoint.geometry)
+    line1.isConstruction = True
+    constraints.addMidPoint(line1.startSketchPoint, sketchHorizontalEdge1)
+    constraints.addMidPoint(line1.endSketchPoint, sketchHorizontalEdge2)
+
+    circle = sketchCurves.sketchCircles.addByCenterRadius(
+        sketch.originPoint.geometry,
+        radius
+    )
+    constraints.addMidPoint(circle.centerSketchPoint, line1)
+    dimensions.addRadialDimension(circle, line1.startSketchPoint.geometry, True)
+    return circle
+
+def createPolygon(
+    originPoint: adsk.core.Point3D,
+    offsets: list[tuple[float, float]],
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    Closed polyline through originPoint (model space) moved by each offset in sketch space
+    """
+    originInSketch = sketch.modelToSketchSpace(originPoint)
+    points = [adsk.core.Point3D.create(originInSketch.x + x, originInSketch.y + y, originInSketch.z) for x, y in offsets]
+    sketchLines = sketch.sketchCurves.sketchLines
+    return [sketchLines.addByTwoPoints(start, end) for start, end in zip(points, points[1:] + points[:1])]
+
+def createTabProfile(
+    originPoint: adsk.core.Point3D,
+    width: float,
+    height: float,
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    Label tab triangle on a plane parallel to YZ, top back corner at originPoint (model space)
+    """
+    tabSketchLine = sketch.sketchCurves.sketchLines
+    line1 = tabSketchLine.addByTwoPoints(
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(originPoint.x, originPoint.y, originPoint.z)),
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(originPoint.x, originPoint.y, originPoint.z - height)),
+    )
+    line2 = tabSketchLine.addByTwoPoints(
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(originPoint.x, originPoint.y, originPoint.z)),
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(originPoint.x, originPoint.y - width, originPoint.z)),
+    )
+    line3 = tabSketchLine.addByTwoPoints(
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(originPoint.x, originPoint.y, originPoint.z - height)),
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(originPoint.x, originPoint.y - width, originPoint.z)),
+    )
+
+    constraints: adsk.fusion.GeometricConstraints = sketch.geometricConstraints
+    dimensions: adsk.fusion.SketchDimensions = sketch.sketchDimensions
+
+    # horizontal/vertical relative to local sketch XY coordinates
+    constraints.addHorizontal(line1)
+    constraints.addVertical(line2)
+    constraints.addCoincident(line1.startSketchPoint, line2.startSketchPoint)
+    constraints.addCoincident(line2.endSketchPoint, line3.endSketchPoint)
+    constraints.addCoincident(line1.endSketchPoint, line3.startSketchPoint)
+
+    dimensions.addDistanceDimension(
+        sketch.originPoint,
+        line1.startSketchPoint,
+        adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
+        line1.startSketchPoint.geometry,
+        True
+        )
+
+    dimensions.addDistanceDimension(
+        sketch.originPoint,
+        line1.startSketchPoint,
+        adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
+        line1.startSketchPoint.geometry,
+        True
+        )
+
+    dimensions.addDistanceDimension(
+        line2.startSketchPoint,
+        line2.endSketchPoint,
+        adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
+        line2.endSketchPoint.geometry,
+        True
+        )
+
+    dimensions.addAngularDimension(
+        line1,
+        line3,
+        line1.endSketchPoint.geometry,
+        True,
+        )
+    return [line1, line2, line3]
+
+def createClearanceOutline(
+    width: float,
+    length: float,
+    startPoint: adsk.core.Point3D,
+    filletRadius: float,
+    offsetDirection: adsk.core.Point3D,
+    sketch: adsk.fusion.Sketch,
+):
+    """
+    Rectangle with filleted corners and its offset towards offsetDirection
+    """
+    innerRectangle = createRectangle(width, length, startPoint, sketch)
+    sketchArcs = sketch.sketchCurves.sketchArcs
+    geometricConstraints = sketch.geometricConstraints
+    sketchDimensions = sketch.sketchDimensions
+
+    [side1, side2, side3, side4] = list(innerRectangle)
+    fillet1 = sketchArcs.addFillet(side1, side1.endSketchPoint.geometry, side2, side2.startSketchPoint.geometry, filletRadius)
+    fillet2 = sketchArcs.addFillet(side2, side2.endSketchPoint.geometry, side3, side3.startSketchPoint.geometry, filletRadius)
+    fillet3 = sketchArcs.addFillet(side3, side3.endSketchPoint.geometry, side4, side4.startSketchPoint.geometry, filletRadius)
+    fillet4 = sketchArcs.addFillet(side4, side4.endSketchPoint.geometry, side1, side1.startSketchPoint.geometry, filletRadius)
+
+    geometricConstraints.addEqual(fillet1, fillet2)
+    geometricConstraints.addEqual(fillet2, fillet3)
+    geometricConstraints.addEqual(fillet3, fillet4)
+    sketchDimensions.addRadialDimension(fillet1, fillet1.startSketchPoint.geometry)
+
+    return sketch.offset(commonUtils.objectCollectionFromList([fillet1, fillet2, fillet3, fillet4, side1, side2, side3, side4]), offsetDirection, 1)
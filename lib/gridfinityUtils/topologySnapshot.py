@@ -0,0 +1,119 @@
+import math
+from array import array
+from collections import OrderedDict
+
+import adsk.core, adsk.fusion
+
+from .const import DEFAULT_FILTER_TOLERANCE
+
+# Face and edge queries on a body read every boundingBox and length through the API, once per
+# entity and per query. A snapshot reads them once into flat arrays (6 bounding box values per
+# entity) and answers the queries from there. Edges shared by two faces are stored once and
+# referenced by index from each face. Snapshots are keyed by the body entity token and dropped
+# when the body revision changes.
+
+AXIS_X = 0
+AXIS_Y = 1
+AXIS_Z = 2
+
+SNAPSHOT_CACHE_ENTRIES = 32
+
+class TopologySnapshot():
+    def __init__(self, body: adsk.fusion.BRepBody):
+        self.body = body
+        self.revisionId = body.revisionId
+        self.faces: list[adsk.fusion.BRepFace] = []
+        self.edges: list[adsk.fusion.BRepEdge] = []
+        self.faceBounds = array('d')
+        self.edgeBounds = array('d')
+        self.edgeLengths = array('d')
+        self.edgeTempIds = array('q')
+        # edges of face i are faceEdges[faceEdgeStarts[i]:faceEdgeStarts[i + 1]]
+        self.faceEdgeStarts = array('l', [0])
+        self.faceEdges = array('l')
+
+        edgeIndexByTempId: dict[int, int] = {}
+        for face in body.faces:
+            self.faces.append(face)
+            self.faceBounds.extend(_boundsOf(face.boundingBox))
+            for edge in face.edges:
+                edgeIndex = edgeIndexByTempId.get(edge.tempId)
+                if edgeIndex is None:
+                    edgeIndex = len(self.edges)
+                    edgeIndexByTempId[edge.tempId] = edgeIndex
+                    self.edges.append(edge)
+                    self.edgeBounds.extend(_boundsOf(edge.boundingBox))
+                    self.edgeLengths.append(edge.length)
+                    self.edgeTempIds.append(edge.tempId)
+                self.faceEdges.append(edgeIndex)
+            self.faceEdgeStarts.append(len(self.faceEdges))
+
+    @property
+    def isCurrent(self) -> bool:
+        return self.body.isValid and self.body.revisionId == self.revisionId
+
+    def _isFlat(self, bounds: array, index: int, axis: int) -> bool:
+        return math.isclose(bounds[index * 6 + axis], bounds[index * 6 + 3 + axis], abs_tol=DEFAULT_FILTER_TOLERANCE)
+
+    def _faceEdgeIndices(self, faceIndices: list[int]) -> list[int]:
+        # edges shared by two faces once, in face order
+        return list(dict.fromkeys(edgeIndex for i in faceIndices for edgeIndex in self.faceEdges[self.faceEdgeStarts[i]:self.faceEdgeStarts[i + 1]]))
+
+    def faceIndicesNormalTo(self, axis: int) -> list[int]:
+        """
+        Faces flat along axis, same test as faceUtils.isXNormal/isYNormal/isZNormal
+        """
+        return [i for i in range(len(self.faces)) if self._isFlat(self.faceBounds, i, axis)]
+
+    def facesNormalTo(self, axis: int) -> list[adsk.fusion.BRepFace]:
+        return [self.faces[i] for i in self.faceIndicesNormalTo(axis)]
+
+    def lowestFaceNormalTo(self, axis: int) -> adsk.fusion.BRepFace:
+        """
+        Face flat along axis with the smallest bounding box minimum on that axis, first one on ties
+        """
+        return self.faces[min(self.faceIndicesNormalTo(axis), key=lambda i: self.faceBounds[i * 6 + axis])]
+
+    def highestFaceNormalTo(self, axis: int) -> adsk.fusion.BRepFace:
+        return self.faces[max(self.faceIndicesNormalTo(axis), key=lambda i: self.faceBounds[i * 6 + axis])]
+
+    def edgesByLength(self, length: float, tolerance: float, faceIndices: list[int] = None) -> list[adsk.fusion.BRepEdge]:
+        """
+        Edges of the faces (all by default) matching length, in face order
+        """
+        if faceIndices is None:
+            faceIndices = range(len(self.faces))
+        return [self.edges[i] for i in self._faceEdgeIndices(faceIndices) if math.isclose(self.edgeLengths[i], length, abs_tol=tolerance)]
+
+    def edgesCollinearTo(self, axis: int, faceIndices: list[int] = None) -> list[adsk.fusion.BRepEdge]:
+        """
+        Edges of the faces (all by default) flat along the other two axes, in face order like faceUtils.getVerticalEdges
+        """
+        if faceIndices is None:
+            faceIndices = range(len(self.faces))
+        otherAxes = [other for other in (AXIS_X, AXIS_Y, AXIS_Z) if other != axis]
+        return [self.edges[i] for i in self._faceEdgeIndices(faceIndices) if all(self._isFlat(self.edgeBounds, i, other) for other in otherAxes)]
+
+def _boundsOf(box: adsk.core.BoundingBox3D) -> tuple[float, float, float, float, float, float]:
+    minPoint = box.minPoint
+    maxPoint = box.maxPoint
+    return (minPoint.x, minPoint.y, minPoint.z, maxPoint.x, maxPoint.y, maxPoint.z)
+
+_snapshots: OrderedDict[str, TopologySnapshot] = OrderedDict()
+
+def snapshotOf(body: adsk.fusion.BRepBody) -> TopologySnapshot:
+    """
+    Snapshot of the body, rebuilt when the body changed since the last call
+    """
+    key = body.entityToken
+    snapshot = _snapshots.get(key)
+    # tokens can come back after a preview is rolled back, the old body is invalid then
+    if snapshot is not None and snapshot.isCurrent and snapshot.revisionId == body.revisionId:
+        _snapshots.move_to_end(key)
+        return snapshot
+    snapshot = TopologySnapshot(body)
+    _snapshots[key] = snapshot
+    _snapshots.move_to_end(key)
+    while len(_snapshots) > SNAPSHOT_CACHE_ENTRIES:
+        _snapshots.popitem(last=False)
+    return snapshot
@@ -0,0 +1,124 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# Timing spans for the generators, saved as Chrome trace / Perfetto JSON
+# (open the file in ui.perfetto.dev or chrome://tracing).
+# Spans only record while a trace is active, so generator code can be wrapped unconditionally.
+
+TRACE_ENABLED = True
+TRACE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'traces')
+TRACE_MAX_FILES = 20
+TRACE_CATEGORY = 'gridfinity'
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.events: list[dict] = []
+        self.startTime = time.perf_counter()
+        self.pid = os.getpid()
+        self.path = ''
+        self.error = ''
+        self._lock = threading.Lock()
+
+    def addSpan(self, name: str, start: float, end: float, args: dict = None):
+        event = {
+            'name': name,
+            'cat': TRACE_CATEGORY,
+            'ph': 'X',
+            'ts': round((start - self.startTime) * 1e6, 3),
+            'dur': round((end - start) * 1e6, 3),
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+    def toDict(self) -> dict:
+        with self._lock:
+            events = sorted(self.events, key=lambda x: (x['ts'], -x['dur']))
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': self.name}}]
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.toDict(), file)
+        self.path = path
+
+_activeTrace: Trace = None
+
+def getActiveTrace() -> Trace:
+    return _activeTrace
+
+@contextmanager
+def span(name: str, **args):
+    trace = _activeTrace
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.addSpan(name, start, time.perf_counter(), args)
+
+def traced(name: str):
+    """
+    Decorator form of span for whole generator functions
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def tracePath(name: str, directory: str = TRACE_DIRECTORY) -> str:
+    fileName = re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_') or 'trace'
+    return os.path.abspath(os.path.join(directory, '{}-{}.json'.format(time.strftime('%Y%m%d-%H%M%S'), fileName)))
+
+def pruneTraces(directory: str = TRACE_DIRECTORY, maxFiles: int = TRACE_MAX_FILES):
+    if not os.path.isdir(directory):
+        return
+    files = sorted(
+        (os.path.join(directory, fileName) for fileName in os.listdir(directory) if fileName.endswith('.json')),
+        key=os.path.getmtime,
+    )
+    for path in files[:max(0, len(files) - maxFiles)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+@contextmanager
+def trace(name: str, directory: str = TRACE_DIRECTORY):
+    """
+    Records spans for one generator run and writes them to the trace folder next to the add-in.
+    Yields None when tracing is disabled, nested calls become spans of the outer trace.
+    Write errors are kept in trace.error, they never fail the generation
+    """
+    global _activeTrace
+    if not TRACE_ENABLED or _activeTrace is not None:
+        with span(name):
+            yield _activeTrace
+        return
+    current = Trace(name)
+    _activeTrace = current
+    try:
+        with span(name):
+            yield current
+    finally:
+        _activeTrace = None
+        try:
+            current.write(tracePath(name, directory))
+            pruneTraces(directory)
+        except OSError as err:
+            current.error = str(err)